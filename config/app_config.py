@@ -33,7 +33,29 @@ DEFAULT_CONFIG = {
         "check_update_on_start": True         # 启动时检查更新默认开启
     },
     "monitor": {
-        "enabled": True                       # ACE弹窗监控开关默认开启
+        "enabled": True,                      # ACE弹窗监控开关默认开启
+        "game_processes": [                   # 游戏/启动器进程，运行时提高轮询频率，退出后逐步降低
+            "VALORANT-Win64-Shipping.exe"
+        ],
+        "idle_backoff_max": 8,                # 空闲时轮询间隔的最大放大倍数
+        "verify_interval": 60,                # 重新核验已优化进程实际状态的间隔(秒)
+        "eco_core_intent": "avoid_game",      # 效能模式进程绑定核心的选择方式: avoid_game/efficiency/least_loaded/last_core
+        "reapply": {                          # 进程还原被修改的状态或拒绝修改时，按指数退避重新应用
+            "base_delay": 2,                  # 第一次重新应用前的等待时间(秒)，之后每次翻倍
+            "max_delay": 300,                 # 退避等待时间上限(秒)
+            "max_attempts": 5,                # 连续未能保持的次数上限，达到后放弃该进程直到其重启，0表示不放弃
+            "jitter": 0.2                     # 退避时间的随机抖动比例
+        },
+        "partition": {                        # 游戏CPU分区: 游戏运行时为其保留核心，其他进程限制在剩余核心上，游戏退出后恢复
+            "enabled": False,
+            "background_cores": 2,            # 留给后台进程的逻辑处理器数量（按完整物理核心分配，优先能效核心）
+            "exclude": []                     # 不调整亲和性的进程名称（系统关键进程已默认排除）
+        },
+        "rules": [                            # 进程规则，match 可组合 name/glob/regex/exe/parent，action 为 kill/optimize/throttle/notify
+                                              # optimize/throttle 规则可设置 "cpu_limit": 5 按占空比将进程限制在单核5%的CPU占用
+            {"name": "ACE-Tray弹窗", "match": {"name": "ACE-Tray.exe"}, "action": "kill"},
+            {"name": "SGuard64扫盘", "match": {"name": "SGuard64.exe"}, "action": "optimize"}
+        ]
     },
     "memory_cleaner": {
         "enabled": False,                     # 内存清理开关默认关闭
@@ -43,6 +65,11 @@ DEFAULT_CONFIG = {
         "threshold": 80.0,                    # 内存占用触发阈值默认值(百分比)
         "cooldown": 60                        # 内存清理冷却时间默认值(秒)
     },
+    "overhead": {
+        "enabled": True,                      # 自身开销超出预算时自动放大轮询间隔并暂停可选工作
+        "cpu_budget_percent": 0.2,            # CPU占用预算(占全部逻辑处理器的百分比)
+        "rss_budget_mb": 80                   # 常驻内存预算(MB)
+    },
     "io_priority": {
         "processes": [                        # 需要自动设置I/O优先级的进程名列表
             {"name": "SGuard64.exe", "priority": 0},
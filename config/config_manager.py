@@ -9,6 +9,7 @@ import os
 import yaml
 from utils.logger import logger
 from utils.system_utils import check_auto_start, enable_auto_start, disable_auto_start
+from utils.cpu_topology import CoreIntent
 from config.app_config import APP_INFO, DEFAULT_CONFIG, SYSTEM_CONFIG
 
 
@@ -46,6 +47,13 @@ class ConfigManager:
         self.show_notifications = self.default_config["notifications"]["enabled"]
         self.auto_start = self.default_config["application"]["auto_start"]
         self.monitor_enabled = self.default_config["monitor"]["enabled"]
+        self.monitor_game_processes = self.default_config["monitor"]["game_processes"].copy()
+        self.monitor_idle_backoff_max = self.default_config["monitor"]["idle_backoff_max"]
+        self.monitor_verify_interval = self.default_config["monitor"]["verify_interval"]
+        self.monitor_rules = self.default_config["monitor"]["rules"].copy()
+        self.monitor_eco_core_intent = self.default_config["monitor"]["eco_core_intent"]
+        self.monitor_reapply = self.default_config["monitor"]["reapply"].copy()
+        self.monitor_partition = self.default_config["monitor"]["partition"].copy()
         self.close_to_tray = self.default_config["application"]["close_to_tray"]
         self.log_retention_days = self.default_config["logging"]["retention_days"]
         self.log_rotation = self.default_config["logging"]["rotation"]
@@ -61,6 +69,11 @@ class ConfigManager:
         self.memory_cleaner_threshold = self.default_config["memory_cleaner"]["threshold"]
         self.memory_cleaner_cooldown = self.default_config["memory_cleaner"]["cooldown"]
 
+        # 自身开销预算
+        self.overhead_enabled = self.default_config["overhead"]["enabled"]
+        self.overhead_cpu_budget = self.default_config["overhead"]["cpu_budget_percent"]
+        self.overhead_rss_budget_mb = self.default_config["overhead"]["rss_budget_mb"]
+
         # I/O优先级设置
         self.io_priority_processes = self.default_config["io_priority"]["processes"].copy()
 
@@ -185,9 +198,41 @@ class ConfigManager:
                         logger.debug(f"已从配置文件加载启动时检查更新设置: {self.check_update_on_start}")
 
                 # 读取监控设置
-                if "monitor" in config_data and "enabled" in config_data["monitor"]:
-                    self.monitor_enabled = bool(config_data["monitor"]["enabled"])
-                    logger.debug(f"已从配置文件加载监控设置: {self.monitor_enabled}")
+                if "monitor" in config_data:
+                    if "enabled" in config_data["monitor"]:
+                        self.monitor_enabled = bool(config_data["monitor"]["enabled"])
+                        logger.debug(f"已从配置文件加载监控设置: {self.monitor_enabled}")
+                    if "game_processes" in config_data["monitor"] and isinstance(
+                        config_data["monitor"]["game_processes"], list
+                    ):
+                        self.monitor_game_processes = [str(name) for name in config_data["monitor"]["game_processes"]]
+                    if "idle_backoff_max" in config_data["monitor"]:
+                        self.monitor_idle_backoff_max = float(config_data["monitor"]["idle_backoff_max"])
+                        # 确保配置值合法
+                        if self.monitor_idle_backoff_max < 1:
+                            self.monitor_idle_backoff_max = 1
+                    if "verify_interval" in config_data["monitor"]:
+                        self.monitor_verify_interval = float(config_data["monitor"]["verify_interval"])
+                        # 确保配置值合法
+                        if self.monitor_verify_interval < 1:
+                            self.monitor_verify_interval = 1
+                    if "rules" in config_data["monitor"] and isinstance(config_data["monitor"]["rules"], list):
+                        self.monitor_rules = [rule for rule in config_data["monitor"]["rules"] if isinstance(rule, dict)]
+                        logger.debug(f"已从配置文件加载 {len(self.monitor_rules)} 条进程规则")
+                    if config_data["monitor"].get("eco_core_intent") in CoreIntent.ALL:
+                        self.monitor_eco_core_intent = config_data["monitor"]["eco_core_intent"]
+                    if isinstance(config_data["monitor"].get("reapply"), dict):
+                        # 与默认值合并，保证缺失的字段有默认值
+                        self.monitor_reapply = {
+                            **self.default_config["monitor"]["reapply"],
+                            **config_data["monitor"]["reapply"],
+                        }
+                    if isinstance(config_data["monitor"].get("partition"), dict):
+                        # 与默认值合并，保证缺失的字段有默认值
+                        self.monitor_partition = {
+                            **self.default_config["monitor"]["partition"],
+                            **config_data["monitor"]["partition"],
+                        }
 
                 # 读取内存清理设置
                 if "memory_cleaner" in config_data:
@@ -220,6 +265,20 @@ class ConfigManager:
                             self.memory_cleaner_cooldown = 30
                     logger.debug("已从配置文件加载内存清理设置")
 
+                # 读取自身开销预算
+                if "overhead" in config_data:
+                    if "enabled" in config_data["overhead"]:
+                        self.overhead_enabled = bool(config_data["overhead"]["enabled"])
+                    if "cpu_budget_percent" in config_data["overhead"]:
+                        self.overhead_cpu_budget = float(config_data["overhead"]["cpu_budget_percent"])
+                        # 确保配置值合法
+                        if self.overhead_cpu_budget <= 0:
+                            self.overhead_cpu_budget = self.default_config["overhead"]["cpu_budget_percent"]
+                    if "rss_budget_mb" in config_data["overhead"]:
+                        self.overhead_rss_budget_mb = float(config_data["overhead"]["rss_budget_mb"])
+                        if self.overhead_rss_budget_mb < 10:
+                            self.overhead_rss_budget_mb = 10
+
                 # 读取I/O优先级设置
                 if "io_priority" in config_data and "processes" in config_data["io_priority"]:
                     self.io_priority_processes = config_data["io_priority"]["processes"]
@@ -255,6 +314,13 @@ class ConfigManager:
             self.theme = self.default_config["application"]["theme"]
             self.check_update_on_start = self.default_config["application"]["check_update_on_start"]
             self.monitor_enabled = self.default_config["monitor"]["enabled"]
+            self.monitor_game_processes = self.default_config["monitor"]["game_processes"].copy()
+            self.monitor_idle_backoff_max = self.default_config["monitor"]["idle_backoff_max"]
+            self.monitor_verify_interval = self.default_config["monitor"]["verify_interval"]
+            self.monitor_rules = self.default_config["monitor"]["rules"].copy()
+            self.monitor_eco_core_intent = self.default_config["monitor"]["eco_core_intent"]
+            self.monitor_reapply = self.default_config["monitor"]["reapply"].copy()
+            self.monitor_partition = self.default_config["monitor"]["partition"].copy()
 
             # 加载内存清理默认设置
             self.memory_cleaner_enabled = self.default_config["memory_cleaner"]["enabled"]
@@ -264,6 +330,11 @@ class ConfigManager:
             self.memory_cleaner_threshold = self.default_config["memory_cleaner"]["threshold"]
             self.memory_cleaner_cooldown = self.default_config["memory_cleaner"]["cooldown"]
 
+            # 加载自身开销预算默认设置
+            self.overhead_enabled = self.default_config["overhead"]["enabled"]
+            self.overhead_cpu_budget = self.default_config["overhead"]["cpu_budget_percent"]
+            self.overhead_rss_budget_mb = self.default_config["overhead"]["rss_budget_mb"]
+
             # 加载I/O优先级默认设置
             self.io_priority_processes = self.default_config["io_priority"]["processes"].copy()
 
@@ -293,7 +364,16 @@ class ConfigManager:
                     "theme": self.theme,
                     "check_update_on_start": self.check_update_on_start,
                 },
-                "monitor": {"enabled": self.monitor_enabled},
+                "monitor": {
+                    "enabled": self.monitor_enabled,
+                    "game_processes": self.monitor_game_processes,
+                    "idle_backoff_max": self.monitor_idle_backoff_max,
+                    "verify_interval": self.monitor_verify_interval,
+                    "rules": self.monitor_rules,
+                    "eco_core_intent": self.monitor_eco_core_intent,
+                    "reapply": self.monitor_reapply,
+                    "partition": self.monitor_partition,
+                },
                 "memory_cleaner": {
                     "enabled": self.memory_cleaner_enabled,
                     "brute_mode": self.memory_cleaner_brute_mode,
@@ -302,6 +382,11 @@ class ConfigManager:
                     "threshold": self.memory_cleaner_threshold,
                     "cooldown": self.memory_cleaner_cooldown,
                 },
+                "overhead": {
+                    "enabled": self.overhead_enabled,
+                    "cpu_budget_percent": self.overhead_cpu_budget,
+                    "rss_budget_mb": self.overhead_rss_budget_mb,
+                },
                 "io_priority": {"processes": self.io_priority_processes},
             }
 
@@ -1,8 +1,25 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-"""核心功能模块"""
+"""
+核心功能模块
+
+GameProcessMonitor 依赖 pywin32，在首次访问时才导入，
+以便规则引擎（core.process_rules）可以在其他平台上单独用于回放和基准测试
+"""
+
+_LAZY_EXPORTS = {
+    "GameProcessMonitor": "core.process_monitor",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(__import__(module_name, fromlist=[name]), name)
+    globals()[name] = value
+    return value
 
-from core.process_monitor import GameProcessMonitor
 
 __all__ = ["GameProcessMonitor"]
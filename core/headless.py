@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+后台守护模式模块
+不加载PySide6，只运行进程监控、I/O优先级服务和内存清理，适合作为低占用的后台程序
+"""
+
+import signal
+import threading
+
+from core.process_monitor import GameProcessMonitor
+from utils.logger import logger
+from utils.task_scheduler import get_task_scheduler
+
+
+class HeadlessDaemon:
+    """无界面的后台守护进程"""
+
+    # 主线程等待的最长时间（秒），Windows下无限期等待时无法及时响应Ctrl+C
+    WAIT_SLICE = 5.0
+
+    def __init__(self, config_manager, monitor=True, io_priority=True, memory_cleaner=True, status_interval=300):
+        """
+        初始化后台守护进程
+
+        Args:
+            config_manager: 配置管理器对象
+            monitor (bool): 是否运行进程监控（仍受配置中的监控开关控制）
+            io_priority (bool): 是否运行I/O优先级服务
+            memory_cleaner (bool): 是否运行内存清理（仍受配置中的内存清理开关控制）
+            status_interval (float): 定期输出运行状态的间隔（秒），0表示不输出
+        """
+        self.config_manager = config_manager
+        self.enable_monitor = monitor
+        self.enable_io_priority = io_priority
+        self.enable_memory_cleaner = memory_cleaner
+        self.status_interval = status_interval
+
+        self.monitor = None
+        self.io_priority_service = None
+        self.memory_cleaner = None
+        self._notification_thread = None
+        self._notification_stop_event = None
+        self._status_task = None
+        self._stop_event = threading.Event()
+        self.started = False
+
+    def start(self):
+        """启动各项后台服务"""
+        if self.started:
+            return
+        self.started = True
+        self.monitor = GameProcessMonitor(self.config_manager)
+        # 测量自身开销，超出预算时放大各后台循环的轮询间隔
+        self.monitor.overhead_governor.start()
+        if self.enable_monitor and self.config_manager.monitor_enabled:
+            self.monitor.start_monitors()
+
+        if self.enable_io_priority:
+            from utils.process_io_priority import get_io_priority_service
+
+            self.io_priority_service = get_io_priority_service(self.config_manager)
+            if self.io_priority_service:
+                # 效能模式按配置避开游戏核心时，由监控器提供游戏进程占用的核心
+                self.io_priority_service.io_manager.game_cpus_provider = self.monitor.get_game_cpus
+                self.io_priority_service.start_service()
+
+        if self.enable_memory_cleaner and self.config_manager.memory_cleaner_enabled:
+            # 内存清理管理器初始化时会根据配置自动启动清理线程
+            from utils.memory_cleaner import get_memory_cleaner
+
+            self.memory_cleaner = get_memory_cleaner()
+
+        # 通知线程只依赖系统通知组件，不依赖PySide6
+        if self.config_manager.show_notifications:
+            try:
+                from utils.notification import create_notification_thread, find_icon_path
+
+                self._notification_thread, self._notification_stop_event = create_notification_thread(
+                    self.monitor.message_queue, find_icon_path()
+                )
+            except Exception as e:
+                logger.warning(f"后台模式下无法启用系统通知: {str(e)}")
+
+        logger.info(
+            f"后台模式已启动: 进程监控={'开' if self.monitor.running else '关'}, "
+            f"I/O优先级={'开' if self.io_priority_service else '关'}, "
+            f"内存清理={'开' if self.memory_cleaner and self.memory_cleaner.running else '关'}"
+        )
+
+    def log_status(self):
+        """输出一次运行状态"""
+        if not self.monitor:
+            return
+        snapshot_stats = self.monitor.snapshot_engine.get_stats()
+        latency = self.monitor.get_latency_stats()["action"]
+        logger.info(
+            f"运行状态: 进程 {snapshot_stats['process_count']} 个, 平均扫描 {snapshot_stats['avg_scan_ms']:.1f}ms, "
+            f"ACE-Tray已终止={self.monitor.anticheat_killed}, SGuard64已优化={self.monitor.scanprocess_optimized}, "
+            f"处理延迟P95 {latency['p95_ms']:.0f}ms"
+        )
+        for target in self.monitor.cpu_throttler.get_stats()["targets"]:
+            logger.info(
+                f"CPU限制: {target['name']} (PID: {target['pid']}) 目标 {target['limit_percent']:g}%, "
+                f"实际 {target['achieved_percent']:.1f}%"
+            )
+        overhead = self.monitor.overhead_governor.get_stats()
+        logger.info(
+            f"自身开销: CPU {overhead['cpu_percent']:.2f}% / 预算 {overhead['cpu_budget']:g}%, "
+            f"内存 {overhead['rss_mb']:.0f}MB / 预算 {overhead['rss_budget_mb']:g}MB, 轮询间隔 x{overhead['factor']}"
+        )
+        scheduler_stats = get_task_scheduler().get_stats()
+        logger.info(
+            f"调度: 线程 {scheduler_stats['process_threads']} 个 (调度器 {scheduler_stats['scheduler_threads']} 个), "
+            f"定时唤醒 {scheduler_stats['wakeups_per_min']:.1f} 次/分, 合并执行 {scheduler_stats['batched_runs']} 次"
+        )
+        if self.io_priority_service:
+            handle_stats = self.io_priority_service.io_manager.get_handle_stats()
+            logger.info(
+                f"进程句柄池: 缓存 {handle_stats['size']} 个, 打开 {handle_stats['opened']} 次, "
+                f"省去 {handle_stats['opens_saved']} 次, 复用率 {handle_stats['reuse_rate']:.0%}, "
+                f"设置写入 {handle_stats['writes']} 项, 已是目标状态跳过 {handle_stats['writes_skipped']} 项"
+            )
+            spawn_stats = self.io_priority_service.get_spawn_stats()
+            optimized_ms = spawn_stats["optimized_ms"]
+            logger.info(
+                f"启动即优化: 事件源 {spawn_stats['event_source'] or '无'}, 已优化 {spawn_stats['optimized']} 次, "
+                f"启动到优化完成 P50 {optimized_ms['p50']:.0f}ms / P95 {optimized_ms['p95']:.0f}ms / "
+                f"P99 {optimized_ms['p99']:.0f}ms"
+            )
+        reapply_stats = self.monitor.reapply_watchdog.get_stats()
+        for name, resets in reapply_stats["fight_back"].items():
+            logger.info(f"重新应用: {name} 已还原设置 {resets} 次")
+        if reapply_stats["given_up"]:
+            logger.info(f"重新应用: 已放弃 {reapply_stats['given_up']} 个连续未能保持设置的进程")
+        if self.monitor.partitioner and self.monitor.partitioner.active:
+            partition_stats = self.monitor.partitioner.get_stats()
+            logger.info(
+                f"CPU分区: 游戏核心 {partition_stats['game_cpus']}, 后台核心 {partition_stats['background_cpus']}, "
+                f"已调整 {partition_stats['fenced']} 个进程"
+            )
+
+    def request_stop(self, *_):
+        """请求停止（可作为信号处理函数）"""
+        self._stop_event.set()
+
+    def run(self):
+        """阻塞运行已启动（start）的后台服务，直到收到停止信号或键盘中断"""
+        for signal_name in ("SIGINT", "SIGTERM", "SIGBREAK"):
+            if hasattr(signal, signal_name):
+                signal.signal(getattr(signal, signal_name), self.request_stop)
+
+        if self.status_interval:
+            self._status_task = get_task_scheduler().schedule("headless_status", self.log_status, self.status_interval)
+        try:
+            while not self._stop_event.wait(self.WAIT_SLICE):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self):
+        """停止各项后台服务"""
+        self.started = False
+        if self.monitor and self.monitor.running:
+            self.monitor.stop_monitors()
+        if self.monitor:
+            self.monitor.overhead_governor.stop()
+
+        if self.io_priority_service and self.io_priority_service.running:
+            self.io_priority_service.stop_service()
+
+        if self.memory_cleaner and self.memory_cleaner.running:
+            self.memory_cleaner.stop_cleaner_thread()
+
+        if self._notification_stop_event:
+            self._notification_stop_event.set()
+            self.monitor.message_queue.put(None)
+            self._notification_thread.join(timeout=0.5)
+
+        if self._status_task:
+            self._status_task.cancel()
+            self._status_task = None
+        scheduler_stats = get_task_scheduler().get_stats()
+        shutdown_ms = get_task_scheduler().stop()
+        logger.info(
+            f"后台模式已停止: 线程 {scheduler_stats['process_threads']} 个, "
+            f"定时唤醒 {scheduler_stats['wakeups_per_min']:.1f} 次/分, 调度器停止耗时 {shutdown_ms:.1f}ms"
+        )
@@ -9,9 +9,23 @@ import os
 import queue
 import threading
 import time
+from collections import deque
 import psutil
 from utils.logger import logger
-import win32service
+from utils.process_snapshot import ProcessEntry, get_process_snapshot_engine
+from utils.applied_state import AppliedStateLedger
+from utils.reapply_watchdog import ReapplyWatchdog
+from utils.service_status import get_service_status_provider
+from utils.metrics import get_metrics_registry
+from utils.status_snapshot import StatusPublisher
+from utils.overhead_governor import get_overhead_governor
+from utils.cpu_partition import GamePartitioner
+from utils.cpu_throttler import get_cpu_throttler
+from utils.cpu_topology import CoreIntent, get_cpu_topology, TOPOLOGY_CACHE_FILE
+from utils.process_events import create_process_event_source
+from utils.adaptive_scheduler import get_adaptive_scheduler
+from utils.task_scheduler import get_task_scheduler
+from core.process_rules import RuleAction, compile_rules
 from win32api import OpenProcess
 from win32con import PROCESS_ALL_ACCESS
 from win32process import SetPriorityClass, IDLE_PRIORITY_CLASS, BELOW_NORMAL_PRIORITY_CLASS
@@ -26,6 +40,10 @@ POWER_THROTTLING_PROCESS_ENABLE = 0x1
 POWER_THROTTLING_PROCESS_DISABLE = 0x2
 
 
+# 直接查询进程优化状态所需的系统调用次数（CPU亲和性、优先级）
+OPTIMIZE_CHECK_SYSCALLS = 2
+
+
 class PROCESS_POWER_THROTTLING_STATE(ctypes.Structure):
     _fields_ = [("Version", wintypes.DWORD), ("ControlMask", wintypes.DWORD), ("StateMask", wintypes.DWORD)]
 
@@ -41,6 +59,7 @@ class GameProcessMonitor:
             config_manager: 配置管理器对象
         """
         self.config_manager = config_manager
+        # 界面状态展示使用的进程名称，实际处理由配置中的进程规则决定
         self.anticheat_name = "ACE-Tray.exe"  # 反作弊进程名称
         self.scanprocess_name = "SGuard64.exe"  # 扫描进程名称
 
@@ -52,20 +71,87 @@ class GameProcessMonitor:
             "ACE-GAME": {"exists": None, "status": None, "start_type": None},
         }
 
+        # 服务状态提供者：批量查询并缓存所有反作弊服务的状态
+        self.service_provider = get_service_status_provider()
+        self.service_provider.watch(self.anticheat_services.keys())
+
         self.running = False  # 监控线程运行标记，初始为False
-        self.process_cache = {}  # 进程缓存
+        self.snapshot_engine = get_process_snapshot_engine()  # 共享进程快照引擎
+
+        # 自适应轮询调度器：根据游戏进程是否运行调整快照引擎及其他后台循环的频率
+        self.scheduler = get_adaptive_scheduler()
+        self.scheduler.configure(config_manager.monitor_game_processes, config_manager.monitor_idle_backoff_max)
+        self.snapshot_engine.scheduler = self.scheduler
+        self.snapshot_engine.add_listener(self.scheduler.observe)
+        self.process_cache = {}  # 进程对象缓存，(pid, create_time) -> psutil.Process
         self.cache_timeout = 5  # 缓存超时时间（秒）
-        self.last_cache_refresh = 0  # 上次缓存刷新时间
         self.anticheat_killed = False  # 终止ACE进程标记
         self.scanprocess_optimized = False  # 优化SGuard64进程标记
         self.message_queue = queue.Queue()  # 消息队列，用于在线程间传递状态信息
 
+        # 进程创建事件源，启动监控时创建（系统通知不可用时回退为轮询）
+        self.event_source = None
+        # 进程启动到被发现、进程启动到被处理的延迟（秒）
+        self.detection_latencies = deque(maxlen=200)
+        self.action_latencies = deque(maxlen=200)
+        self._acted_processes = set()  # 已记录处理延迟的进程，(pid, create_time)
+
+        # 已应用状态台账：在核验周期内信任已设置的状态，避免每个周期查询受保护进程
+        self.applied_state = AppliedStateLedger(config_manager.monitor_verify_interval)
+        # 重新应用看门狗：进程还原状态或拒绝修改时按指数退避重新应用，连续失败达到上限后放弃
+        reapply_config = config_manager.monitor_reapply
+        self.reapply_watchdog = ReapplyWatchdog(
+            base_delay=reapply_config.get("base_delay", 2),
+            max_delay=reapply_config.get("max_delay", 300),
+            max_attempts=reapply_config.get("max_attempts", 5),
+            jitter=reapply_config.get("jitter", 0.2),
+        )
+
+        # CPU占空比限制器，规则设置了 cpu_limit 时使用
+        self.cpu_throttler = get_cpu_throttler()
+
+        # 进程规则：编译一次后在每个快照上单次遍历执行
+        self._handled_entries = set()  # 已处理的 (规则名称, ProcessEntry)
+        self.rule_matcher = None
+        self.reload_rules()
+
+        # 运行指标：缓存命中率、首次发现到处理的延迟、循环滞后及各动作失败次数
+        self.metrics = get_metrics_registry()
+        self._cache_hits = self.metrics.counter("monitor.process_cache.hit")
+        self._cache_misses = self.metrics.counter("monitor.process_cache.miss")
+        self._loop_lag = self.metrics.histogram("monitor.loop_lag_ms", "ms")
+        self._rules_duration = self.metrics.histogram("monitor.rules_ms", "ms")
+        self._first_seen = {}  # ProcessEntry -> 首次在快照中出现的时间（time.monotonic）
+
+        # CPU拓扑，每次开机只读取一次，用于为效能模式进程选择核心
+        self.cpu_topology = get_cpu_topology(os.path.join(config_manager.config_dir, TOPOLOGY_CACHE_FILE))
+
+        # 游戏CPU分区，启用后游戏运行时为其保留核心，其他进程限制在剩余核心上
+        partition_config = config_manager.monitor_partition
+        self.partitioner = None
+        if partition_config.get("enabled"):
+            self.partitioner = GamePartitioner(
+                self.cpu_topology,
+                config_manager.monitor_game_processes,
+                background_count=partition_config.get("background_cores", 2),
+                exclude=partition_config.get("exclude", []),
+            )
+
+        # 自身开销调控：超出预算时放大核验间隔、暂停调试指标采集并释放进程缓存
+        self.overhead_governor = get_overhead_governor(config_manager)
+        self._trim_requested = False
+        self.overhead_governor.add_listener(self._on_overhead_level)
+        self.overhead_governor.add_trim_callback(self._trim_caches)
+
+        # 界面状态发布器，由界面启动，在后台线程中汇总状态供界面渲染
+        self.status_publisher = StatusPublisher()
+        self.status_publisher.register("monitor", self.collect_status)
+
         # 设置自身进程优先级
         self._set_self_priority()
 
-        # 创建专门用于监控进程的线程
-        self.sguard_monitor_thread = None
-        self.acetray_monitor_thread = None
+        # 执行进程规则的监控线程
+        self.rules_monitor_thread = None
 
     def _set_self_priority(self):
         """设置自身进程优先级为低于正常"""
@@ -88,25 +174,59 @@ class GameProcessMonitor:
 
     def refresh_process_cache(self, force=False):
         """
-        刷新进程缓存，确保缓存中的进程信息是最新的
+        刷新进程快照，确保快照中的进程信息是最新的
+
+        Args:
+            force (bool): 是否强制刷新快照
+        """
+        self.snapshot_engine.refresh(force=force, max_age=self.cache_timeout)
+
+    def _get_process(self, entry):
+        """
+        根据快照条目获取进程对象，复用已创建的psutil.Process
 
         Args:
-            force (bool): 是否强制刷新缓存
+            entry (ProcessEntry): 快照中的进程条目
+
+        Returns:
+            psutil.Process or None: 进程对象，进程已退出则返回None
         """
-        current_time = time.time()
-        if force or (current_time - self.last_cache_refresh) >= self.cache_timeout:
-            self.process_cache.clear()
+        proc = self.process_cache.get(entry)
+        if proc is not None:
+            self._cache_hits.inc()
+        else:
+            self._cache_misses.inc()
             try:
-                for proc in psutil.process_iter(["pid", "name"]):
-                    if proc.info["name"]:
-                        self.process_cache[proc.info["name"].lower()] = proc
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                pass
-            self.last_cache_refresh = current_time
+                proc = psutil.Process(entry.pid)
+                # PID已被复用时创建时间不一致，视为原进程已退出
+                if entry.create_time and abs(proc.create_time() - entry.create_time) > 0.01:
+                    self.snapshot_engine.invalidate(entry.pid)
+                    return None
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                return None
+            self.process_cache[entry] = proc
+
+        try:
+            if proc.is_running():
+                return proc
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+        self.process_cache.pop(entry, None)
+        return None
+
+    def _prune_process_cache(self, snapshot):
+        """
+        清理已不在快照中的进程对象
+
+        Args:
+            snapshot (ProcessSnapshot): 最新进程快照
+        """
+        for entry in [entry for entry in list(self.process_cache) if entry not in snapshot]:
+            self.process_cache.pop(entry, None)
 
     def is_process_running(self, process_name):
         """
-        检查进程是否在运行
+        检查进程是否在运行（从共享快照中查找，不遍历进程表）
 
         Args:
             process_name (str): 进程名称
@@ -117,148 +237,228 @@ class GameProcessMonitor:
         if not process_name:
             return None
 
-        process_name_lower = process_name.lower()
+        snapshot = self.snapshot_engine.get_snapshot(max_age=self.cache_timeout)
+        for entry in snapshot.get(process_name):
+            proc = self._get_process(entry)
+            if proc:
+                return proc
 
-        # 先从缓存中查找
-        if process_name_lower in self.process_cache:
-            proc = self.process_cache[process_name_lower]
-            try:
-                if proc.is_running():
-                    return proc
-                else:
-                    del self.process_cache[process_name_lower]
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                del self.process_cache[process_name_lower]
+        return None
 
-        # 缓存中没有找到，则遍历所有进程
-        try:
-            for proc in psutil.process_iter(["name"]):
-                try:
-                    if proc.info["name"] and proc.info["name"].lower() == process_name_lower:
-                        self.process_cache[process_name_lower] = proc
-                        return proc
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-        except Exception:
-            pass
+    def get_process_instances(self, process_name):
+        """
+        获取指定进程名的所有运行中实例（从共享快照中查找，不遍历进程表）
 
-        return None
+        Args:
+            process_name (str): 进程名称
+
+        Returns:
+            list: psutil.Process 列表，未找到时为空列表
+        """
+        if not process_name:
+            return []
 
-    def check_service_status(self, service_name):
+        snapshot = self.snapshot_engine.get_snapshot(max_age=self.cache_timeout)
+        instances = []
+        for entry in snapshot.get(process_name):
+            proc = self._get_process(entry)
+            if proc:
+                instances.append(proc)
+        return instances
+
+    def _on_process_started(self, event):
         """
-        检查Windows服务的运行状态
+        进程创建事件回调，在事件源线程中执行
 
         Args:
-            service_name (str): 服务名称
+            event (ProcessStartEvent): 进程启动事件
+        """
+        # 存在按模式匹配的规则时事件源上报所有进程，只处理可能命中规则的进程
+        if not self.rule_matcher.rules_for_name(event.name):
+            return
+        if event.create_time:
+            self.detection_latencies.append(max(0.0, event.detected_at - event.create_time))
+        logger.debug(f"检测到进程启动: {event.name} (PID: {event.pid}, 来源: {event.source})")
+
+        # 进程被重新观测到时，下次执行规则前核验其实际状态
+        self.applied_state.request_verification(ProcessEntry(event.pid, event.create_time))
+
+        # 系统通知先于快照到达，请求快照引擎尽快刷新以唤醒等待中的监控线程；
+        # 刷新在快照任务中进行，连续到达的通知合并为一次遍历，不阻塞事件线程
+        if self.event_source and self.event_source.native:
+            self.snapshot_engine.request_refresh()
+
+    def _record_action_latency(self, entry):
+        """
+        记录进程从启动到被处理的延迟，每个进程只记录首次处理
+
+        Args:
+            entry (ProcessEntry): 已处理进程的快照条目
+        """
+        if entry in self._acted_processes or not entry.create_time:
+            return
+        if len(self._acted_processes) > 1000:
+            self._acted_processes.clear()
+        self._acted_processes.add(entry)
+        self.action_latencies.append(max(0.0, time.time() - entry.create_time))
+
+    @staticmethod
+    def _summarize_latencies(samples):
+        """
+        汇总延迟样本
+
+        Args:
+            samples (iterable): 延迟样本（秒）
 
         Returns:
-            tuple: (是否存在, 运行状态, 启动类型)
-                运行状态: 'running', 'stopped', 'paused', 'start_pending',
-                         'stop_pending', 'continue_pending', 'pause_pending', 'unknown'
-                启动类型: 'auto', 'manual', 'disabled', 'unknown'
+            dict: 样本数及平均、P50、P95、最大、最近一次延迟（毫秒）
         """
-        # 检查服务缓存，如果服务之前检查过不存在，减少重复检查频率
-        if hasattr(self, "_service_cache") and service_name in self._service_cache:
-            cache_item = self._service_cache[service_name]
-            # 如果服务不存在，且上次检查时间在10分钟内，直接返回缓存结果
-            if not cache_item["exists"] and time.time() - cache_item["last_check"] < 600:
-                return cache_item["exists"], cache_item["status"], cache_item["start_type"]
+        values = list(samples)
+        if not values:
+            return {"count": 0, "avg_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0}
+        ordered = sorted(values)
+        return {
+            "count": len(values),
+            "avg_ms": sum(values) / len(values) * 1000,
+            "p50_ms": ordered[len(ordered) // 2] * 1000,
+            "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+            "max_ms": ordered[-1] * 1000,
+            "last_ms": values[-1] * 1000,
+        }
 
-        try:
-            status_map = {
-                win32service.SERVICE_RUNNING: "running",
-                win32service.SERVICE_STOPPED: "stopped",
-                win32service.SERVICE_PAUSED: "paused",
-                win32service.SERVICE_START_PENDING: "start_pending",
-                win32service.SERVICE_STOP_PENDING: "stop_pending",
-                win32service.SERVICE_CONTINUE_PENDING: "continue_pending",
-                win32service.SERVICE_PAUSE_PENDING: "pause_pending",
-            }
+    def get_latency_stats(self):
+        """
+        获取进程启动到被发现/被处理的延迟统计
 
-            start_type_map = {
-                win32service.SERVICE_AUTO_START: "auto",
-                win32service.SERVICE_DEMAND_START: "manual",
-                win32service.SERVICE_DISABLED: "disabled",
-                win32service.SERVICE_BOOT_START: "boot",
-                win32service.SERVICE_SYSTEM_START: "system",
-            }
+        Returns:
+            dict: 事件源名称及延迟统计
+        """
+        return {
+            "event_source": self.event_source.name if self.event_source else None,
+            "detection": self._summarize_latencies(self.detection_latencies),
+            "action": self._summarize_latencies(self.action_latencies),
+        }
+
+    def get_metrics(self):
+        """
+        获取监控热路径的运行指标
 
-            # 获取服务管理器句柄
-            sch_handle = win32service.OpenSCManager(None, None, win32service.SC_MANAGER_ALL_ACCESS)
+        Returns:
+            dict: 各项计数器与直方图，以及快照引擎、进程缓存、延迟、服务查询、状态台账和任务调度器的统计
+        """
+        hits, misses = self._cache_hits.value, self._cache_misses.value
+        return {
+            **self.metrics.snapshot(),
+            "snapshot": self.snapshot_engine.get_stats(),
+            "process_cache": {
+                "hit": hits,
+                "miss": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "size": len(self.process_cache),
+            },
+            "latency": self.get_latency_stats(),
+            "services": self.service_provider.get_stats(),
+            "applied_state": self.applied_state.get_stats(),
+            "reapply": self.reapply_watchdog.get_stats(),
+            "overhead": self.overhead_governor.get_stats(),
+            "task_scheduler": get_task_scheduler().get_stats(),
+            "cpu_throttle": self.cpu_throttler.get_stats(),
+            "partition": self.partitioner.get_stats() if self.partitioner else None,
+        }
 
-            try:
-                # 获取服务句柄
-                service_handle = win32service.OpenService(
-                    sch_handle, service_name, win32service.SERVICE_QUERY_CONFIG | win32service.SERVICE_QUERY_STATUS
-                )
+    def collect_status(self):
+        """
+        汇总界面所需的监控状态，在状态发布线程中调用，避免在界面线程中查询进程和服务
 
-                try:
-                    # 获取服务状态
-                    service_status = win32service.QueryServiceStatus(service_handle)
-                    status = status_map.get(service_status[1], "unknown")
-
-                    # 获取服务配置信息
-                    service_config = win32service.QueryServiceConfig(service_handle)
-                    start_type = start_type_map.get(service_config[1], "unknown")
-
-                    # 更新缓存
-                    if not hasattr(self, "_service_cache"):
-                        self._service_cache = {}
-                    self._service_cache[service_name] = {
-                        "exists": True,
-                        "status": status,
-                        "start_type": start_type,
-                        "last_check": time.time(),
-                    }
-
-                    return True, status, start_type
-
-                finally:
-                    win32service.CloseServiceHandle(service_handle)
-            except win32service.error as e:
-                # 安全地获取错误码
-                error_code = None
-                try:
-                    # 尝试获取错误码
-                    if hasattr(e, "args") and len(e.args) > 0:
-                        error_code = e.args[0]
-                    elif hasattr(e, "winerror"):
-                        error_code = e.winerror
-                    elif isinstance(e, tuple) and len(e) > 0:
-                        error_code = e[0]
-                except:
-                    error_code = None
-
-                # 服务不存在时不记录警告日志，只在初次检查或错误码不是1060时记录
-                should_log = True
-                if error_code == 1060:  # ERROR_SERVICE_DOES_NOT_EXIST
-                    # 如果是服务不存在的错误，检查是否需要记录日志
-                    if hasattr(self, "_service_cache") and service_name in self._service_cache:
-                        should_log = False
-
-                if should_log:
-                    logger.debug(f"服务 {service_name} 不存在或无法访问: {str(e)} (错误码: {error_code})")
-
-                # 更新缓存
-                if not hasattr(self, "_service_cache"):
-                    self._service_cache = {}
-                self._service_cache[service_name] = {
-                    "exists": False,
-                    "status": "unknown",
-                    "start_type": "unknown",
-                    "last_check": time.time(),
+        Returns:
+            dict: 监控运行状态、轮询模式、状态台账、进程和服务状态，调试模式下包含运行指标
+        """
+        scheduler_stats = self.scheduler.get_stats()
+        ledger_stats = self.applied_state.get_stats()
+        running_count, optimized_count = self.check_process_status(self.scanprocess_name)
+        status = {
+            "running": self.running,
+            "scheduler": {
+                "state": scheduler_stats["state"],
+                "active_games": sorted(scheduler_stats["active_games"]),
+                "factor": scheduler_stats["factor"],
+            },
+            "ledger": {"entries": ledger_stats["entries"], "avoided_syscalls": ledger_stats["avoided_syscalls"]},
+            "anticheat": {
+                "running": self.is_process_running(self.anticheat_name) is not None,
+                "killed": self.anticheat_killed,
+            },
+            "scanprocess": {
+                "running_count": running_count,
+                "optimized_count": optimized_count,
+                "optimized": bool(running_count) and optimized_count >= running_count,
+            },
+            "services": self.monitor_anticheat_service(),
+            "cpu_limits": [
+                {
+                    "name": target["name"],
+                    "pid": target["pid"],
+                    "limit_percent": target["limit_percent"],
+                    "achieved_percent": round(target["achieved_percent"]),
                 }
+                for target in self.cpu_throttler.get_stats()["targets"]
+            ],
+        }
+        reapply_stats = self.reapply_watchdog.get_stats()
+        status["reapply"] = {
+            "pending": reapply_stats["pending"],
+            "given_up": reapply_stats["given_up"],
+            "fight_back": reapply_stats["fight_back"],
+        }
+        if self.partitioner:
+            partition_stats = self.partitioner.get_stats()
+            last_report = partition_stats["last_report"]
+            status["partition"] = {
+                "active": partition_stats["active"],
+                "game_cpus": partition_stats["game_cpus"],
+                "background_cpus": partition_stats["background_cpus"],
+                "fenced": partition_stats["fenced"],
+                "last_duration_ms": round(last_report["duration_ms"], 1) if last_report else None,
+            }
+        overhead = self.overhead_governor.get_stats()
+        status["overhead"] = {
+            "cpu_percent": round(overhead["cpu_percent"], 2),
+            "rss_mb": round(overhead["rss_mb"]),
+            "cpu_budget": overhead["cpu_budget"],
+            "rss_budget_mb": overhead["rss_budget_mb"],
+            "factor": overhead["factor"],
+            "optional_work": overhead["optional_work"],
+        }
+        # 调试指标属于可选工作，自身开销超出预算时暂停采集
+        if self.config_manager.debug_mode and overhead["optional_work"]:
+            status["metrics"] = self.get_metrics()
+        return status
 
-                return False, "unknown", "unknown"
-            finally:
-                win32service.CloseServiceHandle(sch_handle)
+    def _on_overhead_level(self, level, factor):
+        """自身开销调控级别变化回调：按倍数放大已应用状态的核验间隔"""
+        self.applied_state.verify_interval = self.config_manager.monitor_verify_interval * factor
 
-        except Exception as e:
-            error_type = type(e).__name__
-            error_msg = str(e)
-            logger.error(f"检查服务状态时发生错误: [{error_type}] {error_msg}")
-            logger.debug(f"服务名称: {service_name}, 异常详情: {repr(e)}")
-            return False, "unknown", "unknown"
+    def _trim_caches(self):
+        """自身内存超出预算时请求释放缓存，由规则线程在下一个快照前执行，避免与匹配过程并发修改"""
+        self._trim_requested = True
+
+    def check_service_status(self, service_name, force_refresh=False):
+        """
+        检查Windows服务的运行状态（从批量查询的缓存中读取）
+
+        Args:
+            service_name (str): 服务名称
+            force_refresh (bool): 是否丢弃缓存重新查询，停止或删除服务后使用
+
+        Returns:
+            tuple: (是否存在, 运行状态, 启动类型)
+                运行状态: 'running', 'stopped', 'paused', 'start_pending',
+                         'stop_pending', 'continue_pending', 'pause_pending', 'unknown'
+                启动类型: 'auto', 'manual', 'disabled', 'unknown'
+        """
+        if force_refresh:
+            self.service_provider.invalidate(service_name)
+        return tuple(self.service_provider.get_status(service_name))
 
     def monitor_anticheat_service(self):
         """
@@ -269,16 +469,14 @@ class GameProcessMonitor:
         """
         service_results = {}
 
-        # 遍历所有反作弊服务并检查状态
-        for service_name in self.anticheat_services.keys():
-            service_exists, status, start_type = self.check_service_status(service_name)
+        # 一次批量查询所有反作弊服务的状态
+        statuses = self.service_provider.get_statuses(self.anticheat_services.keys())
+        for service_name, service_status in statuses.items():
+            service_exists, status, start_type = service_status
 
             # 记录服务状态
             service_results[service_name] = {"exists": service_exists, "status": status, "start_type": start_type}
 
-            # if service_exists:
-            #     logger.debug(f"反作弊{service_name}服务状态: {status}, 启动类型: {start_type}")
-
             # 更新服务状态缓存
             self.anticheat_services[service_name]["exists"] = service_exists
             self.anticheat_services[service_name]["status"] = status
@@ -288,56 +486,108 @@ class GameProcessMonitor:
 
     def kill_process(self, process_name):
         """
-        终止进程
+        终止指定进程名的所有实例
 
         Args:
             process_name (str): 进程名称
 
         Returns:
-            bool: 是否成功终止进程
+            tuple: (成功终止的实例数, 发现的实例总数)
         """
-        proc = self.is_process_running(process_name)
-        if proc:
+        instances = self.get_process_instances(process_name)
+        killed_count = 0
+        for proc in instances:
             try:
                 proc.kill()
-                logger.debug(f"已终止进程: {process_name}")
-                if process_name.lower() in self.process_cache:
-                    del self.process_cache[process_name.lower()]
-                return True
+                killed_count += 1
+                logger.debug(f"已终止进程: {process_name} (PID: {proc.pid})")
+                for entry in [entry for entry, cached in list(self.process_cache.items()) if cached is proc]:
+                    self.process_cache.pop(entry, None)
             except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
-                logger.warning(f"终止进程失败: {process_name} - {str(e)}")
-        return False
+                logger.warning(f"终止进程失败: {process_name} (PID: {proc.pid}) - {str(e)}")
+        return killed_count, len(instances)
 
-    def set_process_priority_and_affinity(self, process_name):
+    def _optimize_process(self, proc, entry=None):
         """
-        设置进程优先级和CPU相关性
+        将单个进程设置为低优先级、绑定到按CPU拓扑选择的核心并启用效能模式
 
         Args:
-            process_name (str): 进程名称
+            proc (psutil.Process): 进程对象
+            entry (ProcessEntry, optional): 快照中的进程条目，提供时将结果记入已应用状态台账
 
         Returns:
             bool: 是否成功设置
         """
-        proc = self.is_process_running(process_name)
-        if proc:
-            try:
-                handle = OpenProcess(PROCESS_ALL_ACCESS, False, proc.pid)
-                SetPriorityClass(handle, IDLE_PRIORITY_CLASS)
+        try:
+            handle = OpenProcess(PROCESS_ALL_ACCESS, False, proc.pid)
+            SetPriorityClass(handle, IDLE_PRIORITY_CLASS)
+
+            # 设置CPU亲和性
+            affinity = self.select_eco_cores() or None
+            if affinity:
+                proc.cpu_affinity(affinity)
+
+            # 设置为效能模式
+            eco_qos = self._set_process_eco_qos(proc.pid)
+            if entry is not None:
+                self.applied_state.record(
+                    entry, RuleAction.OPTIMIZE, {"priority": IDLE_PRIORITY_CLASS, "affinity": affinity, "eco_qos": eco_qos}
+                )
+            return True
+        except Exception as e:
+            logger.error(f"优化进程(PID: {proc.pid})失败: {str(e)}")
+            return False
 
-                # 设置CPU亲和性
-                cores = psutil.cpu_count(logical=True)
-                if cores > 0:
-                    small_core = cores - 1
-                    proc.cpu_affinity([small_core])
+    def get_game_cpus(self, snapshot=None):
+        """
+        获取正在运行的游戏进程可使用的逻辑处理器
 
-                # 设置为效能模式
-                self._set_process_eco_qos(proc.pid)
+        Args:
+            snapshot (ProcessSnapshot, optional): 进程快照，默认使用当前快照
 
-                logger.debug(f"优化进程: {process_name}，已设置为效能模式")
-                return True
-            except Exception as e:
-                logger.error(f"优化进程失败: {str(e)}")
-        return False
+        Returns:
+            set: 逻辑处理器编号集合，没有游戏运行时为空集合
+        """
+        if snapshot is None:
+            snapshot = self.snapshot_engine.get_snapshot(max_age=self.cache_timeout)
+        game_cpus = set()
+        for game_name in self.config_manager.monitor_game_processes:
+            for entry in snapshot.get(game_name):
+                proc = self._get_process(entry)
+                if proc is None:
+                    continue
+                try:
+                    game_cpus.update(proc.cpu_affinity())
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+        return game_cpus
+
+    def select_eco_cores(self):
+        """
+        按配置的意图为效能模式进程选择核心
+
+        Returns:
+            list: 逻辑处理器编号列表
+        """
+        intent = self.config_manager.monitor_eco_core_intent
+        game_cpus = self.get_game_cpus() if intent == CoreIntent.AVOID_GAME else None
+        return self.cpu_topology.select(intent, game_cpus=game_cpus)
+
+    def set_process_priority_and_affinity(self, process_name):
+        """
+        设置指定进程名所有实例的优先级和CPU相关性
+
+        Args:
+            process_name (str): 进程名称
+
+        Returns:
+            tuple: (成功优化的实例数, 发现的实例总数)
+        """
+        instances = self.get_process_instances(process_name)
+        optimized_count = sum(1 for proc in instances if self._optimize_process(proc))
+        if instances:
+            logger.debug(f"优化进程: {process_name}，已将 {optimized_count}/{len(instances)} 个实例设置为效能模式")
+        return optimized_count, len(instances)
 
     def _set_process_eco_qos(self, pid):
         """
@@ -400,169 +650,337 @@ class GameProcessMonitor:
 
     def check_process_status(self, process_name):
         """
-        检查进程状态，判断是否已被处理
+        检查指定进程名所有实例的状态，判断是否已被处理
 
         Args:
             process_name (str): 进程名称
 
         Returns:
-            tuple: (是否运行, 是否已优化)
+            tuple: (运行中的实例数, 已优化的实例数)
         """
-        proc = self.is_process_running(process_name)
-        if not proc:
-            return False, False
+        if not process_name:
+            return 0, 0
+
+        snapshot = self.snapshot_engine.get_snapshot(max_age=self.cache_timeout)
+        instances = [(entry, proc) for entry in snapshot.get(process_name) for proc in [self._get_process(entry)] if proc]
+        if not instances:
+            return 0, 0
+
+        # 只有命中优化规则的进程才需要检查优化状态
+        if not any(rule.action == RuleAction.OPTIMIZE for rule in self.rule_matcher.rules_for_name(process_name)):
+            return len(instances), 0
+
+        optimized_count = 0
+        for entry, proc in instances:
+            # 优先使用台账中的状态，台账中没有记录时才查询进程
+            optimized = self.applied_state.is_applied(entry, RuleAction.OPTIMIZE, OPTIMIZE_CHECK_SYSCALLS)
+            if optimized is None:
+                optimized = self._is_process_optimized(proc)
+            if optimized:
+                optimized_count += 1
+        return len(instances), optimized_count
+
+    def _is_process_optimized(self, proc):
+        """
+        检查单个进程是否已被优化
 
-        # 进程存在，检查是否已优化
+        Args:
+            proc (psutil.Process): 进程对象
+
+        Returns:
+            bool: 是否已优化
+        """
         is_optimized = False
 
-        if process_name.lower() == self.scanprocess_name.lower():
+        try:
+            # 检查CPU亲和性（这个不涉及Windows API调用，较为安全）
+            cpu_affinity_optimized = False
             try:
-                # 检查CPU亲和性（这个不涉及Windows API调用，较为安全）
-                cpu_affinity_optimized = False
-                try:
-                    cpu_affinity = proc.cpu_affinity()
-                    cores = psutil.cpu_count(logical=True)
-                    expected_core = [cores - 1] if cores > 0 else None
-
-                    # 判断CPU亲和性是否符合优化要求
-                    if expected_core is not None:
-                        # 只要设置了亲和性，或者亲和性包含了最后一个核心，就认为是优化了
-                        if len(cpu_affinity) == 1 or (cores - 1) in cpu_affinity:
-                            cpu_affinity_optimized = True
-                except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
-                    logger.debug(f"检查CPU亲和性失败: {str(e)}")
-                    # 如果检查失败，给予好处理，假设已优化
-                    cpu_affinity_optimized = True
+                cpu_affinity = proc.cpu_affinity()
 
-                # 检查进程优先级
-                priority_optimized = False
-                try:
-                    # 在Windows上，nice()返回的是进程优先级类
-                    priority = proc.nice()
-                    # 只要是低优先级就认为是已优化
-                    if priority in [IDLE_PRIORITY_CLASS, BELOW_NORMAL_PRIORITY_CLASS]:
-                        priority_optimized = True
+                # 亲和性被限制在部分核心上就认为是优化了（所选核心会随负载和游戏占用的核心变化）
+                if len(cpu_affinity) < self.cpu_topology.logical_count:
+                    cpu_affinity_optimized = True
+            except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
+                logger.debug(f"检查CPU亲和性失败: {str(e)}")
+                # 如果检查失败，给予好处理，假设已优化
+                cpu_affinity_optimized = True
 
-                    # logger.debug(f"{process_name} 状态检查: 优先级={priority}, 优先级优化={priority_optimized}, CPU亲和性优化={cpu_affinity_optimized}")
+            # 检查进程优先级
+            priority_optimized = False
+            try:
+                # 在Windows上，nice()返回的是进程优先级类
+                priority = proc.nice()
+                # 只要是低优先级就认为是已优化
+                if priority in [IDLE_PRIORITY_CLASS, BELOW_NORMAL_PRIORITY_CLASS]:
+                    priority_optimized = True
 
-                    # 放宽判断标准：只要优先级或CPU亲和性满足一个条件就认为已优化
-                    is_optimized = priority_optimized or cpu_affinity_optimized
+                # logger.debug(f"进程(PID: {proc.pid}) 状态检查: 优先级={priority}, 优先级优化={priority_optimized}, CPU亲和性优化={cpu_affinity_optimized}")
 
-                except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
-                    logger.debug(f"检查进程优先级失败: {str(e)}")
-                    # 如果检查失败，给予好处理，假设已优化
-                    is_optimized = True
+                # 放宽判断标准：只要优先级或CPU亲和性满足一个条件就认为已优化
+                is_optimized = priority_optimized or cpu_affinity_optimized
 
-            except Exception as e:
-                logger.error(f"检查进程状态失败: {str(e)}")
-                # 如果检查过程出现异常，不要立即判断为未优化，给予好处理
+            except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
+                logger.debug(f"检查进程优先级失败: {str(e)}")
+                # 如果检查失败，给予好处理，假设已优化
                 is_optimized = True
 
-        return True, is_optimized
+        except Exception as e:
+            logger.error(f"检查进程状态失败: {str(e)}")
+            # 如果检查过程出现异常，不要立即判断为未优化，给予好处理
+            is_optimized = True
+
+        return is_optimized
+
+    def reload_rules(self, rule_configs=None):
+        """
+        重新编译进程规则
 
-    def monitor_acetray_process(self):
+        Args:
+            rule_configs (list, optional): 规则配置列表，为空时从配置管理器读取
         """
-        专门监控并终止ACE-Tray.exe进程
+        if rule_configs is None:
+            rule_configs = self.config_manager.monitor_rules
+        self.rule_matcher = compile_rules(rule_configs)
+        self._handled_entries.clear()
+        self.reapply_watchdog.clear()
+        self.cpu_throttler.clear()
+        logger.debug(f"已加载 {len(self.rule_matcher.rules)} 条进程规则")
+
+    def _dispatch_rule(self, rule, name, entry, proc, first_seen):
         """
-        check_counter = 0
+        对单个命中规则的进程执行规则动作
 
-        while self.running:
-            # 每5次循环刷新一次进程缓存
-            if check_counter % 5 == 0:
-                self.refresh_process_cache()
-            check_counter += 1
-
-            # 检查ACE-Tray.exe进程是否存在
-            ace_proc = self.is_process_running(self.anticheat_name)
-
-            if ace_proc:
-                if not self.anticheat_killed:
-                    logger.debug(f"检测到 {self.anticheat_name} 进程，尝试终止")
-                    if self.kill_process(self.anticheat_name):
-                        self.anticheat_killed = True
-                        self.add_message(f"已终止 {self.anticheat_name} 进程")
-                    else:
-                        # 如果终止失败，暂时标记为已处理，避免频繁尝试
-                        self.anticheat_killed = True
-                        logger.warning(f"终止 {self.anticheat_name} 失败")
-            else:
-                # 进程不存在时重置状态，以便下次检测到时再次处理
-                self.anticheat_killed = False
+        Args:
+            rule (ProcessRule): 命中的规则
+            name (str): 进程名称
+            entry (ProcessEntry): 快照中的进程条目
+            proc (psutil.Process): 进程对象
+            first_seen (bool): 该规则是否首次处理此进程
+
+        Returns:
+            bool or None: 动作是否成功，无需执行动作时返回None
+        """
+        if rule.action == RuleAction.KILL:
+            # 终止失败时同样视为已处理，避免频繁尝试
+            if not first_seen:
+                return None
+            try:
+                proc.kill()
+                self.process_cache.pop(entry, None)
+                logger.debug(f"已终止进程: {name} (PID: {proc.pid}, 规则: {rule.rule_id})")
+                return True
+            except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
+                logger.warning(f"终止进程失败: {name} (PID: {proc.pid}) - {str(e)}")
+                return False
 
-            # 降低检测频率，减少CPU使用率
-            time.sleep(2)
+        # 占空比CPU限制与优先级优化相互独立，进程首次命中规则时加入限制器，进程退出后由限制器自行移除
+        if first_seen and rule.cpu_limit:
+            self.cpu_throttler.add(proc, rule.cpu_limit, key=entry, name=name)
+
+        if rule.action == RuleAction.OPTIMIZE:
+            if not first_seen:
+                # 状态被还原或应用失败后，退避期间及放弃后既不核验也不重新应用
+                if self.reapply_watchdog.is_pending(entry, rule.action) and not self.reapply_watchdog.ready(
+                    entry, rule.action
+                ):
+                    return None
+                # 核验周期内直接信任台账，到期或进程被重新观测时才查询实际状态
+                if not self.applied_state.needs_verification(entry, rule.action):
+                    if self.applied_state.is_applied(entry, rule.action, OPTIMIZE_CHECK_SYSCALLS):
+                        return None
+                else:
+                    record = self.applied_state.get(entry, rule.action)
+                    optimized = self._is_process_optimized(proc)
+                    self.applied_state.mark_verified(entry, rule.action, optimized)
+                    if optimized:
+                        self.reapply_watchdog.on_held(entry, rule.action)
+                        return None
+                    if record is not None and record.verified:
+                        # 之前设置的状态被进程自行还原
+                        self.reapply_watchdog.on_reset(entry, rule.action, name)
+                # 退避期间或已放弃时不重新应用
+                if not self.reapply_watchdog.ready(entry, rule.action):
+                    return None
+            optimized = self._optimize_process(proc, entry)
+            self.reapply_watchdog.on_attempt(entry, rule.action, optimized, name)
+            return optimized
+
+        if rule.action == RuleAction.THROTTLE:
+            if not first_seen:
+                return None
+            throttled = self._set_process_eco_qos(proc.pid)
+            if throttled:
+                self.applied_state.record(entry, rule.action, {"eco_qos": True})
+            return throttled
+
+        # RuleAction.NOTIFY
+        if first_seen:
+            self.add_message(f"检测到进程 {name} (PID: {proc.pid}, 规则: {rule.rule_id})")
+        return None
 
-    def monitor_sguard_process(self):
+    def apply_rules(self, snapshot):
         """
-        专门监控并优化SGuard64.exe进程
+        对快照执行所有进程规则，一次遍历完成所有目标进程的处理
+
+        Args:
+            snapshot (ProcessSnapshot): 进程快照
+
+        Returns:
+            dict: (规则名称, 进程名) -> [成功数, 命中实例数]
+        """
+        results = {}
+        seen = set()
+        now = time.monotonic()
+
+        for match in self.rule_matcher.match(snapshot):
+            rule = match.rule
+            key = (rule.rule_id, match.entry)
+            seen.add(key)
+            first_seen = key not in self._handled_entries
+            self._first_seen.setdefault(match.entry, now)
+
+            proc = self._get_process(match.entry)
+            if proc is None:
+                continue
+
+            counts = results.setdefault((rule.rule_id, match.name), [0, 0])
+            counts[1] += 1
+            outcome = self._dispatch_rule(rule, match.name, match.entry, proc, first_seen)
+            self._handled_entries.add(key)
+            if outcome is not None:
+                self.metrics.counter(f"monitor.action.{rule.action}.{'ok' if outcome else 'failed'}").inc()
+            if outcome:
+                counts[0] += 1
+                self._record_action_latency(match.entry)
+                if first_seen:
+                    self.metrics.histogram(f"monitor.first_seen_to_{rule.action}_ms", "ms").observe(
+                        (time.monotonic() - self._first_seen[match.entry]) * 1000
+                    )
+            elif (
+                outcome is None
+                and rule.action == RuleAction.OPTIMIZE
+                and not self.reapply_watchdog.is_pending(match.entry, rule.action)
+            ):
+                # 已处于优化状态
+                counts[0] += 1
+
+            if outcome is not None and first_seen:
+                self._report_rule_outcome(rule, match.name, outcome)
+
+        # 进程退出后清理已处理记录，以便再次出现时重新处理
+        self._handled_entries &= seen
+        for entry in [entry for entry in self._first_seen if entry not in snapshot]:
+            del self._first_seen[entry]
+        self._update_legacy_flags(snapshot, results)
+        return results
+
+    def _report_rule_outcome(self, rule, name, success):
+        """记录规则动作结果并发送通知"""
+        action_text = {
+            RuleAction.KILL: "终止",
+            RuleAction.OPTIMIZE: "优化",
+            RuleAction.THROTTLE: "启用效能模式",
+        }.get(rule.action)
+        if not action_text:
+            return
+        if success:
+            self.add_message(f"已{action_text} {name} 进程")
+        else:
+            logger.warning(f"{action_text} {name} 失败 (规则: {rule.rule_id})")
+
+    def _update_legacy_flags(self, snapshot, results):
+        """根据规则执行结果更新界面使用的ACE-Tray/SGuard64状态标记"""
+        anticheat_lower = self.anticheat_name.lower()
+        self.anticheat_killed = bool(snapshot.get(self.anticheat_name)) and any(
+            name == anticheat_lower for _, name in results
+        )
+
+        scanprocess_lower = self.scanprocess_name.lower()
+        scan_results = [counts for (_, name), counts in results.items() if name == scanprocess_lower]
+        self.scanprocess_optimized = bool(scan_results) and all(done >= total for done, total in scan_results)
+
+    def monitor_rules_loop(self):
         """
-        check_counter = 0
+        规则监控线程：每个新快照执行一次所有规则
+        """
+        last_version = 0
 
         while self.running:
-            # 每5次循环刷新一次进程缓存
-            if check_counter % 5 == 0:
-                self.refresh_process_cache()
-            check_counter += 1
-
-            # 检查SGuard64进程是否存在
-            scan_running, is_optimized = self.check_process_status(self.scanprocess_name)
-
-            if scan_running:
-                # 如果进程正在运行，根据优化状态设置全局标志
-                if is_optimized:
-                    # 如果检测到已优化，直接设置全局标志为True
-                    if not self.scanprocess_optimized:
-                        logger.debug(f"{self.scanprocess_name} 进程已检测为优化状态")
-                        self.scanprocess_optimized = True
-                else:
-                    # 未优化时尝试优化
-                    logger.debug(f"检测到未优化的 {self.scanprocess_name}，尝试优化")
-                    if self.set_process_priority_and_affinity(self.scanprocess_name):
-                        self.scanprocess_optimized = True
-                        self.add_message(f"已优化 {self.scanprocess_name} 进程")
-            else:
-                # 如果当前没有运行，重置状态以便下次检测到时再次优化
-                if self.scanprocess_optimized:
-                    self.scanprocess_optimized = False
+            # 等待快照引擎发布新快照，所有规则共享同一次进程表遍历
+            snapshot = self.snapshot_engine.wait_for_snapshot(last_version)
+            last_version = snapshot.version
+            if not self.running:
+                break
+            # 快照发布到规则线程开始处理之间的滞后
+            start = time.monotonic()
+            self._loop_lag.observe(max(0.0, start - snapshot.timestamp) * 1000)
+            if self._trim_requested:
+                self._trim_requested = False
+                self.process_cache.clear()
+                self.rule_matcher.clear_caches()
+            self._prune_process_cache(snapshot)
+            self.applied_state.prune(snapshot)
+            self.reapply_watchdog.prune(snapshot)
+
+            # 先更新游戏CPU分区，使效能模式选择核心时能看到游戏保留的核心
+            if self.partitioner:
+                try:
+                    self.partitioner.update(snapshot)
+                except Exception as e:
+                    logger.error(f"更新游戏CPU分区时发生错误: {str(e)}")
 
-            # 降低检测频率，减少CPU使用率
-            time.sleep(2)
+            try:
+                self.apply_rules(snapshot)
+            except Exception as e:
+                logger.error(f"执行进程规则时发生错误: {str(e)}")
+            self._rules_duration.observe((time.monotonic() - start) * 1000)
 
     def start_monitors(self):
         """启动所有监控线程"""
         self.running = True
         logger.debug("监控程序已启动")
 
-        # 启动ACE-Tray专用监控线程
-        self.start_acetray_monitor()
+        # 启动共享进程快照引擎
+        self.snapshot_engine.start()
+
+        # 订阅进程创建事件，目标进程启动时立即唤醒规则监控线程
+        if not self.event_source:
+            self.event_source = create_process_event_source(self.snapshot_engine, self.rule_matcher.watched_names)
+            self.event_source.subscribe(self._on_process_started)
 
-        # 启动SGuard64专用监控线程
-        self.start_sguard_monitor()
+        # 启动规则监控线程
+        self.start_rules_monitor()
 
         # 初始检查反作弊服务状态
         self.monitor_anticheat_service()
 
-    def start_acetray_monitor(self):
-        """启动专门用于监控ACE-Tray.exe进程的线程"""
-        if not self.acetray_monitor_thread or not self.acetray_monitor_thread.is_alive():
-            logger.debug(f"启动ACE-Tray专用监控线程")
-            self.acetray_monitor_thread = threading.Thread(target=self.monitor_acetray_process)
-            self.acetray_monitor_thread.daemon = True
-            self.acetray_monitor_thread.start()
-
-    def start_sguard_monitor(self):
-        """启动专门用于监控SGuard64.exe进程的线程"""
-        if not self.sguard_monitor_thread or not self.sguard_monitor_thread.is_alive():
-            logger.debug(f"启动SGuard64专用监控线程")
-            self.sguard_monitor_thread = threading.Thread(target=self.monitor_sguard_process)
-            self.sguard_monitor_thread.daemon = True
-            self.sguard_monitor_thread.start()
+    def start_rules_monitor(self):
+        """启动执行进程规则的监控线程"""
+        if not self.rules_monitor_thread or not self.rules_monitor_thread.is_alive():
+            logger.debug("启动进程规则监控线程")
+            self.rules_monitor_thread = threading.Thread(target=self.monitor_rules_loop)
+            self.rules_monitor_thread.daemon = True
+            self.rules_monitor_thread.start()
 
     def stop_monitors(self):
         """停止所有监控线程"""
         # 设置运行标志为False，使所有监控线程退出循环
         self.running = False
+        # 停止进程创建事件源
+        if self.event_source:
+            self.event_source.stop()
+            self.event_source = None
+        # 停止共享进程快照引擎，停止后其他使用者会按需刷新快照
+        self.snapshot_engine.stop()
+        # 停止CPU限制并恢复所有被暂停的进程
+        self.cpu_throttler.stop()
+        # 恢复游戏CPU分区前的进程亲和性
+        if self.partitioner and self.partitioner.active:
+            self.partitioner.restore()
         # 重置状态
+        self._handled_entries.clear()
+        self._first_seen.clear()
         self.anticheat_killed = False
         self.scanprocess_optimized = False
         logger.debug("监控程序已停止")
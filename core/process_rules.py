@@ -0,0 +1,291 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+进程规则引擎模块
+将配置中的声明式规则编译为匹配器，每个快照只遍历一次即可得到所有规则的命中结果
+"""
+
+import fnmatch
+import re
+from collections import namedtuple
+
+import psutil
+from utils.logger import logger
+
+
+# 规则命中结果
+RuleMatch = namedtuple("RuleMatch", ["rule", "name", "entry"])
+
+
+class RuleAction:
+    """规则动作枚举"""
+
+    KILL = "kill"  # 终止进程
+    OPTIMIZE = "optimize"  # 低优先级 + 绑定按CPU拓扑选择的核心 + 效能模式
+    THROTTLE = "throttle"  # 仅启用效能模式（EcoQoS）
+    NOTIFY = "notify"  # 仅发送通知
+
+    ALL = (KILL, OPTIMIZE, THROTTLE, NOTIFY)
+
+
+class ProcessRule:
+    """单条进程规则"""
+
+    MATCH_KEYS = ("name", "glob", "regex", "exe", "parent")
+
+    def __init__(self, rule_id, action, match, enabled=True, options=None):
+        """
+        初始化进程规则
+
+        Args:
+            rule_id (str): 规则名称
+            action (str): 规则动作，见 RuleAction
+            match (dict): 匹配条件，可组合 name/glob/regex/exe/parent，需全部满足
+            enabled (bool): 是否启用
+            options (dict, optional): 动作参数，optimize/throttle 规则可设置 cpu_limit（单核CPU占用百分比）启用占空比限制
+        """
+        if action not in RuleAction.ALL:
+            raise ValueError(f"未知的规则动作: {action}")
+        unknown_keys = set(match) - set(self.MATCH_KEYS)
+        if unknown_keys:
+            raise ValueError(f"未知的匹配条件: {', '.join(sorted(unknown_keys))}")
+        for key in self.MATCH_KEYS:
+            value = match.get(key)
+            if value is not None and not isinstance(value, str):
+                raise ValueError(f"匹配条件 {key} 必须是字符串: {value!r}")
+        if not any(match.get(key) for key in self.MATCH_KEYS):
+            raise ValueError("规则至少需要一个匹配条件")
+
+        self.rule_id = rule_id
+        self.action = action
+        self.enabled = enabled
+        self.options = options or {}
+
+        self.cpu_limit = self.options.get("cpu_limit") or None
+        if self.cpu_limit is not None:
+            if action not in (RuleAction.OPTIMIZE, RuleAction.THROTTLE):
+                raise ValueError(f"cpu_limit 只能用于 {RuleAction.OPTIMIZE}/{RuleAction.THROTTLE} 规则")
+            if not isinstance(self.cpu_limit, (int, float)) or not 0 < self.cpu_limit <= 100:
+                raise ValueError(f"cpu_limit 必须在 0-100 之间: {self.cpu_limit}")
+
+        self.name = (match.get("name") or "").lower() or None
+        self.glob = match.get("glob") or None
+        self.regex = match.get("regex") or None
+        self.exe = match.get("exe") or None
+        self.parent = (match.get("parent") or "").lower() or None
+
+        # 预编译进程名模式
+        self._name_patterns = []
+        if self.glob:
+            self._name_patterns.append(re.compile(fnmatch.translate(self.glob.lower())))
+        if self.regex:
+            self._name_patterns.append(re.compile(self.regex, re.IGNORECASE))
+        self._exe_pattern = re.compile(fnmatch.translate(self.exe.lower())) if self.exe else None
+        self._parent_pattern = re.compile(fnmatch.translate(self.parent)) if self.parent else None
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        从配置字典创建规则
+
+        Args:
+            config (dict): {"name": 规则名称, "match": {...}, "action": 动作, "enabled": 是否启用, ...}
+
+        Returns:
+            ProcessRule: 进程规则
+        """
+        match = config.get("match") or {}
+        if not isinstance(match, dict):
+            raise ValueError(f"匹配条件必须是字典: {match!r}")
+        options = {key: value for key, value in config.items() if key not in ("name", "match", "action", "enabled")}
+        return cls(
+            rule_id=config.get("name") or str(match),
+            action=config.get("action"),
+            match=dict(match),
+            enabled=bool(config.get("enabled", True)),
+            options=options,
+        )
+
+    @property
+    def needs_process_info(self):
+        """是否需要读取进程路径或父进程才能判断"""
+        return self.exe is not None or self.parent is not None
+
+    def match_name(self, name):
+        """
+        判断小写进程名是否满足名称类条件
+
+        Args:
+            name (str): 小写进程名
+
+        Returns:
+            bool: 是否满足
+        """
+        if self.name is not None and name != self.name:
+            return False
+        return all(pattern.match(name) for pattern in self._name_patterns)
+
+    def match_info(self, exe, parent_name):
+        """
+        判断进程路径和父进程是否满足条件
+
+        Args:
+            exe (str or None): 进程可执行文件路径
+            parent_name (str or None): 小写父进程名
+
+        Returns:
+            bool: 是否满足
+        """
+        if self._exe_pattern is not None and not (exe and self._exe_pattern.match(exe.lower())):
+            return False
+        if self._parent_pattern is not None and not (parent_name and self._parent_pattern.match(parent_name.lower())):
+            return False
+        return True
+
+
+class RuleMatcher:
+    """规则匹配器，编译后对每个快照单次遍历完成所有规则的匹配"""
+
+    # 进程名匹配结果缓存上限
+    NAME_CACHE_LIMIT = 4096
+
+    def __init__(self, rules):
+        """
+        编译规则
+
+        Args:
+            rules (list): ProcessRule 列表
+        """
+        self.rules = [rule for rule in rules if rule.enabled]
+
+        # 只按精确进程名匹配的规则直接建立索引，其他规则需要逐个进程名判断
+        self._exact_rules = {}
+        self._pattern_rules = []
+        for rule in self.rules:
+            if rule.name is not None:
+                self._exact_rules.setdefault(rule.name, []).append(rule)
+            else:
+                self._pattern_rules.append(rule)
+
+        self._name_cache = {}  # 小写进程名 -> 命中的规则元组
+        self._info_cache = {}  # ProcessEntry -> (可执行文件路径, 小写父进程名)
+
+    def clear_caches(self):
+        """清除进程名匹配缓存和进程路径缓存（下次匹配时重新计算）"""
+        self._name_cache.clear()
+        self._info_cache.clear()
+
+    @property
+    def watched_names(self):
+        """
+        可交给进程事件源过滤的进程名集合
+
+        Returns:
+            frozenset or None: 所有规则都有精确进程名时返回进程名集合（没有启用的规则时为空集合，不关注任何进程），
+                否则返回None（需要关注所有进程）
+        """
+        if self._pattern_rules:
+            return None
+        return frozenset(self._exact_rules)
+
+    def rules_for_name(self, name):
+        """
+        获取进程名命中的规则（只判断名称类条件）
+
+        Args:
+            name (str): 进程名
+
+        Returns:
+            tuple: 命中的 ProcessRule
+        """
+        name = name.lower()
+        cached = self._name_cache.get(name)
+        if cached is not None:
+            return cached
+
+        matched = [rule for rule in self._exact_rules.get(name, ()) if rule.match_name(name)]
+        matched.extend(rule for rule in self._pattern_rules if rule.match_name(name))
+        if len(self._name_cache) >= self.NAME_CACHE_LIMIT:
+            self._name_cache.clear()
+        self._name_cache[name] = cached = tuple(matched)
+        return cached
+
+    def _get_process_info(self, entry, snapshot):
+        """读取并缓存进程路径和父进程名"""
+        info = self._info_cache.get(entry)
+        if info is None:
+            exe = None
+            parent_name = None
+            try:
+                proc = psutil.Process(entry.pid)
+                with proc.oneshot():
+                    try:
+                        exe = proc.exe()
+                    except psutil.AccessDenied:
+                        pass
+                    parent_name = snapshot.name_of(proc.ppid())
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+            self._info_cache[entry] = info = (exe, parent_name)
+        return info
+
+    def match(self, snapshot):
+        """
+        对快照执行所有规则
+
+        Args:
+            snapshot (ProcessSnapshot): 进程快照
+
+        Returns:
+            list: RuleMatch 列表
+        """
+        matches = []
+        if not self.rules:
+            return matches
+
+        if self._pattern_rules:
+            candidates = snapshot.items()
+        else:
+            candidates = ((name, snapshot.get(name)) for name in self._exact_rules)
+
+        for name, entries in candidates:
+            if not entries:
+                continue
+            rules = self.rules_for_name(name)
+            if not rules:
+                continue
+            for entry in entries:
+                for rule in rules:
+                    if rule.needs_process_info and not rule.match_info(*self._get_process_info(entry, snapshot)):
+                        continue
+                    matches.append(RuleMatch(rule, name, entry))
+
+        # 清理已退出进程的路径缓存
+        if self._info_cache:
+            for entry in [entry for entry in self._info_cache if entry not in snapshot]:
+                del self._info_cache[entry]
+
+        return matches
+
+
+def compile_rules(rule_configs):
+    """
+    从配置编译规则匹配器，无效规则会被跳过并记录日志
+
+    Args:
+        rule_configs (list): 规则配置字典列表
+
+    Returns:
+        RuleMatcher: 规则匹配器
+    """
+    rules = []
+    for config in rule_configs or []:
+        if not isinstance(config, dict):
+            logger.warning(f"忽略无效的进程规则: {config}")
+            continue
+        try:
+            rules.append(ProcessRule.from_config(config))
+        except (ValueError, re.error) as e:
+            logger.warning(f"忽略无效的进程规则 {config.get('name', '')}: {str(e)}")
+    return RuleMatcher(rules)
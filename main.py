@@ -5,24 +5,90 @@
 ACE-KILLER主程序入口
 """
 
+import time
+
+# 记录进程启动时间，用于统计启动耗时（需在导入其他模块之前）
+_START_TIME = time.perf_counter()
+
 import sys
 
+# 启动导入耗时分析需在导入其他模块之前安装
+if "--profile-startup" in sys.argv:
+    from utils.startup_profiler import get_import_profiler
+
+    get_import_profiler().install()
+
+import argparse
+import json
+
 from config import ConfigManager, APP_INFO, SYSTEM_CONFIG
-from core.process_monitor import GameProcessMonitor
-from ui.main_window import create_gui
 from utils import (
     logger,
     setup_logger,
-    find_icon_path,
-    send_notification,
-    create_notification_thread,
     run_as_admin,
     check_single_instance,
-    get_io_priority_service,
-    check_for_update,
 )
 
 
+def parse_args(argv=None):
+    """
+    解析命令行参数，未知参数会被忽略
+
+    Args:
+        argv (list, optional): 命令行参数，默认使用 sys.argv
+
+    Returns:
+        argparse.Namespace: 解析结果
+    """
+    parser = argparse.ArgumentParser(description="ACE-KILLER")
+    parser.add_argument("--minimized", action="store_true", help="启动时最小化到托盘")
+    parser.add_argument("--headless", action="store_true", help="后台模式运行，不加载图形界面")
+    parser.add_argument("--no-monitor", action="store_true", help="后台模式下不运行进程监控")
+    parser.add_argument("--no-io-priority", action="store_true", help="后台模式下不运行I/O优先级服务")
+    parser.add_argument("--no-memory-cleaner", action="store_true", help="后台模式下不运行内存清理")
+    parser.add_argument("--status-interval", type=float, default=300, help="后台模式下输出运行状态的间隔（秒），0表示不输出")
+    parser.add_argument("--report-startup", action="store_true", help="输出启动耗时和内存占用")
+    parser.add_argument("--exit-after-startup", action="store_true", help="启动完成后立即退出（用于测量启动开销）")
+    parser.add_argument("--profile-startup", action="store_true", help="输出各模块导入耗时树及启动到托盘的总耗时后退出")
+    args, _ = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+    return args
+
+
+def report_startup(mode):
+    """
+    统计从进程启动到当前的耗时及常驻内存
+
+    Args:
+        mode (str): 运行模式名称
+
+    Returns:
+        dict: 运行模式、启动耗时（毫秒）、常驻内存（MB）、已加载模块数及是否加载了PySide6
+    """
+    import psutil
+
+    report = {
+        "mode": mode,
+        "startup_ms": (time.perf_counter() - _START_TIME) * 1000,
+        "rss_mb": psutil.Process().memory_info().rss / (1024 * 1024),
+        "modules": len(sys.modules),
+        "qt_loaded": "PySide6" in sys.modules,
+    }
+    logger.info(
+        f"启动完成 ({mode}): 耗时 {report['startup_ms']:.0f}ms, 内存 {report['rss_mb']:.1f}MB, "
+        f"模块 {report['modules']} 个, PySide6 {'已加载' if report['qt_loaded'] else '未加载'}"
+    )
+    # 供 tests/bench_startup.py 解析
+    print(f"STARTUP_REPORT {json.dumps(report)}", flush=True)
+
+    if "--profile-startup" in sys.argv:
+        from utils.startup_profiler import get_import_profiler
+
+        profiler = get_import_profiler()
+        profiler.uninstall()
+        print(profiler.format_report(report["startup_ms"] / 1000), flush=True)
+    return report
+
+
 def main(custom_app_info=None, custom_default_config=None, custom_system_config=None):
     """
     主程序入口函数
@@ -32,8 +98,10 @@ def main(custom_app_info=None, custom_default_config=None, custom_system_config=
         custom_default_config (dict, optional): 自定义默认配置，用于覆盖默认值
         custom_system_config (dict, optional): 自定义系统配置，用于覆盖默认值
     """
+    args = parse_args()
+
     # 检查是否以最小化模式启动（通过命令行参数）
-    start_minimized = "--minimized" in sys.argv
+    start_minimized = args.minimized
 
     # 合并应用信息
     final_app_info = APP_INFO.copy()
@@ -69,12 +137,42 @@ def main(custom_app_info=None, custom_default_config=None, custom_system_config=
         config_manager.debug_mode,
     )
 
+    # 后台模式：不加载PySide6，只运行后台服务
+    if args.headless:
+        from core.headless import HeadlessDaemon
+
+        daemon = HeadlessDaemon(
+            config_manager,
+            monitor=not args.no_monitor,
+            io_priority=not args.no_io_priority,
+            memory_cleaner=not args.no_memory_cleaner,
+            status_interval=args.status_interval,
+        )
+        daemon.start()
+        logger.debug(f"🟩 {final_app_info['name']} 后台模式已启动！")
+        if args.report_startup or args.exit_after_startup or args.profile_startup:
+            report_startup("headless")
+        if args.exit_after_startup or args.profile_startup:
+            daemon.stop()
+            return
+        daemon.run()
+        logger.debug(f"🔴 {final_app_info['name']} 后台模式已终止！")
+        return
+
+    from core.process_monitor import GameProcessMonitor
+    from ui.launcher import create_gui
+    from utils import find_icon_path, get_io_priority_service, get_task_scheduler
+
     # 创建进程监控器
     monitor = GameProcessMonitor(config_manager)
+    # 测量自身开销，超出预算时放大各后台循环的轮询间隔
+    monitor.overhead_governor.start()
 
     # 创建并启动I/O优先级服务
     io_priority_service = get_io_priority_service(config_manager)
     if io_priority_service:
+        # 效能模式按配置避开游戏核心时，由监控器提供游戏进程占用的核心
+        io_priority_service.io_manager.game_cpus_provider = monitor.get_game_cpus
         io_priority_service.start_service()
 
     # 现在日志系统已初始化，可以记录启动信息
@@ -83,12 +181,25 @@ def main(custom_app_info=None, custom_default_config=None, custom_system_config=
     # 查找图标文件
     icon_path = find_icon_path()
 
+    # 创建PySide6图形界面，最小化启动时只创建托盘图标，主窗口在首次打开时创建
+    app, window = create_gui(config_manager, monitor, icon_path, start_minimized)
+
+    if args.report_startup or args.exit_after_startup or args.profile_startup:
+        report_startup("tray" if start_minimized else "gui")
+        if args.exit_after_startup or args.profile_startup:
+            app.quit()
+            monitor.stop_monitors()
+            if io_priority_service and io_priority_service.running:
+                io_priority_service.stop_service()
+            get_task_scheduler().stop()
+            return
+
+    # 托盘可用后再加载通知组件和版本检查
+    from utils import send_notification, create_notification_thread, check_for_update
+
     # 创建通知线程
     notification_thread_obj, stop_event = create_notification_thread(monitor.message_queue, icon_path)
 
-    # 创建并运行PySide6图形界面
-    app, window = create_gui(config_manager, monitor, icon_path, start_minimized)
-
     app_name = config_manager.get_app_name()
     app_author = config_manager.get_app_author()
     github_repo = config_manager.get_github_repo()
@@ -124,17 +235,22 @@ def main(custom_app_info=None, custom_default_config=None, custom_system_config=
             monitor.running = False
             # 停止所有游戏监控
             monitor.stop_monitors()
+        monitor.overhead_governor.stop()
 
         # 停止I/O优先级服务
         if io_priority_service and io_priority_service.running:
             io_priority_service.stop_service()
 
-        # 设置通知线程停止事件
+        # 设置通知线程停止事件，放入 None 唤醒阻塞等待消息的通知线程
         stop_event.set()
+        monitor.message_queue.put(None)
 
         # 等待通知线程结束
         notification_thread_obj.join(timeout=0.5)
 
+        # 停止统一任务调度器（取消剩余的定时任务并结束定时线程和工作线程）
+        get_task_scheduler().stop()
+
         logger.debug(f"🔴 {final_app_info['name']} 程序已终止！")
 
 
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+CPU占空比限制基准测试脚本
+启动一个持续占满单核的合成进程，分别按不同目标CPU占用进行限制，对比实际占用与目标，并统计限制线程自身的CPU开销
+（Linux 使用 SIGSTOP/SIGCONT，Windows 使用 NtSuspendProcess）
+
+python tests/bench_cpu_throttler.py --seconds 5 --targets 5 20 50
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psutil  # noqa: E402
+
+from utils.cpu_throttler import DutyCycleThrottler  # noqa: E402
+
+BURNER_CODE = "while True:\n    pass\n"
+
+
+def cpu_seconds(proc):
+    cpu_times = proc.cpu_times()
+    return cpu_times.user + cpu_times.system
+
+
+def run_target(limit, seconds, period):
+    """限制一个合成满载进程，返回实际CPU占用和限制线程开销"""
+    burner = subprocess.Popen([sys.executable, "-c", BURNER_CODE])
+    try:
+        proc = psutil.Process(burner.pid)
+        # 等待合成进程进入满载
+        time.sleep(0.3)
+
+        throttler = DutyCycleThrottler(period=period)
+        throttler.add(proc, limit, name="burner")
+
+        # 丢弃前1秒的收敛过程
+        time.sleep(1.0)
+        start_cpu, start = cpu_seconds(proc), time.monotonic()
+        self_start = psutil.Process().cpu_times()
+        time.sleep(seconds)
+        achieved = (cpu_seconds(proc) - start_cpu) / (time.monotonic() - start) * 100
+        self_end = psutil.Process().cpu_times()
+        stats = throttler.get_stats()
+        throttler.stop()
+
+        # 限制停止后进程应恢复运行
+        resumed = proc.status() != psutil.STATUS_STOPPED
+        return {
+            "limit": limit,
+            "achieved": achieved,
+            "error": achieved - limit,
+            "overhead": stats["overhead_percent"],
+            "process_overhead": ((self_end.user + self_end.system) - (self_start.user + self_start.system)) / seconds * 100,
+            "cycles": stats["cycles"],
+            "resumed": resumed,
+        }
+    finally:
+        burner.kill()
+        burner.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CPU占空比限制基准测试")
+    parser.add_argument("--seconds", type=float, default=5.0, help="每个目标的测量时长（秒）")
+    parser.add_argument("--targets", type=float, nargs="+", default=[5, 20, 50], help="目标CPU占用（单核百分比）")
+    parser.add_argument("--period-ms", type=float, default=100.0, help="占空比周期（毫秒）")
+    args = parser.parse_args()
+
+    print(f"占空比周期 {args.period_ms:g}ms, 每个目标测量 {args.seconds:g} 秒")
+    print(f"{'目标 %':>8} | {'实际 %':>8} | {'偏差':>7} | {'限制线程开销 %':>14} | {'本进程开销 %':>12} | {'周期数':>6} | 停止后恢复")
+    for limit in args.targets:
+        result = run_target(limit, args.seconds, args.period_ms / 1000)
+        print(
+            f"{result['limit']:>8.1f} | {result['achieved']:>8.1f} | {result['error']:>+7.1f} | "
+            f"{result['overhead']:>14.3f} | {result['process_overhead']:>12.3f} | {result['cycles']:>6} | "
+            f"{'是' if result['resumed'] else '否'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+增量进程扫描基准测试脚本
+使用合成进程表对比旧版"清空缓存后完整重建"与增量PID差异扫描的每周期耗时
+
+python tests/bench_incremental_scan.py --sizes 500 2000 10000 --ticks 30 --churn 0.01 --resolve-us 20
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.process_snapshot import ProcessSnapshotEngine  # noqa: E402
+
+
+class SyntheticProcessSource:
+    """合成进程数据源，每次解析进程名时模拟一次系统调用的耗时"""
+
+    def __init__(self, size, churn, resolve_cost):
+        """
+        Args:
+            size (int): 进程数量
+            churn (float): 每个周期退出并被新进程替换的比例
+            resolve_cost (float): 单次解析进程名的模拟耗时（秒）
+        """
+        self.random = random.Random(42)
+        self.churn = churn
+        self.resolve_cost = resolve_cost
+        self.next_pid = 4
+        self.processes = {}
+        for _ in range(size):
+            self._spawn()
+
+    def _spawn(self):
+        pid = self.next_pid
+        self.next_pid += 4
+        self.processes[pid] = (f"proc{pid % 97}.exe", time.time())
+
+    def tick(self):
+        """模拟一个周期内的进程退出与创建"""
+        count = max(1, int(len(self.processes) * self.churn))
+        for pid in self.random.sample(list(self.processes), count):
+            del self.processes[pid]
+        for _ in range(count):
+            self._spawn()
+
+    def _simulate_syscall(self):
+        deadline = time.perf_counter() + self.resolve_cost
+        while time.perf_counter() < deadline:
+            pass
+
+    def pids(self):
+        return list(self.processes)
+
+    def resolve(self, pid):
+        self._simulate_syscall()
+        return self.processes.get(pid)
+
+
+def run_full_rebuild(source, ticks):
+    """复现旧版 refresh_process_cache：每周期清空缓存并解析所有进程"""
+    cache = {}
+    resolves = 0
+    start = time.perf_counter()
+    for _ in range(ticks):
+        source.tick()
+        cache.clear()
+        for pid in source.pids():
+            resolves += 1
+            info = source.resolve(pid)
+            if info:
+                cache[info[0].lower()] = pid
+    return (time.perf_counter() - start) / ticks, resolves / ticks
+
+
+def run_incremental(source, ticks):
+    """增量扫描：每周期只解析新出现的PID"""
+    engine = ProcessSnapshotEngine(source=source, full_rescan_interval=float("inf"))
+    engine.refresh(force=True)
+    resolves_before = engine.resolve_count
+    start = time.perf_counter()
+    for _ in range(ticks):
+        source.tick()
+        engine.refresh(force=True)
+    return (time.perf_counter() - start) / ticks, (engine.resolve_count - resolves_before) / ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="增量进程扫描基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 2000, 10000], help="合成进程数量")
+    parser.add_argument("--ticks", type=int, default=30, help="每种规模模拟的周期数")
+    parser.add_argument("--churn", type=float, default=0.01, help="每周期进程更替比例")
+    parser.add_argument("--resolve-us", type=float, default=20.0, help="单次解析进程名的模拟耗时（微秒）")
+    args = parser.parse_args()
+
+    resolve_cost = args.resolve_us / 1e6
+    print(f"周期数: {args.ticks}, 更替比例: {args.churn:.1%}, 单次解析耗时: {args.resolve_us:.0f}us")
+    print(f"{'进程数':>8} | {'完整重建 ms/周期':>16} | {'增量扫描 ms/周期':>16} | {'解析次数/周期':>18} | {'加速比':>6}")
+    for size in args.sizes:
+        full_time, full_resolves = run_full_rebuild(SyntheticProcessSource(size, args.churn, resolve_cost), args.ticks)
+        inc_time, inc_resolves = run_incremental(SyntheticProcessSource(size, args.churn, resolve_cost), args.ticks)
+        print(
+            f"{size:>8} | {full_time * 1000:>16.2f} | {inc_time * 1000:>16.2f} | "
+            f"{full_resolves:>8.0f} -> {inc_resolves:<7.0f} | {full_time / inc_time:>5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
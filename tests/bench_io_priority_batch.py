@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+自动优化列表批量应用基准测试脚本
+按自动优化列表长度统计每轮检查查找目标进程的耗时和遍历进程表的次数，对比：
+    - 逐个遍历：每个进程名各遍历一次 psutil.process_iter(['pid', 'name'])（快照引擎之前的实现）
+    - 逐个查快照：每个进程名各调用一次 set_process_io_priority_by_name（每次读取快照）
+    - 批量：set_process_io_priority_batch，整个列表读取一次快照并批量查找
+
+每轮检查之间间隔 30 秒（用虚拟时钟模拟），因此每轮开始时快照都已过期；
+设置优化的Win32调用在三种方式中完全相同，这里只统计查找目标的部分，不调用Windows专用接口
+
+python tests/bench_io_priority_batch.py --passes 20
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psutil  # noqa: E402
+
+from utils.process_snapshot import ProcessSnapshotEngine  # noqa: E402
+
+CHECK_INTERVAL = 30.0  # I/O优先级服务的基准检查间隔（秒）
+
+
+class PassClock:
+    """每轮检查前前进一个检查间隔的虚拟时钟"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self):
+        self.now += CHECK_INTERVAL
+
+
+def build_list(length):
+    """用当前运行的进程名（一半）和不存在的进程名（一半）构造自动优化列表"""
+    running = sorted({proc.info["name"] for proc in psutil.process_iter(["name"]) if proc.info["name"]})
+    configs = []
+    for index in range(length):
+        if index % 2 == 0 and running:
+            name = running[(index // 2) % len(running)]
+        else:
+            name = f"NotRunning{index}.exe"
+        configs.append({"name": name, "performance_mode": 0})
+    return configs
+
+
+def per_name_walk(configs, engine):
+    """每个进程名遍历一次进程表"""
+    targets = 0
+    for config in configs:
+        target = config["name"].lower()
+        for proc in psutil.process_iter(["pid", "name"]):
+            if (proc.info["name"] or "").lower() == target:
+                targets += 1
+    return targets, len(configs)
+
+
+def per_name_snapshot(configs, engine):
+    """每个进程名读取一次快照，与 set_process_io_priority_by_name 相同"""
+    targets = 0
+    scans = engine.scan_count
+    for config in configs:
+        targets += len(engine.get_snapshot().get(config["name"]))
+    return targets, engine.scan_count - scans
+
+
+def batch(configs, engine):
+    """整个列表读取一次快照，与 set_process_io_priority_batch 相同"""
+    scans = engine.scan_count
+    name_rules = {config["name"].lower(): config for config in configs if config.get("name")}
+    targets = sum(len(entries) for entries in engine.get_snapshot().select(name_rules).values())
+    return targets, engine.scan_count - scans
+
+
+def measure(method, configs, passes):
+    clock = PassClock()
+    engine = ProcessSnapshotEngine(interval=2.0, clock=clock)
+    elapsed, walks, targets = 0.0, 0, 0
+    for _ in range(passes):
+        clock.advance()
+        start = time.perf_counter()
+        targets, pass_walks = method(configs, engine)
+        elapsed += time.perf_counter() - start
+        walks += pass_walks
+    return elapsed / passes * 1000, walks / passes, targets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="自动优化列表批量应用基准测试")
+    parser.add_argument("--passes", type=int, default=20, help="每种方式、每种列表长度执行的检查轮数")
+    parser.add_argument("--lengths", type=int, nargs="*", default=[1, 5, 10, 20, 50], help="自动优化列表长度")
+    args = parser.parse_args()
+
+    print(f"当前进程数: {len(psutil.pids())}, 每种方式执行 {args.passes} 轮")
+    print(f"{'列表长度':>6} | {'方式':>8} | {'每轮耗时 ms':>11} | {'每轮遍历进程表':>14} | {'目标进程':>8}")
+    for length in args.lengths:
+        configs = build_list(length)
+        for label, method in (("逐个遍历", per_name_walk), ("逐个查快照", per_name_snapshot), ("批量", batch)):
+            ms, walks, targets = measure(method, configs, args.passes)
+            print(f"{length:>8} | {label:>8} | {ms:>11.2f} | {walks:>14.1f} | {targets:>8}")
+
+
+if __name__ == "__main__":
+    main()
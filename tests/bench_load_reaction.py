@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+监控反应时间与优化效果基准测试脚本
+用负载生成器启动模拟的 SGuard64.exe（周期性扫盘）、ACE-Tray.exe（被终止后重新弹出）和游戏进程树，
+先不做任何处理测量一段基线，再启动真实的 GameProcessMonitor（快照引擎、进程创建事件源、规则引擎和动作实现），统计：
+    - 进程启动到被终止/优化的反应时间
+    - 优化前后 SGuard64 的CPU占用和读取速率、游戏进程获得的CPU占用
+
+非Windows系统上由 win32_stubs 替换Win32调用：优先级类通过 psutil 设置为对应的 nice 值，
+效能模式（EcoQoS）没有对应实现，只有优先级、核心绑定和占空比CPU限制会生效；
+CPU没有被占满时降低优先级不会减少 SGuard64 的CPU占用，需要 --cpu-limit 才能看到差异。
+配置使用临时目录中的默认配置，不读取也不修改当前用户的配置
+
+python tests/bench_load_reaction.py --baseline 10 --seconds 20 --cpu-limit 5
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import win32_stubs  # noqa: E402
+
+win32_stubs.install()
+
+import psutil  # noqa: E402
+
+from core.process_rules import RuleAction  # noqa: E402
+from load_generator import SCENARIOS, LoadGenerator  # noqa: E402
+
+GAME_NAME = "VALORANT-Win64-Shipping.exe"
+SGUARD_NAME = "SGuard64.exe"
+
+
+def create_monitor(config_dir, cpu_limit):
+    """
+    在临时用户目录下以默认配置创建 GameProcessMonitor
+
+    Args:
+        config_dir (str): 作为用户目录的临时目录
+        cpu_limit (float): 对 SGuard64 优化规则设置的占空比CPU限制，0为不限制
+
+    Returns:
+        tuple: (GameProcessMonitor, 已处理进程的记录 ProcessEntry -> (动作, 处理时间 time.time()))
+    """
+    os.environ["HOME"] = os.environ["USERPROFILE"] = config_dir
+
+    from config import ConfigManager
+    from core.process_monitor import GameProcessMonitor
+
+    config_manager = ConfigManager()
+    if cpu_limit:
+        config_manager.monitor_rules = [
+            dict(rule, cpu_limit=cpu_limit) if rule.get("action") == RuleAction.OPTIMIZE else rule
+            for rule in config_manager.monitor_rules
+        ]
+    monitor = GameProcessMonitor(config_manager)
+
+    # 只记录规则动作的结果，动作本身由监控器执行
+    actions = {}
+    dispatch_rule = monitor._dispatch_rule
+
+    def recording_dispatch(rule, name, entry, proc, first_seen):
+        outcome = dispatch_rule(rule, name, entry, proc, first_seen)
+        if outcome and first_seen:
+            actions[entry] = (rule.action, time.time())
+        return outcome
+
+    monitor._dispatch_rule = recording_dispatch
+    return monitor, actions
+
+
+def measure(generator, seconds):
+    """测量一段时间内 SGuard64 与游戏进程的CPU占用和读取速率"""
+
+    def sample():
+        result = {}
+        for name in (SGUARD_NAME, GAME_NAME):
+            cpu = io = 0.0
+            for proc in generator.processes(name):
+                try:
+                    times = proc.cpu_times()
+                    cpu += times.user + times.system
+                    counters = proc.io_counters()
+                    io += getattr(counters, "read_chars", counters.read_bytes)
+                except psutil.Error:
+                    continue
+            result[name] = (cpu, io)
+        return result
+
+    before, start = sample(), time.monotonic()
+    time.sleep(seconds)
+    after, elapsed = sample(), time.monotonic() - start
+    return {
+        name: {
+            "cpu_percent": max(0.0, after[name][0] - before[name][0]) / elapsed * 100,
+            "read_mb_s": max(0.0, after[name][1] - before[name][1]) / elapsed / 2**20,
+        }
+        for name in after
+    }
+
+
+def percentiles(values):
+    ordered = sorted(values)
+    if not ordered:
+        return "无样本"
+
+    def pick(fraction):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000
+
+    return f"P50 {pick(0.5):.0f}ms / P95 {pick(0.95):.0f}ms / 最大 {ordered[-1] * 1000:.0f}ms (n={len(ordered)})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="监控反应时间与优化效果基准测试")
+    parser.add_argument("--baseline", type=float, default=10.0, help="不做处理的基线测量时长（秒）")
+    parser.add_argument("--seconds", type=float, default=20.0, help="启动监控后的测量时长（秒）")
+    parser.add_argument("--cpu-limit", type=float, default=0, help="对 SGuard64 使用的占空比CPU限制（单核百分比），0为不限制")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as config_dir, LoadGenerator(SCENARIOS["ace"]) as generator:
+        # 等待进程树启动
+        time.sleep(1.0)
+        baseline = measure(generator, args.baseline)
+
+        monitor, actions = create_monitor(config_dir, args.cpu_limit)
+        monitor_start = time.time()
+        monitor.start_monitors()
+        event_source = monitor.event_source.name
+        optimized = measure(generator, args.seconds)
+        sguard_state = []
+        for proc in generator.processes(SGUARD_NAME):
+            try:
+                sguard_state.append((proc.pid, proc.nice(), len(proc.cpu_affinity())))
+            except psutil.Error:
+                continue
+        monitor.stop_monitors()
+
+        # 监控启动前已存在的进程以监控启动时间为起点
+        reactions = {RuleAction.KILL: [], RuleAction.OPTIMIZE: []}
+        for name, pid, create_time in generator.spawns:
+            for entry, (action, acted_at) in actions.items():
+                if entry.pid == pid:
+                    reactions[action].append(max(0.0, acted_at - max(create_time, monitor_start)))
+        respawns = sum(1 for name, *_ in generator.spawns if name == "ACE-Tray.exe") - 1
+
+    print(f"事件源: {event_source}, CPU限制 {args.cpu_limit or '无'}")
+    print(f"ACE-Tray 终止反应时间: {percentiles(reactions[RuleAction.KILL])}, 重新弹出 {respawns} 次")
+    print(f"SGuard64 优化反应时间: {percentiles(reactions[RuleAction.OPTIMIZE])}")
+    for pid, priority, cores in sguard_state:
+        print(f"SGuard64 (PID: {pid}) 优化后: 优先级 {priority}, 可用核心 {cores}/{psutil.cpu_count()}")
+    print(f"{'进程':>28} | {'基线 CPU%':>9} | {'优化后 CPU%':>11} | {'基线读取 MB/s':>13} | {'优化后读取 MB/s':>15}")
+    for name in (SGUARD_NAME, GAME_NAME):
+        print(
+            f"{name:>28} | {baseline[name]['cpu_percent']:>9.1f} | {optimized[name]['cpu_percent']:>11.1f} | "
+            f"{baseline[name]['read_mb_s']:>13.1f} | {optimized[name]['read_mb_s']:>15.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
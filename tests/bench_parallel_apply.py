@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+并行优化基准测试脚本
+用模拟的句柄后端对 10/100/1000 个目标进程执行完整优化，对比逐个串行优化与 ParallelApplier 的总耗时。
+模拟后端按比例产生三类目标（均为阻塞调用，与真实的 OpenProcess + 四项设置一样会释放GIL）：
+    - 普通进程：打开和四项设置共约 --normal-ms 毫秒
+    - 正在退出的进程：OpenProcess 较慢（--exiting-ms）
+    - 受保护进程：OpenProcess 阻塞很久（--protected-ms），并行实现在超时后跳过
+
+python tests/bench_parallel_apply.py --counts 10 100 1000 --workers 4 --timeout 0.5
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.parallel_apply import STATUS_OK, ParallelApplier  # noqa: E402
+
+
+class FakeBackend:
+    """模拟的优化后端：按目标类型阻塞对应时间"""
+
+    def __init__(self, normal_ms, exiting_ms, protected_ms):
+        self.delays = {"normal": normal_ms / 1000, "exiting": exiting_ms / 1000, "protected": protected_ms / 1000}
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def apply(self, target):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delays[target[1]])
+        return target[0]
+
+
+def build_targets(count, exiting_ratio, protected_ratio, seed):
+    """构造 (pid, 类型) 目标列表，相同参数下每次结果相同"""
+    rng = random.Random(seed)
+    targets = []
+    for index in range(count):
+        roll = rng.random()
+        kind = "protected" if roll < protected_ratio else "exiting" if roll < protected_ratio + exiting_ratio else "normal"
+        targets.append((1000 + index * 4, kind))
+    return targets
+
+
+def run_serial(backend, targets):
+    return [backend.apply(target) for target in targets]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="并行优化基准测试")
+    parser.add_argument("--counts", type=int, nargs="*", default=[10, 100, 1000], help="目标进程数")
+    parser.add_argument("--workers", type=int, default=4, help="并行工作线程数")
+    parser.add_argument("--timeout", type=float, default=0.5, help="单个目标的超时时间（秒）")
+    parser.add_argument("--normal-ms", type=float, default=1.0, help="普通进程的优化耗时（毫秒）")
+    parser.add_argument("--exiting-ms", type=float, default=20.0, help="正在退出的进程的打开耗时（毫秒）")
+    parser.add_argument("--protected-ms", type=float, default=1000.0, help="受保护进程的打开阻塞时间（毫秒）")
+    parser.add_argument("--exiting-ratio", type=float, default=0.05, help="正在退出的进程比例")
+    parser.add_argument("--protected-ratio", type=float, default=0.01, help="受保护进程比例")
+    parser.add_argument("--seed", type=int, default=1, help="随机种子")
+    args = parser.parse_args()
+
+    backend = FakeBackend(args.normal_ms, args.exiting_ms, args.protected_ms)
+    print(
+        f"工作线程 {args.workers} 个, 单个目标超时 {args.timeout:g}s, 普通/退出中/受保护耗时 "
+        f"{args.normal_ms:g}/{args.exiting_ms:g}/{args.protected_ms:g}ms"
+    )
+    print(f"{'目标数':>6} | {'受保护':>6} | {'串行 ms':>10} | {'并行 ms':>10} | {'加速比':>6} | {'并行完成':>8} | {'超时':>4}")
+    for count in args.counts:
+        targets = build_targets(count, args.exiting_ratio, args.protected_ratio, args.seed)
+        protected = sum(1 for _, kind in targets if kind == "protected")
+
+        start = time.perf_counter()
+        run_serial(backend, targets)
+        serial_ms = (time.perf_counter() - start) * 1000
+
+        # 每种规模使用新的执行器，避免上一轮被放弃的阻塞线程影响结果
+        applier = ParallelApplier(args.workers, args.timeout)
+        start = time.perf_counter()
+        outcomes = applier.run(backend.apply, targets)
+        parallel_ms = (time.perf_counter() - start) * 1000
+
+        completed = [outcome.result for outcome in outcomes if outcome.status == STATUS_OK]
+        # 结果按输入顺序返回，跳过超时目标后应与串行结果的顺序一致
+        protected_completes = args.timeout * 1000 > args.protected_ms
+        expected = [pid for (pid, kind) in targets if kind != "protected" or protected_completes]
+        ordered = "" if completed == expected else " (顺序不一致)"
+        print(
+            f"{count:>8} | {protected:>8} | {serial_ms:>10.1f} | {parallel_ms:>10.1f} | {serial_ms / parallel_ms:>8.1f} | "
+            f"{len(completed):>11} | {applier.get_stats()['timeouts']:>6}{ordered}"
+        )
+
+
+if __name__ == "__main__":
+    main()
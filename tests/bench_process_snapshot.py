@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+进程快照引擎基准测试脚本
+对比旧的"每个使用者各自遍历进程表"方式与共享快照引擎每个周期遍历进程表的次数和耗时
+
+python tests/bench_process_snapshot.py --ticks 20
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import psutil
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.process_snapshot import ProcessSnapshotEngine  # noqa: E402
+
+WATCHED_NAMES = ["ACE-Tray.exe", "SGuard64.exe"]
+
+
+class LegacyProcessCache:
+    """复现旧版 GameProcessMonitor 的进程缓存逻辑，并统计遍历进程表的次数"""
+
+    def __init__(self):
+        self.process_cache = {}
+        self.last_cache_refresh = 0
+        self.cache_timeout = 5
+        self.walks = 0
+
+    def refresh_process_cache(self, force=False):
+        current_time = time.time()
+        if force or (current_time - self.last_cache_refresh) >= self.cache_timeout:
+            self.process_cache.clear()
+            self.walks += 1
+            for proc in psutil.process_iter(["pid", "name"]):
+                if proc.info["name"]:
+                    self.process_cache[proc.info["name"].lower()] = proc
+            self.last_cache_refresh = current_time
+
+    def is_process_running(self, process_name):
+        process_name_lower = process_name.lower()
+        if process_name_lower in self.process_cache:
+            proc = self.process_cache[process_name_lower]
+            try:
+                if proc.is_running():
+                    return proc
+                del self.process_cache[process_name_lower]
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                del self.process_cache[process_name_lower]
+
+        self.walks += 1
+        for proc in psutil.process_iter(["name"]):
+            if proc.info["name"] and proc.info["name"].lower() == process_name_lower:
+                self.process_cache[process_name_lower] = proc
+                return proc
+        return None
+
+
+def run_legacy(ticks):
+    """每个2秒周期：两个监控线程各查询一次，界面每秒查询两个进程并检查一次状态"""
+    cache = LegacyProcessCache()
+    start = time.perf_counter()
+    for tick in range(ticks):
+        for name in WATCHED_NAMES:
+            if tick % 5 == 0:
+                cache.refresh_process_cache()
+            cache.is_process_running(name)
+        for _ in range(2):
+            for name in WATCHED_NAMES:
+                cache.is_process_running(name)
+            cache.is_process_running(WATCHED_NAMES[1])
+    return cache.walks, time.perf_counter() - start
+
+
+def run_snapshot(ticks):
+    """每个2秒周期：生产者遍历一次，所有使用者读取同一快照"""
+    engine = ProcessSnapshotEngine()
+    start = time.perf_counter()
+    for _ in range(ticks):
+        engine.refresh(force=True)
+        for name in WATCHED_NAMES:
+            engine.get_snapshot(max_age=5).get(name)
+        for _ in range(2):
+            for name in WATCHED_NAMES:
+                engine.get_snapshot(max_age=5).get(name)
+            engine.get_snapshot(max_age=5).get(WATCHED_NAMES[1])
+    return engine.scan_count, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="进程快照引擎基准测试")
+    parser.add_argument("--ticks", type=int, default=20, help="模拟的监控周期数")
+    args = parser.parse_args()
+
+    process_count = len(psutil.pids())
+    legacy_walks, legacy_time = run_legacy(args.ticks)
+    snapshot_walks, snapshot_time = run_snapshot(args.ticks)
+
+    print(f"进程数: {process_count}, 周期数: {args.ticks}")
+    print(f"旧方式:   遍历 {legacy_walks} 次 ({legacy_walks / args.ticks:.1f} 次/周期), 耗时 {legacy_time * 1000:.1f}ms")
+    print(
+        f"共享快照: 遍历 {snapshot_walks} 次 ({snapshot_walks / args.ticks:.1f} 次/周期), 耗时 {snapshot_time * 1000:.1f}ms"
+    )
+    print(f"每周期节省遍历: {(legacy_walks - snapshot_walks) / args.ticks:.1f} 次")
+
+
+if __name__ == "__main__":
+    main()
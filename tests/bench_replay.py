@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+进程表录制回放基准测试脚本
+录制一段真实的进程表（或加载已有录制），用虚拟时钟回放给快照引擎和进程规则引擎，
+统计决策延迟（进程出现到规则命中，虚拟时间）、进程数据源调用次数和CPU开销，
+对比固定轮询周期与自适应轮询调度器
+
+录制 20 秒（期间每 2 秒启动一个 sleep 子进程作为规则目标）并回放：
+python tests/bench_replay.py --record session.jsonl.gz --seconds 20 --watch sleep
+回放已有录制：
+python tests/bench_replay.py --replay session.jsonl.gz --watch sguard64.exe --game valorant.exe
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.app_config import DEFAULT_CONFIG  # noqa: E402
+from core.process_rules import compile_rules  # noqa: E402
+from utils.adaptive_scheduler import AdaptivePollingScheduler  # noqa: E402
+from utils.process_recording import ProcessRecorder, ProcessRecording, ReplayDriver  # noqa: E402
+
+
+def record_session(path, seconds, interval, spawn_every):
+    """录制进程表，期间周期性启动短时子进程"""
+    recorder = ProcessRecorder(path, interval=interval)
+    stop = threading.Event()
+    children = []
+
+    def spawn_loop():
+        while not stop.wait(spawn_every):
+            children.append(subprocess.Popen(["sleep", str(spawn_every * 1.5)]))
+
+    spawner = threading.Thread(target=spawn_loop, daemon=True)
+    if spawn_every > 0 and os.name != "nt":
+        spawner.start()
+    try:
+        recorder.record(seconds)
+    finally:
+        stop.set()
+        recorder.stop()
+        for child in children:
+            child.kill()
+            child.wait()
+    return recorder
+
+
+def make_decide(rule_configs):
+    """复现 GameProcessMonitor.apply_rules 的决策：每个 (规则, 进程) 首次命中时处理一次"""
+    matcher = compile_rules(rule_configs)
+    handled = set()
+
+    def decide(snapshot):
+        acted = []
+        seen = set()
+        for match in matcher.match(snapshot):
+            key = (match.rule.rule_id, match.entry)
+            seen.add(key)
+            if key not in handled:
+                handled.add(key)
+                acted.append(match.entry)
+        handled.intersection_update(seen)
+        return acted
+
+    return decide
+
+
+def main():
+    parser = argparse.ArgumentParser(description="进程表录制回放基准测试")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--record", help="录制到该文件后回放（.gz 结尾时压缩）")
+    group.add_argument("--replay", help="回放已有的录制文件")
+    parser.add_argument("--seconds", type=float, default=20.0, help="录制时长（秒）")
+    parser.add_argument("--record-interval", type=float, default=0.5, help="录制间隔（秒）")
+    parser.add_argument("--spawn-every", type=float, default=2.0, help="录制期间启动 sleep 子进程的间隔（秒），0为不启动")
+    parser.add_argument("--watch", nargs="*", default=[], help="额外作为规则目标的进程名（notify 规则）")
+    parser.add_argument("--game", nargs="*", default=None, help="游戏进程名，默认使用配置中的游戏列表")
+    parser.add_argument("--interval", type=float, default=2.0, help="快照引擎的基础刷新周期（秒）")
+    args = parser.parse_args()
+
+    path = args.record or args.replay
+    if args.record:
+        recorder = record_session(args.record, args.seconds, args.record_interval, args.spawn_every)
+        print(
+            f"已录制 {recorder.frame_count} 帧, {recorder.bytes_written / 1024:.1f} KB (未压缩), "
+            f"文件 {os.path.getsize(args.record) / 1024:.1f} KB"
+        )
+
+    start = time.perf_counter()
+    recording = ProcessRecording.load(path)
+    print(
+        f"加载 {len(recording.frames)} 帧, 时长 {recording.end_time - recording.start_time:.1f} 秒, "
+        f"进程 {len(recording.first_seen)} 个, 耗时 {(time.perf_counter() - start) * 1000:.0f}ms"
+    )
+
+    rule_configs = list(DEFAULT_CONFIG["monitor"]["rules"])
+    rule_configs += [{"name": f"watch-{name}", "match": {"name": name}, "action": "notify"} for name in args.watch]
+    game_names = args.game if args.game is not None else DEFAULT_CONFIG["monitor"]["game_processes"]
+
+    print(
+        f"{'调度方式':>10} | {'周期数':>6} | {'决策数':>6} | {'延迟P50 s':>9} | {'延迟P95 s':>9} | {'最大 s':>7} | "
+        f"{'pids调用':>8} | {'解析调用':>8} | {'CPU ms/周期':>11}"
+    )
+    for label, scheduler in (
+        ("固定周期", None),
+        ("自适应", AdaptivePollingScheduler(game_names, max_backoff=DEFAULT_CONFIG["monitor"]["idle_backoff_max"])),
+    ):
+        report = ReplayDriver(recording, make_decide(rule_configs), args.interval, scheduler).run()
+        latency = report["latency"]
+        print(
+            f"{label:>10} | {report['ticks']:>6} | {report['decisions']:>6} | {latency['p50_s']:>9.2f} | "
+            f"{latency['p95_s']:>9.2f} | {latency['max_s']:>7.2f} | {report['syscalls']['pids']:>8} | "
+            f"{report['syscalls']['resolve']:>8} | {report['cpu_ms_per_tick']:>11.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
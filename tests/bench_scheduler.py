@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+统一任务调度基准测试脚本
+按程序中各后台循环的默认周期模拟同一组任务，对比“每个循环一个线程 + Event.wait 轮询”与统一任务调度器：
+    - 运行期间的线程数
+    - 每分钟唤醒次数（所有线程从等待中返回的次数）
+    - 停止耗时（发出停止到所有线程退出）
+    - 任务实际执行时间相对计划的延迟
+
+周期按 --scale 缩放以便在较短时间内得到足够样本，唤醒次数按缩放比例换算回实际周期
+
+python tests/bench_scheduler.py --seconds 20 --scale 0.1
+"""
+
+import argparse
+import os
+import queue
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.task_scheduler import TaskScheduler  # noqa: E402
+
+# (任务名, 周期秒, 每次执行的阻塞耗时秒, 是否为阻塞调用)，与各模块的默认值一致
+JOBS = [
+    ("snapshot", 2.0, 0.010, True),
+    ("status", 1.0, 0.005, True),
+    ("memory_cleaner", 15.0, 0.200, True),
+    ("io_priority", 30.0, 0.100, True),
+    ("overhead_governor", 5.0, 0.0005, False),
+    ("headless_status", 300.0, 0.001, False),
+]
+NOTIFICATION_POLL = 0.5  # 原通知线程的队列轮询超时（秒）
+
+
+class LegacyLoops:
+    """原实现：每个循环一个线程，Event.wait 等待下一周期，通知线程按超时轮询队列"""
+
+    def __init__(self, jobs, scale):
+        self.jobs = jobs
+        self.scale = scale
+        self._stop_event = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+        self.wakeups = 0
+        self.lateness = []
+        self.message_queue = queue.Queue()
+
+    def _count(self, lateness=None):
+        with self._lock:
+            self.wakeups += 1
+            if lateness is not None:
+                self.lateness.append(lateness)
+
+    def _loop(self, period, cost):
+        planned = time.monotonic()
+        while not self._stop_event.is_set():
+            self._count(max(0.0, time.monotonic() - planned))
+            time.sleep(cost)
+            planned = time.monotonic() + period
+            if self._stop_event.wait(period):
+                break
+
+    def _notification_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                self.message_queue.get(timeout=NOTIFICATION_POLL * self.scale)
+            except queue.Empty:
+                pass
+            self._count()
+
+    def start(self):
+        for _, period, cost, _ in self.jobs:
+            thread = threading.Thread(target=self._loop, args=(period * self.scale, cost), daemon=True)
+            self._threads.append(thread)
+        self._threads.append(threading.Thread(target=self._notification_loop, daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        start = time.perf_counter()
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(5.0)
+        return (time.perf_counter() - start) * 1000
+
+
+class UnifiedLoops:
+    """新实现：所有周期任务由 TaskScheduler 调度，阻塞调用在有界工作线程池中执行，通知线程阻塞等待消息"""
+
+    def __init__(self, jobs, scale):
+        self.jobs = jobs
+        self.scale = scale
+        self.scheduler = TaskScheduler()
+        self.tasks = []
+        self.lateness = []
+        self.message_queue = queue.Queue()
+        self._notification_thread = None
+
+    def _job(self, name, cost):
+        def run():
+            self.lateness.append(self.tasks_by_name[name].last_lateness)
+            time.sleep(cost)
+
+        return run
+
+    def _notification_loop(self):
+        while self.message_queue.get() is not None:
+            pass
+
+    def start(self):
+        self.tasks_by_name = {}
+        for name, period, cost, blocking in self.jobs:
+            task = self.scheduler.schedule(name, self._job(name, cost), period * self.scale, delay=0, blocking=blocking)
+            self.tasks_by_name[name] = task
+        self._notification_thread = threading.Thread(target=self._notification_loop, daemon=True)
+        self._notification_thread.start()
+
+    @property
+    def wakeups(self):
+        stats = self.scheduler.get_stats()
+        return stats["wakeups"] + stats["worker_wakeups"]
+
+    def stop(self):
+        start = time.perf_counter()
+        self.message_queue.put(None)
+        self._notification_thread.join(5.0)
+        self.scheduler.stop(timeout=5.0)
+        return (time.perf_counter() - start) * 1000
+
+
+def run(label, loops, seconds, scale):
+    baseline_threads = threading.active_count()
+    loops.start()
+    time.sleep(seconds * 0.5)
+    threads = threading.active_count() - baseline_threads
+    time.sleep(seconds * 0.5)
+    wakeups = loops.wakeups
+    shutdown_ms = loops.stop()
+
+    lateness = sorted(loops.lateness)
+    p95 = lateness[min(len(lateness) - 1, int(len(lateness) * 0.95))] * 1000 if lateness else 0.0
+    # 周期缩放后唤醒次数按比例换算回实际周期
+    per_minute = wakeups / seconds * 60 * scale
+    print(
+        f"{label:>8} | {threads:>6} | {per_minute:>12.1f} | {shutdown_ms:>11.1f} | {p95:>13.1f} | "
+        f"{threading.active_count() - baseline_threads:>10}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="统一任务调度基准测试")
+    parser.add_argument("--seconds", type=float, default=20.0, help="每种实现的运行时长（秒）")
+    parser.add_argument("--scale", type=float, default=0.1, help="周期缩放比例")
+    args = parser.parse_args()
+
+    print(f"模拟任务 {len(JOBS)} 个 + 通知线程, 周期缩放 {args.scale:g}, 每种实现运行 {args.seconds:g} 秒")
+    print(f"{'实现':>8} | {'线程数':>6} | {'唤醒 次/分':>12} | {'停止耗时 ms':>11} | {'执行延迟P95 ms':>13} | {'停止后残留':>10}")
+    run("原实现", LegacyLoops(JOBS, args.scale), args.seconds, args.scale)
+    run("统一调度", UnifiedLoops(JOBS, args.scale), args.seconds, args.scale)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+服务状态查询基准测试脚本
+使用内存服务后端对比旧版"每个服务单独打开SCM句柄查询"与批量查询+TTL缓存的服务管理器往返次数，
+并验证停止/删除服务后的缓存失效行为
+
+python tests/bench_service_status.py --seconds 60 --latency-ms 2
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.service_status import FakeServiceBackend, ServiceStatusProvider  # noqa: E402
+
+SERVICES = ["AntiCheatExpert Service", "AntiCheatExpert Protection", "ACE-BASE", "ACE-GAME"]
+
+
+class VirtualClock:
+    """虚拟时钟，模拟界面每秒刷新而不真正等待"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class LegacyServiceChecker:
+    """复现旧版 check_service_status：每个服务 OpenSCManager + OpenService + QueryServiceStatus + QueryServiceConfig"""
+
+    ROUND_TRIPS_PER_SERVICE = 4
+
+    def __init__(self, backend, latency):
+        self.backend = backend
+        self.latency = latency
+        self.round_trips = 0
+
+    def check_service_status(self, service_name):
+        self.round_trips += self.ROUND_TRIPS_PER_SERVICE
+        if self.latency:
+            time.sleep(self.latency * self.ROUND_TRIPS_PER_SERVICE)
+        if service_name in self.backend.services:
+            return (True, *self.backend.services[service_name])
+        return False, "unknown", "unknown"
+
+
+def make_backend(latency=0.0):
+    backend = FakeServiceBackend(latency=latency)
+    for name in SERVICES[:3]:
+        backend.set_service(name, "running", "auto")
+    return backend
+
+
+def run_legacy(seconds, latency):
+    """界面每秒调用一次 monitor_anticheat_service"""
+    checker = LegacyServiceChecker(make_backend(), latency)
+    start = time.perf_counter()
+    for _ in range(seconds):
+        for name in SERVICES:
+            checker.check_service_status(name)
+    return checker.round_trips, time.perf_counter() - start
+
+
+def run_provider(seconds, latency, ttl):
+    """界面每秒批量读取一次，缓存过期时一次枚举"""
+    clock = VirtualClock()
+    backend = make_backend(latency)
+    provider = ServiceStatusProvider(backend, ttl=ttl, clock=clock)
+    start = time.perf_counter()
+    for second in range(seconds):
+        clock.now = float(second)
+        provider.get_statuses(SERVICES)
+    return backend.enum_calls, time.perf_counter() - start, provider.get_stats()
+
+
+def check_invalidation():
+    """停止、删除服务后显式失效缓存，应立即读到新状态"""
+    clock = VirtualClock()
+    backend = make_backend()
+    provider = ServiceStatusProvider(backend, ttl=60.0, clock=clock)
+
+    assert provider.get_status("ACE-BASE").status == "running"
+    backend.set_service("ACE-BASE", "stopped", "auto")
+    assert provider.get_status("ACE-BASE").status == "running", "TTL内应返回缓存结果"
+    provider.invalidate("ACE-BASE")
+    assert provider.get_status("ACE-BASE").status == "stopped", "失效后应读取到停止状态"
+
+    backend.delete_service("ACE-BASE")
+    provider.invalidate("ACE-BASE")
+    assert not provider.get_status("ACE-BASE").exists, "失效后应读取到服务已删除"
+
+    clock.now = 61.0
+    backend.set_service("ACE-GAME", "running", "manual")
+    assert provider.get_status("ACE-GAME").exists, "TTL过期后应重新查询"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="服务状态查询基准测试")
+    parser.add_argument("--seconds", type=int, default=60, help="模拟的界面刷新秒数")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="单次服务管理器往返的模拟耗时（毫秒）")
+    parser.add_argument("--ttl", type=float, default=2.0, help="缓存有效期（秒）")
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+    legacy_trips, legacy_time = run_legacy(args.seconds, latency)
+    provider_trips, provider_time, stats = run_provider(args.seconds, latency, args.ttl)
+    check_invalidation()
+
+    print(f"模拟 {args.seconds} 秒, {len(SERVICES)} 个服务, 单次往返 {args.latency_ms:g}ms, TTL {args.ttl:g}s")
+    print(f"旧方式:   服务管理器往返 {legacy_trips} 次 ({legacy_trips / args.seconds:.1f} 次/秒), 耗时 {legacy_time * 1000:.1f}ms")
+    print(
+        f"批量缓存: 服务管理器往返 {provider_trips} 次 ({provider_trips / args.seconds:.1f} 次/秒), "
+        f"耗时 {provider_time * 1000:.1f}ms, 缓存命中率 {stats['hit_rate']:.0%}"
+    )
+    print("缓存失效检查: 通过")
+
+
+if __name__ == "__main__":
+    main()
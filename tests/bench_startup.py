@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+启动开销基准测试脚本
+分别以图形界面模式、托盘模式（最小化启动）和后台模式启动程序并在启动完成后立即退出，对比启动耗时和常驻内存。
+非Windows系统上子进程会先用 win32_stubs 替换 pywin32 模块和 ctypes.windll，并跳过管理员权限和单实例检查，
+测得的是模块导入和服务启动的开销（不含真实的Win32调用）；未安装PySide6时跳过图形界面和托盘模式
+
+python tests/bench_startup.py --runs 5
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from win32_stubs import IS_WINDOWS, install as install_win32_stubs  # noqa: E402
+
+MODES = {
+    "gui": [],
+    "tray": ["--minimized"],
+    "headless": ["--headless", "--status-interval", "0"],
+}
+
+
+def run_child(mode_args):
+    """在子进程中启动程序（非Windows系统），替换Win32依赖后调用 main.main()"""
+    install_win32_stubs()
+    sys.path.insert(0, ROOT_DIR)
+    sys.argv = [os.path.join(ROOT_DIR, "main.py"), *mode_args]
+
+    import main as app_main
+
+    # 管理员权限和单实例检查只能在Windows上执行
+    app_main.run_as_admin = lambda: True
+    app_main.check_single_instance = lambda mutex_name=None: True
+    app_main.main()
+
+
+def run_once(mode_args):
+    """启动一次程序并解析启动报告"""
+    if IS_WINDOWS:
+        command = [sys.executable, os.path.join(ROOT_DIR, "main.py"), *mode_args, "--exit-after-startup"]
+    else:
+        command = [sys.executable, os.path.abspath(__file__), "--child", *mode_args, "--exit-after-startup"]
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    result = subprocess.run(
+        command,
+        cwd=ROOT_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        timeout=120,
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith("STARTUP_REPORT "):
+            return json.loads(line[len("STARTUP_REPORT ") :])
+    raise RuntimeError(f"未找到启动报告:\n{result.stdout}\n{result.stderr}")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        run_child(sys.argv[2:])
+        return
+
+    parser = argparse.ArgumentParser(description="启动开销基准测试")
+    parser.add_argument("--runs", type=int, default=5, help="每种模式的启动次数")
+    args = parser.parse_args()
+
+    modes = dict(MODES)
+    if not IS_WINDOWS:
+        print("非Windows系统: Win32调用已替换为空实现，结果只包含模块导入和服务启动开销")
+        if importlib.util.find_spec("PySide6") is None:
+            print("未安装PySide6，跳过图形界面和托盘模式")
+            modes = {"headless": MODES["headless"]}
+
+    results = {}
+    for mode, mode_args in modes.items():
+        reports = [run_once(mode_args) for _ in range(args.runs)]
+        results[mode] = {
+            "startup_ms": sorted(report["startup_ms"] for report in reports)[len(reports) // 2],
+            "rss_mb": sorted(report["rss_mb"] for report in reports)[len(reports) // 2],
+            "modules": reports[-1]["modules"],
+            "qt_loaded": reports[-1]["qt_loaded"],
+        }
+
+    print(f"启动次数: {args.runs}（取中位数）")
+    print(f"{'模式':>10} | {'启动耗时 ms':>12} | {'常驻内存 MB':>12} | {'模块数':>6} | PySide6")
+    for mode, result in results.items():
+        print(
+            f"{mode:>10} | {result['startup_ms']:>12.0f} | {result['rss_mb']:>12.1f} | "
+            f"{result['modules']:>6} | {'已加载' if result['qt_loaded'] else '未加载'}"
+        )
+
+    gui = results.get("gui")
+    if gui is None:
+        return
+    for mode, mode_text in (("tray", "托盘模式"), ("headless", "后台模式")):
+        print(
+            f"{mode_text}相对图形界面: 启动耗时 {results[mode]['startup_ms'] / gui['startup_ms']:.0%}, "
+            f"常驻内存 {results[mode]['rss_mb'] / gui['rss_mb']:.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
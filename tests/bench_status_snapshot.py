@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+界面状态刷新基准测试脚本
+模拟界面每秒刷新一次状态，对比旧版"在界面线程中查询进程、服务和内存后生成HTML"
+与"后台线程发布状态快照，界面线程只在版本变化时渲染"两种方式在界面线程中的耗时
+
+python tests/bench_status_snapshot.py --ticks 120 --probe-ms 15 --change-every 10
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.status_snapshot import StatusPublisher  # noqa: E402
+
+
+class FakeStatusSource:
+    """模拟状态采集：每次采集耗时 probe_ms，内容每 change_every 次采集变化一次"""
+
+    def __init__(self, probe_ms, change_every):
+        self.probe = probe_ms / 1000
+        self.change_every = change_every
+        self.calls = 0
+
+    def collect(self):
+        self.calls += 1
+        time.sleep(self.probe)
+        generation = self.calls // self.change_every
+        return {
+            "running": True,
+            "scanprocess": {"running_count": 1, "optimized_count": generation % 2},
+            "services": {"ACE-BASE": {"exists": True, "status": "running", "start_type": "auto"}},
+            "memory": {"percent": 40.0 + generation % 5, "used_gb": 12.5, "total_gb": 32.0},
+        }
+
+
+def render_html(status):
+    """模拟生成状态HTML"""
+    return "".join(f"<p>{key}: {value}</p>" for key, value in sorted(status.items()))
+
+
+def run_legacy(ticks, probe_ms, change_every):
+    """旧方式：每次刷新都在界面线程中采集并重新生成HTML"""
+    source = FakeStatusSource(probe_ms, change_every)
+    samples = []
+    renders = 0
+    for _ in range(ticks):
+        start = time.perf_counter()
+        render_html(source.collect())
+        renders += 1
+        samples.append(time.perf_counter() - start)
+    return samples, renders
+
+
+def run_snapshot(ticks, probe_ms, change_every):
+    """新方式：后台线程采集并发布快照，界面线程比较版本号后按需渲染"""
+    source = FakeStatusSource(probe_ms, change_every)
+    publisher = StatusPublisher(interval=3600)
+    publisher.register("monitor", source.collect)
+
+    samples = []
+    renders = 0
+    rendered_version = None
+    for _ in range(ticks):
+        # 后台线程的采集不计入界面线程耗时
+        publisher.build()
+
+        start = time.perf_counter()
+        snapshot = publisher.get_snapshot()
+        if snapshot.version != rendered_version:
+            rendered_version = snapshot.version
+            render_html(dict(snapshot["monitor"]))
+            renders += 1
+        samples.append(time.perf_counter() - start)
+    return samples, renders, publisher.get_stats()
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        "total_ms": sum(samples) * 1000,
+        "avg_ms": sum(samples) / len(samples) * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="界面状态刷新基准测试")
+    parser.add_argument("--ticks", type=int, default=120, help="模拟的界面刷新次数（每秒一次）")
+    parser.add_argument("--probe-ms", type=float, default=15.0, help="单次采集进程、服务和内存状态的模拟耗时（毫秒）")
+    parser.add_argument("--change-every", type=int, default=10, help="状态内容每隔多少次采集变化一次")
+    args = parser.parse_args()
+
+    legacy_samples, legacy_renders = run_legacy(args.ticks, args.probe_ms, args.change_every)
+    snapshot_samples, snapshot_renders, stats = run_snapshot(args.ticks, args.probe_ms, args.change_every)
+    legacy = summarize(legacy_samples)
+    snapshot = summarize(snapshot_samples)
+
+    print(f"模拟刷新 {args.ticks} 次, 单次采集 {args.probe_ms:g}ms, 内容每 {args.change_every} 次采集变化一次")
+    print(f"{'方式':>8} | {'界面线程总耗时 ms':>16} | {'平均 ms':>8} | {'P95 ms':>8} | {'最大 ms':>8} | 渲染次数")
+    for name, result, renders in (("旧方式", legacy, legacy_renders), ("状态快照", snapshot, snapshot_renders)):
+        print(
+            f"{name:>8} | {result['total_ms']:>16.1f} | {result['avg_ms']:>8.3f} | "
+            f"{result['p95_ms']:>8.3f} | {result['max_ms']:>8.3f} | {renders}"
+        )
+    print(f"快照版本 {stats['version']}, 内容未变化 {stats['unchanged']} 次")
+
+
+if __name__ == "__main__":
+    main()
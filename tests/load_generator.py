@@ -0,0 +1,355 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+跨平台目标进程负载生成器
+以指定的进程名启动若干工作进程，每个进程按配置模拟CPU占用、磁盘读取和内存分配，
+可设置周期性突发（模拟SGuard64扫盘）、被终止后自动重启（模拟ACE-Tray）和子进程树（模拟游戏启动器），
+用于在Linux等没有反作弊环境的机器上重复测试监控的反应时间和优化效果
+
+进程名通过以目标名称指向Python解释器的符号链接（Windows上为复制的解释器）实现，
+psutil 读取到的进程名与真实的 SGuard64.exe 等一致
+
+python tests/load_generator.py --scenario ace --seconds 30
+python tests/load_generator.py --spec '[{"name": "SGuard64.exe", "cpu": 0.3, "count": 2}]'
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import psutil
+
+# 工作进程的负载配置：
+#   name            进程名
+#   count           实例数量（仅顶层进程）
+#   cpu             持续CPU占用（单核比例 0~1）
+#   disk_read_mb_s  磁盘读取速率（MB/s）
+#   memory_mb       常驻内存（MB），启动后逐步分配并写入每一页
+#   burst           {"every": 秒, "duration": 秒, "cpu": 比例}，只在突发窗口内读取磁盘并使用突发CPU占用
+#   lifetime        运行时长（秒），到期后自行退出，不设置时一直运行
+#   respawn_delay   被终止或退出后多久重新启动（秒），不设置时不重启（仅顶层进程）
+#   children        子进程配置列表，由该进程自己启动，形成进程树
+SCENARIOS = {
+    # ACE反作弊：SGuard64周期性扫盘，ACE-Tray被终止后重新弹出，游戏由启动器拉起并保持稳定负载
+    "ace": [
+        {
+            "name": "SGuard64.exe",
+            "cpu": 0.05,
+            "disk_read_mb_s": 40,
+            "memory_mb": 64,
+            "burst": {"every": 10, "duration": 4, "cpu": 0.35},
+        },
+        {"name": "ACE-Tray.exe", "cpu": 0.01, "memory_mb": 16, "respawn_delay": 1.0},
+        {
+            "name": "VALORANT.exe",
+            "cpu": 0.02,
+            "memory_mb": 32,
+            "children": [{"name": "VALORANT-Win64-Shipping.exe", "cpu": 0.6, "memory_mb": 256}],
+        },
+    ],
+    # 只有扫盘进程，用于单独测试优化效果
+    "sguard": [
+        {"name": "SGuard64.exe", "cpu": 0.3, "disk_read_mb_s": 40, "memory_mb": 64},
+    ],
+    # 持续重启的弹窗进程，用于测试终止的反应时间
+    "respawn": [
+        {"name": "ACE-Tray.exe", "cpu": 0.01, "memory_mb": 8, "respawn_delay": 0.5},
+    ],
+}
+
+SCAN_FILE_NAME = "scan.dat"
+SCAN_FILE_MB = 64
+PERIOD = 0.1  # 工作进程调度周期（秒）
+CHUNK = 1024 * 1024
+
+
+def _named_executable(name, workdir):
+    """
+    创建以目标进程名命名、指向当前Python解释器的可执行文件
+
+    Args:
+        name (str): 进程名
+        workdir (str): 存放可执行文件的目录
+
+    Returns:
+        tuple: (可执行文件路径, 启动所需的环境变量)
+    """
+    path = os.path.join(workdir, name)
+    env = dict(os.environ)
+    if os.name == "nt":
+        # Windows按可执行文件名确定进程名，复制解释器并让其找到原安装目录中的DLL和标准库
+        base = getattr(sys, "_base_executable", sys.executable)
+        if not path.lower().endswith(".exe"):
+            path += ".exe"
+        if not os.path.exists(path):
+            shutil.copy2(base, path)
+        env["PATH"] = os.path.dirname(base) + os.pathsep + env.get("PATH", "")
+        env["PYTHONHOME"] = sys.base_prefix
+    elif not os.path.exists(path):
+        # Linux的进程名取自 execve 的文件名，符号链接即可
+        os.symlink(sys.executable, path)
+    return path, env
+
+
+def spawn(profile, workdir):
+    """
+    以目标进程名启动一个工作进程
+
+    Args:
+        profile (dict): 负载配置
+        workdir (str): 工作目录（存放命名的可执行文件和扫盘文件）
+
+    Returns:
+        subprocess.Popen: 工作进程
+    """
+    executable, env = _named_executable(profile["name"], workdir)
+    return subprocess.Popen(
+        [executable, os.path.abspath(__file__), "--worker", json.dumps(profile), "--workdir", workdir],
+        env=env,
+        stdin=subprocess.DEVNULL,
+    )
+
+
+def ensure_scan_file(workdir, size_mb=SCAN_FILE_MB):
+    """创建供扫盘模拟读取的数据文件"""
+    path = os.path.join(workdir, SCAN_FILE_NAME)
+    if not os.path.exists(path) or os.path.getsize(path) < size_mb * CHUNK:
+        block = os.urandom(CHUNK)
+        with open(path, "wb") as f:
+            for _ in range(size_mb):
+                f.write(block)
+    return path
+
+
+class _DiskReader:
+    """按速率顺序读取扫盘文件，读到末尾时丢弃页缓存并从头开始"""
+
+    def __init__(self, path):
+        self.fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        self.bytes_read = 0
+
+    def read(self, budget):
+        while budget > 0:
+            data = os.read(self.fd, min(CHUNK, budget))
+            if not data:
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(self.fd, 0, 0, os.POSIX_FADV_DONTNEED)
+                os.lseek(self.fd, 0, os.SEEK_SET)
+                continue
+            budget -= len(data)
+            self.bytes_read += len(data)
+
+
+def run_worker(profile, workdir):
+    """工作进程主循环"""
+    start = time.monotonic()
+    parent = os.getppid()
+    children = [spawn(child, workdir) for child in profile.get("children", ())]
+
+    # 逐步分配内存并写入每一页，使其计入常驻内存
+    memory = bytearray(int(profile.get("memory_mb", 0) * CHUNK))
+    for offset in range(0, len(memory), 4096):
+        memory[offset] = 1
+
+    disk_rate = profile.get("disk_read_mb_s", 0) * CHUNK
+    reader = _DiskReader(os.path.join(workdir, SCAN_FILE_NAME)) if disk_rate else None
+    burst = profile.get("burst")
+    lifetime = profile.get("lifetime")
+
+    try:
+        while True:
+            period_start = time.monotonic()
+            elapsed = period_start - start
+            if lifetime is not None and elapsed >= lifetime:
+                break
+            # 父进程退出后（进程树被拆散）随之退出，Windows上由生成器统一清理
+            if os.name != "nt" and os.getppid() != parent:
+                break
+
+            in_burst = burst is None or elapsed % burst["every"] < burst["duration"]
+            cpu = burst.get("cpu", profile.get("cpu", 0)) if burst and in_burst else profile.get("cpu", 0)
+            if reader and in_burst:
+                reader.read(int(disk_rate * PERIOD))
+
+            # 周期内先忙等到目标CPU占用，再休眠到周期结束
+            busy_until = period_start + PERIOD * cpu
+            while time.monotonic() < busy_until:
+                pass
+            remaining = period_start + PERIOD - time.monotonic()
+            if remaining > 0:
+                time.sleep(remaining)
+    finally:
+        for child in children:
+            child.kill()
+
+
+class LoadGenerator:
+    """负载生成器：启动并维护一组命名的工作进程，记录每次启动与退出"""
+
+    def __init__(self, profiles, workdir=None):
+        """
+        初始化负载生成器
+
+        Args:
+            profiles (list): 负载配置列表
+            workdir (str, optional): 工作目录，默认使用临时目录
+        """
+        self.profiles = profiles
+        self._own_workdir = workdir is None
+        self.workdir = workdir or tempfile.mkdtemp(prefix="ace-load-")
+        self._slots = []  # [配置, Popen 或 None, 下次重启时间]
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._tree = {}  # pid -> create_time，见过的所有工作进程（含子进程），用于退出时清理
+
+        # 启动与退出记录
+        self.spawns = []  # (进程名, pid, create_time)
+        self.exits = []  # (进程名, pid, 退出时间 time.time(), 返回码)
+
+    def start(self):
+        """启动所有工作进程和重启监督线程"""
+        if any(self._needs_scan_file(profile) for profile in self.profiles):
+            ensure_scan_file(self.workdir)
+        for profile in self.profiles:
+            for _ in range(profile.get("count", 1)):
+                slot = [profile, None, 0.0]
+                self._slots.append(slot)
+                self._spawn(slot)
+        self._thread = threading.Thread(target=self._supervise_loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def _needs_scan_file(self, profile):
+        children = profile.get("children", ())
+        return bool(profile.get("disk_read_mb_s")) or any(self._needs_scan_file(child) for child in children)
+
+    def _spawn(self, slot):
+        proc = spawn(slot[0], self.workdir)
+        slot[1] = proc
+        try:
+            create_time = psutil.Process(proc.pid).create_time()
+        except psutil.Error:
+            create_time = time.time()
+        with self._lock:
+            self._tree[proc.pid] = create_time
+            self.spawns.append((slot[0]["name"], proc.pid, create_time))
+
+    def _supervise_loop(self):
+        """监督线程：记录退出的工作进程，按配置延迟后重新启动，并记录子进程"""
+        while not self._stop_event.wait(0.02):
+            now = time.time()
+            for slot in self._slots:
+                profile, proc, respawn_at = slot
+                if proc is not None:
+                    returncode = proc.poll()
+                    if returncode is None:
+                        self._track_children(proc.pid)
+                        continue
+                    with self._lock:
+                        self.exits.append((profile["name"], proc.pid, now, returncode))
+                    slot[1] = None
+                    if profile.get("respawn_delay") is None:
+                        continue
+                    slot[2] = now + profile["respawn_delay"]
+                elif profile.get("respawn_delay") is not None and now >= respawn_at:
+                    self._spawn(slot)
+
+    def _track_children(self, pid):
+        try:
+            children = psutil.Process(pid).children(recursive=True)
+        except psutil.Error:
+            return
+        for child in children:
+            if child.pid not in self._tree:
+                try:
+                    self._tree[child.pid] = child.create_time()
+                except psutil.Error:
+                    continue
+
+    def processes(self, name=None):
+        """
+        获取当前存活的工作进程
+
+        Args:
+            name (str, optional): 只返回指定名称的进程
+
+        Returns:
+            list: psutil.Process 列表
+        """
+        alive = []
+        for pid, create_time in list(self._tree.items()):
+            try:
+                proc = psutil.Process(pid)
+                if proc.create_time() != create_time or proc.status() == psutil.STATUS_ZOMBIE:
+                    continue
+                if name is None or proc.name().lower() == name.lower():
+                    alive.append(proc)
+            except psutil.Error:
+                continue
+        return alive
+
+    def stop(self):
+        """停止监督线程并终止所有工作进程（包括子进程）"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(1.0)
+        for slot in self._slots:
+            if slot[1] is not None:
+                self._track_children(slot[1].pid)
+        procs = self.processes()
+        for proc in procs:
+            try:
+                proc.kill()
+            except psutil.Error:
+                pass
+        psutil.wait_procs(procs, timeout=3)
+        for slot in self._slots:
+            if slot[1] is not None:
+                slot[1].wait()
+        if self._own_workdir:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *_):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="跨平台目标进程负载生成器")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="ace", help="预设场景")
+    parser.add_argument("--spec", help="JSON格式的负载配置列表，设置后忽略 --scenario")
+    parser.add_argument("--seconds", type=float, default=0, help="运行时长（秒），0表示直到按下 Ctrl+C")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(json.loads(args.worker), args.workdir)
+        return
+
+    profiles = json.loads(args.spec) if args.spec else SCENARIOS[args.scenario]
+    with LoadGenerator(profiles) as generator:
+        print(f"工作目录: {generator.workdir}")
+        for name, pid, _ in generator.spawns:
+            print(f"已启动 {name} (PID: {pid})")
+        deadline = time.monotonic() + args.seconds if args.seconds else None
+        try:
+            while deadline is None or time.monotonic() < deadline:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        print(f"共启动 {len(generator.spawns)} 次, 退出 {len(generator.exits)} 次")
+
+
+if __name__ == "__main__":
+    main()
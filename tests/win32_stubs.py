@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+非Windows系统上的 pywin32 模块和 ctypes.windll 替身
+供基准测试在Linux等系统上导入并运行真实的监控代码：
+    - 进程句柄即PID，SetPriorityClass 通过 psutil 设置 nice 值（优先级类常量取对应的 nice 值）
+    - kernel32.OpenProcess/SetProcessInformation/CloseHandle 可以调用，效能模式（EcoQoS）在这些系统上没有对应实现，直接视为成功
+    - 其余Win32函数和常量为空实现：属性访问和调用都返回自身，按整数参与运算时为0，遍历时为空
+
+在导入项目模块之前调用 install()，Windows上不做任何替换
+"""
+
+import ctypes
+import sys
+import types
+
+import psutil
+
+IS_WINDOWS = sys.platform == "win32"
+
+# 需要替换的 pywin32 模块
+WIN32_MODULES = (
+    "win32api",
+    "win32con",
+    "win32event",
+    "win32process",
+    "win32security",
+    "win32service",
+    "win32com",
+    "win32com.client",
+    "ntsecuritycon",
+    "pythoncom",
+    "pywintypes",
+)
+
+# 优先级类对应的 nice 值，psutil.Process.nice() 在这些系统上返回 nice 值
+PRIORITY_CLASSES = {
+    "IDLE_PRIORITY_CLASS": 19,
+    "BELOW_NORMAL_PRIORITY_CLASS": 10,
+    "NORMAL_PRIORITY_CLASS": 0,
+    "ABOVE_NORMAL_PRIORITY_CLASS": -5,
+    "HIGH_PRIORITY_CLASS": -10,
+}
+
+
+class WinStub:
+    """Win32 函数和常量的空实现"""
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return self
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+    def __int__(self):
+        return 0
+
+    __index__ = __int__
+
+    def __bool__(self):
+        return False
+
+    def __iter__(self):
+        return iter(())
+
+    def __len__(self):
+        return 0
+
+    def __or__(self, other):
+        return self
+
+    __ror__ = __and__ = __rand__ = __or__
+
+
+class StubModule(types.ModuleType):
+    """pywin32 模块的空实现，可以用关键字参数指定真实的函数和常量"""
+
+    def __init__(self, name, **attributes):
+        super().__init__(name)
+        self.__dict__.update(attributes)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return WinStub()
+
+
+def _open_process(access, inherit, pid):
+    """OpenProcess 替身，进程不存在时与真实接口一样抛出异常"""
+    if not psutil.pid_exists(pid):
+        raise OSError(f"进程不存在: {pid}")
+    return pid
+
+
+def _set_priority_class(handle, priority):
+    """SetPriorityClass 替身"""
+    psutil.Process(handle).nice(priority)
+
+
+class _Kernel32(WinStub):
+    """kernel32 替身"""
+
+    def OpenProcess(self, access, inherit, pid):
+        return pid if psutil.pid_exists(pid) else 0
+
+    def SetProcessInformation(self, handle, information_class, information, size):
+        return 1
+
+    def CloseHandle(self, handle):
+        return 1
+
+    def GetLastError(self):
+        return 0
+
+
+class _WinDLL(WinStub):
+    """ctypes.windll 替身"""
+
+    def __init__(self):
+        self.kernel32 = _Kernel32()
+
+
+def install():
+    """替换 pywin32 模块和 ctypes.windll，已存在的模块（如已安装 pywin32）不替换"""
+    if IS_WINDOWS:
+        return
+    attributes = {
+        "win32api": {"OpenProcess": _open_process},
+        "win32con": {"PROCESS_ALL_ACCESS": 0x1F0FFF},
+        "win32process": dict(PRIORITY_CLASSES, SetPriorityClass=_set_priority_class),
+    }
+    for name in WIN32_MODULES:
+        sys.modules.setdefault(name, StubModule(name, **attributes.get(name, {})))
+    if not hasattr(ctypes, "windll"):
+        ctypes.windll = _WinDLL()
+    for name in ("WinDLL", "WINFUNCTYPE", "WinError", "GetLastError"):
+        if not hasattr(ctypes, name):
+            setattr(ctypes, name, WinStub())
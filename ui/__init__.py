@@ -3,6 +3,26 @@
 
 """用户界面模块"""
 
-from ui.main_window import create_gui, MainWindow, get_status_info
+# 导出名称 -> 所在子模块，首次访问时才导入（主窗口模块较重，托盘启动时不需要）
+_LAZY_EXPORTS = {
+    "create_gui": "ui.launcher",
+    "MainWindow": "ui.main_window",
+    "get_status_info": "ui.main_window",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # 使用 __import__ 而非 importlib.import_module，以便启动导入耗时分析能统计到按需导入的模块
+    value = getattr(__import__(module_name, fromlist=[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
 
 __all__ = ["create_gui", "MainWindow", "get_status_info"]
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+界面启动模块
+最小化启动时只创建托盘图标并启动监控，主窗口（及样式表、进程管理等界面模块）在首次打开时才加载
+"""
+
+import sys
+
+from PySide6.QtCore import QObject, QTimer
+from PySide6.QtGui import QAction, QIcon
+from PySide6.QtWidgets import QApplication, QMenu, QSystemTrayIcon
+
+from utils.logger import logger
+
+
+class TrayLauncher(QObject):
+    """轻量托盘启动器，主窗口按需创建"""
+
+    def __init__(self, app, config_manager, monitor=None, icon_path=None):
+        """
+        初始化托盘启动器
+
+        Args:
+            app (QApplication): 应用程序对象
+            config_manager: 配置管理器对象
+            monitor: 进程监控器对象
+            icon_path: 图标路径
+        """
+        super().__init__()
+        self.app = app
+        self.config_manager = config_manager
+        self.monitor = monitor
+        self.icon_path = icon_path
+        self.window = None
+
+        self.setup_tray()
+
+        # 按配置启动监控（原本由主窗口加载设置时完成）
+        if self.monitor and self.config_manager.monitor_enabled and not self.monitor.running:
+            self.monitor.start_monitors()
+            logger.debug("根据配置启动监控程序")
+
+        # 托盘显示后再初始化内存清理（初始化时会根据配置启动清理线程）
+        QTimer.singleShot(0, self._start_memory_cleaner)
+
+    def setup_tray(self):
+        """创建只包含基本操作的托盘图标"""
+        self.tray_icon = QSystemTrayIcon(QIcon(self.icon_path) if self.icon_path else QIcon(), self)
+
+        tray_menu = QMenu()
+
+        show_window_action = QAction("显示主窗口", self)
+        show_window_action.triggered.connect(self.show_main_window)
+        tray_menu.addAction(show_window_action)
+
+        tray_menu.addSeparator()
+
+        exit_action = QAction("退出", self)
+        exit_action.triggered.connect(self.exit_app)
+        tray_menu.addAction(exit_action)
+
+        self._tray_menu = tray_menu
+        self.tray_icon.setContextMenu(tray_menu)
+        self.tray_icon.activated.connect(self.tray_icon_activated)
+        self.tray_icon.setToolTip(self.config_manager.get_app_name())
+        self.tray_icon.show()
+
+    def _start_memory_cleaner(self):
+        """初始化内存清理管理器"""
+        if self.config_manager.memory_cleaner_enabled:
+            from utils.memory_cleaner import get_memory_cleaner
+
+            get_memory_cleaner()
+
+    def tray_icon_activated(self, reason):
+        """处理托盘图标激活事件"""
+        if reason == QSystemTrayIcon.ActivationReason.DoubleClick:
+            self.show_main_window()
+
+    def create_main_window(self):
+        """
+        创建主窗口，创建后由主窗口自己的托盘图标接管
+
+        Returns:
+            MainWindow: 主窗口对象
+        """
+        if self.window is None:
+            from ui.main_window import MainWindow
+            from ui.styles import StyleApplier
+
+            logger.debug("首次打开主窗口，加载界面模块")
+            StyleApplier.apply_ant_design_theme(self.app)
+            self.window = MainWindow(self.config_manager, self.monitor, self.icon_path, start_minimized=True)
+            self.tray_icon.hide()
+        return self.window
+
+    def show_main_window(self):
+        """显示主窗口"""
+        window = self.create_main_window()
+        window.showNormal()
+        window.activateWindow()
+        window.update_tray_menu_text()
+
+    def exit_app(self):
+        """退出应用程序"""
+        if self.monitor and self.monitor.running:
+            self.monitor.stop_monitors()
+        self.tray_icon.hide()
+        QApplication.quit()
+
+
+def create_gui(config_manager, monitor=None, icon_path=None, start_minimized=False):
+    """
+    创建图形用户界面，最小化启动时只创建托盘图标
+
+    Args:
+        config_manager: 配置管理器对象
+        monitor: 进程监控器对象
+        icon_path: 图标路径
+        start_minimized: 是否以最小化模式启动
+
+    Returns:
+        (QApplication, MainWindow or TrayLauncher): 应用程序对象和主窗口（或托盘启动器）对象
+    """
+    if not start_minimized:
+        from ui.main_window import create_gui as create_main_window_gui
+
+        return create_main_window_gui(config_manager, monitor, icon_path, start_minimized)
+
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    # 托盘常驻时关闭所有窗口不退出程序
+    app.setQuitOnLastWindowClosed(False)
+
+    logger.debug("程序以最小化模式启动，主窗口将在首次打开时创建")
+    return app, TrayLauncher(app, config_manager, monitor, icon_path)
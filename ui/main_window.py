@@ -7,8 +7,8 @@ PySide6 GUI界面模块
 
 import os
 import sys
-import threading
 import subprocess
+import threading
 import time
 from PySide6.QtWidgets import (
     QApplication,
@@ -44,6 +44,8 @@ from utils import (
     disable_auto_start,
     get_memory_cleaner,
     get_io_priority_manager,
+    get_metrics_registry,
+    get_task_scheduler,
     IO_PRIORITY_HINT,
 )
 
@@ -74,6 +76,22 @@ class MainWindow(QWidget):
     stop_progress_signal = Signal(int)
     stop_result_signal = Signal(str, int, int)
 
+    # 一键优化反作弊进程相关信号
+    optimize_progress_signal = Signal(int, int)
+    optimize_result_signal = Signal(object)
+
+    # 状态快照发布信号（由状态发布线程触发，在界面线程中渲染）
+    status_snapshot_signal = Signal()
+
+    # 一键优化的反作弊相关进程名称列表
+    ANTICHEAT_PROCESSES = [
+        "SGuard64.exe",  # SGuard64进程
+        "ACE-Tray.exe",  # ACE进程
+        "AntiCheatExpert.exe",  # ACE进程
+        "AntiCheatExpertBase.sys",  # ACE进程
+        "FeverGamesService.exe",  # FeverGamesService进程
+    ]
+
     def __init__(self, config_manager, monitor=None, icon_path=None, start_minimized=False):
         super().__init__()
 
@@ -97,6 +115,13 @@ class MainWindow(QWidget):
         # 初始化内存清理管理器
         self.memory_cleaner = get_memory_cleaner()
 
+        # 状态渲染指标：界面线程每次刷新状态的耗时，以及实际渲染和因内容未变化而跳过的次数
+        self.metrics = get_metrics_registry()
+        self._status_render_histogram = self.metrics.histogram("ui.update_status_ms", "ms")
+        self._status_rendered = self.metrics.counter("ui.status_rendered")
+        self._status_skipped = self.metrics.counter("ui.status_skipped")
+        self._rendered_status_key = None  # 上次渲染时的 (快照版本号, 界面设置)
+
         # 初始化版本检查器
         self.version_checker = get_version_checker(config_manager)
         self.version_checker.check_finished.connect(self._on_version_check_finished)
@@ -107,6 +132,9 @@ class MainWindow(QWidget):
         self.delete_result_signal.connect(self._show_delete_services_result)
         self.stop_progress_signal.connect(self._update_stop_progress)
         self.stop_result_signal.connect(self._show_stop_services_result)
+        self.optimize_progress_signal.connect(self._update_optimize_progress)
+        self.optimize_result_signal.connect(self._show_optimize_anticheat_result)
+        self.status_snapshot_signal.connect(self.render_status)
 
         self.setup_ui()
         self.setup_tray()
@@ -114,9 +142,16 @@ class MainWindow(QWidget):
         # 连接主题切换信号 - 当主题改变时自动应用组件属性
         theme_manager.theme_changed.connect(self.apply_component_properties)
 
+        # 启动状态发布线程，进程、服务和内存状态在后台采集，界面线程只读取快照
+        if self.monitor:
+            publisher = self.monitor.status_publisher
+            publisher.register("memory", self.memory_cleaner.collect_status)
+            publisher.add_listener(self._on_status_published)
+            publisher.start()
+
         # 初始化定时器和设置
         self.update_timer = QTimer(self)
-        self.update_timer.timeout.connect(self.update_status)
+        self.update_timer.timeout.connect(self.render_status)
         self.update_timer.start(1000)
 
         # 应用初始主题
@@ -878,11 +913,22 @@ class MainWindow(QWidget):
         except Exception as e:
             logger.error(f"设置进度条属性失败: {str(e)}")
 
-    def get_status_html(self):
-        """获取HTML格式的状态信息"""
+    def get_status_html(self, snapshot=None):
+        """
+        根据状态快照生成HTML格式的状态信息，不在界面线程中查询进程和服务
+
+        Args:
+            snapshot (StatusSnapshot, optional): 状态快照，默认使用状态发布器的最新快照
+        """
         if not self.monitor:
             return "<p>程序未启动</p>"
 
+        if snapshot is None:
+            snapshot = self.monitor.status_publisher.get_snapshot()
+        if snapshot is None or "monitor" not in snapshot:
+            return "<p>正在获取状态...</p>"
+        monitor_status = snapshot["monitor"]
+
         # 使用新的状态HTML生成器
         style = StatusHTMLGenerator.get_html_style()
 
@@ -893,11 +939,40 @@ class MainWindow(QWidget):
         html.append('<div class="section-title">程序状态</div>')
 
         # 监控程序状态
-        if self.monitor.running:
+        if monitor_status["running"]:
             html.append('<p class="status-item"><span class="status-success">🟩 监控程序运行中</span></p>')
         else:
             html.append('<p class="status-item"><span class="status-error">🟥 监控程序已停止</span></p>')
 
+        # 自适应轮询状态
+        scheduler_stats = monitor_status["scheduler"]
+        if scheduler_stats["state"] == "active":
+            html.append(
+                f'<p class="status-item">🎮 轮询模式: <span class="status-success">游戏中</span> ({", ".join(scheduler_stats["active_games"])})</p>'
+            )
+        else:
+            html.append(
+                f'<p class="status-item">💤 轮询模式: <span class="status-normal">空闲</span> (间隔 x{scheduler_stats["factor"]:g})</p>'
+            )
+
+        # 已应用状态台账
+        ledger_stats = monitor_status["ledger"]
+        html.append(
+            f'<p class="status-item">📒 状态台账: 跟踪 {ledger_stats["entries"]} 项，已节省 {ledger_stats["avoided_syscalls"]} 次状态查询</p>'
+        )
+
+        # 自身开销与预算
+        overhead = monitor_status["overhead"]
+        over_budget = overhead["factor"] > 1
+        html.append(
+            f'<p class="status-item">🪶 自身开销: <span class="{"status-warning" if over_budget else "status-success"}">'
+            f'CPU {overhead["cpu_percent"]:.2f}%</span> / 预算 {overhead["cpu_budget"]:g}%，'
+            f'内存 {overhead["rss_mb"]}MB / 预算 {overhead["rss_budget_mb"]:g}MB'
+            + (f'，轮询间隔已放大 {overhead["factor"]} 倍' if over_budget else "")
+            + ("，已暂停可选工作" if not overhead["optional_work"] else "")
+            + "</p>"
+        )
+
         html.append("</div>")
 
         # 进程状态卡片
@@ -905,13 +980,13 @@ class MainWindow(QWidget):
         html.append('<div class="section-title">进程状态</div>')
 
         # ACE进程状态(ACE反作弊程序是否安装提示弹窗)
-        ace_running = self.monitor.is_process_running(self.monitor.anticheat_name) is not None
+        anticheat_status = monitor_status["anticheat"]
 
-        if ace_running and self.monitor.anticheat_killed:
+        if anticheat_status["running"] and anticheat_status["killed"]:
             html.append(
                 '<p class="status-item">✅ ACE-Tray进程: <span class="status-success">已被终止</span>  (反作弊安装弹窗进程)</p>'
             )
-        elif ace_running:
+        elif anticheat_status["running"]:
             html.append(
                 '<p class="status-item">🔄 ACE-Tray进程: <span class="status-warning">正在处理</span>  (反作弊安装弹窗进程)</p>'
             )
@@ -920,39 +995,63 @@ class MainWindow(QWidget):
                 '<p class="status-item">ℹ️ ACE-Tray进程: <span class="status-normal">未处理</span>  (反作弊安装弹窗进程)</p>'
             )
 
-        # SGuard64进程状态
-        scan_running = self.monitor.is_process_running(self.monitor.scanprocess_name) is not None
+        # SGuard64进程状态（统计所有实例，所有实例都已优化才视为已优化）
+        scan_status = monitor_status["scanprocess"]
+        running_count = scan_status["running_count"]
+        optimized_count = scan_status["optimized_count"]
 
-        # 如果进程在运行，直接检查其优化状态并更新全局标志
-        if scan_running:
-            # 直接检查当前进程的真实优化状态
-            _, is_optimized = self.monitor.check_process_status(self.monitor.scanprocess_name)
-            # 强制更新全局状态标志
-            self.monitor.scanprocess_optimized = is_optimized
+        if running_count:
+            instance_text = f" ({optimized_count}/{running_count})" if running_count > 1 else ""
 
-            if self.monitor.scanprocess_optimized:
+            if scan_status["optimized"]:
                 html.append(
-                    '<p class="status-item">✅ SGuard64进程: <span class="status-success">已被优化</span>  (反作弊扫盘进程)</p>'
+                    f'<p class="status-item">✅ SGuard64进程: <span class="status-success">已被优化{instance_text}</span>  (反作弊扫盘进程)</p>'
                 )
             else:
                 html.append(
-                    '<p class="status-item">🔄 SGuard64进程: <span class="status-warning">正在运行 (未优化)</span>  (反作弊扫盘进程)</p>'
+                    f'<p class="status-item">🔄 SGuard64进程: <span class="status-warning">正在运行 (未优化){instance_text}</span>  (反作弊扫盘进程)</p>'
                 )
         else:
             html.append(
                 '<p class="status-item">⚠️ SGuard64进程: <span class="status-error">未在运行</span>  (反作弊扫盘进程)</p>'
             )
+
+        # 占空比CPU限制（实际占用为开始限制以来的平均值）
+        for cpu_limit in monitor_status["cpu_limits"]:
+            html.append(
+                f'<p class="status-item">⏳ CPU限制: {cpu_limit["name"]} (PID: {cpu_limit["pid"]}) '
+                f'目标 <span class="status-normal">{cpu_limit["limit_percent"]:g}%</span> / '
+                f'实际 <span class="status-success">{cpu_limit["achieved_percent"]:.0f}%</span></p>'
+            )
+
+        # 还原被修改状态的进程及重新应用情况
+        reapply = monitor_status["reapply"]
+        for name, resets in sorted(reapply["fight_back"].items(), key=lambda item: item[1], reverse=True):
+            html.append(f'<p class="status-item">🔁 {name}: 已还原设置 <span class="status-warning">{resets}</span> 次</p>')
+        if reapply["given_up"]:
+            html.append(
+                f'<p class="status-item">🔁 重新应用: <span class="status-error">已放弃 {reapply["given_up"]} 个进程</span> '
+                f'(连续未能保持，进程重启后重试)</p>'
+            )
+
+        # 游戏CPU分区
+        partition = monitor_status.get("partition")
+        if partition and partition["active"]:
+            html.append(
+                f'<p class="status-item">🧱 CPU分区: <span class="status-success">已生效</span> '
+                f'游戏核心 {partition["game_cpus"]} / 后台核心 {partition["background_cpus"]}，'
+                f'已调整 {partition["fenced"]} 个进程 (耗时 {partition["last_duration_ms"]}ms)</p>'
+            )
+        elif partition:
+            html.append('<p class="status-item">🧱 CPU分区: <span class="status-normal">等待游戏启动</span></p>')
         html.append("</div>")
 
         # 反作弊服务状态
         html.append('<div class="card">')
         html.append('<div class="section-title">反作弊服务状态</div>')
 
-        # 获取所有反作弊服务的状态
-        service_results = self.monitor.monitor_anticheat_service()
-
         # 显示每个服务的状态
-        for service_name, service_info in service_results.items():
+        for service_name, service_info in monitor_status["services"].items():
             service_exists = service_info["exists"]
             status = service_info["status"]
             start_type = service_info["start_type"]
@@ -999,12 +1098,11 @@ class MainWindow(QWidget):
         html.append('<div class="card">')
         html.append('<div class="section-title">内存状态</div>')
 
-        if self.memory_cleaner.running:
-            mem_info = self.memory_cleaner.get_memory_info()
+        memory_status = snapshot.get("memory")
+        if memory_status and memory_status["running"]:
+            mem_info = memory_status["memory"]
             if mem_info:
                 used_percent = mem_info["percent"]
-                used_gb = mem_info["used"] / (1024**3)
-                total_gb = mem_info["total"] / (1024**3)
 
                 # 根据内存使用率设置颜色
                 bar_color = "#2ecc71"  # 绿色（低）
@@ -1018,27 +1116,25 @@ class MainWindow(QWidget):
 
                 html.append(f'<p class="status-item">🛡️ 内存清理: <span class="status-success">已启用</span></p>')
                 html.append(
-                    f'<p class="status-item">🍋‍🟩 内存使用: <span class="{status_class}">{used_percent:.1f}%</span> ({used_gb:.1f}GB / {total_gb:.1f}GB)</p>'
+                    f'<p class="status-item">🍋‍🟩 内存使用: <span class="{status_class}">{used_percent:.1f}%</span> ({mem_info["used_gb"]:.1f}GB / {mem_info["total_gb"]:.1f}GB)</p>'
                 )
 
                 # 添加自定义清理配置信息
                 html.append(
-                    f'<p class="status-item">⏱️ 清理间隔: <span class="status-normal">{self.memory_cleaner.clean_interval}秒</span></p>'
+                    f'<p class="status-item">⏱️ 清理间隔: <span class="status-normal">{memory_status["clean_interval"]}秒</span></p>'
                 )
                 html.append(
-                    f'<p class="status-item">📊 触发阈值: <span class="status-normal">{self.memory_cleaner.threshold}%</span></p>'
+                    f'<p class="status-item">📊 触发阈值: <span class="status-normal">{memory_status["threshold"]}%</span></p>'
                 )
                 html.append(
-                    f'<p class="status-item">⏲️ 冷却时间: <span class="status-normal">{self.memory_cleaner.cooldown_time}秒</span></p>'
+                    f'<p class="status-item">⏲️ 冷却时间: <span class="status-normal">{memory_status["cooldown_time"]}秒</span></p>'
                 )
 
                 # 系统缓存信息
-                cache_info = self.memory_cleaner.get_system_cache_info()
+                cache_info = memory_status["cache"]
                 if cache_info:
-                    cache_size = cache_info["current_size"] / (1024**3)
-                    peak_size = cache_info["peak_size"] / (1024**3)
                     html.append(
-                        f'<p class="status-item">💾 系统缓存: <span class="status-normal">{cache_size:.1f}GB</span> (峰值: {peak_size:.1f}GB)</p>'
+                        f'<p class="status-item">💾 系统缓存: <span class="status-normal">{cache_info["current_gb"]:.1f}GB</span> (峰值: {cache_info["peak_gb"]:.1f}GB)</p>'
                     )
             else:
                 html.append('<p class="status-item">🧠 内存清理: <span class="status-success">已启用</span></p>')
@@ -1048,6 +1144,10 @@ class MainWindow(QWidget):
 
         html.append("</div>")
 
+        # 运行诊断卡片（调试模式下显示，运行指标由状态发布线程采集）
+        if self.monitor.config_manager.debug_mode and "metrics" in monitor_status:
+            html.append(self.get_diagnostics_html(monitor_status["metrics"]))
+
         # 系统设置卡片
         html.append('<div class="card">')
         html.append('<div class="section-title">系统设置</div>')
@@ -1087,14 +1187,105 @@ class MainWindow(QWidget):
 
         html.append("</div>")
 
-        # 添加更新时间
+        # 添加更新时间（状态内容最近一次变化的时间）
         import datetime
 
-        current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        html.append(f'<p class="update-time">更新时间: {current_time}</p>')
+        changed_time = datetime.datetime.fromtimestamp(snapshot.changed_at).strftime("%Y-%m-%d %H:%M:%S")
+        html.append(f'<p class="update-time">更新时间: {changed_time}</p>')
 
         return "".join(html)
 
+    def get_diagnostics_html(self, metrics):
+        """
+        生成运行诊断卡片的HTML，用于根据实际数据调整轮询间隔
+
+        Args:
+            metrics (dict): GameProcessMonitor.get_metrics() 返回的运行指标
+        """
+        histograms = metrics["histograms"]
+        counters = metrics["counters"]
+
+        def histogram_text(name):
+            summary = histograms.get(name)
+            if not summary or not summary["count"]:
+                return "暂无数据"
+            unit = summary["unit"]
+            return f"平均 {summary['avg']:.1f}{unit} / P95 {summary['p95']:.1f}{unit} / 最大 {summary['max']:.1f}{unit}"
+
+        html = ['<div class="card">', '<div class="section-title">运行诊断</div>']
+
+        snapshot_stats = metrics["snapshot"]
+        html.append(
+            f'<p class="status-item">🔍 进程扫描: {histogram_text("snapshot.scan_ms")} '
+            f'(进程 {snapshot_stats["process_count"]} 个，已扫描 {snapshot_stats["scan_count"]} 次)</p>'
+        )
+        html.append(f'<p class="status-item">🧮 每次新解析进程数: {histogram_text("snapshot.processes_inspected")}</p>')
+        html.append(f'<p class="status-item">⏱️ 定时器超时: {histogram_text("snapshot.oversleep_ms")}</p>')
+        task_stats = metrics["task_scheduler"]
+        html.append(
+            f'<p class="status-item">🧵 统一调度: 线程 {task_stats["process_threads"]} 个 '
+            f'(调度器 {task_stats["scheduler_threads"]} 个)，定时唤醒 {task_stats["wakeups_per_min"]:.1f} 次/分，'
+            f'合并执行 {task_stats["batched_runs"]} 次，工作线程排队 {histogram_text("scheduler.executor_wait_ms")}</p>'
+        )
+        html.append(f'<p class="status-item">🐢 规则线程滞后: {histogram_text("monitor.loop_lag_ms")}</p>')
+
+        cache_stats = metrics["process_cache"]
+        html.append(
+            f'<p class="status-item">📦 进程缓存命中率: {cache_stats["hit_rate"]:.0%} '
+            f'(命中 {cache_stats["hit"]} / 未命中 {cache_stats["miss"]})</p>'
+        )
+
+        for action, action_text in (("kill", "终止"), ("optimize", "优化"), ("throttle", "效能模式")):
+            ok_count = counters.get(f"monitor.action.{action}.ok", 0)
+            failed_count = counters.get(f"monitor.action.{action}.failed", 0)
+            if not ok_count and not failed_count:
+                continue
+            html.append(
+                f'<p class="status-item">⚡ {action_text}: 成功 {ok_count} / 失败 {failed_count}，'
+                f'发现到处理 {histogram_text(f"monitor.first_seen_to_{action}_ms")}</p>'
+            )
+
+        service_stats = metrics["services"]
+        html.append(
+            f'<p class="status-item">🛡️ 服务查询: 批量查询 {service_stats["query_count"]} 次，缓存命中率 {service_stats["hit_rate"]:.0%}</p>'
+        )
+        html.append(
+            f'<p class="status-item">🖥️ 界面刷新: {histogram_text("ui.update_status_ms")} '
+            f'(渲染 {counters.get("ui.status_rendered", 0)} 次 / 内容未变化跳过 {counters.get("ui.status_skipped", 0)} 次)</p>'
+        )
+        html.append(f'<p class="status-item">📋 后台状态采集: {histogram_text("status.build_ms")}</p>')
+        handle_stats = get_io_priority_manager().get_handle_stats()
+        html.append(
+            f'<p class="status-item">🔑 进程句柄池: 缓存 {handle_stats["size"]} 个，打开 {handle_stats["opened"]} 次，'
+            f'省去 {handle_stats["opens_saved"]} 次，复用率 {handle_stats["reuse_rate"]:.0%}；'
+            f'设置写入 {handle_stats["writes"]} 项 / 已是目标状态跳过 {handle_stats["writes_skipped"]} 项</p>'
+        )
+        html.append(
+            f'<p class="status-item">⚡ 启动即优化: {histogram_text("io_priority.spawn_to_optimized_ms")} '
+            f'(检测 {histogram_text("io_priority.spawn_detect_ms")})</p>'
+        )
+
+        throttle_stats = metrics["cpu_throttle"]
+        if throttle_stats["targets"]:
+            html.append(
+                f'<p class="status-item">⏳ CPU限制线程: 周期 {throttle_stats["period_ms"]:g}ms，'
+                f'自身开销 {throttle_stats["overhead_percent"]:.2f}%，每周期 {histogram_text("throttle.cycle_cpu_ms")}</p>'
+            )
+        reapply_stats = metrics["reapply"]
+        if reapply_stats["tracked"]:
+            html.append(
+                f'<p class="status-item">🔁 重新应用: 还原 {counters.get("reapply.resets", 0)} 次，'
+                f'重新应用 {counters.get("reapply.attempts", 0)} 次，退避抑制 {counters.get("reapply.suppressed", 0)} 次，'
+                f'等待中 {reapply_stats["pending"]} / 已放弃 {reapply_stats["given_up"]}</p>'
+            )
+        if metrics["partition"]:
+            html.append(
+                f'<p class="status-item">🧱 CPU分区: 分区 {histogram_text("partition.apply_ms")}，'
+                f'恢复 {histogram_text("partition.restore_ms")}</p>'
+            )
+        html.append("</div>")
+        return "".join(html)
+
     def _get_theme_display_name(self):
         """获取主题的显示名称"""
         if self.current_theme == "light":
@@ -1180,32 +1371,80 @@ class MainWindow(QWidget):
         self.update_status()
         self.blockSignals(False)
 
-    def update_status(self):
-        """更新状态信息"""
-        if not self.monitor:
-            self.status_label.setText("<p>程序未启动</p>")
-            return
+    def _on_status_published(self, snapshot):
+        """状态快照发布回调（在状态发布线程中调用），转到界面线程渲染"""
+        self.status_snapshot_signal.emit()
+
+    def _get_settings_key(self):
+        """获取状态页中直接显示的界面设置，设置变化时也需要重新渲染"""
+        config_manager = self.monitor.config_manager
+        return (
+            config_manager.show_notifications,
+            config_manager.auto_start,
+            config_manager.close_to_tray,
+            config_manager.debug_mode,
+            self.current_theme,
+        )
 
-        # 获取状态HTML
-        status_html = self.get_status_html()
+    def update_status(self):
+        """用户操作后更新状态信息：请求后台立即重新采集，并按当前快照渲染设置变化"""
+        if self.monitor:
+            self.monitor.status_publisher.request_refresh()
+        self.render_status()
+
+    def render_status(self):
+        """渲染状态信息，只在状态快照版本或界面设置变化时重新生成HTML"""
+        start = time.perf_counter()
+        try:
+            if not self.monitor:
+                self.status_label.setText("<p>程序未启动</p>")
+                return
 
-        # 设置状态文本
-        self.status_label.setText(status_html)
+            # 自身开销超出预算时同步放大界面刷新定时器的间隔
+            timer_interval = int(self.monitor.overhead_governor.stretch(1000))
+            if self.update_timer.interval() != timer_interval:
+                self.update_timer.setInterval(timer_interval)
 
-        # 更新内存信息显示
-        self.update_memory_status()
+            snapshot = self.monitor.status_publisher.get_snapshot()
+            if snapshot is None:
+                self.status_label.setText(self.get_status_html(snapshot))
+                return
 
-        # 更新托盘图标提示
-        if self.tray_icon:
-            mem_info = self.memory_cleaner.get_memory_info() if self.memory_cleaner.running else None
-            mem_usage = f" - 内存: {mem_info['percent']:.1f}%" if mem_info else ""
-            self.tray_icon.setToolTip(f"ACE-KILLER - {'运行中' if self.monitor.running else '已停止'}{mem_usage}")
+            status_key = (snapshot.version, self._get_settings_key())
+            if status_key == self._rendered_status_key:
+                self._status_skipped.inc()
+                return
+            self._rendered_status_key = status_key
+            self._status_rendered.inc()
+
+            # 设置状态文本
+            self.status_label.setText(self.get_status_html(snapshot))
+
+            # 更新内存信息显示
+            memory_status = snapshot.get("memory")
+            self.update_memory_status(memory_status)
+
+            # 更新托盘图标提示
+            if self.tray_icon:
+                mem_info = memory_status["memory"] if memory_status and memory_status["running"] else None
+                mem_usage = f" - 内存: {mem_info['percent']:.1f}%" if mem_info else ""
+                monitor_running = snapshot["monitor"]["running"] if "monitor" in snapshot else self.monitor.running
+                self.tray_icon.setToolTip(f"ACE-KILLER - {'运行中' if monitor_running else '已停止'}{mem_usage}")
+        finally:
+            self._status_render_histogram.observe((time.perf_counter() - start) * 1000)
+
+    def update_memory_status(self, memory_status=None):
+        """
+        更新内存状态显示
 
-    def update_memory_status(self):
-        """更新内存状态显示"""
-        # 更新内存信息
-        mem_info = self.memory_cleaner.get_memory_info()
+        Args:
+            memory_status (dict, optional): 状态快照中的内存分区，默认使用最新快照
+        """
+        if memory_status is None and self.monitor:
+            snapshot = self.monitor.status_publisher.get_snapshot()
+            memory_status = snapshot.get("memory") if snapshot else None
 
+        mem_info = memory_status["memory"] if memory_status else None
         if not mem_info:
             self.memory_info_label.setText("无法获取内存信息")
             self.cache_info_label.setText("系统缓存: 无法获取信息")
@@ -1215,22 +1454,18 @@ class MainWindow(QWidget):
             return
 
         used_percent = mem_info["percent"]
-        used_gb = mem_info["used"] / (1024**3)
-        total_gb = mem_info["total"] / (1024**3)
-
-        # 获取系统缓存信息
-        cache_info = self.memory_cleaner.get_system_cache_info()
 
         # 更新标签文本
-        self.memory_info_label.setText(f"物理内存: {used_gb:.1f}GB / {total_gb:.1f}GB ({used_percent:.1f}%)")
+        self.memory_info_label.setText(
+            f"物理内存: {mem_info['used_gb']:.1f}GB / {mem_info['total_gb']:.1f}GB ({used_percent:.1f}%)"
+        )
 
         # 更新缓存信息标签
+        cache_info = memory_status["cache"]
         if cache_info:
-            cache_size_gb = cache_info["current_size"] / (1024**3)
-            cache_peak_gb = cache_info["peak_size"] / (1024**3)
-            cache_percent = (cache_size_gb / total_gb) * 100 if total_gb > 0 else 0
+            cache_percent = cache_info["percent"]
             self.cache_info_label.setText(
-                f"系统缓存: 当前 {cache_size_gb:.1f}GB ({cache_percent:.1f}%) | 峰值 {cache_peak_gb:.1f}GB"
+                f"系统缓存: 当前 {cache_info['current_gb']:.1f}GB ({cache_percent:.1f}%) | 峰值 {cache_info['peak_gb']:.1f}GB"
             )
 
             # 根据缓存占用设置标签类型
@@ -1252,9 +1487,9 @@ class MainWindow(QWidget):
 
         # 更新配置信息标签
         config_text = (
-            f"配置: 清理间隔 {self.memory_cleaner.clean_interval}秒 | "
-            f"触发阈值 {self.memory_cleaner.threshold}% | "
-            f"冷却时间 {self.memory_cleaner.cooldown_time}秒"
+            f"配置: 清理间隔 {memory_status['clean_interval']}秒 | "
+            f"触发阈值 {memory_status['threshold']}% | "
+            f"冷却时间 {memory_status['cooldown_time']}秒"
         )
         self.config_info_label.setText(config_text)
 
@@ -1270,7 +1505,7 @@ class MainWindow(QWidget):
             StyleHelper.set_progress_type(self.memory_progress, "memory-low")
 
         # 更新清理统计信息
-        stats = self.memory_cleaner.get_clean_stats()
+        stats = memory_status["stats"]
         stats_text = (
             f"累计释放: {stats['total_cleaned_mb']:.2f}MB | "
             f"上次释放: {stats['last_cleaned_mb']:.2f}MB | "
@@ -1719,6 +1954,10 @@ class MainWindow(QWidget):
         if hasattr(self, "update_timer") and self.update_timer:
             self.update_timer.stop()
 
+        # 停止状态发布线程
+        self.monitor.status_publisher.remove_listener(self._on_status_published)
+        self.monitor.status_publisher.stop()
+
         # 隐藏托盘图标（在主线程中处理）
         if hasattr(self, "tray_icon") and self.tray_icon:
             self.tray_icon.hide()
@@ -1834,7 +2073,7 @@ class MainWindow(QWidget):
             logger.debug("内存清理功能已禁用")
 
         # 立即更新UI状态
-        self.update_memory_status()
+        self.update_status()
 
     def toggle_brute_mode(self):
         """切换暴力模式开关"""
@@ -1897,7 +2136,7 @@ class MainWindow(QWidget):
         """手动清理工作集"""
         try:
             cleaned_mb = self.memory_cleaner.trim_process_working_set()
-            self.update_memory_status()
+            self.update_status()
             logger.debug(f"手动清理工作集完成，释放了 {cleaned_mb:.2f}MB 内存")
         except Exception as e:
             logger.error(f"手动清理工作集失败: {str(e)}")
@@ -1906,7 +2145,7 @@ class MainWindow(QWidget):
         """手动清理系统缓存"""
         try:
             cleaned_mb = self.memory_cleaner.flush_system_buffer()
-            self.update_memory_status()
+            self.update_status()
             logger.debug(f"手动清理系统缓存完成，释放了 {cleaned_mb:.2f}MB 内存")
         except Exception as e:
             logger.error(f"手动清理系统缓存失败: {str(e)}")
@@ -1957,10 +2196,8 @@ class MainWindow(QWidget):
             except Exception as e:
                 logger.error(f"全面内存清理失败: {str(e)}")
 
-        # 创建并启动线程
-        clean_thread = threading.Thread(target=clean_thread_func)
-        clean_thread.daemon = True
-        clean_thread.start()
+        # 在统一任务调度器的工作线程中执行
+        get_task_scheduler().submit_background(clean_thread_func)
 
         # 显示进度对话框
         self.progress_dialog.exec_()
@@ -1969,7 +2206,7 @@ class MainWindow(QWidget):
         self.progress_dialog = None
 
         # 更新状态
-        self.update_memory_status()
+        self.update_status()
 
     def delete_ace_services(self):
         """删除ACE相关服务"""
@@ -2000,8 +2237,8 @@ class MainWindow(QWidget):
         self.delete_progress_dialog.setValue(0)
         self.delete_progress_dialog.show()
 
-        # 使用线程执行删除操作
-        threading.Thread(target=self._delete_services_thread, args=(services, self.delete_progress_dialog)).start()
+        # 在统一任务调度器的工作线程中执行删除操作
+        get_task_scheduler().submit_background(self._delete_services_thread, services, self.delete_progress_dialog)
 
     def _delete_services_thread(self, services, progress):
         """线程函数：删除服务"""
@@ -2033,7 +2270,7 @@ class MainWindow(QWidget):
                 time.sleep(2)
 
                 # 校验服务是否已删除
-                exists, _, _ = self.monitor.check_service_status(service)
+                exists, _, _ = self.monitor.check_service_status(service, force_refresh=True)
                 if exists:
                     results.append(f"{service}: 删除失败")
                 else:
@@ -2091,27 +2328,55 @@ class MainWindow(QWidget):
 
     def optimize_anticheat_processes(self):
         """一键优化所有反作弊进程的I/O优先级并添加到自动优化列表"""
-        # 反作弊相关进程名称列表
-        anticheat_processes = [
-            "SGuard64.exe",  # SGuard64进程
-            "ACE-Tray.exe",  # ACE进程
-            "AntiCheatExpert.exe",  # ACE进程
-            "AntiCheatExpertBase.sys",  # ACE进程
-            "FeverGamesService.exe",  # FeverGamesService进程
+        # 导入性能模式枚举
+        from utils.process_io_priority import PERFORMANCE_MODE
+
+        # 显示进度对话框，目标进程数在读取快照后才能确定
+        self.optimize_progress_dialog = QProgressDialog("正在优化反作弊进程...", "取消", 0, 0, self)
+        self.optimize_progress_dialog.setWindowTitle("优化I/O优先级")
+        self.optimize_progress_dialog.setMinimumDuration(0)
+        self.optimize_progress_dialog.setValue(0)
+        cancel_event = threading.Event()
+        self.optimize_progress_dialog.canceled.connect(cancel_event.set)
+        self.optimize_progress_dialog.show()
+
+        # 所有反作弊进程设置为很低优先级和效能模式
+        configs = [
+            {"name": name, "priority": IO_PRIORITY_HINT.IoPriorityVeryLow, "performance_mode": PERFORMANCE_MODE.ECO_MODE}
+            for name in self.ANTICHEAT_PROCESSES
         ]
+        # 在后台线程中执行，进度和结果通过信号回到界面线程
+        get_task_scheduler().submit_background(self._optimize_anticheat_thread, configs, cancel_event)
 
-        # 获取I/O优先级管理器
-        io_manager = get_io_priority_manager()
+    def _optimize_anticheat_thread(self, configs, cancel_event):
+        """线程函数：并行优化反作弊进程，单个进程阻塞不影响其他进程"""
+        try:
+            results = get_io_priority_manager().set_process_io_priority_batch(
+                configs,
+                should_cancel=cancel_event.is_set,
+                on_progress=self.optimize_progress_signal.emit,
+            )
+        except Exception as e:
+            logger.error(f"一键优化反作弊进程时出错: {str(e)}")
+            results = {}
+        self.optimize_result_signal.emit(results)
 
-        # 导入性能模式枚举
+    @Slot(int, int)
+    def _update_optimize_progress(self, done, total):
+        """更新一键优化进度对话框的值"""
+        if getattr(self, "optimize_progress_dialog", None) is not None:
+            self.optimize_progress_dialog.setMaximum(total)
+            self.optimize_progress_dialog.setValue(done)
+
+    @Slot(object)
+    def _show_optimize_anticheat_result(self, results):
+        """统计一键优化结果、添加到自动优化列表并显示"""
         from utils.process_io_priority import PERFORMANCE_MODE
 
-        # 显示进度对话框
-        progress = QProgressDialog("正在优化反作弊进程...", "取消", 0, len(anticheat_processes), self)
-        progress.setWindowTitle("优化I/O优先级")
-        progress.setMinimumDuration(0)
-        progress.setValue(0)
-        progress.show()
+        # 清理进度对话框引用
+        if getattr(self, "optimize_progress_dialog", None) is not None:
+            self.optimize_progress_dialog.close()
+            self.optimize_progress_dialog = None
 
         # 初始化结果统计
         total_processes = 0
@@ -2120,19 +2385,10 @@ class MainWindow(QWidget):
         added_to_list = []  # 新添加到自动优化列表的进程
         updated_in_list = []  # 在自动优化列表中更新的进程
 
-        # 为每个进程设置优先级（使用效能模式）
-        for i, process_name in enumerate(anticheat_processes):
-            # 更新进度
-            progress.setValue(i)
-            if progress.wasCanceled():
-                break
-
-            # 设置为很低优先级和效能模式
-            success_count, count = io_manager.set_process_io_priority_by_name(
-                process_name, IO_PRIORITY_HINT.IoPriorityVeryLow, PERFORMANCE_MODE.ECO_MODE
-            )
-
-            if count > 0:
+        for process_name in self.ANTICHEAT_PROCESSES:
+            result = results.get(process_name)
+            if result is not None and result.attempted > 0:
+                success_count, count = result.success, result.attempted
                 total_processes += count
                 successful_processes += success_count
                 affected_process_names.append(f"{process_name} ({success_count}/{count})")
@@ -2143,9 +2399,6 @@ class MainWindow(QWidget):
                         process_name, PERFORMANCE_MODE.ECO_MODE, added_to_list, updated_in_list
                     )
 
-        # 完成进度
-        progress.setValue(len(anticheat_processes))
-
         # 保存配置（如果有进程被添加或更新）
         if added_to_list or updated_in_list:
             self.monitor.config_manager.save_config()
@@ -2168,7 +2421,7 @@ class MainWindow(QWidget):
                 result_message += f"🔄 在自动优化列表中更新: {', '.join(updated_in_list)}\n"
 
             if added_to_list or updated_in_list:
-                result_message += "\n💡 这些进程将在程序启动时和每隔30秒自动优化"
+                result_message += "\n💡 这些进程将在程序启动时和每次启动时立即自动优化，并定期检查"
 
             QMessageBox.information(self, "优化结果", result_message)
 
@@ -2258,8 +2511,8 @@ class MainWindow(QWidget):
         self.stop_progress_dialog.setValue(0)
         self.stop_progress_dialog.show()
 
-        # 使用线程执行停止操作
-        threading.Thread(target=self._stop_services_thread, args=(services, self.stop_progress_dialog)).start()
+        # 在统一任务调度器的工作线程中执行停止操作
+        get_task_scheduler().submit_background(self._stop_services_thread, services, self.stop_progress_dialog)
 
     def _stop_services_thread(self, services, progress):
         """线程函数：停止服务"""
@@ -2297,7 +2550,7 @@ class MainWindow(QWidget):
                 time.sleep(2)
 
                 # 校验服务是否已停止
-                exists, new_status, _ = self.monitor.check_service_status(service)
+                exists, new_status, _ = self.monitor.check_service_status(service, force_refresh=True)
                 if exists and new_status.lower() != "stopped":
                     results.append(f"{service}: 停止失败")
                 else:
@@ -2453,8 +2706,8 @@ def get_status_info(monitor):
     elif scan_proc and monitor.scanprocess_optimized:
         # 验证是否真的优化了
         try:
-            is_running, is_optimized = monitor.check_process_status(monitor.scanprocess_name)
-            if is_running and is_optimized:
+            running_count, optimized_count = monitor.check_process_status(monitor.scanprocess_name)
+            if running_count and optimized_count >= running_count:
                 status_lines.append("✅ SGuard64进程：已优化")
             else:
                 status_lines.append("⏳ SGuard64进程：优化中")
@@ -322,7 +322,7 @@ class ProcessIoPriorityManagerWidget(QWidget):
 
         # 说明信息
         self.auto_info_label = QLabel(
-            "自动优化列表中的进程会在程序启动时和每隔30秒自动优化。\n"
+            "自动优化列表中的进程会在程序启动时和进程启动时立即自动优化，并定期检查。\n"
             "优化包括：根据性能模式自动设置CPU优先级、CPU亲和性调整、I/O优先级设置。\n"
             "这有助于持续优化这些进程的系统资源占用，减少对前台应用的影响。"
         )
@@ -593,7 +593,7 @@ class ProcessIoPriorityManagerWidget(QWidget):
                 "🔥 最大性能模式 - 实时优先级，绑定所有核心，最高性能\n"
                 "🚀 高性能模式 - 高优先级，绑定所有核心，适合游戏等重要应用\n"
                 "🍉 正常模式 - 正常优先级，绑定所有核心，系统默认设置\n"
-                "🌱 效能模式 - 效能模式，绑定到最后一个核心，降低功耗\n\n"
+                "🌱 效能模式 - 效能模式，绑定到按CPU拓扑选择的能效/空闲核心，降低功耗\n\n"
                 "💡 建议：\n"
                 "• 游戏/重要应用：高性能或最大性能\n"
                 "• 后台进程/反作弊：效能模式\n"
@@ -681,7 +681,7 @@ class ProcessIoPriorityManagerWidget(QWidget):
             # 正常模式：正常优先级，绑定所有核心
             priority = IO_PRIORITY_HINT.IoPriorityNormal
         else:  # ECO_MODE
-            # 效能模式：低优先级，绑定到最后一个核心
+            # 效能模式：低优先级，绑定到按CPU拓扑选择的核心
             priority = IO_PRIORITY_HINT.IoPriorityLow
 
         # 应用性能模式设置
@@ -154,15 +154,17 @@ class ThemeManager(QObject):
         self._current_theme = "light"
         self._light_stylesheet = None
         self._dark_stylesheet = None
-        self._generate_stylesheets()
 
-    def _generate_stylesheets(self):
-        """预生成浅色和深色两套完整样式表"""
-        # 生成浅色主题样式表
-        self._light_stylesheet = self._build_complete_stylesheet(AntColors)
+    def _generate_stylesheet(self, theme):
+        """首次使用时生成指定主题的完整样式表并缓存"""
+        if theme == "dark":
+            if self._dark_stylesheet is None:
+                self._dark_stylesheet = self._build_complete_stylesheet(AntColorsDark)
+            return self._dark_stylesheet
 
-        # 生成深色主题样式表
-        self._dark_stylesheet = self._build_complete_stylesheet(AntColorsDark)
+        if self._light_stylesheet is None:
+            self._light_stylesheet = self._build_complete_stylesheet(AntColors)
+        return self._light_stylesheet
 
     def _build_complete_stylesheet(self, colors):
         """构建完整的样式表"""
@@ -940,10 +942,7 @@ class ThemeManager(QObject):
         if theme is None:
             theme = self._current_theme
 
-        if theme == "dark":
-            return self._dark_stylesheet or ""
-        else:
-            return self._light_stylesheet or ""
+        return self._generate_stylesheet(theme) or ""
 
     def is_dark_theme(self, theme: str | None = None) -> bool:
         """判断是否为深色主题"""
@@ -1,28 +1,60 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-"""工具类模块"""
+"""
+工具类模块
 
+导出项在首次访问时才导入对应子模块，避免后台模式加载通知组件（winrt）、
+版本检查（requests + PySide6）等用不到的依赖
+"""
+
+# 日志模块依赖很少且几乎所有模块都会使用，直接导入（同时避免子模块 utils.logger 覆盖 logger 对象）
 from utils.logger import setup_logger, logger
-from utils.notification import send_notification, notification_thread
-from utils.version_checker import (
-    check_for_update,
-    get_app_version,
-    format_version_info,
-    create_update_message,
-    get_version_checker,
-)
-from utils.system_utils import (
-    run_as_admin,
-    check_auto_start,
-    enable_auto_start,
-    disable_auto_start,
-    check_single_instance,
-)
-from utils.memory_cleaner import get_memory_cleaner
-from utils.process_io_priority import get_io_priority_manager, get_io_priority_service, IO_PRIORITY_HINT
-
-from utils.notification import find_icon_path, create_notification_thread
+
+# 导出名称 -> 所在子模块
+_LAZY_EXPORTS = {
+    "send_notification": "utils.notification",
+    "notification_thread": "utils.notification",
+    "find_icon_path": "utils.system_utils",
+    "create_notification_thread": "utils.notification",
+    "check_for_update": "utils.version_checker",
+    "get_app_version": "utils.version_checker",
+    "format_version_info": "utils.version_checker",
+    "create_update_message": "utils.version_checker",
+    "get_version_checker": "utils.version_checker",
+    "run_as_admin": "utils.system_utils",
+    "check_auto_start": "utils.system_utils",
+    "enable_auto_start": "utils.system_utils",
+    "disable_auto_start": "utils.system_utils",
+    "check_single_instance": "utils.system_utils",
+    "get_memory_cleaner": "utils.memory_cleaner",
+    "get_io_priority_manager": "utils.process_io_priority",
+    "get_io_priority_service": "utils.process_io_priority",
+    "IO_PRIORITY_HINT": "utils.process_io_priority",
+    "get_process_snapshot_engine": "utils.process_snapshot",
+    "create_process_event_source": "utils.process_events",
+    "get_adaptive_scheduler": "utils.adaptive_scheduler",
+    "get_service_status_provider": "utils.service_status",
+    "get_metrics_registry": "utils.metrics",
+    "get_cpu_throttler": "utils.cpu_throttler",
+    "get_cpu_topology": "utils.cpu_topology",
+    "get_overhead_governor": "utils.overhead_governor",
+    "get_task_scheduler": "utils.task_scheduler",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # 使用 __import__ 而非 importlib.import_module，以便启动导入耗时分析能统计到按需导入的模块
+    value = getattr(__import__(module_name, fromlist=[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
 
 
 __all__ = [
@@ -46,4 +78,13 @@ __all__ = [
     "get_io_priority_manager",
     "get_io_priority_service",
     "IO_PRIORITY_HINT",
+    "get_process_snapshot_engine",
+    "create_process_event_source",
+    "get_adaptive_scheduler",
+    "get_service_status_provider",
+    "get_metrics_registry",
+    "get_cpu_throttler",
+    "get_cpu_topology",
+    "get_overhead_governor",
+    "get_task_scheduler",
 ]
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+自适应轮询调度模块
+游戏或启动器运行时缩短各后台循环的轮询间隔，空闲时按指数退避降低唤醒频率
+"""
+
+import threading
+import time
+
+from utils.logger import logger
+
+
+class AdaptivePollingScheduler:
+    """根据游戏会话状态调整轮询间隔的调度器"""
+
+    STATE_ACTIVE = "active"  # 检测到游戏/启动器进程
+    STATE_IDLE = "idle"  # 未检测到游戏/启动器进程
+
+    def __init__(self, game_names=None, active_factor=0.5, backoff_factor=2.0, max_backoff=8.0):
+        """
+        初始化自适应轮询调度器
+
+        Args:
+            game_names (iterable, optional): 游戏/启动器进程名
+            active_factor (float): 游戏运行时的间隔倍数（小于1表示更频繁）
+            backoff_factor (float): 空闲时每次观测后间隔倍数的增长系数
+            max_backoff (float): 空闲时间隔倍数上限
+        """
+        self.active_factor = active_factor
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.game_names = set()
+        self.configure(game_names or [])
+
+        self._lock = threading.Lock()
+        self.state = self.STATE_IDLE
+        self.factor = 1.0  # 当前间隔倍数，从1开始逐步退避
+        self.stretch_factor = 1.0  # 自身开销超出预算时由调控器设置的额外倍数，不受间隔上限限制
+        self.active_games = ()
+        self._state_since = time.monotonic()
+
+        # 统计信息
+        self.transition_count = 0
+        self.observation_count = 0
+        self.time_in_state = {self.STATE_ACTIVE: 0.0, self.STATE_IDLE: 0.0}
+        self.wakeups = {}  # 任务名 -> 唤醒次数
+
+    def configure(self, game_names, max_backoff=None):
+        """
+        更新游戏/启动器进程名列表
+
+        Args:
+            game_names (iterable): 游戏/启动器进程名
+            max_backoff (float, optional): 空闲时间隔倍数上限
+        """
+        self.game_names = {name.lower() for name in game_names if name}
+        if max_backoff is not None:
+            self.max_backoff = max(1.0, float(max_backoff))
+
+    def observe(self, snapshot):
+        """
+        根据进程快照更新会话状态，可直接注册为快照引擎的监听者
+
+        Args:
+            snapshot (ProcessSnapshot): 进程快照
+        """
+        active_games = tuple(sorted(name for name in self.game_names if snapshot.contains(name)))
+
+        with self._lock:
+            self.observation_count += 1
+            new_state = self.STATE_ACTIVE if active_games else self.STATE_IDLE
+            if new_state != self.state:
+                self._transition(new_state, active_games)
+            elif new_state == self.STATE_IDLE:
+                # 持续空闲时指数退避
+                self.factor = min(self.factor * self.backoff_factor, self.max_backoff)
+            self.active_games = active_games
+
+    def _transition(self, new_state, active_games):
+        """切换会话状态（调用方需持有锁）"""
+        now = time.monotonic()
+        self.time_in_state[self.state] += now - self._state_since
+        self._state_since = now
+        self.transition_count += 1
+
+        if new_state == self.STATE_ACTIVE:
+            self.factor = self.active_factor
+            logger.info(f"检测到游戏进程 {', '.join(active_games)}，切换为高频轮询")
+        else:
+            self.factor = 1.0
+            logger.info("游戏进程已退出，轮询频率将逐步降低")
+        self.state = new_state
+
+    def interval(self, base_interval, job=None, min_interval=None, max_interval=None):
+        """
+        计算任务本次等待的间隔
+
+        Args:
+            base_interval (float): 任务的基准间隔（秒）
+            job (str, optional): 任务名，用于统计唤醒次数
+            min_interval (float, optional): 间隔下限
+            max_interval (float, optional): 间隔上限
+
+        Returns:
+            float: 本次等待的间隔（秒）
+        """
+        if job:
+            self.wakeups[job] = self.wakeups.get(job, 0) + 1
+
+        value = base_interval * self.factor
+        if min_interval is not None:
+            value = max(value, min_interval)
+        if max_interval is not None:
+            value = min(value, max_interval)
+        return value * self.stretch_factor
+
+    @property
+    def is_active(self):
+        """是否处于游戏会话中"""
+        return self.state == self.STATE_ACTIVE
+
+    def get_stats(self):
+        """
+        获取调度器统计信息
+
+        Returns:
+            dict: 当前状态、倍数、状态切换次数、各状态累计时长及各任务唤醒次数
+        """
+        with self._lock:
+            time_in_state = dict(self.time_in_state)
+            time_in_state[self.state] += time.monotonic() - self._state_since
+            return {
+                "state": self.state,
+                "factor": self.factor,
+                "stretch_factor": self.stretch_factor,
+                "active_games": list(self.active_games),
+                "transition_count": self.transition_count,
+                "observation_count": self.observation_count,
+                "time_in_state": time_in_state,
+                "wakeups": dict(self.wakeups),
+            }
+
+
+# 全局调度器实例
+_adaptive_scheduler = None
+_adaptive_scheduler_lock = threading.Lock()
+
+
+def get_adaptive_scheduler():
+    """获取AdaptivePollingScheduler单例"""
+    global _adaptive_scheduler
+    if _adaptive_scheduler is None:
+        with _adaptive_scheduler_lock:
+            if _adaptive_scheduler is None:
+                _adaptive_scheduler = AdaptivePollingScheduler()
+    return _adaptive_scheduler
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+已应用状态台账模块
+记录对每个进程（按 (pid, create_time) 区分）设置过的状态及时间，
+在核验周期内直接信任台账，避免反复对受保护进程打开句柄查询状态
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+from utils.logger import logger
+
+
+# 台账记录：state 为设置的目标状态，applied_at/verified_at 为 time.monotonic()
+AppliedRecord = namedtuple("AppliedRecord", ["state", "applied_at", "verified_at", "verified"])
+
+
+class AppliedStateLedger:
+    """已应用状态台账"""
+
+    def __init__(self, verify_interval=60.0):
+        """
+        初始化台账
+
+        Args:
+            verify_interval (float): 重新核验实际状态的间隔（秒）
+        """
+        self.verify_interval = verify_interval
+        self._records = {}  # (ProcessEntry, 动作) -> AppliedRecord
+        self._pending = set()  # 被重新观测到、需要尽快核验的 ProcessEntry
+        self._lock = threading.Lock()
+
+        # 统计信息
+        self.record_count = 0
+        self.verification_count = 0
+        self.drift_count = 0
+        self.avoided_syscalls = 0
+
+    def record(self, entry, action, state=None):
+        """
+        记录对进程应用的状态
+
+        Args:
+            entry (ProcessEntry): 进程条目
+            action (str): 动作名称
+            state (dict, optional): 设置的目标状态
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._records[(entry, action)] = AppliedRecord(state or {}, now, now, True)
+            self._pending.discard(entry)
+            self.record_count += 1
+
+    def get(self, entry, action):
+        """
+        获取台账记录
+
+        Returns:
+            AppliedRecord or None: 台账记录
+        """
+        return self._records.get((entry, action))
+
+    def needs_verification(self, entry, action):
+        """
+        判断是否需要查询进程实际状态
+
+        Args:
+            entry (ProcessEntry): 进程条目
+            action (str): 动作名称
+
+        Returns:
+            bool: 无记录、核验到期或进程被重新观测时返回True
+        """
+        record = self._records.get((entry, action))
+        if record is None or entry in self._pending:
+            return True
+        return time.monotonic() - record.verified_at >= self.verify_interval
+
+    def is_applied(self, entry, action, syscalls=1):
+        """
+        在台账中查询状态是否已应用，命中时计入节省的系统调用
+
+        Args:
+            entry (ProcessEntry): 进程条目
+            action (str): 动作名称
+            syscalls (int): 直接查询实际状态所需的系统调用次数
+
+        Returns:
+            bool or None: 台账中的核验结果，无记录时返回None
+        """
+        record = self._records.get((entry, action))
+        if record is None:
+            return None
+        self.avoided_syscalls += syscalls
+        return record.verified
+
+    def mark_verified(self, entry, action, verified):
+        """
+        记录一次实际状态核验的结果
+
+        Args:
+            entry (ProcessEntry): 进程条目
+            action (str): 动作名称
+            verified (bool): 实际状态是否仍与台账一致
+        """
+        now = time.monotonic()
+        with self._lock:
+            self.verification_count += 1
+            self._pending.discard(entry)
+            record = self._records.get((entry, action))
+            if record is None:
+                # 状态并非由本程序设置但已满足要求，同样记入台账
+                if verified:
+                    self._records[(entry, action)] = AppliedRecord({}, now, now, True)
+                return
+            if not verified and record.verified:
+                self.drift_count += 1
+                logger.debug(f"进程(PID: {entry.pid}) 的 {action} 状态已被修改，需要重新应用")
+            self._records[(entry, action)] = record._replace(verified_at=now, verified=verified)
+
+    def request_verification(self, entry):
+        """
+        进程被重新观测到（如收到进程事件）时，要求下次使用前核验其状态
+
+        Args:
+            entry (ProcessEntry): 进程条目
+        """
+        with self._lock:
+            if any(key[0] == entry for key in self._records):
+                self._pending.add(entry)
+
+    def prune(self, snapshot):
+        """
+        清理已退出进程的记录
+
+        Args:
+            snapshot (ProcessSnapshot): 最新进程快照
+        """
+        with self._lock:
+            for key in [key for key in self._records if key[0] not in snapshot]:
+                del self._records[key]
+            self._pending = {entry for entry in self._pending if entry in snapshot}
+
+    def get_stats(self):
+        """
+        获取台账统计信息
+
+        Returns:
+            dict: 记录数、应用次数、核验次数、漂移次数及节省的系统调用次数
+        """
+        return {
+            "entries": len(self._records),
+            "record_count": self.record_count,
+            "verification_count": self.verification_count,
+            "drift_count": self.drift_count,
+            "avoided_syscalls": self.avoided_syscalls,
+            "verify_interval": self.verify_interval,
+        }
@@ -0,0 +1,262 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+游戏CPU分区模块
+检测到游戏进程时为游戏保留一组核心，其他后台进程（包括反作弊辅助进程）限制在剩余核心上，游戏退出后恢复原有亲和性
+每次分区都基于同一个进程快照一次遍历完成，并统计每次重新分区的耗时
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+import psutil
+from utils.logger import logger
+from utils.metrics import get_metrics_registry
+
+
+# CPU分区：游戏使用的逻辑处理器与后台进程使用的逻辑处理器
+CpuPartition = namedtuple("CpuPartition", ["game_cpus", "background_cpus"])
+
+# 不调整亲和性的系统关键进程（小写）
+PROTECTED_PROCESSES = frozenset(
+    {
+        "system",
+        "system idle process",
+        "secure system",
+        "registry",
+        "memory compression",
+        "smss.exe",
+        "csrss.exe",
+        "wininit.exe",
+        "winlogon.exe",
+        "services.exe",
+        "lsass.exe",
+        "dwm.exe",
+        "audiodg.exe",
+    }
+)
+
+
+def plan_partition(topology, background_count):
+    """
+    按CPU拓扑规划分区：后台进程使用能效等级最低、编号最大的若干完整物理核心，其余留给游戏
+
+    Args:
+        topology (CpuTopology): CPU拓扑
+        background_count (int): 后台进程至少使用的逻辑处理器数量
+
+    Returns:
+        CpuPartition or None: 分区方案，核心太少无法分区时返回None
+    """
+    cores = {}
+    for cpu in topology.cpus:
+        cores.setdefault(topology.siblings(cpu.index), cpu.efficiency_class)
+    # 能效等级低的优先，同等级时编号大的优先（保持超线程兄弟在同一侧）
+    ordered = sorted(cores.items(), key=lambda item: (item[1], -max(item[0])))
+
+    background = []
+    for siblings, _ in ordered:
+        if len(background) >= background_count:
+            break
+        background.extend(siblings)
+
+    game = sorted(cpu.index for cpu in topology.cpus if cpu.index not in background)
+    if not game or not background:
+        return None
+    return CpuPartition(tuple(game), tuple(sorted(background)))
+
+
+class GamePartitioner:
+    """游戏CPU分区管理器，由规则线程在每个快照上调用"""
+
+    def __init__(self, topology, game_names, background_count=2, exclude=()):
+        """
+        初始化游戏CPU分区管理器
+
+        Args:
+            topology (CpuTopology): CPU拓扑
+            game_names (iterable): 游戏进程名称
+            background_count (int): 后台进程至少使用的逻辑处理器数量
+            exclude (iterable): 不调整亲和性的进程名称
+        """
+        self.topology = topology
+        self.game_names = {name.lower() for name in game_names}
+        self.background_count = max(1, int(background_count))
+        self.exclude = PROTECTED_PROCESSES | {name.lower() for name in exclude}
+        self.partition = None  # 当前生效的分区方案，未分区时为None
+        self._original = {}  # ProcessEntry -> (原亲和性, 设置的亲和性)
+        self._visited = set()  # 分区期间已处理过的 ProcessEntry
+        self.last_report = None
+        self._lock = threading.RLock()  # 规则线程分区与停止监控时恢复可能并发
+
+        metrics = get_metrics_registry()
+        self._apply_histogram = metrics.histogram("partition.apply_ms", "ms")
+        self._restore_histogram = metrics.histogram("partition.restore_ms", "ms")
+
+    @property
+    def active(self):
+        """是否处于分区状态"""
+        return self.partition is not None
+
+    def update(self, snapshot):
+        """
+        根据快照更新分区：游戏启动时分区，分区期间处理新进程，游戏退出后恢复
+
+        Args:
+            snapshot (ProcessSnapshot): 进程快照
+
+        Returns:
+            dict or None: 本次分区或恢复的统计，无变化时返回None
+        """
+        with self._lock:
+            return self._update(snapshot)
+
+    def _update(self, snapshot):
+        """在锁内根据快照更新分区"""
+        game_running = any(snapshot.contains(name) for name in self.game_names)
+
+        if game_running and self.partition is None:
+            self.partition = plan_partition(self.topology, self.background_count)
+            if self.partition is None:
+                logger.debug("CPU核心数量不足，跳过游戏CPU分区")
+                return None
+            report = self._apply(snapshot, "activate")
+            logger.info(
+                f"游戏CPU分区已生效: 游戏核心 {list(self.partition.game_cpus)}, 后台核心 {list(self.partition.background_cpus)}, "
+                f"调整 {report['changed']} 个进程, 跳过 {report['skipped']} 个, 失败 {report['failed']} 个, "
+                f"耗时 {report['duration_ms']:.1f}ms"
+            )
+            return report
+
+        if game_running:
+            # 已分区时只处理新出现的进程
+            self._forget_exited(snapshot)
+            if any(entry not in self._visited for _, items in snapshot.items() for entry in items):
+                report = self._apply(snapshot, "incremental")
+                if report["changed"]:
+                    logger.debug(f"游戏CPU分区: 新进程调整 {report['changed']} 个, 耗时 {report['duration_ms']:.1f}ms")
+                return report
+            return None
+
+        if self.partition is not None:
+            report = self._restore()
+            logger.info(
+                f"游戏已退出，恢复 {report['changed']} 个进程的CPU亲和性, 失败 {report['failed']} 个, "
+                f"耗时 {report['duration_ms']:.1f}ms"
+            )
+            return report
+        return None
+
+    def _forget_exited(self, snapshot):
+        """移除已退出进程的记录"""
+        self._visited = {entry for entry in self._visited if entry in snapshot}
+        for entry in [entry for entry in self._original if entry not in snapshot]:
+            del self._original[entry]
+
+    def _apply(self, snapshot, kind):
+        """一次遍历快照，为尚未处理的进程设置分区亲和性"""
+        start = time.perf_counter()
+        game_cpus = set(self.partition.game_cpus)
+        background_cpus = set(self.partition.background_cpus)
+        changed = unchanged = skipped = failed = 0
+
+        for name, items in snapshot.items():
+            for entry in items:
+                if entry in self._visited:
+                    continue
+                self._visited.add(entry)
+                if name in self.exclude or entry.pid in (0, 4):
+                    skipped += 1
+                    continue
+
+                target = game_cpus if name in self.game_names else background_cpus
+                try:
+                    proc = psutil.Process(entry.pid)
+                    if proc.create_time() != entry.create_time:
+                        continue
+                    original = proc.cpu_affinity()
+                    # 已限制在目标范围内的较窄亲和性（例如效能模式绑定的核心）保持不变
+                    affinity = sorted(set(original) & target) or sorted(target)
+                    if affinity == sorted(original):
+                        unchanged += 1
+                        continue
+                    proc.cpu_affinity(affinity)
+                    self._original[entry] = (original, affinity)
+                    changed += 1
+                except psutil.AccessDenied:
+                    skipped += 1
+                except (psutil.NoSuchProcess, OSError, ValueError):
+                    failed += 1
+
+        duration = time.perf_counter() - start
+        self._apply_histogram.observe(duration * 1000)
+        self.last_report = {
+            "kind": kind,
+            "changed": changed,
+            "unchanged": unchanged,
+            "skipped": skipped,
+            "failed": failed,
+            "duration_ms": duration * 1000,
+        }
+        return self.last_report
+
+    def restore(self):
+        """
+        恢复所有被调整过的进程的原亲和性（进程自行修改过亲和性时保持不变）
+
+        Returns:
+            dict: 恢复统计
+        """
+        with self._lock:
+            return self._restore()
+
+    def _restore(self):
+        """在锁内恢复原亲和性"""
+        start = time.perf_counter()
+        changed = unchanged = failed = 0
+        for entry, (original, applied) in self._original.items():
+            try:
+                proc = psutil.Process(entry.pid)
+                if proc.create_time() != entry.create_time:
+                    continue
+                if sorted(proc.cpu_affinity()) != applied:
+                    unchanged += 1
+                    continue
+                proc.cpu_affinity(original)
+                changed += 1
+            except psutil.NoSuchProcess:
+                continue
+            except (psutil.AccessDenied, OSError, ValueError):
+                failed += 1
+
+        self._original.clear()
+        self._visited.clear()
+        self.partition = None
+        duration = time.perf_counter() - start
+        self._restore_histogram.observe(duration * 1000)
+        self.last_report = {
+            "kind": "restore",
+            "changed": changed,
+            "unchanged": unchanged,
+            "skipped": 0,
+            "failed": failed,
+            "duration_ms": duration * 1000,
+        }
+        return self.last_report
+
+    def get_stats(self):
+        """
+        获取分区状态
+
+        Returns:
+            dict: 是否分区、游戏与后台核心、被调整的进程数及最近一次分区/恢复的统计
+        """
+        return {
+            "active": self.active,
+            "game_cpus": list(self.partition.game_cpus) if self.partition else [],
+            "background_cpus": list(self.partition.background_cpus) if self.partition else [],
+            "fenced": len(self._original),
+            "last_report": dict(self.last_report) if self.last_report else None,
+        }
@@ -0,0 +1,436 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+CPU占空比限制模块
+在每个周期内按占空比暂停/恢复目标进程，并根据实测CPU时间反馈调整占空比，将进程限制在目标CPU占用附近
+暂停/恢复机制可替换：Windows 使用 NtSuspendProcess/NtResumeProcess，Linux 使用 SIGSTOP/SIGCONT
+"""
+
+import atexit
+import os
+import signal
+import threading
+import time
+
+import psutil
+from utils.logger import logger
+from utils.metrics import get_metrics_registry
+
+
+class SignalSuspendBackend:
+    """基于 SIGSTOP/SIGCONT 的暂停/恢复后端（Linux）"""
+
+    name = "signal"
+
+    def open(self, pid):
+        """
+        准备控制指定进程
+
+        Args:
+            pid (int): 进程ID
+
+        Returns:
+            int: 后续调用使用的句柄（即PID）
+        """
+        return pid
+
+    def suspend(self, handle):
+        """暂停进程"""
+        os.kill(handle, signal.SIGSTOP)
+
+    def resume(self, handle):
+        """恢复进程"""
+        os.kill(handle, signal.SIGCONT)
+
+    def close(self, handle):
+        """释放句柄"""
+
+
+class NtSuspendBackend:
+    """基于 NtSuspendProcess/NtResumeProcess 的暂停/恢复后端（Windows）"""
+
+    name = "ntsuspend"
+
+    PROCESS_SUSPEND_RESUME = 0x0800
+
+    def __init__(self):
+        import ctypes
+
+        self._kernel32 = ctypes.windll.kernel32
+        self._ntdll = ctypes.windll.ntdll
+
+    def open(self, pid):
+        """
+        以最小权限打开进程句柄
+
+        Args:
+            pid (int): 进程ID
+
+        Returns:
+            int: 进程句柄
+        """
+        handle = self._kernel32.OpenProcess(self.PROCESS_SUSPEND_RESUME, False, pid)
+        if not handle:
+            raise psutil.AccessDenied(pid, msg=f"OpenProcess 失败，错误码: {self._kernel32.GetLastError()}")
+        return handle
+
+    def suspend(self, handle):
+        """暂停进程"""
+        status = self._ntdll.NtSuspendProcess(handle)
+        if status != 0:
+            raise OSError(f"NtSuspendProcess 失败，NTSTATUS: {status & 0xFFFFFFFF:#010x}")
+
+    def resume(self, handle):
+        """恢复进程"""
+        status = self._ntdll.NtResumeProcess(handle)
+        if status != 0:
+            raise OSError(f"NtResumeProcess 失败，NTSTATUS: {status & 0xFFFFFFFF:#010x}")
+
+    def close(self, handle):
+        """关闭进程句柄"""
+        self._kernel32.CloseHandle(handle)
+
+
+def create_suspend_backend():
+    """
+    根据当前平台创建暂停/恢复后端
+
+    Returns:
+        NtSuspendBackend or SignalSuspendBackend: 暂停/恢复后端
+    """
+    if os.name == "nt":
+        return NtSuspendBackend()
+    return SignalSuspendBackend()
+
+
+class ThrottleTarget:
+    """单个被限制的进程及其反馈控制状态"""
+
+    __slots__ = (
+        "key",
+        "name",
+        "limit",
+        "proc",
+        "handle",
+        "duty",
+        "usage",
+        "suspended",
+        "last_cpu",
+        "last_sample",
+        "started_at",
+        "start_cpu",
+        "cycles",
+    )
+
+    def __init__(self, key, name, limit, proc, handle, now, cpu_time):
+        self.key = key
+        self.name = name
+        self.limit = limit  # 目标CPU占用（单个逻辑核心的百分比）
+        self.proc = proc
+        self.handle = handle
+        self.duty = 1.0  # 每个周期中允许运行的时间比例
+        self.usage = None  # 平滑后的实测CPU占用（百分比）
+        self.suspended = False
+        self.last_cpu = cpu_time
+        self.last_sample = now
+        self.started_at = now
+        self.start_cpu = cpu_time
+        self.cycles = 0
+
+    def achieved_percent(self, now, cpu_time):
+        """从开始限制到现在的平均CPU占用（百分比）"""
+        elapsed = now - self.started_at
+        return (cpu_time - self.start_cpu) / elapsed * 100 if elapsed > 0 else 0.0
+
+
+def _process_cpu_time(proc):
+    """进程累计CPU时间（用户态 + 内核态，秒）"""
+    cpu_times = proc.cpu_times()
+    return cpu_times.user + cpu_times.system
+
+
+class DutyCycleThrottler:
+    """占空比CPU限制器，单个后台线程按周期控制所有目标进程"""
+
+    MIN_DUTY = 0.01  # 最小占空比，保证进程仍能推进（避免看门狗类逻辑判定为挂起）
+    SMOOTHING = 0.3  # 实测CPU占用的指数平滑系数
+
+    def __init__(self, backend=None, period=0.1, clock=time.monotonic):
+        """
+        初始化CPU限制器
+
+        Args:
+            backend: 暂停/恢复后端，默认按平台创建
+            period (float): 占空比周期（秒），周期越短越平滑，但暂停/恢复调用越频繁
+            clock (callable): 单调时钟
+        """
+        self.backend = backend or create_suspend_backend()
+        self.period = period
+        self.clock = clock
+        self._targets = {}  # (pid, create_time) -> ThrottleTarget
+        self._lock = threading.RLock()  # 暂停/恢复也在锁内执行，避免释放目标后又被暂停
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._atexit_registered = False
+        self._loop_started = None  # 限制线程启动时间，用于统计自身开销
+        self._loop_cpu = 0.0  # 限制线程自身消耗的CPU时间（秒）
+        self.cycle_count = 0  # 本次启动以来执行的周期数
+
+        metrics = get_metrics_registry()
+        self._cycles = metrics.counter("throttle.cycles")
+        self._failures = metrics.counter("throttle.failed")
+        self._cycle_cpu = metrics.histogram("throttle.cycle_cpu_ms", "ms")
+
+    @property
+    def running(self):
+        """限制线程是否在运行"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def add(self, proc, limit, key=None, name=None):
+        """
+        开始限制进程的CPU占用
+
+        Args:
+            proc (psutil.Process): 目标进程
+            limit (float): 目标CPU占用，单个逻辑核心的百分比（0-100）
+            key (hashable, optional): 进程标识，默认为 (pid, create_time)
+            name (str, optional): 进程名称，用于日志和状态显示
+
+        Returns:
+            bool: 是否成功加入限制
+        """
+        try:
+            key = key or (proc.pid, proc.create_time())
+            name = name or proc.name()
+            with self._lock:
+                target = self._targets.get(key)
+                if target is not None:
+                    target.limit = limit
+                    return True
+                handle = self.backend.open(proc.pid)
+                now = self.clock()
+                self._targets[key] = ThrottleTarget(key, name, limit, proc, handle, now, _process_cpu_time(proc))
+        except (psutil.NoSuchProcess, psutil.AccessDenied, OSError) as e:
+            self._failures.inc()
+            logger.warning(f"无法限制进程CPU占用: {name or proc.pid} - {str(e)}")
+            return False
+
+        logger.debug(f"开始限制进程CPU占用: {name} (PID: {proc.pid}) 目标 {limit:g}%")
+        self.start()
+        return True
+
+    def remove(self, key):
+        """
+        停止限制进程，进程处于暂停状态时立即恢复
+
+        Args:
+            key (hashable): 进程标识
+        """
+        with self._lock:
+            target = self._targets.pop(key, None)
+            if target is not None:
+                self._release(target)
+
+    def clear(self):
+        """停止限制所有进程"""
+        with self._lock:
+            targets = list(self._targets.values())
+            self._targets.clear()
+            for target in targets:
+                self._release(target)
+
+    def _release(self, target):
+        """恢复并释放目标进程"""
+        try:
+            if target.suspended:
+                self.backend.resume(target.handle)
+                target.suspended = False
+        except (psutil.NoSuchProcess, ProcessLookupError):
+            pass
+        except OSError as e:
+            logger.error(f"恢复进程失败: {target.name} (PID: {target.proc.pid}) - {str(e)}")
+        finally:
+            self.backend.close(target.handle)
+            target.handle = None
+        logger.debug(f"已停止限制进程CPU占用: {target.name} (PID: {target.proc.pid})")
+
+    def _set_suspended(self, target, suspended):
+        """暂停或恢复目标进程，失败时停止限制该进程"""
+        with self._lock:
+            if target.handle is None or target.suspended == suspended:
+                return
+            try:
+                if suspended:
+                    self.backend.suspend(target.handle)
+                else:
+                    self.backend.resume(target.handle)
+                target.suspended = suspended
+            except (psutil.NoSuchProcess, ProcessLookupError, OSError) as e:
+                self._failures.inc()
+                logger.debug(f"{'暂停' if suspended else '恢复'}进程失败: {target.name} - {str(e)}")
+                self.remove(target.key)
+
+    def _update_duty(self, target, now):
+        """
+        根据上个周期的实测CPU占用调整占空比
+
+        Returns:
+            bool: 目标进程是否仍然存在
+        """
+        try:
+            if not target.proc.is_running():
+                return False
+            cpu_time = _process_cpu_time(target.proc)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return False
+
+        elapsed = now - target.last_sample
+        if elapsed <= 0:
+            return True
+        sample = (cpu_time - target.last_cpu) / elapsed * 100
+        target.last_cpu = cpu_time
+        target.last_sample = now
+        target.usage = sample if target.usage is None else target.usage + self.SMOOTHING * (sample - target.usage)
+        target.cycles += 1
+
+        # 按实测占用与目标的比例缩放占空比（占用为0时说明进程空闲或运行时间不足，逐步放宽）
+        if target.usage > 0:
+            duty = target.duty * target.limit / target.usage
+        else:
+            duty = target.duty * 2
+        target.duty = min(1.0, max(self.MIN_DUTY, duty))
+        return True
+
+    def run_cycle(self):
+        """执行一个占空比周期：恢复所有目标，按各自占空比依次暂停，周期结束时根据实测占用调整占空比"""
+        thread_start = time.thread_time()
+        cycle_start = self.clock()
+        with self._lock:
+            targets = sorted(self._targets.values(), key=lambda item: item.duty)
+
+        for target in targets:
+            self._set_suspended(target, False)
+
+        for target in targets:
+            if target.duty >= 1.0:
+                continue
+            wait = cycle_start + target.duty * self.period - self.clock()
+            if wait > 0 and self._stop_event.wait(wait):
+                return
+            self._set_suspended(target, True)
+
+        wait = cycle_start + self.period - self.clock()
+        if wait > 0 and self._stop_event.wait(wait):
+            return
+
+        now = self.clock()
+        for target in targets:
+            if target.handle is None:
+                continue
+            if not self._update_duty(target, now):
+                logger.debug(f"被限制的进程已退出: {target.name} (PID: {target.proc.pid})")
+                self.remove(target.key)
+
+        cycle_cpu = time.thread_time() - thread_start
+        self._loop_cpu += cycle_cpu
+        self._cycle_cpu.observe(cycle_cpu * 1000)
+        self._cycles.inc()
+        self.cycle_count += 1
+
+    def _throttle_loop(self):
+        """限制线程，没有目标进程时退出"""
+        try:
+            while not self._stop_event.is_set():
+                with self._lock:
+                    if not self._targets:
+                        # 在锁内清除线程引用，之后加入的目标会启动新的限制线程
+                        self._thread = None
+                        break
+                self.run_cycle()
+        finally:
+            # 退出前恢复所有仍处于暂停状态的进程
+            with self._lock:
+                targets = list(self._targets.values())
+            for target in targets:
+                self._set_suspended(target, False)
+
+    def start(self):
+        """启动限制线程"""
+        with self._lock:
+            if self.running:
+                return
+            if not self._atexit_registered:
+                # 程序退出时确保不会遗留被暂停的进程
+                atexit.register(self.stop)
+                self._atexit_registered = True
+            self._stop_event.clear()
+            self._loop_started = self.clock()
+            self._loop_cpu = 0.0
+            self.cycle_count = 0
+            self._thread = threading.Thread(target=self._throttle_loop, daemon=True)
+            self._thread.start()
+        logger.debug("CPU限制线程已启动")
+
+    def stop(self):
+        """停止限制线程并恢复、释放所有目标进程"""
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._stop_event.set()
+            thread.join(1.0)
+            logger.debug("CPU限制线程已停止")
+        self.clear()
+
+    def get_stats(self):
+        """
+        获取限制器统计信息
+
+        Returns:
+            dict: 后端名称、周期、限制线程自身CPU开销，以及每个目标进程的目标/实际CPU占用
+        """
+        now = self.clock()
+        targets = []
+        with self._lock:
+            items = list(self._targets.values())
+        for target in items:
+            try:
+                achieved = target.achieved_percent(now, _process_cpu_time(target.proc))
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            targets.append(
+                {
+                    "pid": target.proc.pid,
+                    "name": target.name,
+                    "limit_percent": target.limit,
+                    "achieved_percent": achieved,
+                    "recent_percent": target.usage or 0.0,
+                    "duty": target.duty,
+                    "cycles": target.cycles,
+                }
+            )
+
+        loop_elapsed = now - self._loop_started if self._loop_started is not None and self.running else 0.0
+        return {
+            "backend": self.backend.name,
+            "period_ms": self.period * 1000,
+            "running": self.running,
+            "cycles": self.cycle_count,
+            "failures": self._failures.value,
+            "overhead_percent": self._loop_cpu / loop_elapsed * 100 if loop_elapsed > 0 else 0.0,
+            "targets": targets,
+        }
+
+
+# 全局CPU限制器实例
+_cpu_throttler = None
+_cpu_throttler_lock = threading.Lock()
+
+
+def get_cpu_throttler():
+    """获取DutyCycleThrottler单例"""
+    global _cpu_throttler
+    if _cpu_throttler is None:
+        with _cpu_throttler_lock:
+            if _cpu_throttler is None:
+                _cpu_throttler = DutyCycleThrottler()
+    return _cpu_throttler
@@ -0,0 +1,500 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+CPU拓扑模块
+识别物理核心、超线程兄弟、能效等级、NUMA节点和三级缓存分组，并按意图（能效核心、负载最低、避开游戏核心）选择CPU核心
+Windows 使用 GetLogicalProcessorInformationEx，Linux 读取 /sys/devices/system/cpu，结果按开机时间缓存到文件
+"""
+
+import json
+import os
+import struct
+import threading
+import time
+from collections import namedtuple
+
+import psutil
+from utils.logger import logger
+
+
+# 单个逻辑处理器：物理核心编号、封装编号、能效等级（0为最节能，数值越大性能越高）、NUMA节点、三级缓存分组
+LogicalCpu = namedtuple("LogicalCpu", ["index", "core", "package", "efficiency_class", "numa_node", "cache_group"])
+
+
+class CoreIntent:
+    """核心选择意图枚举"""
+
+    EFFICIENCY = "efficiency"  # 能效核心（非混合架构时为所有核心），其中负载最低者优先
+    LEAST_LOADED = "least_loaded"  # 当前负载最低的核心
+    AVOID_GAME = "avoid_game"  # 不与游戏共享物理核心的核心，优先能效核心和负载最低者
+    LAST_CORE = "last_core"  # 最后一个逻辑核心（旧版行为）
+
+    ALL = (EFFICIENCY, LEAST_LOADED, AVOID_GAME, LAST_CORE)
+
+
+# 效能模式进程默认的核心选择意图
+DEFAULT_ECO_INTENT = CoreIntent.AVOID_GAME
+
+# 各逻辑处理器负载的最短采样间隔（秒），间隔内的调用共用上次采样结果
+LOAD_SAMPLE_INTERVAL = 1.0
+
+# 拓扑缓存文件名（位于配置目录）
+TOPOLOGY_CACHE_FILE = "cpu_topology.json"
+
+
+class CpuTopology:
+    """CPU拓扑信息"""
+
+    def __init__(self, cpus, source="unknown"):
+        """
+        初始化CPU拓扑
+
+        Args:
+            cpus (list): LogicalCpu 列表
+            source (str): 拓扑来源（windows/sysfs/fallback/cache）
+        """
+        self.cpus = tuple(sorted(cpus, key=lambda cpu: cpu.index))
+        self.source = source
+        self._by_index = {cpu.index: cpu for cpu in self.cpus}
+        self._cores = {}  # (封装编号, 核心编号) -> 逻辑处理器编号元组
+        for cpu in self.cpus:
+            self._cores.setdefault((cpu.package, cpu.core), []).append(cpu.index)
+        self._cores = {key: tuple(indexes) for key, indexes in self._cores.items()}
+        self._load = None  # 最近一次采样的各逻辑处理器负载
+        self._load_at = None  # 最近一次采样的时间（time.monotonic()）
+        self._load_lock = threading.Lock()
+
+    @property
+    def logical_count(self):
+        """逻辑处理器数量"""
+        return len(self.cpus)
+
+    @property
+    def physical_count(self):
+        """物理核心数量"""
+        return len(self._cores)
+
+    @property
+    def is_hybrid(self):
+        """是否为混合架构（存在多个能效等级）"""
+        return len({cpu.efficiency_class for cpu in self.cpus}) > 1
+
+    @property
+    def has_smt(self):
+        """是否启用了超线程"""
+        return self.physical_count < self.logical_count
+
+    def siblings(self, index):
+        """
+        获取与指定逻辑处理器共享物理核心的所有逻辑处理器（包括自身）
+
+        Args:
+            index (int): 逻辑处理器编号
+
+        Returns:
+            tuple: 逻辑处理器编号元组
+        """
+        cpu = self._by_index.get(index)
+        if cpu is None:
+            return ()
+        return self._cores[(cpu.package, cpu.core)]
+
+    def efficiency_cores(self):
+        """
+        获取能效等级最低的逻辑处理器，非混合架构时返回所有逻辑处理器
+
+        Returns:
+            list: 逻辑处理器编号列表
+        """
+        if not self.cpus:
+            return []
+        lowest = min(cpu.efficiency_class for cpu in self.cpus)
+        return [cpu.index for cpu in self.cpus if cpu.efficiency_class == lowest]
+
+    def groups(self, field):
+        """
+        按 numa_node 或 cache_group 分组
+
+        Args:
+            field (str): "numa_node" 或 "cache_group"
+
+        Returns:
+            dict: 分组编号 -> 逻辑处理器编号列表
+        """
+        result = {}
+        for cpu in self.cpus:
+            result.setdefault(getattr(cpu, field), []).append(cpu.index)
+        return result
+
+    def prime_load(self):
+        """建立负载采样基准，首次调用 psutil.cpu_percent 的结果没有采样窗口，不作为负载使用"""
+        with self._load_lock:
+            psutil.cpu_percent(interval=None, percpu=True)
+            self._load = None
+            self._load_at = time.monotonic()
+
+    def current_load(self, max_age=LOAD_SAMPLE_INTERVAL):
+        """
+        获取各逻辑处理器的负载百分比
+
+        psutil.cpu_percent(interval=None) 返回的是与上一次调用之间的负载，采样窗口在整个进程内共享，
+        进程监控、I/O优先级服务和并行优化线程各自调用会互相重置窗口；因此只在这里采样，
+        超过 max_age 才重新采样，其余调用读取缓存结果
+
+        Args:
+            max_age (float): 允许复用的采样结果最大年龄（秒）
+
+        Returns:
+            list: 各逻辑处理器的负载百分比
+        """
+        with self._load_lock:
+            now = time.monotonic()
+            if self._load is None or now - self._load_at >= max_age:
+                self._load = psutil.cpu_percent(interval=None, percpu=True)
+                self._load_at = now
+            return self._load
+
+    def _core_loads(self, load):
+        """按物理核心汇总负载，同一物理核心上的逻辑处理器负载相同"""
+        if load is None:
+            load = self.current_load()
+        core_loads = {}
+        for key, indexes in self._cores.items():
+            total = sum(load[index] for index in indexes if index < len(load))
+            for index in indexes:
+                core_loads[index] = total
+        return core_loads
+
+    def select(self, intent=DEFAULT_ECO_INTENT, count=1, game_cpus=None, load=None):
+        """
+        按意图选择逻辑处理器
+
+        Args:
+            intent (str): 选择意图，见 CoreIntent
+            count (int): 需要的逻辑处理器数量
+            game_cpus (iterable, optional): 游戏正在使用的逻辑处理器，AVOID_GAME 时会连同其超线程兄弟一起避开
+            load (list, optional): 各逻辑处理器的负载百分比，默认读取 current_load() 的采样结果
+
+        Returns:
+            list: 按编号排序的逻辑处理器编号列表
+        """
+        if not self.cpus:
+            return []
+        count = max(1, min(count, self.logical_count))
+
+        if intent == CoreIntent.LAST_CORE:
+            return [cpu.index for cpu in self.cpus[-count:]]
+
+        core_loads = self._core_loads(load)
+        efficiency = {cpu.index: cpu.efficiency_class for cpu in self.cpus}
+
+        if intent == CoreIntent.LEAST_LOADED:
+            candidates = [cpu.index for cpu in self.cpus]
+            ranking = lambda index: (core_loads[index], -index)  # noqa: E731
+        elif intent == CoreIntent.AVOID_GAME:
+            fenced = set()
+            for index in game_cpus or ():
+                fenced.update(self.siblings(index) or (index,))
+            candidates = [cpu.index for cpu in self.cpus if cpu.index not in fenced]
+            if not candidates:
+                # 游戏可以使用所有核心时退回到能效核心
+                candidates = self.efficiency_cores()
+            ranking = lambda index: (efficiency[index], core_loads[index], -index)  # noqa: E731
+        else:  # CoreIntent.EFFICIENCY
+            candidates = self.efficiency_cores()
+            ranking = lambda index: (core_loads[index], -index)  # noqa: E731
+
+        return sorted(sorted(candidates, key=ranking)[:count])
+
+    def to_dict(self):
+        """转换为可JSON序列化的字典"""
+        return {"source": self.source, "cpus": [list(cpu) for cpu in self.cpus]}
+
+    @classmethod
+    def from_dict(cls, data):
+        """从 to_dict() 的结果恢复"""
+        return cls([LogicalCpu(*cpu) for cpu in data["cpus"]], source=data.get("source", "cache"))
+
+    def describe(self):
+        """拓扑摘要，用于日志"""
+        return (
+            f"逻辑处理器 {self.logical_count} 个, 物理核心 {self.physical_count} 个, "
+            f"超线程={'是' if self.has_smt else '否'}, 混合架构={'是' if self.is_hybrid else '否'}, "
+            f"能效核心 {len(self.efficiency_cores())} 个, NUMA节点 {len(self.groups('numa_node'))} 个, "
+            f"三级缓存分组 {len(self.groups('cache_group'))} 个 (来源: {self.source})"
+        )
+
+
+# =============================================================================
+# Windows: GetLogicalProcessorInformationEx
+# =============================================================================
+
+RelationProcessorCore = 0
+RelationNumaNode = 1
+RelationCache = 2
+RelationAll = 0xFFFF
+
+# GROUP_AFFINITY: KAFFINITY Mask; WORD Group; WORD Reserved[3]
+_POINTER_SIZE = struct.calcsize("P")
+_GROUP_AFFINITY_SIZE = _POINTER_SIZE + 8
+
+
+def _read_group_masks(buffer, offset, group_count, group_offsets):
+    """读取 GROUP_AFFINITY 数组，转换为连续的逻辑处理器编号"""
+    indexes = []
+    for i in range(group_count):
+        base = offset + i * _GROUP_AFFINITY_SIZE
+        mask = int.from_bytes(buffer[base : base + _POINTER_SIZE], "little")
+        group = struct.unpack_from("<H", buffer, base + _POINTER_SIZE)[0]
+        group_offset = group_offsets[group] if group < len(group_offsets) else group * _POINTER_SIZE * 8
+        bit = 0
+        while mask:
+            if mask & 1:
+                indexes.append(group_offset + bit)
+            mask >>= 1
+            bit += 1
+    return indexes
+
+
+def parse_logical_processor_information(buffer, group_offsets=(0,)):
+    """
+    解析 GetLogicalProcessorInformationEx(RelationAll) 返回的缓冲区
+
+    Args:
+        buffer (bytes): SYSTEM_LOGICAL_PROCESSOR_INFORMATION_EX 变长记录序列
+        group_offsets (sequence): 每个处理器组第一个逻辑处理器的连续编号
+
+    Returns:
+        list: LogicalCpu 列表
+    """
+    cores = {}  # 逻辑处理器编号 -> (核心编号, 能效等级)
+    numa = {}
+    caches = {}
+    offset = 0
+    core_number = 0
+    while offset + 8 <= len(buffer):
+        relationship, size = struct.unpack_from("<II", buffer, offset)
+        if size == 0:
+            break
+        body = offset + 8
+        if relationship == RelationProcessorCore:
+            # PROCESSOR_RELATIONSHIP: BYTE Flags; BYTE EfficiencyClass; BYTE Reserved[20]; WORD GroupCount; GROUP_AFFINITY GroupMask[]
+            efficiency_class = buffer[body + 1]
+            group_count = struct.unpack_from("<H", buffer, body + 22)[0]
+            for index in _read_group_masks(buffer, body + 24, group_count, group_offsets):
+                cores[index] = (core_number, efficiency_class)
+            core_number += 1
+        elif relationship == RelationNumaNode:
+            # NUMA_NODE_RELATIONSHIP: DWORD NodeNumber; BYTE Reserved[18]; WORD GroupCount; GROUP_AFFINITY GroupMask[]
+            node_number = struct.unpack_from("<I", buffer, body)[0]
+            group_count = struct.unpack_from("<H", buffer, body + 22)[0] or 1
+            for index in _read_group_masks(buffer, body + 24, group_count, group_offsets):
+                numa[index] = node_number
+        elif relationship == RelationCache:
+            # CACHE_RELATIONSHIP: BYTE Level; BYTE Associativity; WORD LineSize; DWORD CacheSize; DWORD Type;
+            #                     BYTE Reserved[18]; WORD GroupCount; GROUP_AFFINITY GroupMask[]
+            if buffer[body] == 3:
+                group_count = struct.unpack_from("<H", buffer, body + 30)[0] or 1
+                indexes = _read_group_masks(buffer, body + 32, group_count, group_offsets)
+                for index in indexes:
+                    caches[index] = min(indexes)
+        offset += size
+
+    return [
+        LogicalCpu(index, core, 0, efficiency_class, numa.get(index, 0), caches.get(index, 0))
+        for index, (core, efficiency_class) in sorted(cores.items())
+    ]
+
+
+def _discover_windows():
+    """通过 GetLogicalProcessorInformationEx 获取拓扑"""
+    import ctypes
+    from ctypes import wintypes
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.GetLogicalProcessorInformationEx.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.POINTER(wintypes.DWORD)]
+    kernel32.GetLogicalProcessorInformationEx.restype = wintypes.BOOL
+
+    length = wintypes.DWORD(0)
+    kernel32.GetLogicalProcessorInformationEx(RelationAll, None, ctypes.byref(length))
+    buffer = ctypes.create_string_buffer(length.value)
+    if not kernel32.GetLogicalProcessorInformationEx(RelationAll, buffer, ctypes.byref(length)):
+        raise OSError(f"GetLogicalProcessorInformationEx 失败，错误码: {ctypes.get_last_error()}")
+
+    # 多处理器组时按组顺序编号
+    group_offsets = []
+    total = 0
+    for group in range(kernel32.GetActiveProcessorGroupCount()):
+        group_offsets.append(total)
+        total += kernel32.GetActiveProcessorCount(group)
+
+    return parse_logical_processor_information(buffer.raw[: length.value], group_offsets or (0,))
+
+
+# =============================================================================
+# Linux: /sys/devices/system/cpu
+# =============================================================================
+
+SYSFS_CPU_ROOT = "/sys/devices/system/cpu"
+
+
+def _read_text(path):
+    try:
+        with open(path, encoding="ascii") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def parse_cpu_list(text):
+    """
+    解析 "0-3,8,10-11" 形式的CPU列表
+
+    Returns:
+        list: 逻辑处理器编号列表
+    """
+    indexes = []
+    for part in (text or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            indexes.extend(range(int(start), int(end) + 1))
+        else:
+            indexes.append(int(part))
+    return indexes
+
+
+def _discover_sysfs(root=SYSFS_CPU_ROOT):
+    """读取 sysfs 获取拓扑"""
+    online = parse_cpu_list(_read_text(os.path.join(root, "online")))
+    if not online:
+        raise OSError(f"无法读取 {root}/online")
+
+    # 混合架构：Intel 的 cpu_atom/cpu_core PMU 设备，或 ARM 的 cpu_capacity
+    devices_root = os.path.dirname(os.path.dirname(root))
+    atom_cpus = set(parse_cpu_list(_read_text(os.path.join(devices_root, "cpu_atom", "cpus"))))
+    capacities = {}
+    for index in online:
+        capacity = _read_text(os.path.join(root, f"cpu{index}", "cpu_capacity"))
+        if capacity is not None:
+            capacities[index] = int(capacity)
+    capacity_rank = {value: rank for rank, value in enumerate(sorted(set(capacities.values())))}
+
+    cpus = []
+    for index in online:
+        cpu_dir = os.path.join(root, f"cpu{index}")
+        core = int(_read_text(os.path.join(cpu_dir, "topology", "core_id")) or index)
+        package = int(_read_text(os.path.join(cpu_dir, "topology", "physical_package_id")) or 0)
+
+        if atom_cpus:
+            efficiency_class = 0 if index in atom_cpus else 1
+        else:
+            efficiency_class = capacity_rank.get(capacities.get(index), 0)
+
+        numa_node = 0
+        try:
+            for name in os.listdir(cpu_dir):
+                if name.startswith("node") and name[4:].isdigit():
+                    numa_node = int(name[4:])
+                    break
+        except OSError:
+            pass
+
+        cache_group = index
+        cache_root = os.path.join(cpu_dir, "cache")
+        try:
+            for name in sorted(os.listdir(cache_root)):
+                if name.startswith("index") and _read_text(os.path.join(cache_root, name, "level")) == "3":
+                    shared = parse_cpu_list(_read_text(os.path.join(cache_root, name, "shared_cpu_list")))
+                    cache_group = min(shared) if shared else index
+                    break
+        except OSError:
+            pass
+
+        cpus.append(LogicalCpu(index, core, package, efficiency_class, numa_node, cache_group))
+    return cpus
+
+
+def _discover_fallback():
+    """无法读取拓扑时，按 psutil 的核心数假设无超线程、单一能效等级"""
+    count = psutil.cpu_count(logical=True) or 1
+    return [LogicalCpu(index, index, 0, 0, 0, 0) for index in range(count)]
+
+
+def discover_topology():
+    """
+    读取当前系统的CPU拓扑
+
+    Returns:
+        CpuTopology: CPU拓扑
+    """
+    try:
+        if os.name == "nt":
+            cpus, source = _discover_windows(), "windows"
+        else:
+            cpus, source = _discover_sysfs(), "sysfs"
+        if cpus:
+            return CpuTopology(cpus, source)
+    except Exception as e:
+        logger.warning(f"读取CPU拓扑失败，使用默认拓扑: {str(e)}")
+    return CpuTopology(_discover_fallback(), "fallback")
+
+
+def load_topology(cache_file=None):
+    """
+    读取CPU拓扑，本次开机已缓存时直接使用缓存
+
+    Args:
+        cache_file (str, optional): 缓存文件路径，为空时不使用缓存
+
+    Returns:
+        CpuTopology: CPU拓扑
+    """
+    boot_time = int(psutil.boot_time())
+    if cache_file and os.path.exists(cache_file):
+        try:
+            with open(cache_file, encoding="utf-8") as f:
+                data = json.load(f)
+            # 开机时间在不同读取方式下可能有1秒误差
+            if abs(data.get("boot_time", 0) - boot_time) <= 1:
+                topology = CpuTopology.from_dict(data)
+                if topology.logical_count == psutil.cpu_count(logical=True):
+                    return topology
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            logger.debug(f"读取CPU拓扑缓存失败: {str(e)}")
+
+    topology = discover_topology()
+    if cache_file and topology.source != "fallback":
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(cache_file, "w", encoding="utf-8") as f:
+                json.dump({"boot_time": boot_time, **topology.to_dict()}, f)
+        except OSError as e:
+            logger.debug(f"写入CPU拓扑缓存失败: {str(e)}")
+    return topology
+
+
+# 全局拓扑实例
+_cpu_topology = None
+_cpu_topology_lock = threading.Lock()
+
+
+def get_cpu_topology(cache_file=None):
+    """
+    获取CpuTopology单例
+
+    Args:
+        cache_file (str, optional): 缓存文件路径，仅首次调用时生效
+    """
+    global _cpu_topology
+    if _cpu_topology is None:
+        with _cpu_topology_lock:
+            if _cpu_topology is None:
+                _cpu_topology = load_topology(cache_file)
+                # 预先采样一次，之后按意图选择时可以得到两次采样之间的负载
+                _cpu_topology.prime_load()
+                logger.debug(f"CPU拓扑: {_cpu_topology.describe()}")
+    return _cpu_topology
@@ -6,7 +6,6 @@
 """
 
 import time
-import threading
 import ctypes
 from ctypes import windll, wintypes, byref, Structure, POINTER, sizeof, c_long
 import psutil
@@ -14,6 +13,8 @@ from utils.logger import logger
 
 # 导入权限管理器
 from utils.privilege_manager import get_privilege_manager
+from utils.adaptive_scheduler import get_adaptive_scheduler
+from utils.task_scheduler import get_task_scheduler
 
 # 定义NTSTATUS类型
 NTSTATUS = c_long
@@ -85,8 +86,15 @@ class MemoryCleanerManager:
 
         # 状态
         self.running = False
-        self._clean_thread = None
+        self._clean_task = None  # 统一任务调度器中的定时检查任务
+        self._last_timed_clean = 0  # 最后一次定时清理的时间
         self._last_threshold_clean = 0  # 最后一次基于阈值的清理时间
+        self._check_failed = False  # 上次检查出现异常时延长下次检查间隔
+
+        # 自适应轮询：游戏运行时更频繁地检查内存占用，空闲时逐步降低检查频率
+        self.scheduler = get_adaptive_scheduler()
+        self.check_interval = 15  # 基准检查间隔（秒）
+        self.max_check_interval = 60  # 空闲退避时的最大检查间隔（秒）
 
         # 清理统计
         self.total_cleaned_mb = 0
@@ -443,8 +451,11 @@ class MemoryCleanerManager:
             return
 
         self.running = True
-        self._clean_thread = threading.Thread(target=self._cleaner_thread_func, daemon=True)
-        self._clean_thread.start()
+        self._last_timed_clean = time.time()
+        # 清理操作调用Win32接口且可能持续较长时间，在调度器的工作线程中执行
+        self._clean_task = get_task_scheduler().schedule(
+            "memory_cleaner", self._cleaner_thread_func, self._next_check_interval, blocking=True
+        )
         logger.debug("内存清理线程已启动")
 
     def stop_cleaner_thread(self):
@@ -453,94 +464,90 @@ class MemoryCleanerManager:
             return
 
         self.running = False
+        if self._clean_task:
+            self._clean_task.cancel()
+            self._clean_task = None
 
-        logger.debug("内存清理线程停止标志已设置，线程将在下次循环时退出")
+        logger.debug("内存清理任务已取消，正在进行的清理完成后不再执行")
 
-        # 线程是daemon线程，程序退出时会自动结束
+    def _next_check_interval(self):
+        """下次检查前的等待时间（秒）"""
+        if self._check_failed:
+            # 出错后延长等待时间
+            self._check_failed = False
+            return 60
+        return self.scheduler.interval(self.check_interval, job="memory_cleaner", max_interval=self.max_check_interval)
 
     def _cleaner_thread_func(self):
-        """内存清理线程函数"""
-        last_clean_time = time.time()
+        """定时检查任务，每次执行一次检查"""
+        try:
+            cleaned = False
+            current_time = time.time()
+
+            # 检查是否有任何清理选项被启用
+            any_option_enabled = any(self.clean_switches)
+
+            # 只有在至少启用了一个清理选项的情况下才执行清理
+            if any_option_enabled:
+                # 定时清理
+                if self.clean_switches[0] or self.clean_switches[1] or self.clean_switches[2]:
+                    if current_time - self._last_timed_clean > self.clean_interval:
+                        logger.debug(f"定时内存清理触发，距上次清理: {int(current_time - self._last_timed_clean)}秒")
+
+                        # 清理进程工作集
+                        if self.clean_switches[0]:
+                            self.trim_process_working_set()
+
+                        # 清理系统缓存
+                        if self.clean_switches[1]:
+                            self.flush_system_buffer()
+
+                        # 全面清理
+                        if self.clean_switches[2]:
+                            self.clean_memory_all()
+
+                        self._last_timed_clean = current_time
+                        cleaned = True
+
+                # 内存使用率触发清理
+                if (
+                    not cleaned
+                    and (self.clean_switches[3] or self.clean_switches[4] or self.clean_switches[5])
+                    and (current_time - self._last_threshold_clean > self.cooldown_time)
+                ):  # 确保冷却时间已过
+
+                    mem_info = self.get_memory_info()
+
+                    if mem_info and mem_info["percent"] >= self.threshold:
+                        logger.debug(
+                            f"内存使用率触发清理，当前使用率: {mem_info['percent']}%，阈值: {self.threshold}%"
+                        )
 
-        while self.running:
-            try:
-                cleaned = False
-                current_time = time.time()
-
-                # 检查是否有任何清理选项被启用
-                any_option_enabled = any(self.clean_switches)
-
-                # 只有在至少启用了一个清理选项的情况下才执行清理
-                if any_option_enabled:
-                    # 定时清理
-                    if self.clean_switches[0] or self.clean_switches[1] or self.clean_switches[2]:
-                        if current_time - last_clean_time > self.clean_interval:
-                            logger.debug(f"定时内存清理触发，距上次清理: {int(current_time - last_clean_time)}秒")
-
-                            # 清理进程工作集
-                            if self.clean_switches[0]:
-                                self.trim_process_working_set()
-
-                            # 清理系统缓存
-                            if self.clean_switches[1]:
-                                self.flush_system_buffer()
-
-                            # 全面清理
-                            if self.clean_switches[2]:
-                                self.clean_memory_all()
-
-                            last_clean_time = current_time
-                            cleaned = True
-
-                    # 内存使用率触发清理
-                    if (
-                        not cleaned
-                        and (self.clean_switches[3] or self.clean_switches[4] or self.clean_switches[5])
-                        and (current_time - self._last_threshold_clean > self.cooldown_time)
-                    ):  # 确保冷却时间已过
-
-                        mem_info = self.get_memory_info()
-
-                        if mem_info and mem_info["percent"] >= self.threshold:
-                            logger.debug(
-                                f"内存使用率触发清理，当前使用率: {mem_info['percent']}%，阈值: {self.threshold}%"
-                            )
-
-                            # 清理进程工作集
-                            if self.clean_switches[3]:
-                                self.trim_process_working_set()
-
-                            # 清理系统缓存
-                            if self.clean_switches[4]:
-                                self.flush_system_buffer()
-
-                            # 全面清理
-                            if self.clean_switches[5]:
-                                self.clean_memory_all()
-
-                            # 更新最后一次基于阈值的清理时间
-                            self._last_threshold_clean = current_time
+                        # 清理进程工作集
+                        if self.clean_switches[3]:
+                            self.trim_process_working_set()
+
+                        # 清理系统缓存
+                        if self.clean_switches[4]:
+                            self.flush_system_buffer()
+
+                        # 全面清理
+                        if self.clean_switches[5]:
+                            self.clean_memory_all()
+
+                        # 更新最后一次基于阈值的清理时间
+                        self._last_threshold_clean = current_time
+            else:
+                # 没有启用任何清理选项，记录日志并等待
+                if hasattr(self, "_last_no_option_warning") and current_time - self._last_no_option_warning < 60:
+                    pass  # 一分钟内不重复记录日志
                 else:
-                    # 没有启用任何清理选项，记录日志并等待
-                    if hasattr(self, "_last_no_option_warning") and current_time - self._last_no_option_warning < 60:
-                        pass  # 一分钟内不重复记录日志
-                    else:
-                        logger.debug("内存清理已启用，但未勾选任何清理选项，清理线程处于空闲状态")
-                        self._last_no_option_warning = current_time
-
-                # 使用短时间的多次休眠替代长时间休眠，以便能更快响应停止命令
-                for _ in range(15):
-                    if not self.running:
-                        break
-                    time.sleep(1)
+                    logger.debug("内存清理已启用，但未勾选任何清理选项，清理线程处于空闲状态")
+                    self._last_no_option_warning = current_time
 
-            except Exception as e:
-                logger.error(f"内存清理线程出现异常: {str(e)}")
-                # 出错后延长休眠时间，但也分成短循环以便响应停止
-                for _ in range(30):
-                    if not self.running:
-                        break
-                    time.sleep(2)
+        except Exception as e:
+            logger.error(f"内存清理线程出现异常: {str(e)}")
+            self._check_failed = True
 
     def manual_clean(self):
         """手动执行内存清理"""
@@ -617,6 +624,41 @@ class MemoryCleanerManager:
             "last_clean_time": last_time_str,
         }
 
+    def collect_status(self):
+        """
+        汇总界面所需的内存状态，在状态发布线程中调用
+        数值按界面显示精度取整，避免微小波动导致状态快照内容摘要变化
+
+        Returns:
+            dict: 清理线程状态、内存和系统缓存占用（GB）、清理配置及统计
+        """
+        gb = 1024**3
+        status = {
+            "running": self.running,
+            "clean_interval": self.clean_interval,
+            "threshold": self.threshold,
+            "cooldown_time": self.cooldown_time,
+            "memory": None,
+            "cache": None,
+            "stats": self.get_clean_stats(),
+        }
+
+        mem_info = self.get_memory_info()
+        if mem_info:
+            status["memory"] = {
+                "percent": round(mem_info["percent"], 1),
+                "used_gb": round(mem_info["used"] / gb, 1),
+                "total_gb": round(mem_info["total"] / gb, 1),
+            }
+            cache_info = self.get_system_cache_info()
+            if cache_info:
+                status["cache"] = {
+                    "current_gb": round(cache_info["current_size"] / gb, 1),
+                    "peak_gb": round(cache_info["peak_size"] / gb, 1),
+                    "percent": round(cache_info["current_size"] / mem_info["total"] * 100, 1) if mem_info["total"] else 0.0,
+                }
+        return status
+
     def set_clean_option(self, option_index, enabled):
         """设置清理选项状态"""
         if 0 <= option_index < len(self.clean_switches):
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+运行指标模块
+提供轻量的计数器和直方图，用于统计监控热路径的耗时、延迟和失败次数
+"""
+
+import threading
+from collections import deque
+
+
+class Counter:
+    """单调递增计数器"""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        """增加计数"""
+        self.value += amount
+
+
+class Histogram:
+    """直方图，保留最近的样本用于计算分位数，并累计总数、总和及最值"""
+
+    def __init__(self, unit="", max_samples=512):
+        """
+        Args:
+            unit (str): 样本单位，仅用于展示
+            max_samples (int): 保留的最近样本数
+        """
+        self.unit = unit
+        self._samples = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        """记录一个样本"""
+        with self._lock:
+            self._samples.append(value)
+            self.count += 1
+            self.total += value
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+
+    def summary(self):
+        """
+        汇总样本
+
+        Returns:
+            dict: 样本总数、平均值、最值及最近样本的P50/P95/P99
+        """
+        with self._lock:
+            ordered = sorted(self._samples)
+            count, total, minimum, maximum = self.count, self.total, self.min, self.max
+        if not ordered:
+            return {"unit": self.unit, "count": 0, "avg": 0.0, "min": 0.0, "max": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0}
+
+        def percentile(q):
+            return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+        return {
+            "unit": self.unit,
+            "count": count,
+            "avg": total / count,
+            "min": minimum,
+            "max": maximum,
+            "p50": percentile(0.5),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+        }
+
+
+class MetricsRegistry:
+    """指标注册表，按名称创建和读取计数器与直方图"""
+
+    def __init__(self):
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name):
+        """
+        获取（不存在时创建）计数器
+
+        Args:
+            name (str): 指标名称，使用点号分隔层级，如 monitor.action.kill.failed
+
+        Returns:
+            Counter: 计数器
+        """
+        counter = self._counters.get(name)
+        if counter is None:
+            with self._lock:
+                counter = self._counters.setdefault(name, Counter())
+        return counter
+
+    def histogram(self, name, unit=""):
+        """
+        获取（不存在时创建）直方图
+
+        Args:
+            name (str): 指标名称
+            unit (str): 样本单位
+
+        Returns:
+            Histogram: 直方图
+        """
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, Histogram(unit))
+        return histogram
+
+    def snapshot(self, prefix=None):
+        """
+        读取所有指标
+
+        Args:
+            prefix (str, optional): 只返回以此开头的指标
+
+        Returns:
+            dict: {"counters": {名称: 值}, "histograms": {名称: 汇总}}
+        """
+        with self._lock:
+            counters = list(self._counters.items())
+            histograms = list(self._histograms.items())
+        if prefix:
+            counters = [(name, c) for name, c in counters if name.startswith(prefix)]
+            histograms = [(name, h) for name, h in histograms if name.startswith(prefix)]
+        return {
+            "counters": {name: counter.value for name, counter in sorted(counters)},
+            "histograms": {name: histogram.summary() for name, histogram in sorted(histograms)},
+        }
+
+    def reset(self):
+        """清空所有指标"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+# 全局指标注册表实例
+_metrics_registry = None
+_metrics_registry_lock = threading.Lock()
+
+
+def get_metrics_registry():
+    """获取MetricsRegistry单例"""
+    global _metrics_registry
+    if _metrics_registry is None:
+        with _metrics_registry_lock:
+            if _metrics_registry is None:
+                _metrics_registry = MetricsRegistry()
+    return _metrics_registry
@@ -11,10 +11,10 @@ import winrt.windows.foundation.collections
 
 import os
 import sys
-import queue
 import threading
 import time
 from .logger import logger
+from .system_utils import find_icon_path
 from windows_toasts import (
     InteractableWindowsToaster, Toast, WindowsToaster, 
     ToastImagePosition, ToastButton, ToastDisplayImage, ToastAudio
@@ -88,30 +88,6 @@ def send_notification(title, message, icon_path=None, buttons=None, silent=True)
         return False
 
 
-def find_icon_path():
-    """
-    查找应用图标路径
-    
-    Returns:
-        str or None: 找到的图标路径，如果未找到则返回None
-    """
-    # 查找图标文件
-    base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    icon_paths = [
-        # 标准开发环境路径
-        os.path.join(base_path, 'assets', 'icon', 'favicon.ico'),
-        # 打包环境路径
-        os.path.join(os.path.dirname(sys.executable), 'favicon.ico')
-    ]
-    
-    # 静默查找图标文件，使用第一个存在的路径
-    for path in icon_paths:
-        if os.path.exists(path):
-            return path
-    
-    return None
-
-
 def notification_thread(message_queue, icon_path=None, stop_event=None):
     """
     通知线程函数，从队列中获取消息并发送通知
@@ -119,7 +95,7 @@ def notification_thread(message_queue, icon_path=None, stop_event=None):
     Args:
         message_queue (queue.Queue): 消息队列
         icon_path (str, optional): 图标路径
-        stop_event (threading.Event, optional): 停止事件
+        stop_event (threading.Event, optional): 停止事件，设置后需向队列放入 None 唤醒线程
     """
     logger.debug("通知线程已启动")
     
@@ -129,8 +105,11 @@ def notification_thread(message_queue, icon_path=None, stop_event=None):
     
     while not stop_event.is_set():
         try:
-            # 获取消息，最多等待0.5秒
-            message = message_queue.get(timeout=0.5)
+            # 阻塞等待消息，空闲时不产生定时唤醒，停止时由 None 唤醒
+            message = message_queue.get()
+            if message is None:
+                message_queue.task_done()
+                continue
             
             # 支持字符串和字典格式的消息
             if isinstance(message, str):
@@ -152,9 +131,6 @@ def notification_thread(message_queue, icon_path=None, stop_event=None):
             
             # 标记任务完成
             message_queue.task_done()
-        except queue.Empty:
-            # 队列为空，继续等待
-            pass
         except Exception as e:
             logger.error(f"处理通知失败: {str(e)}")
             # 尝试短暂休眠以避免CPU占用过高
@@ -0,0 +1,298 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+自身开销调控模块
+持续测量本程序的CPU时间和常驻内存，超出预算时逐级放大所有后台循环的轮询间隔、
+暂停可选工作并释放缓存，回到预算内后逐级恢复
+"""
+
+import gc
+import threading
+import time
+
+import psutil
+from utils.adaptive_scheduler import get_adaptive_scheduler
+from utils.logger import logger
+from utils.metrics import get_metrics_registry
+from utils.task_scheduler import get_task_scheduler
+
+
+class OverheadGovernor:
+    """自身开销调控器"""
+
+    MAX_LEVEL = 3  # 最高调控级别，轮询间隔最多放大 2**MAX_LEVEL 倍
+    OPTIONAL_WORK_LEVEL = 2  # 达到该级别时暂停可选工作
+    ESCALATE_SAMPLES = 2  # 连续超出预算的采样次数达到后升级
+    RELAX_SAMPLES = 3  # 连续低于预算的采样次数达到后降级
+    RELAX_RATIO = 0.7  # 低于预算的该比例才视为回到预算内，避免在预算附近反复切换
+    TRIM_COOLDOWN = 60.0  # 两次释放缓存之间的最短间隔（秒）
+
+    def __init__(self, cpu_budget=0.2, rss_budget_mb=80, sample_interval=5.0, enabled=True, process=None):
+        """
+        初始化自身开销调控器
+
+        Args:
+            cpu_budget (float): CPU占用预算（占全部逻辑处理器的百分比，与任务管理器一致）
+            rss_budget_mb (float): 常驻内存预算（MB）
+            sample_interval (float): 采样间隔（秒）
+            enabled (bool): 是否根据预算自动调控，关闭时仍然测量
+            process (psutil.Process, optional): 被测量的进程，默认为当前进程
+        """
+        self.cpu_budget = cpu_budget
+        self.rss_budget_mb = rss_budget_mb
+        self.sample_interval = sample_interval
+        self.enabled = enabled
+        self._process = process or psutil.Process()
+        self._cpu_count = psutil.cpu_count() or 1
+        self._lock = threading.Lock()
+        self._task = None  # 统一任务调度器中的采样任务
+        self._listeners = []
+        self._trim_callbacks = []
+
+        self.level = 0
+        self.cpu_percent = 0.0  # 平滑后的CPU占用（占全部逻辑处理器的百分比）
+        self.rss_mb = 0.0
+        self._last_sample = None  # (time.monotonic(), 累计CPU秒)
+        self._over_streak = 0
+        self._under_streak = 0
+        self._last_trim = 0.0
+
+        # 统计信息
+        self.sample_count = 0
+        self.over_budget_samples = 0
+        self.level_changes = 0
+        self.trim_count = 0
+
+        metrics = get_metrics_registry()
+        self._cpu_histogram = metrics.histogram("governor.cpu_percent", "%")
+        self._rss_histogram = metrics.histogram("governor.rss_mb", "MB")
+        self._level_counter = metrics.counter("governor.level_changes")
+
+    def configure(self, cpu_budget=None, rss_budget_mb=None, enabled=None):
+        """
+        更新预算
+
+        Args:
+            cpu_budget (float, optional): CPU占用预算（百分比）
+            rss_budget_mb (float, optional): 常驻内存预算（MB）
+            enabled (bool, optional): 是否自动调控
+        """
+        if cpu_budget is not None:
+            self.cpu_budget = max(0.01, float(cpu_budget))
+        if rss_budget_mb is not None:
+            self.rss_budget_mb = max(10.0, float(rss_budget_mb))
+        if enabled is not None:
+            self.enabled = bool(enabled)
+            if not self.enabled:
+                self._set_level(0)
+
+    @property
+    def factor(self):
+        """当前轮询间隔的放大倍数"""
+        return 2**self.level
+
+    @property
+    def optional_work_enabled(self):
+        """是否允许执行可选工作（调试指标、定期核验等）"""
+        return self.level < self.OPTIONAL_WORK_LEVEL
+
+    def stretch(self, interval):
+        """
+        按当前调控级别放大间隔
+
+        Args:
+            interval (float): 基准间隔（秒）
+
+        Returns:
+            float: 放大后的间隔（秒）
+        """
+        return interval * self.factor
+
+    def add_listener(self, listener):
+        """
+        注册调控级别变化回调，回调在采样线程中调用
+
+        Args:
+            listener (callable): 接收 (级别, 放大倍数) 的回调
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """取消注册调控级别变化回调"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def add_trim_callback(self, callback):
+        """
+        注册内存超出预算时调用的缓存释放回调
+
+        Args:
+            callback (callable): 无参数回调
+        """
+        if callback not in self._trim_callbacks:
+            self._trim_callbacks.append(callback)
+
+    def sample(self):
+        """
+        采样一次自身开销并按预算调整级别
+
+        Returns:
+            dict or None: 本次采样的CPU占用和常驻内存，首次采样只建立基准时返回None
+        """
+        now = time.monotonic()
+        try:
+            cpu_times = self._process.cpu_times()
+            rss = self._process.memory_info().rss
+        except psutil.Error as e:
+            logger.debug(f"读取自身开销失败: {str(e)}")
+            return None
+        cpu_seconds = cpu_times.user + cpu_times.system
+
+        last = self._last_sample
+        self._last_sample = (now, cpu_seconds)
+        self.rss_mb = rss / (1024 * 1024)
+        if last is None or now <= last[0]:
+            return None
+
+        cpu_percent = (cpu_seconds - last[1]) / (now - last[0]) / self._cpu_count * 100
+        # 指数平滑，避免单次突发（如一次全量扫描）触发调控
+        self.cpu_percent = cpu_percent if not self.sample_count else self.cpu_percent * 0.6 + cpu_percent * 0.4
+        self.sample_count += 1
+        self._cpu_histogram.observe(cpu_percent)
+        self._rss_histogram.observe(self.rss_mb)
+
+        cpu_over = self.cpu_percent > self.cpu_budget
+        rss_over = self.rss_mb > self.rss_budget_mb
+        if cpu_over or rss_over:
+            self.over_budget_samples += 1
+        if self.enabled:
+            self._evaluate(cpu_over, rss_over)
+        return {"cpu_percent": cpu_percent, "rss_mb": self.rss_mb}
+
+    def _evaluate(self, cpu_over, rss_over):
+        """根据是否超出预算升级或降级"""
+        if rss_over:
+            self._trim()
+
+        if cpu_over or rss_over:
+            self._under_streak = 0
+            self._over_streak += 1
+            if self._over_streak >= self.ESCALATE_SAMPLES and self.level < self.MAX_LEVEL:
+                self._over_streak = 0
+                self._set_level(self.level + 1)
+            return
+
+        self._over_streak = 0
+        if self.cpu_percent < self.cpu_budget * self.RELAX_RATIO and self.rss_mb < self.rss_budget_mb:
+            self._under_streak += 1
+            if self._under_streak >= self.RELAX_SAMPLES and self.level > 0:
+                self._under_streak = 0
+                self._set_level(self.level - 1)
+        else:
+            self._under_streak = 0
+
+    def _trim(self):
+        """内存超出预算时释放各模块的缓存"""
+        now = time.monotonic()
+        if now - self._last_trim < self.TRIM_COOLDOWN:
+            return
+        self._last_trim = now
+        self.trim_count += 1
+        for callback in list(self._trim_callbacks):
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"释放缓存失败: {str(e)}")
+        gc.collect()
+        logger.debug(f"自身内存 {self.rss_mb:.1f}MB 超出预算 {self.rss_budget_mb:g}MB，已释放缓存")
+
+    def _set_level(self, level):
+        """切换调控级别并通知各模块"""
+        with self._lock:
+            if level == self.level:
+                return
+            previous, self.level = self.level, level
+            self.level_changes += 1
+        self._level_counter.inc()
+
+        # 所有通过自适应调度器计算间隔的后台循环同时放大
+        get_adaptive_scheduler().stretch_factor = self.factor
+        if level > previous:
+            logger.info(
+                f"自身开销超出预算 (CPU {self.cpu_percent:.2f}% / {self.cpu_budget:g}%, "
+                f"内存 {self.rss_mb:.0f}MB / {self.rss_budget_mb:g}MB)，轮询间隔放大到 {self.factor} 倍"
+                + ("，暂停可选工作" if not self.optional_work_enabled else "")
+            )
+        else:
+            logger.info(f"自身开销已回到预算内，轮询间隔恢复为 {self.factor} 倍")
+
+        for listener in list(self._listeners):
+            try:
+                listener(self.level, self.factor)
+            except Exception as e:
+                logger.error(f"开销调控回调处理失败: {str(e)}")
+
+    def start(self):
+        """启动采样任务，采样只读取自身的计数器，直接在调度器的定时线程中执行"""
+        if self._task and self._task.active:
+            return
+        self.sample()
+        self._task = get_task_scheduler().schedule("overhead_governor", self.sample, self.sample_interval)
+        logger.debug(f"自身开销调控已启动，预算: CPU {self.cpu_budget:g}%, 内存 {self.rss_budget_mb:g}MB")
+
+    def stop(self):
+        """停止采样任务并恢复原轮询间隔"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self._set_level(0)
+
+    def get_stats(self):
+        """
+        获取自身开销统计
+
+        Returns:
+            dict: 当前CPU占用与常驻内存、预算、调控级别、轮询放大倍数、可选工作是否启用及采样统计
+        """
+        return {
+            "enabled": self.enabled,
+            "cpu_percent": self.cpu_percent,
+            "rss_mb": self.rss_mb,
+            "cpu_budget": self.cpu_budget,
+            "rss_budget_mb": self.rss_budget_mb,
+            "level": self.level,
+            "factor": self.factor,
+            "optional_work": self.optional_work_enabled,
+            "sample_count": self.sample_count,
+            "over_budget_samples": self.over_budget_samples,
+            "level_changes": self.level_changes,
+            "trim_count": self.trim_count,
+        }
+
+
+# 全局调控器实例
+_overhead_governor = None
+_overhead_governor_lock = threading.Lock()
+
+
+def get_overhead_governor(config_manager=None):
+    """
+    获取OverheadGovernor单例
+
+    Args:
+        config_manager (ConfigManager, optional): 配置管理器，首次创建时用于读取预算
+    """
+    global _overhead_governor
+    if _overhead_governor is None:
+        with _overhead_governor_lock:
+            if _overhead_governor is None:
+                _overhead_governor = OverheadGovernor()
+                if config_manager is not None:
+                    _overhead_governor.configure(
+                        config_manager.overhead_cpu_budget,
+                        config_manager.overhead_rss_budget_mb,
+                        config_manager.overhead_enabled,
+                    )
+    return _overhead_governor
@@ -0,0 +1,328 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+并行优化模块
+用有界工作线程池并发地对多个目标进程执行同一个优化函数，单个目标超时后不再等待，
+支持取消尚未开始的目标，结果按输入顺序返回
+"""
+
+import queue
+import threading
+import time
+from collections import namedtuple
+
+from utils.logger import logger
+from utils.metrics import get_metrics_registry
+
+# 单个目标的执行状态
+STATUS_OK = "ok"
+STATUS_ERROR = "error"  # 优化函数抛出异常
+STATUS_TIMEOUT = "timeout"  # 超过单个目标的超时时间仍未返回（如对受保护或正在退出的进程 OpenProcess 阻塞）
+STATUS_CANCELLED = "cancelled"  # 开始执行前已被取消
+
+# 单个目标的执行结果：输入中的序号、目标、状态、优化函数的返回值（或异常）、执行耗时（毫秒）
+ApplyOutcome = namedtuple("ApplyOutcome", ["index", "target", "status", "result", "elapsed_ms"])
+
+
+class _Job:
+    """一次批量执行中的单个目标"""
+
+    __slots__ = ("index", "target", "status", "result", "started", "elapsed_ms", "worker")
+
+    def __init__(self, index, target):
+        self.index = index
+        self.target = target
+        self.status = None  # 未完成时为None
+        self.result = None
+        self.started = None  # 开始执行的时间（time.monotonic()），未开始时为None
+        self.elapsed_ms = 0.0
+        self.worker = None
+
+
+class _Batch:
+    """一次批量执行，工作线程完成目标后通过条件变量通知调用线程"""
+
+    def __init__(self, func, targets):
+        self.func = func
+        self.jobs = [_Job(index, target) for index, target in enumerate(targets)]
+        self.condition = threading.Condition()
+        self.cancelled = False
+        self.pending = len(self.jobs)
+        self.unstarted = len(self.jobs)
+        self.running = set()  # 正在执行的目标，超时检查只需遍历这些目标
+
+    def finish(self, job, status, result, now):
+        """记录目标结果（调用方需持有锁），已有结果（如已超时）时忽略"""
+        if job.status is not None:
+            return False
+        job.status = status
+        job.result = result
+        if job.started is None:
+            self.unstarted -= 1
+            job.elapsed_ms = 0.0
+        else:
+            job.elapsed_ms = (now - job.started) * 1000
+        self.pending -= 1
+        self.running.discard(job)
+        self.condition.notify_all()
+        return True
+
+
+class _Worker:
+    """工作线程状态，超时后被放弃或执行器关闭后退役的线程在当前调用返回后退出"""
+
+    __slots__ = ("thread", "abandoned", "retired")
+
+    def __init__(self):
+        self.thread = None
+        self.abandoned = False
+        self.retired = False
+
+
+class ParallelApplier:
+    """有界并行执行器"""
+
+    def __init__(self, max_workers=4, timeout=2.0, max_abandoned=None, idle_timeout=10.0):
+        """
+        初始化并行执行器
+
+        Args:
+            max_workers (int): 同时执行的工作线程数上限
+            timeout (float): 单个目标的默认超时时间（秒），从该目标开始执行时计算
+            max_abandoned (int, optional): 超时后仍在阻塞的线程数上限，达到后不再补充新线程，默认等于 max_workers
+            idle_timeout (float): 工作线程空闲多久后退出（秒），下次执行时重新创建
+        """
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.max_abandoned = self.max_workers if max_abandoned is None else max(0, max_abandoned)
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._workers = []  # 未被放弃的工作线程，执行时按需创建，空闲超时后退出
+        self._abandoned_alive = 0
+        self._thread_count = 0
+        self._batches = set()
+
+        # 统计信息
+        self.run_count = 0
+        self.target_count = 0
+        self.timeout_count = 0
+        self.error_count = 0
+        self.cancelled_count = 0
+        self.abandoned_count = 0
+
+        metrics = get_metrics_registry()
+        self._batch_histogram = metrics.histogram("parallel_apply.batch_ms", "ms")
+        self._target_histogram = metrics.histogram("parallel_apply.target_ms", "ms")
+
+    def run(self, func, targets, timeout=None, should_cancel=None, on_progress=None):
+        """
+        并发执行 func(target)，阻塞到所有目标完成、超时或被取消
+
+        Args:
+            func (callable): 接收单个目标的优化函数
+            targets (iterable): 目标列表
+            timeout (float, optional): 单个目标的超时时间（秒），默认使用初始化时的值
+            should_cancel (callable, optional): 在调用线程中定期调用，返回True时取消尚未开始的目标
+            on_progress (callable, optional): 在调用线程中接收 (已完成数, 总数) 的进度回调
+
+        Returns:
+            list: 按输入顺序排列的 ApplyOutcome 列表
+        """
+        timeout = self.timeout if timeout is None else timeout
+        batch = _Batch(func, list(targets))
+        total = len(batch.jobs)
+        if not total:
+            return []
+
+        start = time.monotonic()
+        with self._lock:
+            self._batches.add(batch)
+            while len(self._workers) < min(total, self.max_workers):
+                self._start_worker_locked()
+            # 持有锁入队，空闲超时的线程在锁内确认队列为空后才退出
+            for job in batch.jobs:
+                self._queue.put((batch, job))
+
+        # 有取消回调时按该间隔检查，否则只在有目标完成或超时时唤醒
+        poll = 0.05 if should_cancel else None
+        reported = 0
+        try:
+            while reported < total:
+                cancel = bool(should_cancel and not batch.cancelled and should_cancel())
+                with batch.condition:
+                    now = time.monotonic()
+                    if cancel:
+                        self._cancel_locked(batch, now)
+                    wait = self._expire_locked(batch, timeout, now)
+                    if batch.pending and total - batch.pending == reported:
+                        if poll is not None:
+                            wait = poll if wait is None else min(wait, poll)
+                        batch.condition.wait(wait)
+                    done = total - batch.pending
+                # 回调在锁外调用，界面进度条可以在其中处理事件
+                if on_progress and done != reported:
+                    on_progress(done, total)
+                reported = done
+        finally:
+            with self._lock:
+                self._batches.discard(batch)
+            if batch.pending:
+                # 调用线程异常退出时取消剩余目标，避免工作线程继续执行
+                with batch.condition:
+                    self._cancel_locked(batch, time.monotonic())
+
+        outcomes = []
+        for job in batch.jobs:
+            outcomes.append(ApplyOutcome(job.index, job.target, job.status, job.result, job.elapsed_ms))
+            if job.status == STATUS_OK:
+                self._target_histogram.observe(job.elapsed_ms)
+            elif job.status == STATUS_ERROR:
+                self.error_count += 1
+            elif job.status == STATUS_TIMEOUT:
+                self.timeout_count += 1
+            else:
+                self.cancelled_count += 1
+        self.run_count += 1
+        self.target_count += total
+        self._batch_histogram.observe((time.monotonic() - start) * 1000)
+        return outcomes
+
+    def cancel(self):
+        """取消所有正在进行的批量执行中尚未开始的目标"""
+        with self._lock:
+            batches = list(self._batches)
+        now = time.monotonic()
+        for batch in batches:
+            with batch.condition:
+                self._cancel_locked(batch, now)
+
+    @staticmethod
+    def _cancel_locked(batch, now):
+        """取消尚未开始的目标（调用方需持有批次锁），已开始的目标继续执行到超时或完成"""
+        batch.cancelled = True
+        for job in batch.jobs:
+            if job.started is None:
+                batch.finish(job, STATUS_CANCELLED, None, now)
+
+    def _expire_locked(self, batch, timeout, now):
+        """
+        将超时的目标标记为超时并放弃其工作线程（调用方需持有批次锁）
+
+        Returns:
+            float or None: 距离最近一个目标可能超时的时间（秒），没有未完成的目标时为None
+        """
+        next_deadline = None
+        for job in list(batch.running):
+            deadline = job.started + timeout
+            if now >= deadline:
+                batch.finish(job, STATUS_TIMEOUT, None, now)
+                self._abandon(job.worker)
+            elif next_deadline is None or deadline < next_deadline:
+                next_deadline = deadline
+
+        if batch.unstarted and next_deadline is None:
+            with self._lock:
+                stuck = not self._workers
+            if stuck:
+                # 所有线程都阻塞在超时的调用中且已达放弃上限，剩余目标无法开始
+                for job in batch.jobs:
+                    if job.started is None:
+                        batch.finish(job, STATUS_TIMEOUT, None, now)
+                return None
+            # 之后开始执行的目标最早在一个超时时间后到期
+            return timeout
+        return None if next_deadline is None else next_deadline - now
+
+    def _abandon(self, worker):
+        """放弃阻塞的工作线程，未达上限时补充新线程以保持并发数"""
+        with self._lock:
+            if worker is None or worker.abandoned:
+                return
+            worker.abandoned = True
+            self._workers.remove(worker)
+            self._abandoned_alive += 1
+            self.abandoned_count += 1
+            if self._abandoned_alive <= self.max_abandoned:
+                self._start_worker_locked()
+            logger.debug(f"并行优化目标超时，已放弃阻塞的工作线程（当前阻塞 {self._abandoned_alive} 个）")
+
+    def _start_worker_locked(self):
+        """新建工作线程（调用方需持有锁）"""
+        self._thread_count += 1
+        worker = _Worker()
+        worker.thread = threading.Thread(
+            target=self._worker_loop, args=(worker,), name=f"ace-apply-{self._thread_count}", daemon=True
+        )
+        self._workers.append(worker)
+        worker.thread.start()
+
+    def _worker_loop(self, worker):
+        """工作线程，阻塞等待目标，空闲超过 idle_timeout 或退役后退出"""
+        while True:
+            try:
+                item = self._queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                with self._lock:
+                    if not worker.retired and not self._queue.empty():
+                        continue
+                    if worker in self._workers:
+                        self._workers.remove(worker)
+                    return
+            batch, job = item
+            with batch.condition:
+                if job.status is not None:
+                    continue
+                job.started = time.monotonic()
+                job.worker = worker
+                batch.unstarted -= 1
+                batch.running.add(job)
+
+            try:
+                result, status = batch.func(job.target), STATUS_OK
+            except Exception as e:
+                result, status = e, STATUS_ERROR
+
+            with batch.condition:
+                batch.finish(job, status, result, time.monotonic())
+            with self._lock:
+                if worker.abandoned:
+                    # 调用超时后才返回，由补充的新线程接替
+                    self._abandoned_alive -= 1
+                    return
+                if worker.retired:
+                    return
+
+    def shutdown(self):
+        """
+        取消所有目标并让工作线程退役：正在执行的线程在调用返回后退出，空闲线程在空闲超时后退出，
+        之后再次执行时重新创建线程
+        """
+        self.cancel()
+        with self._lock:
+            workers, self._workers = self._workers, []
+            for worker in workers:
+                worker.retired = True
+
+    def get_stats(self):
+        """
+        获取并行执行统计
+
+        Returns:
+            dict: 工作线程数、阻塞中被放弃的线程数及各状态的目标计数
+        """
+        with self._lock:
+            workers = len(self._workers)
+            abandoned_alive = self._abandoned_alive
+        return {
+            "max_workers": self.max_workers,
+            "workers": workers,
+            "abandoned_alive": abandoned_alive,
+            "abandoned": self.abandoned_count,
+            "runs": self.run_count,
+            "targets": self.target_count,
+            "timeouts": self.timeout_count,
+            "errors": self.error_count,
+            "cancelled": self.cancelled_count,
+        }
@@ -0,0 +1,359 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+进程创建事件模块
+优先使用系统提供的进程创建通知（Windows WMI / Linux netlink proc connector），
+不可用时回退为基于进程快照差异的轮询
+"""
+
+import socket
+import struct
+import sys
+import threading
+import time
+from collections import namedtuple
+
+import psutil
+from utils.logger import logger
+
+
+# 进程启动事件：detected_at 为本程序收到通知的时间（time.time）
+ProcessStartEvent = namedtuple("ProcessStartEvent", ["pid", "name", "create_time", "detected_at", "source"])
+
+
+class ProcessEventSource:
+    """进程创建事件源基类"""
+
+    # 事件源名称，用于日志和状态展示
+    name = "base"
+    # 是否为系统原生通知（原生通知到达时需要主动刷新快照）
+    native = False
+
+    def __init__(self, watched_names=None):
+        """
+        初始化事件源
+
+        Args:
+            watched_names (iterable, optional): 关注的进程名，为None时上报所有进程，为空集合时不上报任何进程
+        """
+        self.watched_names = None if watched_names is None else {name.lower() for name in watched_names}
+        self._handlers = []
+        self._handlers_lock = threading.Lock()
+        self.running = False
+        self.event_count = 0
+
+    def subscribe(self, handler):
+        """
+        注册事件处理函数
+
+        Args:
+            handler (callable): 接收 ProcessStartEvent 的回调
+        """
+        with self._handlers_lock:
+            if handler not in self._handlers:
+                self._handlers.append(handler)
+
+    def unsubscribe(self, handler):
+        """取消注册事件处理函数"""
+        with self._handlers_lock:
+            if handler in self._handlers:
+                self._handlers.remove(handler)
+
+    def _is_watched(self, name):
+        """判断进程名是否在关注列表中"""
+        return bool(name) and (self.watched_names is None or name.lower() in self.watched_names)
+
+    def _emit(self, pid, name, create_time=None):
+        """
+        向所有处理函数分发进程启动事件
+
+        Args:
+            pid (int): 进程ID
+            name (str): 进程名称
+            create_time (float, optional): 进程创建时间，未提供时尝试读取
+        """
+        if not self._is_watched(name):
+            return
+
+        if create_time is None:
+            try:
+                create_time = psutil.Process(pid).create_time()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                create_time = 0.0
+
+        event = ProcessStartEvent(pid, name, create_time, time.time(), self.name)
+        self.event_count += 1
+
+        with self._handlers_lock:
+            handlers = list(self._handlers)
+        for handler in handlers:
+            try:
+                handler(event)
+            except Exception as e:
+                logger.error(f"处理进程启动事件失败: {str(e)}")
+
+    def start(self):
+        """启动事件源，失败时抛出异常"""
+        raise NotImplementedError
+
+    def stop(self):
+        """停止事件源"""
+        self.running = False
+
+
+class PollingProcessEventSource(ProcessEventSource):
+    """轮询事件源，通过比较相邻两次进程快照发现新进程"""
+
+    name = "polling"
+
+    def __init__(self, snapshot_engine, watched_names=None):
+        """
+        初始化轮询事件源
+
+        Args:
+            snapshot_engine (ProcessSnapshotEngine): 共享进程快照引擎
+            watched_names (iterable, optional): 关注的进程名
+        """
+        super().__init__(watched_names)
+        self.snapshot_engine = snapshot_engine
+        self._last_snapshot = None
+
+    def _on_snapshot(self, snapshot):
+        """快照发布回调，找出新出现的进程"""
+        previous = self._last_snapshot
+        self._last_snapshot = snapshot
+        if previous is None:
+            return
+
+        names = self.watched_names if self.watched_names is not None else snapshot.names()
+        for name in names:
+            for entry in snapshot.get(name):
+                if entry not in previous:
+                    self._emit(entry.pid, name, entry.create_time)
+
+    def start(self):
+        """开始监听快照发布"""
+        self._last_snapshot = None
+        self.snapshot_engine.add_listener(self._on_snapshot)
+        self.running = True
+
+    def stop(self):
+        """停止监听快照发布"""
+        self.snapshot_engine.remove_listener(self._on_snapshot)
+        self.running = False
+
+
+class WmiProcessEventSource(ProcessEventSource):
+    """Windows WMI 进程创建事件源（Win32_ProcessStartTrace，需要管理员权限）"""
+
+    name = "wmi"
+    native = True
+
+    # WMI 事件等待超时（毫秒），超时后检查停止标志
+    POLL_TIMEOUT_MS = 500
+    # wbemErrTimedOut
+    WBEM_E_TIMED_OUT = -2147209215
+
+    def __init__(self, watched_names=None):
+        super().__init__(watched_names)
+        self._thread = None
+        self._started = threading.Event()
+        self._start_error = None
+
+    @staticmethod
+    def _quote(value):
+        """转义WQL字符串字面量中的反斜杠和单引号"""
+        return value.replace("\\", "\\\\").replace("'", "\\'")
+
+    def _build_query(self):
+        """构建WQL查询，关注列表非空时在WMI侧过滤"""
+        query = "SELECT ProcessID, ProcessName FROM Win32_ProcessStartTrace"
+        if self.watched_names:
+            conditions = " OR ".join(f"ProcessName = '{self._quote(name)}'" for name in sorted(self.watched_names))
+            query += f" WHERE {conditions}"
+        return query
+
+    def _event_loop(self):
+        """WMI 事件等待线程"""
+        import pythoncom
+        import pywintypes
+        import win32com.client
+
+        pythoncom.CoInitialize()
+        try:
+            try:
+                wmi = win32com.client.GetObject("winmgmts:")
+                watcher = wmi.ExecNotificationQuery(self._build_query())
+            except Exception as e:
+                self._start_error = e
+                return
+            finally:
+                self._started.set()
+
+            while self.running:
+                try:
+                    event = watcher.NextEvent(self.POLL_TIMEOUT_MS)
+                except pywintypes.com_error as e:
+                    if e.args and e.args[0] == self.WBEM_E_TIMED_OUT:
+                        continue
+                    excepinfo = e.args[2] if len(e.args) > 2 else None
+                    if excepinfo and excepinfo[5] == self.WBEM_E_TIMED_OUT:
+                        continue
+                    logger.error(f"WMI进程事件监听出错: {str(e)}")
+                    break
+                self._emit(int(event.ProcessID), str(event.ProcessName))
+        finally:
+            self.running = False
+            pythoncom.CoUninitialize()
+
+    def start(self):
+        """启动WMI事件线程，订阅失败时抛出异常"""
+        self.running = True
+        self._started.clear()
+        self._start_error = None
+        self._thread = threading.Thread(target=self._event_loop, daemon=True)
+        self._thread.start()
+        self._started.wait(10)
+        if self._start_error is not None:
+            self.running = False
+            raise self._start_error
+
+    def stop(self):
+        """停止WMI事件线程"""
+        self.running = False
+        if self._thread and self._thread.is_alive():
+            self._thread.join(1.0)
+
+
+class NetlinkProcessEventSource(ProcessEventSource):
+    """Linux netlink proc connector 进程事件源（需要 CAP_NET_ADMIN）"""
+
+    name = "netlink"
+    native = True
+
+    NETLINK_CONNECTOR = 11
+    CN_IDX_PROC = 1
+    CN_VAL_PROC = 1
+    NLMSG_DONE = 3
+    PROC_CN_MCAST_LISTEN = 1
+    PROC_CN_MCAST_IGNORE = 2
+    PROC_EVENT_EXEC = 0x00000002
+    PROC_EVENT_COMM = 0x00000200
+
+    NLMSG_HEADER = struct.Struct("=IHHII")
+    CN_MSG_HEADER = struct.Struct("=IIIIHH")
+    PROC_EVENT_HEADER = struct.Struct("=IIQ")
+    PROC_EVENT_PIDS = struct.Struct("=II")
+
+    def __init__(self, watched_names=None):
+        super().__init__(watched_names)
+        self._sock = None
+        self._thread = None
+
+    def _send_control(self, op):
+        """向 proc connector 发送订阅/取消订阅请求"""
+        payload = struct.pack("=I", op)
+        cn_msg = self.CN_MSG_HEADER.pack(self.CN_IDX_PROC, self.CN_VAL_PROC, 0, 0, len(payload), 0) + payload
+        header = self.NLMSG_HEADER.pack(
+            self.NLMSG_HEADER.size + len(cn_msg), self.NLMSG_DONE, 0, 0, self._sock.getsockname()[0]
+        )
+        self._sock.send(header + cn_msg)
+
+    def _handle_message(self, data):
+        """解析一条 netlink 消息中的进程事件"""
+        offset = self.NLMSG_HEADER.size + self.CN_MSG_HEADER.size
+        if len(data) < offset + self.PROC_EVENT_HEADER.size + self.PROC_EVENT_PIDS.size:
+            return
+        what, _, _ = self.PROC_EVENT_HEADER.unpack_from(data, offset)
+        if what not in (self.PROC_EVENT_EXEC, self.PROC_EVENT_COMM):
+            return
+        pid, tgid = self.PROC_EVENT_PIDS.unpack_from(data, offset + self.PROC_EVENT_HEADER.size)
+        if pid != tgid:
+            return
+        try:
+            name = psutil.Process(tgid).name()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return
+        self._emit(tgid, name)
+
+    def _event_loop(self):
+        """netlink 事件接收线程"""
+        while self.running:
+            try:
+                data = self._sock.recv(4096)
+            except socket.timeout:
+                continue
+            except OSError as e:
+                if self.running:
+                    logger.error(f"netlink进程事件监听出错: {str(e)}")
+                break
+            self._handle_message(data)
+        self.running = False
+
+    def start(self):
+        """订阅 proc connector，权限不足时抛出异常"""
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, self.NETLINK_CONNECTOR)
+        try:
+            sock.bind((0, self.CN_IDX_PROC))
+            sock.settimeout(0.5)
+            self._sock = sock
+            self._send_control(self.PROC_CN_MCAST_LISTEN)
+        except OSError:
+            sock.close()
+            self._sock = None
+            raise
+
+        self.running = True
+        self._thread = threading.Thread(target=self._event_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """取消订阅并关闭 socket"""
+        if not self._sock:
+            return
+        self.running = False
+        try:
+            self._send_control(self.PROC_CN_MCAST_IGNORE)
+        except OSError:
+            pass
+        if self._thread and self._thread.is_alive():
+            self._thread.join(1.0)
+        self._sock.close()
+        self._sock = None
+
+
+def create_process_event_source(snapshot_engine, watched_names=None):
+    """
+    创建并启动进程创建事件源，系统通知不可用时回退为轮询
+
+    Args:
+        snapshot_engine (ProcessSnapshotEngine): 共享进程快照引擎，用于轮询回退
+        watched_names (iterable, optional): 关注的进程名，为None时关注所有进程，为空集合时不关注任何进程
+
+    Returns:
+        ProcessEventSource: 已启动的事件源
+    """
+    if watched_names is not None:
+        watched_names = frozenset(watched_names)
+    candidates = []
+    # 没有需要关注的进程时不订阅系统通知（WMI查询没有过滤条件时会收到所有进程的事件），轮询事件源不会上报任何进程
+    if watched_names is None or watched_names:
+        if sys.platform == "win32":
+            candidates.append(WmiProcessEventSource)
+        elif sys.platform.startswith("linux") and hasattr(socket, "AF_NETLINK"):
+            candidates.append(NetlinkProcessEventSource)
+
+    for source_class in candidates:
+        source = source_class(watched_names)
+        try:
+            source.start()
+            logger.debug(f"已启用 {source.name} 进程创建事件源")
+            return source
+        except Exception as e:
+            logger.debug(f"{source_class.name} 进程创建事件源不可用，回退为轮询: {str(e)}")
+
+    source = PollingProcessEventSource(snapshot_engine, watched_names)
+    source.start()
+    logger.debug("已启用轮询进程创建事件源")
+    return source
@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+进程句柄池模块
+按 (pid, 创建时间) 缓存进程句柄，同一进程的多项设置和多轮检查共用一个句柄，
+权限不足时按已有权限与所需权限的并集重新打开，进程退出或超出容量时关闭
+"""
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from utils.logger import logger
+from utils.metrics import get_metrics_registry
+
+# 进程访问权限
+PROCESS_SET_INFORMATION = 0x0200
+PROCESS_QUERY_INFORMATION = 0x0400
+
+
+class Win32HandleOpener:
+    """基于 OpenProcess/CloseHandle 的句柄后端（Windows）"""
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+
+        self._ctypes = ctypes
+        self._kernel32 = ctypes.WinDLL("kernel32.dll", use_last_error=True)
+        self._kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+        self._kernel32.OpenProcess.restype = wintypes.HANDLE
+        self._kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        self._kernel32.CloseHandle.restype = wintypes.BOOL
+
+    def open(self, pid, access):
+        """
+        打开进程句柄
+
+        Args:
+            pid (int): 进程ID
+            access (int): 访问权限
+
+        Returns:
+            tuple: (句柄, 错误码)，失败时句柄为None
+        """
+        handle = self._kernel32.OpenProcess(access, False, pid)
+        if not handle:
+            return None, self._ctypes.get_last_error()
+        return handle, 0
+
+    def close(self, handle):
+        """关闭进程句柄"""
+        self._kernel32.CloseHandle(handle)
+
+
+class _PooledHandle:
+    """池中的单个句柄"""
+
+    __slots__ = ("handle", "access", "leases", "stale")
+
+    def __init__(self, handle, access):
+        self.handle = handle
+        self.access = access
+        self.leases = 0  # 正在使用该句柄的调用数
+        self.stale = False  # 已被移出池，最后一个使用者归还后关闭
+
+
+class ProcessHandlePool:
+    """按 (pid, 创建时间) 复用进程句柄的LRU池"""
+
+    def __init__(self, capacity=64, opener=None):
+        """
+        初始化进程句柄池
+
+        Args:
+            capacity (int): 最多缓存的句柄数
+            opener (Win32HandleOpener, optional): 句柄后端，默认使用 OpenProcess/CloseHandle
+        """
+        self.capacity = max(1, capacity)
+        self._opener = opener
+        self._handles = OrderedDict()  # ProcessEntry -> _PooledHandle，按最近使用排序
+        self._lock = threading.Lock()
+
+        # 统计信息
+        self.open_count = 0  # 实际调用 OpenProcess 的次数
+        self.reuse_count = 0  # 复用已缓存句柄、省去 OpenProcess 的次数
+        self.upgrade_count = 0  # 权限不足时按权限并集重新打开的次数
+        self.open_failures = 0
+        self.evicted_exit = 0  # 进程退出后关闭的句柄数
+        self.evicted_lru = 0  # 超出容量后关闭的句柄数
+
+        metrics = get_metrics_registry()
+        self._opened_counter = metrics.counter("handles.opened")
+        self._reused_counter = metrics.counter("handles.reused")
+
+    @property
+    def opener(self):
+        """句柄后端，首次使用时创建"""
+        if self._opener is None:
+            self._opener = Win32HandleOpener()
+        return self._opener
+
+    @contextmanager
+    def lease(self, entry, access):
+        """
+        借用进程句柄，退出上下文时归还（不会关闭仍在池中的句柄）
+
+        Args:
+            entry (ProcessEntry): 进程条目
+            access (int): 所需访问权限
+
+        Yields:
+            tuple: (句柄, 错误码)，打开失败时句柄为None
+        """
+        pooled, error = self._acquire(entry, access)
+        try:
+            yield (pooled.handle if pooled else None), error
+        finally:
+            if pooled:
+                self._release(pooled)
+
+    def _acquire(self, entry, access):
+        to_close = []
+        with self._lock:
+            pooled = self._handles.get(entry)
+            if pooled is not None and pooled.access & access == access:
+                self._handles.move_to_end(entry)
+                pooled.leases += 1
+                self.reuse_count += 1
+                self._reused_counter.inc()
+                return pooled, 0
+
+            if pooled is not None:
+                # 已有句柄权限不足，按并集重新打开，之后的所有操作都能共用
+                access |= pooled.access
+                self.upgrade_count += 1
+                self._discard_locked(entry, to_close)
+            # PID复用后旧进程的句柄不再有效
+            for key in [key for key in self._handles if key.pid == entry.pid]:
+                self.evicted_exit += 1
+                self._discard_locked(key, to_close)
+
+        self._close_all(to_close)
+        to_close = []
+        handle, error = self.opener.open(entry.pid, access)
+
+        with self._lock:
+            self.open_count += 1
+            self._opened_counter.inc()
+            if handle is None:
+                self.open_failures += 1
+                return None, error
+            pooled = _PooledHandle(handle, access)
+            pooled.leases = 1
+            previous = self._handles.pop(entry, None)
+            if previous is not None:
+                # 另一个线程同时打开了同一进程，保留新句柄
+                self._mark_stale_locked(previous, to_close)
+            self._handles[entry] = pooled
+            while len(self._handles) > self.capacity:
+                key = next(iter(self._handles))
+                self.evicted_lru += 1
+                self._discard_locked(key, to_close)
+        self._close_all(to_close)
+        return pooled, 0
+
+    def _release(self, pooled):
+        with self._lock:
+            pooled.leases -= 1
+            close = pooled.stale and pooled.leases == 0
+        if close:
+            self._close_all([pooled.handle])
+
+    def _discard_locked(self, entry, to_close):
+        """移出池，没有使用者时加入待关闭列表（调用方需持有锁）"""
+        pooled = self._handles.pop(entry, None)
+        if pooled is not None:
+            self._mark_stale_locked(pooled, to_close)
+
+    @staticmethod
+    def _mark_stale_locked(pooled, to_close):
+        pooled.stale = True
+        if pooled.leases == 0:
+            to_close.append(pooled.handle)
+
+    def _close_all(self, handles):
+        for handle in handles:
+            try:
+                self.opener.close(handle)
+            except Exception as e:
+                logger.debug(f"关闭进程句柄失败: {str(e)}")
+
+    def discard(self, entry):
+        """
+        移除指定进程的句柄，操作失败（如进程正在退出）时调用，下次使用时重新打开
+
+        Args:
+            entry (ProcessEntry): 进程条目
+        """
+        to_close = []
+        with self._lock:
+            self._discard_locked(entry, to_close)
+        self._close_all(to_close)
+
+    def prune(self, snapshot):
+        """
+        关闭已退出进程的句柄，可直接注册为快照引擎的监听者
+
+        Args:
+            snapshot (ProcessSnapshot): 进程快照
+        """
+        to_close = []
+        with self._lock:
+            for entry in [entry for entry in self._handles if entry not in snapshot]:
+                self.evicted_exit += 1
+                self._discard_locked(entry, to_close)
+        self._close_all(to_close)
+
+    def close_all(self):
+        """关闭池中的所有句柄"""
+        to_close = []
+        with self._lock:
+            for entry in list(self._handles):
+                self._discard_locked(entry, to_close)
+        self._close_all(to_close)
+
+    def get_stats(self):
+        """
+        获取句柄池统计信息
+
+        Returns:
+            dict: 缓存句柄数、实际打开次数、复用次数、权限升级次数及各类关闭次数
+        """
+        with self._lock:
+            size = len(self._handles)
+        requests = self.open_count + self.reuse_count
+        return {
+            "size": size,
+            "capacity": self.capacity,
+            "opened": self.open_count,
+            "reused": self.reuse_count,
+            "reuse_rate": self.reuse_count / requests if requests else 0.0,
+            "upgrades": self.upgrade_count,
+            "open_failures": self.open_failures,
+            "evicted_exit": self.evicted_exit,
+            "evicted_lru": self.evicted_lru,
+        }
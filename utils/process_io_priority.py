@@ -6,16 +6,15 @@
 """
 
 import ctypes
-import time
+import os
 import threading
+import time
+from collections import namedtuple
 from typing import Optional, Tuple, Dict, Any
 from ctypes import wintypes
 import psutil
 from utils.logger import logger
-from win32api import OpenProcess, CloseHandle
-from win32con import PROCESS_ALL_ACCESS
 from win32process import (
-    SetPriorityClass, 
     IDLE_PRIORITY_CLASS, 
     BELOW_NORMAL_PRIORITY_CLASS, 
     ABOVE_NORMAL_PRIORITY_CLASS,
@@ -26,6 +25,14 @@ from win32process import (
 
 # 导入权限管理器
 from utils.privilege_manager import get_privilege_manager
+from utils.process_snapshot import ProcessEntry, get_process_snapshot_engine
+from utils.process_events import create_process_event_source
+from utils.process_handle_pool import ProcessHandlePool
+from utils.parallel_apply import ParallelApplier, STATUS_OK, STATUS_TIMEOUT
+from utils.metrics import get_metrics_registry
+from utils.adaptive_scheduler import get_adaptive_scheduler
+from utils.task_scheduler import get_task_scheduler
+from utils.cpu_topology import get_cpu_topology, CoreIntent, DEFAULT_ECO_INTENT, TOPOLOGY_CACHE_FILE
 
 # =============================================================================
 # Windows API 常量和结构体定义
@@ -35,6 +42,8 @@ from utils.privilege_manager import get_privilege_manager
 PROCESS_SET_INFORMATION = 0x0200
 PROCESS_QUERY_INFORMATION = 0x0400
 PROCESS_ALL_ACCESS = 0x1F0FFF
+# I/O优先级、CPU优先级、CPU亲和性和功耗节流所需权限的并集，四项设置共用一个句柄
+OPTIMIZE_ACCESS = PROCESS_SET_INFORMATION | PROCESS_QUERY_INFORMATION
 
 # ProcessInformationClass 枚举
 ProcessIoPriority = 33
@@ -43,6 +52,30 @@ ProcessIoPriority = 33
 PROCESS_POWER_THROTTLING_INFORMATION = 4
 PROCESS_POWER_THROTTLING_EXECUTION_SPEED = 0x1
 
+# 完整优化包含的四项设置
+OPTIMIZE_ATTRIBUTES = ('io', 'cpu', 'affinity', 'power')
+
+class ApplyReport(namedtuple('ApplyReport', ['pid', 'changed', 'unchanged', 'failed'])):
+    """单个进程一次优化的差异报告，各字段为设置项名称元组：已写入、已是目标状态无需写入、写入失败"""
+    
+    __slots__ = ()
+    
+    @property
+    def succeeded(self) -> bool:
+        """I/O优先级已是目标状态或写入成功即视为优化成功，各处的成功计数都使用此判定"""
+        return 'io' in self.changed or 'io' in self.unchanged
+
+
+# 按进程名配置批量优化的结果：成功优化的进程数、尝试优化的进程数、各进程的差异报告列表
+BatchResult = namedtuple('BatchResult', ['success', 'attempted', 'reports'])
+
+# 多个进程并行优化的线程数和单个进程的超时时间（秒），对受保护或正在退出的进程 OpenProcess 可能阻塞
+PARALLEL_APPLY_WORKERS = 4
+PARALLEL_APPLY_TIMEOUT = 2.0
+
+# 订阅到系统原生进程创建通知后，完整遍历自动优化列表只作为兜底的最短间隔（秒）
+SAFETY_SWEEP_INTERVAL = 120
+
 
 class IO_PRIORITY_HINT:
     """I/O优先级枚举"""
@@ -94,7 +127,7 @@ class PerformanceModeConfig:
     
     # 性能模式到CPU亲和性策略的映射
     CPU_AFFINITY_MAP = {
-        PERFORMANCE_MODE.ECO_MODE: "last_core",        # 效能模式：绑定到最后一个核心
+        PERFORMANCE_MODE.ECO_MODE: "eco_cores",        # 效能模式：绑定到按CPU拓扑选择的核心
         PERFORMANCE_MODE.NORMAL_MODE: "all_cores",     # 正常模式：绑定所有核心
         PERFORMANCE_MODE.HIGH_PERFORMANCE: "all_cores", # 高性能：绑定所有核心
         PERFORMANCE_MODE.MAXIMUM_PERFORMANCE: "all_cores"  # 最大性能：绑定所有核心
@@ -146,6 +179,26 @@ class ProcessIoPriorityManager:
         
         # 缓存系统CPU核心数
         self._cpu_count = psutil.cpu_count(logical=True)
+        
+        # 效能模式的核心选择意图，由I/O优先级服务按配置设置
+        self.eco_core_intent = DEFAULT_ECO_INTENT
+        # 返回游戏进程可使用的逻辑处理器集合的函数，由创建进程监控器的一方设置（GameProcessMonitor.get_game_cpus）；
+        # 未设置时无法得知游戏占用的核心，避开游戏核心的意图改为按能效核心选择
+        self.game_cpus_provider = None
+        
+        # 进程句柄池：每个进程只打开一次句柄，供四项设置和之后的每轮检查复用，进程退出后随快照关闭
+        self.handle_pool = ProcessHandlePool()
+        get_process_snapshot_engine().add_listener(self.handle_pool.prune)
+        self.optimize_count = 0  # 调用完整优化的次数，用于统计句柄池省去的打开次数
+        
+        # 先读取当前状态，只写入与目标不同的设置项
+        metrics = get_metrics_registry()
+        self._write_counter = metrics.counter("io_priority.writes")
+        self._skip_counter = metrics.counter("io_priority.writes_skipped")
+        
+        # 多个目标进程（自动优化列表、一键优化）并行优化，单个进程阻塞不影响其他进程；
+        # 工作线程只在并行优化时存在，空闲后退出
+        self.applier = ParallelApplier(PARALLEL_APPLY_WORKERS, PARALLEL_APPLY_TIMEOUT)
     
     def _init_api_functions(self):
         """初始化Windows API函数"""
@@ -158,6 +211,35 @@ class ProcessIoPriorityManager:
             ctypes.c_ulong      # ProcessInformationLength
         ]
         self.NtSetInformationProcess.restype = ctypes.c_ulong
+        
+        # 使用句柄池中的句柄设置CPU优先级、CPU亲和性和功耗模式
+        self.SetPriorityClass = self.kernel32.SetPriorityClass
+        self.SetPriorityClass.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+        self.SetPriorityClass.restype = wintypes.BOOL
+        self.SetProcessAffinityMask = self.kernel32.SetProcessAffinityMask
+        self.SetProcessAffinityMask.argtypes = [wintypes.HANDLE, ctypes.c_size_t]
+        self.SetProcessAffinityMask.restype = wintypes.BOOL
+        self.SetProcessInformation = self.kernel32.SetProcessInformation
+        self.SetProcessInformation.argtypes = [wintypes.HANDLE, ctypes.c_int, ctypes.c_void_p, wintypes.DWORD]
+        self.SetProcessInformation.restype = wintypes.BOOL
+        
+        # 读取当前状态，已是目标状态的设置项不再写入
+        self.NtQueryInformationProcess = self.ntdll.NtQueryInformationProcess
+        self.NtQueryInformationProcess.argtypes = [
+            wintypes.HANDLE, ctypes.c_int, ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(ctypes.c_ulong)
+        ]
+        self.NtQueryInformationProcess.restype = ctypes.c_ulong
+        self.GetPriorityClass = self.kernel32.GetPriorityClass
+        self.GetPriorityClass.argtypes = [wintypes.HANDLE]
+        self.GetPriorityClass.restype = wintypes.DWORD
+        self.GetProcessAffinityMask = self.kernel32.GetProcessAffinityMask
+        self.GetProcessAffinityMask.argtypes = [
+            wintypes.HANDLE, ctypes.POINTER(ctypes.c_size_t), ctypes.POINTER(ctypes.c_size_t)
+        ]
+        self.GetProcessAffinityMask.restype = wintypes.BOOL
+        self.GetProcessInformation = self.kernel32.GetProcessInformation
+        self.GetProcessInformation.argtypes = [wintypes.HANDLE, ctypes.c_int, ctypes.c_void_p, wintypes.DWORD]
+        self.GetProcessInformation.restype = wintypes.BOOL
     
     def _check_privileges(self):
         """检查并记录权限状态"""
@@ -168,7 +250,7 @@ class ProcessIoPriorityManager:
             if not self.privilege_manager.check_admin_rights():
                 logger.warning("建议以管理员身份运行程序以获得完整的进程管理权限")
     
-    def set_process_io_priority(self, process_id: int, priority: int = None, performance_mode: int = PERFORMANCE_MODE.ECO_MODE) -> bool:
+    def set_process_io_priority(self, process_id: int, priority: int = None, performance_mode: int = PERFORMANCE_MODE.ECO_MODE, create_time: float = None) -> bool:
         """
         根据性能模式设置指定进程的完整优化
         
@@ -176,63 +258,134 @@ class ProcessIoPriorityManager:
             process_id: 进程ID
             priority: I/O优先级（如果为None，则根据性能模式自动确定）
             performance_mode: 性能模式
+            create_time: 进程创建时间，用于区分PID复用（如果为None，则从进程快照中查找）
             
         Returns:
             bool: 操作是否成功
         """
+        return self.apply_performance_mode(process_id, priority, performance_mode, create_time).succeeded
+    
+    def apply_performance_mode(self, process_id: int, priority: int = None, performance_mode: int = PERFORMANCE_MODE.ECO_MODE, create_time: float = None) -> ApplyReport:
+        """
+        读取进程当前的I/O优先级、CPU优先级、CPU亲和性和功耗节流状态，只写入与性能模式目标不同的项
+        
+        Args:
+            process_id: 进程ID
+            priority: I/O优先级（如果为None，则根据性能模式自动确定）
+            performance_mode: 性能模式
+            create_time: 进程创建时间，用于区分PID复用（如果为None，则从进程快照中查找）
+            
+        Returns:
+            ApplyReport: 已写入、无需写入和写入失败的设置项
+        """
+        changed, unchanged, failed = [], [], []
         try:
             # 根据性能模式自动确定I/O优先级（如果未指定）
             if priority is None:
                 priority = self.config.IO_PRIORITY_MAP.get(performance_mode, IO_PRIORITY_HINT.IoPriorityLow)
             
-            mode_text = self.config.MODE_DESCRIPTIONS.get(performance_mode, f"未知模式({performance_mode})")
-            logger.debug(f"开始优化进程(PID={process_id}) - {mode_text}")
-            
-            # 执行优化步骤
-            results = {}
-            
-            # 1. 设置I/O优先级
-            results['io'] = self._set_io_priority(process_id, priority)
-            if not results['io']:
-                logger.error(f"设置进程(PID={process_id})I/O优先级失败")
-                return False
-            
-            # 2. 设置CPU优先级
-            results['cpu'] = self._set_cpu_priority(process_id, performance_mode)
-            
-            # 3. 设置CPU亲和性
-            results['affinity'] = self._set_cpu_affinity_by_mode(process_id, performance_mode)
-            
-            # 4. 设置功耗节流模式
-            results['power'] = self._set_power_throttling(process_id, performance_mode)
-            
-            # 记录结果
-            success_count = sum(1 for success in results.values() if success)
-            logger.debug(f"进程优化完成(PID={process_id}): {success_count}/4 项成功 - I/O={results['io']}, CPU={results['cpu']}, 亲和性={results['affinity']}, 功耗={results['power']} ({mode_text})")
-            
-            # 只要I/O优先级设置成功就认为操作成功
-            return results['io']
+            entry = self._process_entry(process_id, create_time)
+            self.optimize_count += 1
+            with self.handle_pool.lease(entry, OPTIMIZE_ACCESS) as (process_handle, error_code):
+                if not process_handle:
+                    self._log_process_error(process_id, error_code, "打开进程")
+                    return ApplyReport(process_id, (), (), OPTIMIZE_ATTRIBUTES)
+                
+                # 四项设置共用同一个句柄：(名称, 读取当前值, 是否已是目标状态, 写入)，读取失败时直接写入
+                cpu_target = self.config.CPU_PRIORITY_MAP.get(performance_mode, NORMAL_PRIORITY_CLASS)
+                power_target = self._target_power_throttling(performance_mode)
+                steps = (
+                    ('io', self._get_io_priority, lambda current: current == priority,
+                     lambda: self._set_io_priority(process_handle, process_id, priority)),
+                    ('cpu', self._get_cpu_priority, lambda current: current == cpu_target,
+                     lambda: self._set_cpu_priority(process_handle, process_id, performance_mode)),
+                    ('affinity', self._get_cpu_affinity, lambda current: self._affinity_satisfied(current, performance_mode),
+                     lambda: self._set_cpu_affinity_by_mode(process_handle, process_id, performance_mode)),
+                    ('power', self._get_power_throttling, lambda current: current == power_target,
+                     lambda: self._set_power_throttling(process_handle, process_id, performance_mode)),
+                )
+                for name, read, satisfied, write in steps:
+                    current = read(process_handle)
+                    if current is not None and satisfied(current):
+                        unchanged.append(name)
+                        continue
+                    if write():
+                        changed.append(name)
+                    else:
+                        failed.append(name)
+                        if name == 'io':
+                            logger.error(f"设置进程(PID={process_id})I/O优先级失败")
+                            # 进程可能正在退出，下次重新打开句柄，其余设置不再尝试
+                            self.handle_pool.discard(entry)
+                            break
+            
+            self._write_counter.inc(len(changed) + len(failed))
+            self._skip_counter.inc(len(unchanged))
+            if changed or failed:
+                mode_text = self.config.MODE_DESCRIPTIONS.get(performance_mode, f"未知模式({performance_mode})")
+                logger.debug(
+                    f"进程优化完成(PID={process_id}, {mode_text}): 已写入 {changed}，无需写入 {unchanged}，失败 {failed}"
+                )
             
         except Exception as e:
             logger.error(f"设置进程优化时发生错误: {str(e)}")
-            return False
+            attempted = set(changed) | set(unchanged)
+            failed = [name for name in OPTIMIZE_ATTRIBUTES if name not in attempted]
+        
+        return ApplyReport(process_id, tuple(changed), tuple(unchanged), tuple(failed))
     
-    def _set_io_priority(self, process_id: int, priority: int) -> bool:
+    def apply_many(self, targets, should_cancel=None, on_progress=None) -> list:
+        """
+        并行优化多个进程，单个进程超时后不再等待，结果按输入顺序返回
+        
+        Args:
+            targets: (进程ID, I/O优先级, 性能模式, 进程创建时间) 元组列表，I/O优先级为None时根据性能模式自动确定
+            should_cancel: 返回True时取消尚未开始的进程（如界面进度对话框的取消按钮）
+            on_progress: 接收 (已完成数, 总数) 的进度回调
+            
+        Returns:
+            list: 与 targets 顺序一致的差异报告（ApplyReport），超时或取消的进程所有设置项均记为失败
+        """
+        outcomes = self.applier.run(
+            lambda target: self.apply_performance_mode(*target), targets,
+            should_cancel=should_cancel, on_progress=on_progress
+        )
+        reports = []
+        for outcome in outcomes:
+            if outcome.status == STATUS_OK:
+                reports.append(outcome.result)
+                continue
+            process_id = outcome.target[0]
+            if outcome.status == STATUS_TIMEOUT:
+                logger.warning(f"优化进程(PID={process_id})超过 {self.applier.timeout:g} 秒未完成，已跳过")
+            reports.append(ApplyReport(process_id, (), (), OPTIMIZE_ATTRIBUTES))
+        return reports
+    
+    def get_handle_stats(self) -> Dict[str, Any]:
+        """
+        获取句柄池统计信息
+        
+        Returns:
+            dict: 句柄池统计，opens_saved 为相比每项设置各自打开进程（每次优化4次）省去的打开次数，
+                writes/writes_skipped 为实际写入和因已是目标状态而跳过的设置项数，parallel 为并行优化统计
+        """
+        stats = self.handle_pool.get_stats()
+        stats['opens_saved'] = max(0, self.optimize_count * 4 - stats['opened'])
+        stats['writes'] = self._write_counter.value
+        stats['writes_skipped'] = self._skip_counter.value
+        stats['parallel'] = self.applier.get_stats()
+        return stats
+    
+    def _process_entry(self, process_id: int, create_time: float = None) -> ProcessEntry:
+        """获取句柄池使用的进程条目，未提供创建时间时从共享进程快照中查找"""
+        if create_time is not None:
+            return ProcessEntry(process_id, create_time)
+        entry = get_process_snapshot_engine().get_snapshot().lookup(process_id)
+        return entry or ProcessEntry(process_id, 0.0)
+    
+    def _set_io_priority(self, process_handle, process_id: int, priority: int) -> bool:
         """设置I/O优先级"""
-        process_handle = None
         try:
-            # 打开进程句柄
-            process_handle = self.kernel32.OpenProcess(
-                PROCESS_SET_INFORMATION | PROCESS_QUERY_INFORMATION,
-                False,
-                process_id
-            )
-            
-            if not process_handle:
-                error_code = ctypes.GetLastError()
-                self._log_process_error(process_id, error_code, "打开进程")
-                return False
-            
             # 设置优先级值
             priority_value = ctypes.c_int(priority)
             
@@ -255,11 +408,8 @@ class ProcessIoPriorityManager:
         except Exception as e:
             logger.error(f"设置I/O优先级时发生错误: {str(e)}")
             return False
-        finally:
-            if process_handle:
-                self.kernel32.CloseHandle(process_handle)
     
-    def _set_cpu_priority(self, process_id: int, performance_mode: int) -> bool:
+    def _set_cpu_priority(self, process_handle, process_id: int, performance_mode: int) -> bool:
         """根据性能模式设置CPU优先级"""
         try:
             # 获取对应的优先级类
@@ -269,62 +419,123 @@ class ProcessIoPriorityManager:
             if performance_mode == PERFORMANCE_MODE.MAXIMUM_PERFORMANCE:
                 logger.warning(f"正在为进程(PID={process_id})设置实时优先级，这可能影响系统稳定性")
             
-            # 打开进程并设置优先级
-            handle = OpenProcess(PROCESS_ALL_ACCESS, False, process_id)
-            if not handle:
-                logger.error(f"无法打开进程(PID={process_id})用于设置CPU优先级")
+            if not self.SetPriorityClass(process_handle, priority_class):
+                logger.error(f"设置进程(PID={process_id})CPU优先级失败，错误码: {self.kernel32.GetLastError()}")
                 return False
             
-            try:
-                SetPriorityClass(handle, priority_class)
-                priority_name = self.config.PRIORITY_NAMES.get(priority_class, f"未知({priority_class})")
-                logger.debug(f"成功设置进程(PID={process_id})的CPU优先级为: {priority_name}")
-                return True
-            finally:
-                CloseHandle(handle)
+            priority_name = self.config.PRIORITY_NAMES.get(priority_class, f"未知({priority_class})")
+            logger.debug(f"成功设置进程(PID={process_id})的CPU优先级为: {priority_name}")
+            return True
                 
         except Exception as e:
             logger.error(f"设置CPU优先级时发生错误: {str(e)}")
             return False
     
-    def _set_cpu_affinity_by_mode(self, process_id: int, performance_mode: int) -> bool:
-        """根据性能模式设置CPU亲和性"""
+    def _set_cpu_affinity_by_mode(self, process_handle, process_id: int, performance_mode: int) -> bool:
+        """根据性能模式设置CPU亲和性，目标核心只选择一次，记录和写入的是同一组核心"""
         try:
-            affinity_strategy = self.config.CPU_AFFINITY_MAP.get(performance_mode, "all_cores")
-            
-            if self._cpu_count <= 1:
+            cores = self._target_affinity_cores(performance_mode)
+            if cores is None:
                 logger.debug(f"系统只有一个核心，跳过CPU亲和性设置(PID={process_id})")
                 return True
             
-            proc = psutil.Process(process_id)
+            mask = sum(1 << core for core in cores)
+            if not self.SetProcessAffinityMask(process_handle, mask):
+                logger.error(f"设置进程(PID={process_id})CPU亲和性失败，错误码: {self.kernel32.GetLastError()}")
+                return False
             
-            if affinity_strategy == "last_core":
-                # 效能模式：绑定到最后一个核心
-                last_core = self._cpu_count - 1
-                proc.cpu_affinity([last_core])
-                logger.debug(f"成功设置进程(PID={process_id})的CPU亲和性到核心{last_core}")
-            else:  # "all_cores"
-                # 其他模式：绑定到所有核心
-                all_cores = list(range(self._cpu_count))
-                proc.cpu_affinity(all_cores)
+            if self.config.CPU_AFFINITY_MAP.get(performance_mode, "all_cores") == "eco_cores":
+                logger.debug(f"成功设置进程(PID={process_id})的CPU亲和性到核心{cores}")
+            else:
                 logger.debug(f"成功设置进程(PID={process_id})的CPU亲和性到所有核心")
-            
             return True
             
         except Exception as e:
             logger.error(f"设置CPU亲和性时发生错误: {str(e)}")
             return False
     
-    def _set_power_throttling(self, process_id: int, performance_mode: int) -> bool:
+    def _target_affinity_cores(self, performance_mode: int) -> Optional[list]:
+        """性能模式对应的目标核心列表，单核系统返回None（不设置亲和性）"""
+        if self._cpu_count <= 1:
+            return None
+        if self.config.CPU_AFFINITY_MAP.get(performance_mode, "all_cores") == "eco_cores":
+            # 效能模式：按CPU拓扑选择核心（能效核心、负载最低或不与游戏共享物理核心）
+            intent, game_cpus = self.eco_core_intent, None
+            if intent == CoreIntent.AVOID_GAME:
+                if self.game_cpus_provider is None:
+                    intent = CoreIntent.EFFICIENCY
+                else:
+                    try:
+                        game_cpus = self.game_cpus_provider()
+                    except Exception as e:
+                        logger.debug(f"获取游戏占用的核心失败: {str(e)}")
+                        game_cpus = None
+            return get_cpu_topology().select(intent, game_cpus=game_cpus)
+        # 其他模式：绑定到所有核心
+        return list(range(self._cpu_count))
+    
+    def _affinity_satisfied(self, current_mask: int, performance_mode: int) -> bool:
+        """
+        判断当前亲和性是否已满足性能模式，单核系统不设置亲和性
+        
+        效能模式所选核心随负载和游戏占用的核心变化，绑定到某个核心后该核心负载升高，下次往往会选中别的核心；
+        因此与 GameProcessMonitor._is_process_optimized 一致，亲和性已被限制在部分核心上就视为已优化，避免每轮都重新绑定
+        """
+        if self._cpu_count <= 1:
+            return True
+        all_cores_mask = (1 << self._cpu_count) - 1
+        if self.config.CPU_AFFINITY_MAP.get(performance_mode, "all_cores") == "eco_cores":
+            return 0 < current_mask and current_mask & all_cores_mask != all_cores_mask
+        return current_mask & all_cores_mask == all_cores_mask
+    
+    @staticmethod
+    def _target_power_throttling(performance_mode: int) -> Tuple[int, int]:
+        """性能模式对应的目标功耗节流状态 (ControlMask, StateMask)，只有效能模式启用节流"""
+        state = PROCESS_POWER_THROTTLING_EXECUTION_SPEED if performance_mode == PERFORMANCE_MODE.ECO_MODE else 0
+        return PROCESS_POWER_THROTTLING_EXECUTION_SPEED, state
+    
+    def _get_io_priority(self, process_handle) -> Optional[int]:
+        """读取当前I/O优先级，失败时返回None"""
+        priority_value = ctypes.c_int(0)
+        return_length = ctypes.c_ulong(0)
+        status = self.NtQueryInformationProcess(
+            process_handle,
+            ProcessIoPriority,
+            ctypes.byref(priority_value),
+            ctypes.sizeof(priority_value),
+            ctypes.byref(return_length)
+        )
+        return priority_value.value if status == 0 else None
+    
+    def _get_cpu_priority(self, process_handle) -> Optional[int]:
+        """读取当前CPU优先级类，失败时返回None"""
+        priority_class = self.GetPriorityClass(process_handle)
+        return priority_class or None
+    
+    def _get_cpu_affinity(self, process_handle) -> Optional[int]:
+        """读取当前CPU亲和性掩码，失败时返回None"""
+        process_mask = ctypes.c_size_t(0)
+        system_mask = ctypes.c_size_t(0)
+        if not self.GetProcessAffinityMask(process_handle, ctypes.byref(process_mask), ctypes.byref(system_mask)):
+            return None
+        return process_mask.value
+    
+    def _get_power_throttling(self, process_handle) -> Optional[Tuple[int, int]]:
+        """读取当前功耗节流状态 (ControlMask, StateMask)，失败时返回None"""
+        throttling_state = PROCESS_POWER_THROTTLING_STATE()
+        throttling_state.Version = 1
+        if not self.GetProcessInformation(
+            process_handle,
+            PROCESS_POWER_THROTTLING_INFORMATION,
+            ctypes.byref(throttling_state),
+            ctypes.sizeof(throttling_state)
+        ):
+            return None
+        return throttling_state.ControlMask, throttling_state.StateMask
+    
+    def _set_power_throttling(self, process_handle, process_id: int, performance_mode: int) -> bool:
         """设置进程的功耗节流模式"""
-        process_handle = None
         try:
-            # 打开进程句柄
-            process_handle = self.kernel32.OpenProcess(PROCESS_ALL_ACCESS, False, process_id)
-            if not process_handle:
-                logger.error(f"无法打开进程(PID={process_id})句柄用于设置功耗模式")
-                return False
-            
             # 创建功耗节流状态结构体
             throttling_state = PROCESS_POWER_THROTTLING_STATE()
             throttling_state.Version = 1
@@ -346,8 +557,7 @@ class ProcessIoPriorityManager:
                     mode_text = "最大性能模式(禁用节流)"
             
             # 调用API设置功耗模式
-            SetProcessInformation = self.kernel32.SetProcessInformation
-            result = SetProcessInformation(
+            result = self.SetProcessInformation(
                 process_handle,
                 PROCESS_POWER_THROTTLING_INFORMATION,
                 ctypes.byref(throttling_state),
@@ -365,9 +575,6 @@ class ProcessIoPriorityManager:
         except Exception as e:
             logger.error(f"设置进程功耗模式时发生异常: {str(e)}")
             return False
-        finally:
-            if process_handle:
-                self.kernel32.CloseHandle(process_handle)
     
     def _log_process_error(self, process_id: int, error_code: int, operation: str):
         """记录进程操作错误的详细信息"""
@@ -408,12 +615,14 @@ class ProcessIoPriorityManager:
         total_count = 0
         
         try:
-            # 查找所有匹配的进程
-            for proc in psutil.process_iter(['pid', 'name']):
-                if proc.info['name'].lower() == process_name.lower():
-                    total_count += 1
-                    if self.set_process_io_priority(proc.info['pid'], priority, performance_mode):
-                        success_count += 1
+            # 从共享进程快照中查找所有匹配的进程，避免重复遍历进程表
+            snapshot = get_process_snapshot_engine().get_snapshot()
+            targets = [
+                (entry.pid, priority, performance_mode, entry.create_time)
+                for entry in snapshot.get(process_name)
+            ]
+            total_count = len(targets)
+            success_count = sum(1 for report in self.apply_many(targets) if report.succeeded)
             
             if total_count == 0:
                 logger.warning(f"未找到名为 {process_name} 的进程")
@@ -427,6 +636,47 @@ class ProcessIoPriorityManager:
             logger.error(f"通过名称设置进程优化时发生错误: {str(e)}")
             return (success_count, total_count)
     
+    def set_process_io_priority_batch(self, process_configs, should_cancel=None, on_progress=None) -> Dict[str, BatchResult]:
+        """
+        为按进程名配置的列表（如自动优化列表）中的所有进程并行设置优化，整个列表只读取一次进程快照
+        
+        Args:
+            process_configs: 包含 name、performance_mode 和可选 priority 字段的配置字典列表
+            should_cancel: 返回True时取消尚未开始的进程
+            on_progress: 接收 (已完成数, 总数) 的进度回调
+            
+        Returns:
+            dict: 配置中的进程名 -> BatchResult（成功数、尝试数、各进程的差异报告），未找到进程的名称不包含在内
+        """
+        # 小写进程名 -> 配置，同名配置以后出现的为准
+        name_rules = {
+            config['name'].lower(): config
+            for config in process_configs or []
+            if isinstance(config, dict) and config.get('name')
+        }
+        
+        reports = {}
+        try:
+            snapshot = get_process_snapshot_engine().get_snapshot()
+            names, targets = [], []
+            for name, entries in snapshot.select(name_rules).items():
+                config = name_rules[name]
+                performance_mode = config.get('performance_mode', PERFORMANCE_MODE.ECO_MODE)
+                # 未指定I/O优先级时根据性能模式自动确定，已是目标状态的设置项不再写入
+                for entry in entries:
+                    names.append(config['name'])
+                    targets.append((entry.pid, config.get('priority'), performance_mode, entry.create_time))
+                reports[config['name']] = []
+            
+            for name, report in zip(names, self.apply_many(targets, should_cancel, on_progress)):
+                reports[name].append(report)
+        except Exception as e:
+            logger.error(f"批量设置进程优化时发生错误: {str(e)}")
+        return {
+            name: BatchResult(sum(1 for report in name_reports if report.succeeded), len(name_reports), name_reports)
+            for name, name_reports in reports.items()
+        }
+    
     def get_process_info(self, process_id: int) -> Optional[Dict[str, Any]]:
         """获取进程信息"""
         try:
@@ -455,17 +705,36 @@ class ProcessIoPriorityService:
         """初始化I/O优先级服务"""
         self.config_manager = config_manager
         self.io_manager = get_io_priority_manager()
+        get_cpu_topology(os.path.join(config_manager.config_dir, TOPOLOGY_CACHE_FILE))
+        self.io_manager.eco_core_intent = config_manager.monitor_eco_core_intent
         self.running = False
-        self.thread = None
-        self.check_interval = 30  # 检查间隔，单位秒
+        self._task = None  # 统一任务调度器中的定时检查任务
+        self.check_interval = 30  # 基准检查间隔，单位秒，实际间隔随游戏会话状态调整
+        self.max_check_interval = 300  # 空闲退避时的最大检查间隔，单位秒
         self.auto_optimize_enabled = True  # 自动优化开关
+        self.scheduler = get_adaptive_scheduler()
+        
+        # 进程创建事件源：自动优化列表中的进程启动后立即优化，定时检查只作为兜底
+        self.event_source = None
+        self._watched_names = frozenset()
+        self._last_sweep = None  # 上次完整检查的时间（time.monotonic()）
+        self.spawn_optimized = 0  # 进程启动后立即优化的次数
+        # 等待优化的新启动进程，同一进程的重复事件合并；由后台任务批量交给并行执行器，单个进程超时后跳过
+        self._spawn_lock = threading.Lock()
+        self._pending_spawns = {}  # 进程ID -> ProcessStartEvent
+        self._spawn_task_pending = False
+        metrics = get_metrics_registry()
+        self._spawn_latency = metrics.histogram("io_priority.spawn_to_optimized_ms", "ms")
+        self._spawn_detect_latency = metrics.histogram("io_priority.spawn_detect_ms", "ms")
     
     def start_service(self) -> bool:
         """启动I/O优先级服务"""
         if not self.running:
             self.running = True
-            self.thread = threading.Thread(target=self._service_loop, daemon=True)
-            self.thread.start()
+            # 遍历进程并调用Win32接口，在调度器的工作线程中执行，启动后立即检查一次
+            self._task = get_task_scheduler().schedule(
+                "io_priority", self._service_loop, self._next_check_interval, delay=0, blocking=True
+            )
             return True
         return False
     
@@ -473,25 +742,153 @@ class ProcessIoPriorityService:
         """停止I/O优先级服务"""
         if self.running:
             self.running = False
-            if self.thread and self.thread.is_alive():
-                self.thread.join(1.0)
+            if self._task:
+                self._task.cancel()
+                self._task = None
+            self._stop_event_source()
+            # 并行优化的工作线程随服务停止退出，之后再次使用时重新创建
+            self.io_manager.applier.shutdown()
             return True
         return False
     
     def _service_loop(self):
-        """服务主循环"""
-        while self.running:
+        """定时检查任务"""
+        try:
+            # 自动优化列表变化时重新订阅进程创建事件并立即完整检查一次
+            names_changed = self._sync_event_source()
+            if not self.auto_optimize_enabled:
+                return
+            # 只有系统原生通知才能保证进程启动后立即优化；轮询回退依赖快照引擎的发布，
+            # 监控关闭时快照引擎不运行、收不到任何事件，仍按原间隔完整检查
+            now = time.monotonic()
+            native = self.event_source is not None and self.event_source.native
+            if (names_changed or not native or self._last_sweep is None
+                    or now - self._last_sweep >= SAFETY_SWEEP_INTERVAL):
+                self._last_sweep = now
+                self._check_and_optimize_processes()
+        except Exception as e:
+            logger.error(f"I/O优先级服务出错: {str(e)}")
+    
+    def _sync_event_source(self) -> bool:
+        """
+        按当前自动优化列表订阅进程创建事件（系统通知的过滤条件在订阅时确定，列表变化后需要重新订阅）
+        
+        Returns:
+            bool: 关注的进程名是否发生变化
+        """
+        names = frozenset()
+        if self.running and self.auto_optimize_enabled:
+            names = frozenset(
+                config['name'].lower()
+                for config in self.config_manager.io_priority_processes or []
+                if isinstance(config, dict) and config.get('name')
+            )
+        if names == self._watched_names and (self.event_source is not None or not names):
+            return False
+        
+        self._stop_event_source()
+        self._watched_names = names
+        if names:
+            self.event_source = create_process_event_source(get_process_snapshot_engine(), names)
+            self.event_source.subscribe(self._on_process_started)
+            logger.debug(f"自动优化已订阅 {len(names)} 个进程名的启动事件 (来源: {self.event_source.name})")
+        return True
+    
+    def _stop_event_source(self):
+        """停止进程创建事件源"""
+        if self.event_source:
+            self.event_source.unsubscribe(self._on_process_started)
+            self.event_source.stop()
+            self.event_source = None
+        self._watched_names = frozenset()
+    
+    def _on_process_started(self, event):
+        """
+        进程创建事件回调，在事件源线程中执行，只记录进程并按需提交后台任务，不阻塞后续事件
+        
+        Args:
+            event (ProcessStartEvent): 进程启动事件
+        """
+        if not (self.running and self.auto_optimize_enabled):
+            return
+        with self._spawn_lock:
+            self._pending_spawns[event.pid] = event
+            if self._spawn_task_pending:
+                return
+            self._spawn_task_pending = True
+        # 优化可能因 OpenProcess 等调用阻塞，放在后台通道执行，不占用快照和状态刷新等周期任务的工作线程
+        get_task_scheduler().submit_background(self._optimize_started_processes)
+    
+    def _optimize_started_processes(self):
+        """后台任务：批量优化等待中的新启动进程，直到没有新的事件"""
+        while True:
+            with self._spawn_lock:
+                events = list(self._pending_spawns.values())
+                self._pending_spawns.clear()
+                if not events or not self.running:
+                    self._spawn_task_pending = False
+                    return
             try:
-                if self.auto_optimize_enabled:
-                    self._check_and_optimize_processes()
+                self._optimize_started_batch(events)
             except Exception as e:
-                logger.error(f"I/O优先级服务出错: {str(e)}")
-            
-            # 分段睡眠，便于及时响应停止信号
-            for _ in range(self.check_interval):
-                if not self.running:
-                    break
-                time.sleep(1)
+                logger.error(f"优化新启动的进程时出错: {str(e)}")
+    
+    def _optimize_started_batch(self, events):
+        """按自动优化列表中的配置并行优化刚启动的进程，并记录从进程创建到优化完成的延迟"""
+        configs = {}
+        for item in self.config_manager.io_priority_processes or []:
+            if isinstance(item, dict) and item.get('name'):
+                configs[item['name'].lower()] = item
+        
+        started, targets = [], []
+        for event in events:
+            config = configs.get(event.name.lower())
+            if config is None:
+                continue
+            started.append(event)
+            targets.append((
+                event.pid, config.get('priority'),
+                config.get('performance_mode', PERFORMANCE_MODE.ECO_MODE), event.create_time or None
+            ))
+        if not targets:
+            return
+        
+        # 经由并行执行器优化，单个进程超时后跳过，服务停止时取消尚未开始的进程
+        reports = self.io_manager.apply_many(targets, should_cancel=lambda: not self.running)
+        for event, report in zip(started, reports):
+            if len(report.failed) == len(OPTIMIZE_ATTRIBUTES):
+                logger.debug(f"优化新启动的进程 {event.name} (PID: {event.pid}) 失败")
+                continue
+            self.spawn_optimized += 1
+            latency_text = ""
+            if event.create_time:
+                latency_ms = max(0.0, time.time() - event.create_time) * 1000
+                self._spawn_latency.observe(latency_ms)
+                self._spawn_detect_latency.observe(max(0.0, event.detected_at - event.create_time) * 1000)
+                latency_text = f"，启动后 {latency_ms:.0f}ms 完成"
+            logger.debug(
+                f"已优化新启动的进程 {event.name} (PID: {event.pid}, 来源: {event.source}){latency_text}，"
+                f"写入 {list(report.changed)}，失败 {list(report.failed)}"
+            )
+    
+    def get_spawn_stats(self) -> Dict[str, Any]:
+        """
+        获取启动即优化统计
+        
+        Returns:
+            dict: 事件源名称、关注的进程名数、启动后立即优化的次数，以及从进程创建到检测、到优化完成的延迟分位数
+        """
+        return {
+            "event_source": self.event_source.name if self.event_source else None,
+            "watched": len(self._watched_names),
+            "optimized": self.spawn_optimized,
+            "detect_ms": self._spawn_detect_latency.summary(),
+            "optimized_ms": self._spawn_latency.summary(),
+        }
+    
+    def _next_check_interval(self) -> float:
+        """下次检查前的等待时间（秒）"""
+        return self.scheduler.interval(self.check_interval, job="io_priority", max_interval=self.max_check_interval)
     
     def _check_and_optimize_processes(self):
         """检查并优化指定进程"""
@@ -499,27 +896,23 @@ class ProcessIoPriorityService:
         if not processes_to_optimize:
             return
         
-        total_processes = 0
-        successful_processes = 0
+        # 整个列表共用一个进程快照，每个进程名只查找一次
+        results = self.io_manager.set_process_io_priority_batch(processes_to_optimize)
+        reports = [report for result in results.values() for report in result.reports]
+        if not reports:
+            return
         
-        for proc_config in processes_to_optimize:
-            if not isinstance(proc_config, dict) or 'name' not in proc_config:
-                continue
-            
-            process_name = proc_config['name']
-            performance_mode = proc_config.get('performance_mode', PERFORMANCE_MODE.ECO_MODE)
-            
-            # 根据性能模式自动确定I/O优先级
-            success, count = self.io_manager.set_process_io_priority_by_name(
-                process_name, 
-                priority=None,  # 自动确定优先级
-                performance_mode=performance_mode
+        # 已是目标状态的进程不会产生写入，只在有写入或失败时记录
+        changed = sum(len(report.changed) for report in reports)
+        failed = sum(len(report.failed) for report in reports)
+        unchanged = sum(len(report.unchanged) for report in reports)
+        if changed or failed:
+            handle_stats = self.io_manager.get_handle_stats()
+            success = sum(result.success for result in results.values())
+            logger.debug(
+                f"自动优化完成: 检查 {len(reports)} 个进程，成功 {success} 个，写入 {changed} 项，无需写入 {unchanged} 项，失败 {failed} 项，"
+                f"句柄池累计打开 {handle_stats['opened']} 次，省去 {handle_stats['opens_saved']} 次"
             )
-            total_processes += count
-            successful_processes += success
-        
-        if total_processes > 0:
-            logger.debug(f"自动优化完成: 已处理 {successful_processes}/{total_processes} 个进程")
 
 
 # =============================================================================
@@ -0,0 +1,441 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+进程表录制与回放模块
+录制器按固定间隔把进程表（pid、名称、父进程、创建时间、CPU时间、内存、IO计数）以增量帧追加写入文件，
+回放时通过可注入的进程数据源和虚拟时钟把录制内容交给快照引擎与监控决策逻辑，
+从而在没有反作弊环境的机器（包括Linux）上离线测试决策延迟、系统调用次数和CPU开销
+
+文件格式为每行一个紧凑JSON对象（扩展名为 .gz 时使用gzip压缩），只追加不改写：
+    第一行为文件头 {"format": ..., "version": 1, "started": 录制开始的时间戳, "interval": 录制间隔}
+    之后每行一帧 {"t": 相对时间, "add": [[pid, 名称, ppid, 创建时间, CPU秒, RSS, 读字节, 写字节]],
+                  "del": [pid], "upd": [[pid, CPU秒, RSS, 读字节, 写字节]]}
+    再次向同一文件录制时，新会话的第一帧带 "reset": true 并包含完整的进程表
+"""
+
+import bisect
+import gzip
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+import psutil
+from utils.logger import logger
+from utils.process_snapshot import ProcessEntry, ProcessSnapshotEngine
+
+
+RECORDING_FORMAT = "ace-killer-process-recording"
+RECORDING_VERSION = 1
+
+# 录制的单个进程
+ProcessRow = namedtuple(
+    "ProcessRow", ["pid", "name", "ppid", "create_time", "cpu_time", "rss", "read_bytes", "write_bytes"]
+)
+
+# 一帧：time 为相对录制开始的秒数，processes 为 pid -> ProcessRow
+RecordingFrame = namedtuple("RecordingFrame", ["time", "processes"])
+
+_PROCESS_ATTRS = ["pid", "name", "ppid", "create_time", "cpu_times", "memory_info", "io_counters"]
+
+
+def _open(path, mode):
+    """按扩展名打开普通或gzip压缩的文本文件"""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _dump(record):
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def read_process_table():
+    """
+    一次遍历读取当前进程表
+
+    Returns:
+        dict: pid -> ProcessRow
+    """
+    table = {}
+    for proc in psutil.process_iter(_PROCESS_ATTRS):
+        info = proc.info
+        if not info.get("name"):
+            continue
+        cpu_times = info.get("cpu_times")
+        memory_info = info.get("memory_info")
+        io_counters = info.get("io_counters")
+        table[info["pid"]] = ProcessRow(
+            info["pid"],
+            info["name"],
+            info.get("ppid") or 0,
+            round(info.get("create_time") or 0.0, 3),
+            round(cpu_times.user + cpu_times.system, 2) if cpu_times else 0.0,
+            memory_info.rss if memory_info else 0,
+            io_counters.read_bytes if io_counters else 0,
+            io_counters.write_bytes if io_counters else 0,
+        )
+    return table
+
+
+class ProcessRecorder:
+    """进程表录制器，只写入与上一帧相比的变化"""
+
+    def __init__(self, path, interval=1.0, reader=read_process_table):
+        """
+        初始化录制器
+
+        Args:
+            path (str): 录制文件路径，文件已存在时追加新会话
+            interval (float): 录制间隔（秒）
+            reader (callable): 读取进程表的函数，返回 pid -> ProcessRow
+        """
+        self.path = path
+        self.interval = interval
+        self._reader = reader
+        self._previous = {}
+        self._file = None
+        self._started = None
+        self._reset = False
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        # 统计信息
+        self.frame_count = 0
+        self.bytes_written = 0
+
+    def _open(self):
+        """打开文件，新文件写入文件头，已有文件沿用其开始时间"""
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            with _open(self.path, "r") as f:
+                header = json.loads(f.readline())
+            if header.get("format") != RECORDING_FORMAT:
+                raise ValueError(f"不是进程录制文件: {self.path}")
+            self._started = header["started"]
+            self._reset = True
+            self._file = _open(self.path, "a")
+        else:
+            self._started = time.time()
+            self._file = _open(self.path, "a")
+            self._write(
+                {
+                    "format": RECORDING_FORMAT,
+                    "version": RECORDING_VERSION,
+                    "started": self._started,
+                    "interval": self.interval,
+                }
+            )
+
+    def _write(self, record):
+        line = _dump(record)
+        self._file.write(line)
+        self._file.flush()
+        self.bytes_written += len(line)
+
+    def record_frame(self):
+        """
+        读取一次进程表并追加一帧
+
+        Returns:
+            dict: 写入的帧（新增、退出和变化的进程）
+        """
+        if self._file is None:
+            self._open()
+
+        table = self._reader()
+        previous = self._previous
+        frame = {"t": round(time.time() - self._started, 3)}
+        if self._reset:
+            frame["reset"] = True
+            previous = {}
+            self._reset = False
+
+        added = []
+        updated = []
+        for pid, row in table.items():
+            old = previous.get(pid)
+            if old is None or old.create_time != row.create_time or old.name != row.name:
+                added.append(list(row))
+            elif old[4:] != row[4:]:
+                updated.append([pid, row.cpu_time, row.rss, row.read_bytes, row.write_bytes])
+        # PID被复用时新进程通过 add 覆盖，只有真正退出的PID写入 del
+        removed = [pid for pid in previous if pid not in table]
+
+        if added:
+            frame["add"] = added
+        if removed:
+            frame["del"] = removed
+        if updated:
+            frame["upd"] = updated
+        self._write(frame)
+        self._previous = table
+        self.frame_count += 1
+        return frame
+
+    def record(self, duration):
+        """
+        在当前线程中录制指定时长
+
+        Args:
+            duration (float): 录制时长（秒）
+        """
+        deadline = time.monotonic() + duration
+        while not self._stop_event.is_set():
+            self.record_frame()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._stop_event.wait(min(self.interval, remaining))
+
+    def start(self):
+        """启动后台录制线程"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._record_loop, daemon=True)
+        self._thread.start()
+        logger.debug(f"开始录制进程表: {self.path}")
+
+    def _record_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                self.record_frame()
+            except Exception as e:
+                logger.error(f"录制进程表失败: {str(e)}")
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        """停止录制并关闭文件"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(self.interval + 1.0)
+            self._thread = None
+        if self._file:
+            self._file.close()
+            self._file = None
+        logger.debug(f"进程表录制结束: {self.frame_count} 帧, {self.bytes_written} 字节")
+
+
+class ProcessRecording:
+    """加载到内存中的进程表录制"""
+
+    def __init__(self, frames, started=0.0, interval=1.0):
+        """
+        Args:
+            frames (list): RecordingFrame 列表，按时间排序
+            started (float): 录制开始的时间戳
+            interval (float): 录制间隔（秒）
+        """
+        self.frames = frames
+        self.started = started
+        self.interval = interval
+        self._times = [frame.time for frame in frames]
+
+        # 每个进程第一次出现在录制中的时间，用于计算决策延迟
+        self.first_seen = {}
+        for frame in frames:
+            for row in frame.processes.values():
+                self.first_seen.setdefault(ProcessEntry(row.pid, row.create_time), frame.time)
+
+    @classmethod
+    def load(cls, path):
+        """
+        从文件加载录制
+
+        Args:
+            path (str): 录制文件路径
+
+        Returns:
+            ProcessRecording: 录制
+        """
+        frames = []
+        state = {}
+        with _open(path, "r") as f:
+            header = json.loads(f.readline())
+            if header.get("format") != RECORDING_FORMAT:
+                raise ValueError(f"不是进程录制文件: {path}")
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # 录制被中断时最后一行可能不完整
+                    logger.warning(f"忽略录制文件中无法解析的行: {path}")
+                    continue
+                if record.get("reset"):
+                    state = {}
+                else:
+                    state = dict(state)
+                for pid in record.get("del", ()):
+                    state.pop(pid, None)
+                for values in record.get("add", ()):
+                    state[values[0]] = ProcessRow(*values)
+                for pid, cpu_time, rss, read_bytes, write_bytes in record.get("upd", ()):
+                    row = state.get(pid)
+                    if row is not None:
+                        state[pid] = row._replace(
+                            cpu_time=cpu_time, rss=rss, read_bytes=read_bytes, write_bytes=write_bytes
+                        )
+                frames.append(RecordingFrame(record["t"], state))
+        return cls(frames, header.get("started", 0.0), header.get("interval", 1.0))
+
+    @property
+    def start_time(self):
+        return self.frames[0].time if self.frames else 0.0
+
+    @property
+    def end_time(self):
+        return self.frames[-1].time if self.frames else 0.0
+
+    def frame_at(self, t):
+        """
+        获取指定时间点的进程表（该时间之前的最后一帧）
+
+        Args:
+            t (float): 相对录制开始的秒数
+
+        Returns:
+            RecordingFrame or None: 录制开始前返回None
+        """
+        index = bisect.bisect_right(self._times, t) - 1
+        return self.frames[index] if index >= 0 else None
+
+
+class VirtualClock:
+    """回放使用的虚拟时钟，只在回放驱动推进时前进"""
+
+    def __init__(self, start=0.0):
+        self.now = float(start)
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        """时钟前进指定秒数"""
+        self.now += max(0.0, seconds)
+
+    def set(self, t):
+        """时钟设置到指定时间（不回退）"""
+        self.now = max(self.now, float(t))
+
+
+class ReplayProcessSource:
+    """按虚拟时钟从录制中读取进程表的进程数据源，可注入 ProcessSnapshotEngine"""
+
+    def __init__(self, recording, clock):
+        """
+        Args:
+            recording (ProcessRecording): 录制
+            clock (VirtualClock): 虚拟时钟
+        """
+        self.recording = recording
+        self.clock = clock
+        self.syscalls = {"pids": 0, "resolve": 0, "info": 0}
+
+    def _table(self):
+        frame = self.recording.frame_at(self.clock())
+        return frame.processes if frame else {}
+
+    def pids(self):
+        self.syscalls["pids"] += 1
+        return list(self._table())
+
+    def resolve(self, pid):
+        self.syscalls["resolve"] += 1
+        row = self._table().get(pid)
+        if row is None:
+            return None
+        return row.name, row.create_time
+
+    def info(self, pid):
+        """
+        获取进程的完整录制信息（父进程、CPU时间、内存和IO计数）
+
+        Returns:
+            ProcessRow or None: 进程信息
+        """
+        self.syscalls["info"] += 1
+        return self._table().get(pid)
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class ReplayDriver:
+    """回放驱动：按快照引擎的刷新周期推进虚拟时钟，把每个快照交给决策函数并统计开销"""
+
+    def __init__(self, recording, decide, interval=2.0, scheduler=None):
+        """
+        初始化回放驱动
+
+        Args:
+            recording (ProcessRecording): 录制
+            decide (callable): 决策函数，接收 ProcessSnapshot，返回本次处理的 ProcessEntry 列表（可为None）
+            interval (float): 快照引擎的基础刷新周期（秒）
+            scheduler (AdaptivePollingScheduler, optional): 自适应轮询调度器，提供时按其调整刷新周期
+        """
+        self.recording = recording
+        self.decide = decide
+        self.clock = VirtualClock(recording.start_time)
+        self.source = ReplayProcessSource(recording, self.clock)
+        self.engine = ProcessSnapshotEngine(
+            interval=interval, source=self.source, full_rescan_interval=float("inf"), clock=self.clock
+        )
+        if scheduler is not None:
+            self.engine.scheduler = scheduler
+            self.engine.add_listener(scheduler.observe)
+
+    def run(self):
+        """
+        回放整个录制
+
+        Returns:
+            dict: 周期数、决策次数、决策延迟分位数（虚拟时间）、系统调用次数及决策与扫描的CPU耗时
+        """
+        latencies = []
+        decided = set()
+        ticks = 0
+        decide_cpu = 0.0
+        scan_cpu = 0.0
+        first_seen = self.recording.first_seen
+
+        while self.clock() <= self.recording.end_time:
+            start = time.process_time()
+            snapshot = self.engine.refresh(force=True)
+            scan_cpu += time.process_time() - start
+
+            start = time.process_time()
+            acted = self.decide(snapshot) or ()
+            decide_cpu += time.process_time() - start
+            ticks += 1
+
+            for entry in acted:
+                if entry in decided:
+                    continue
+                decided.add(entry)
+                if entry in first_seen:
+                    latencies.append(self.clock() - first_seen[entry])
+
+            self.clock.advance(self.engine.current_interval)
+
+        latencies.sort()
+        return {
+            "ticks": ticks,
+            "duration": self.recording.end_time - self.recording.start_time,
+            "decisions": len(decided),
+            "latency": {
+                "p50_s": _percentile(latencies, 0.5),
+                "p95_s": _percentile(latencies, 0.95),
+                "max_s": latencies[-1] if latencies else 0.0,
+            },
+            "syscalls": dict(self.source.syscalls),
+            "scan_cpu_ms": scan_cpu * 1000,
+            "decide_cpu_ms": decide_cpu * 1000,
+            "cpu_ms_per_tick": (scan_cpu + decide_cpu) * 1000 / ticks if ticks else 0.0,
+        }
@@ -0,0 +1,487 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+进程快照模块
+由单一生产者遍历进程表，向所有消费者发布按进程名索引的不可变快照
+"""
+
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+import psutil
+from utils.logger import logger
+from utils.metrics import get_metrics_registry
+from utils.task_scheduler import get_task_scheduler
+
+
+# 快照中的单个进程实例，(pid, create_time) 可唯一标识一个进程，避免PID复用误判
+ProcessEntry = namedtuple("ProcessEntry", ["pid", "create_time"])
+
+
+class ProcessSnapshot:
+    """不可变的进程快照，按小写进程名索引"""
+
+    __slots__ = ("_table", "_entries", "_pid_names", "version", "timestamp", "process_count", "scan_duration")
+
+    def __init__(
+        self, table, version=0, timestamp=0.0, process_count=0, scan_duration=0.0, entries=None, pid_names=None
+    ):
+        """
+        初始化进程快照
+
+        Args:
+            table (dict): 小写进程名 -> ProcessEntry 列表
+            version (int): 快照版本号，每次遍历进程表后递增
+            timestamp (float): 快照生成时间（time.monotonic）
+            process_count (int): 快照中的进程总数
+            scan_duration (float): 生成快照所用时间（秒）
+            entries (dict, optional): pid -> ProcessEntry，未提供时从 table 生成
+            pid_names (dict, optional): pid -> 小写进程名，未提供时从 table 生成
+        """
+        self._table = MappingProxyType({name: tuple(items) for name, items in table.items()})
+        if entries is None:
+            entries = {entry.pid: entry for items in self._table.values() for entry in items}
+        if pid_names is None:
+            pid_names = {entry.pid: name for name, items in self._table.items() for entry in items}
+        self._entries = MappingProxyType(entries)
+        self._pid_names = MappingProxyType(pid_names)
+        self.version = version
+        self.timestamp = timestamp
+        self.process_count = process_count
+        self.scan_duration = scan_duration
+
+    def get(self, process_name):
+        """
+        获取指定进程名的所有实例
+
+        Args:
+            process_name (str): 进程名称（不区分大小写）
+
+        Returns:
+            tuple: ProcessEntry 元组，未找到时为空元组
+        """
+        if not process_name:
+            return ()
+        return self._table.get(process_name.lower(), ())
+
+    def select(self, process_names):
+        """
+        批量查找多个进程名的所有实例，整个列表共用同一个快照
+
+        Args:
+            process_names (iterable): 小写进程名
+
+        Returns:
+            dict: 小写进程名 -> ProcessEntry 元组，未找到的进程名对应空元组
+        """
+        return {name: self._table.get(name, ()) for name in process_names}
+
+    def contains(self, process_name):
+        """判断快照中是否存在指定进程"""
+        return bool(self.get(process_name))
+
+    def names(self):
+        """获取快照中的所有小写进程名"""
+        return self._table.keys()
+
+    def items(self):
+        """遍历 (小写进程名, ProcessEntry 元组)"""
+        return self._table.items()
+
+    @property
+    def age(self):
+        """快照距今的时间（秒）"""
+        return time.monotonic() - self.timestamp
+
+    def lookup(self, pid):
+        """
+        按PID查找进程条目
+
+        Args:
+            pid (int): 进程ID
+
+        Returns:
+            ProcessEntry or None: 进程条目
+        """
+        return self._entries.get(pid)
+
+    def name_of(self, pid):
+        """
+        按PID查找小写进程名
+
+        Args:
+            pid (int): 进程ID
+
+        Returns:
+            str or None: 小写进程名
+        """
+        return self._pid_names.get(pid)
+
+    def __contains__(self, entry):
+        return self._entries.get(entry.pid) == entry
+
+    def __len__(self):
+        return self.process_count
+
+
+class PsutilProcessSource:
+    """基于psutil的进程数据源"""
+
+    def pids(self):
+        """
+        获取当前所有进程ID
+
+        Returns:
+            list: 进程ID列表
+        """
+        return psutil.pids()
+
+    def resolve(self, pid):
+        """
+        读取单个进程的名称和创建时间
+
+        Args:
+            pid (int): 进程ID
+
+        Returns:
+            tuple or None: (进程名称, 创建时间)，进程已退出或无名称时返回None
+        """
+        try:
+            proc = psutil.Process(pid)
+            with proc.oneshot():
+                name = proc.name()
+                try:
+                    create_time = proc.create_time()
+                except psutil.AccessDenied:
+                    create_time = 0.0
+        except (psutil.NoSuchProcess, psutil.ZombieProcess, psutil.AccessDenied):
+            return None
+        if not name:
+            return None
+        return name, create_time
+
+
+class ProcessSnapshotEngine:
+    """进程快照引擎，每个周期只遍历一次进程表，供所有监控线程和界面共享"""
+
+    def __init__(self, interval=2.0, source=None, full_rescan_interval=60.0, clock=time.monotonic):
+        """
+        初始化进程快照引擎
+
+        Args:
+            interval (float): 定时刷新周期（秒）
+            source (PsutilProcessSource, optional): 进程数据源，默认使用psutil
+            full_rescan_interval (float): 完整重建间隔（秒），用于纠正增量扫描期间遗漏的PID复用
+            clock (callable): 快照时间戳使用的单调时钟，回放录制的进程表时传入虚拟时钟
+        """
+        self.interval = interval
+        self.source = source or PsutilProcessSource()
+        self.clock = clock
+        self.full_rescan_interval = full_rescan_interval
+        self._known = {}  # pid -> 小写进程名
+        self._entries = {}  # pid -> ProcessEntry
+        self._by_name = {}  # 小写进程名 -> {pid: ProcessEntry}
+        self._unresolved = set()  # 无法解析的PID（无权限或无名称），退出前不再重复解析
+        self._invalid_pids = set()  # 使用者发现PID复用后标记，下次扫描时重新解析
+        self._invalid_lock = threading.Lock()  # 使用者线程标记与扫描线程读取互斥
+        self._last_full_scan = 0.0
+        self._snapshot = ProcessSnapshot({})
+        self._version = 0
+        self._last_scan_started = None  # 最近一次完成的遍历开始的时间（clock()）
+        self._scan_lock = threading.Lock()
+        self._condition = threading.Condition()
+        self._task = None  # 统一任务调度器中的定时刷新任务
+        self._listeners = []
+        self.scheduler = None  # 可选的自适应轮询调度器，用于调整定时刷新周期
+
+        # 统计信息
+        self.scan_count = 0  # 实际遍历进程表的次数
+        self.request_count = 0  # 消费者读取快照的次数
+        self.total_scan_time = 0.0  # 遍历进程表累计耗时（秒）
+        self.resolve_count = 0  # 解析进程名称的次数
+
+        # 运行指标
+        metrics = get_metrics_registry()
+        self._scan_histogram = metrics.histogram("snapshot.scan_ms", "ms")
+        self._inspected_histogram = metrics.histogram("snapshot.processes_inspected")
+        self._oversleep_histogram = metrics.histogram("snapshot.oversleep_ms", "ms")
+
+    @property
+    def running(self):
+        """定时刷新任务是否在运行"""
+        return self._task is not None and self._task.active
+
+    @property
+    def current_interval(self):
+        """当前的定时刷新周期（秒），设置了调度器时随游戏会话状态变化"""
+        if self.scheduler is None:
+            return self.interval
+        return self.scheduler.interval(self.interval)
+
+    def _scan(self):
+        """
+        增量扫描进程表：只解析新出现的PID，移除已退出的PID
+
+        Returns:
+            tuple: (进程名索引表, pid -> ProcessEntry, pid -> 小写进程名, 进程总数)
+        """
+        now = self.clock()
+        full = not self._known or now - self._last_full_scan >= self.full_rescan_interval
+        if full:
+            # 定期完整重建，纠正两次扫描之间发生且未被察觉的PID复用
+            self._known.clear()
+            self._entries.clear()
+            self._by_name.clear()
+            self._unresolved.clear()
+            self._last_full_scan = now
+
+        current = set(self.source.pids())
+        known = self._known
+        dirty = set()
+
+        with self._invalid_lock:
+            stale = self._invalid_pids & current
+            self._invalid_pids.clear()
+
+        for pid in [pid for pid in known if pid not in current or pid in stale]:
+            name = known.pop(pid)
+            del self._entries[pid]
+            self._by_name[name].pop(pid, None)
+            dirty.add(name)
+        self._unresolved.intersection_update(current)
+
+        for pid in current.difference(known, self._unresolved):
+            self.resolve_count += 1
+            resolved = self.source.resolve(pid)
+            if resolved is None:
+                self._unresolved.add(pid)
+                continue
+            name, create_time = resolved
+            name = name.lower()
+            entry = ProcessEntry(pid, create_time or 0.0)
+            known[pid] = name
+            self._entries[pid] = entry
+            self._by_name.setdefault(name, {})[pid] = entry
+            dirty.add(name)
+
+        for name in [name for name in dirty if not self._by_name.get(name)]:
+            self._by_name.pop(name, None)
+
+        if full:
+            table = {name: tuple(instances.values()) for name, instances in self._by_name.items()}
+        else:
+            # 只重建发生变化的进程名，其余直接复用上一份快照中的不可变元组
+            table = dict(self._snapshot.items())
+            for name in dirty:
+                instances = self._by_name.get(name)
+                if instances:
+                    table[name] = tuple(instances.values())
+                else:
+                    table.pop(name, None)
+
+        return table, dict(self._entries), dict(known), len(known)
+
+    def invalidate(self, pid):
+        """
+        标记PID需要重新解析（使用者发现创建时间不一致时调用）
+
+        Args:
+            pid (int): 进程ID
+        """
+        with self._invalid_lock:
+            self._invalid_pids.add(pid)
+
+    def refresh(self, force=False, max_age=None):
+        """
+        刷新快照，多个线程同时请求时只会进行一次遍历
+
+        Args:
+            force (bool): 是否强制遍历进程表
+            max_age (float, optional): 允许复用的快照最大年龄，默认使用当前的刷新周期（随自适应调度放大）
+
+        Returns:
+            ProcessSnapshot: 最新快照
+        """
+        if max_age is None:
+            # 定时刷新周期被放大时，使用者的默认复用期随之放大，否则会按基准周期频繁遍历，抵消退避效果
+            max_age = self.current_interval
+
+        snapshot = self._snapshot
+        requested = self.clock()
+        if not force and snapshot.version and requested - snapshot.timestamp < max_age:
+            return snapshot
+
+        with self._scan_lock:
+            # 等待锁期间其他线程可能已经完成了遍历，直接复用其结果；
+            # 强制刷新（如收到进程创建通知）只复用在请求之后才开始的遍历，之前开始的遍历可能看不到新进程
+            if self._snapshot.version != snapshot.version and (
+                not force or self._last_scan_started is not None and self._last_scan_started > requested
+            ):
+                return self._snapshot
+
+            scan_started = self.clock()
+            start = time.perf_counter()
+            resolves_before = self.resolve_count
+            try:
+                table, entries, pid_names, count = self._scan()
+            except Exception as e:
+                logger.error(f"遍历进程表失败: {str(e)}")
+                return snapshot
+            duration = time.perf_counter() - start
+
+            self.scan_count += 1
+            self.total_scan_time += duration
+            self._scan_histogram.observe(duration * 1000)
+            self._inspected_histogram.observe(self.resolve_count - resolves_before)
+            self._version += 1
+            self._last_scan_started = scan_started
+            snapshot = ProcessSnapshot(table, self._version, self.clock(), count, duration, entries, pid_names)
+            self._publish(snapshot)
+            return snapshot
+
+    def request_refresh(self):
+        """
+        请求尽快遍历一次进程表，不等待遍历完成（如收到进程创建通知时）
+
+        定时刷新运行时唤醒刷新任务，短时间内的多次请求合并为一次遍历，
+        遍历进行中收到的请求在本次结束后再遍历一次；定时刷新未运行时同步刷新
+        """
+        task = self._task
+        if task is not None and task.active:
+            task.wake()
+        else:
+            self.refresh(force=True)
+
+    def _publish(self, snapshot):
+        """发布新快照，通知监听者并唤醒等待中的消费者"""
+        with self._condition:
+            self._snapshot = snapshot
+            self._condition.notify_all()
+
+        for listener in list(self._listeners):
+            try:
+                listener(snapshot)
+            except Exception as e:
+                logger.error(f"进程快照监听者处理失败: {str(e)}")
+
+    def add_listener(self, listener):
+        """
+        注册快照发布回调，回调在执行遍历的线程中调用
+
+        Args:
+            listener (callable): 接收 ProcessSnapshot 的回调
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """取消注册快照发布回调"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def get_snapshot(self, max_age=None):
+        """
+        获取快照，仅在快照过期时才会遍历进程表
+
+        Args:
+            max_age (float, optional): 允许的快照最大年龄（秒）
+
+        Returns:
+            ProcessSnapshot: 进程快照
+        """
+        self.request_count += 1
+        return self.refresh(max_age=max_age)
+
+    def wait_for_snapshot(self, after_version=0, timeout=None):
+        """
+        等待比指定版本更新的快照
+
+        Args:
+            after_version (int): 已处理过的快照版本号
+            timeout (float, optional): 最长等待时间（秒），默认为两个当前刷新周期
+
+        Returns:
+            ProcessSnapshot: 最新快照（超时时返回当前快照）
+        """
+        if timeout is None:
+            timeout = self.current_interval * 2
+
+        if not self.running:
+            # 定时刷新未运行时按需刷新
+            snapshot = self.get_snapshot()
+            if snapshot.version <= after_version:
+                time.sleep(min(timeout, self.current_interval))
+                snapshot = self.get_snapshot()
+            return snapshot
+
+        self.request_count += 1
+        with self._condition:
+            self._condition.wait_for(lambda: self._snapshot.version > after_version, timeout)
+            return self._snapshot
+
+    def start(self):
+        """启动定时刷新任务，由统一任务调度器在工作线程中执行"""
+        if self.running:
+            return
+        self._task = get_task_scheduler().schedule(
+            "snapshot", self._produce, self._next_interval, delay=0, jitter=0, blocking=True
+        )
+        logger.debug("进程快照定时刷新已启动")
+
+    def stop(self):
+        """停止定时刷新任务"""
+        if not self.running:
+            return
+        self._task.cancel()
+        with self._condition:
+            self._condition.notify_all()
+        logger.debug("进程快照定时刷新已停止")
+
+    def _produce(self):
+        """定时刷新任务，每个周期遍历一次进程表"""
+        # 实际执行时间超出计划的部分（系统负载高、计时器精度不足或工作线程繁忙）
+        self._oversleep_histogram.observe(self._task.last_lateness * 1000)
+        self.refresh(force=True)
+
+    def _next_interval(self):
+        """下次刷新前的等待时间（秒）"""
+        if self.scheduler is None:
+            return self.interval
+        return self.scheduler.interval(self.interval, job="snapshot")
+
+    def get_stats(self):
+        """
+        获取快照引擎统计信息
+
+        Returns:
+            dict: 统计信息
+        """
+        snapshot = self._snapshot
+        return {
+            "scan_count": self.scan_count,
+            "request_count": self.request_count,
+            "scans_saved": max(0, self.request_count - self.scan_count),
+            "avg_scan_ms": (self.total_scan_time / self.scan_count * 1000) if self.scan_count else 0.0,
+            "last_scan_ms": snapshot.scan_duration * 1000,
+            "process_count": snapshot.process_count,
+            "resolve_count": self.resolve_count,
+            "version": snapshot.version,
+        }
+
+
+# 全局快照引擎实例
+_snapshot_engine = None
+_snapshot_engine_lock = threading.Lock()
+
+
+def get_process_snapshot_engine():
+    """获取ProcessSnapshotEngine单例"""
+    global _snapshot_engine
+    if _snapshot_engine is None:
+        with _snapshot_engine_lock:
+            if _snapshot_engine is None:
+                _snapshot_engine = ProcessSnapshotEngine()
+    return _snapshot_engine
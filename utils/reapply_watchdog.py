@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+重新应用看门狗模块
+部分进程（如SGuard64）会自行恢复被修改的优先级，或拒绝修改。看门狗按 (pid, create_time) 记录每个进程的
+"反抗"（状态被还原）和失败次数，以带随机抖动的指数退避安排重新应用，连续失败达到上限后放弃该进程，
+避免无效的系统调用和重复日志
+"""
+
+import random
+import threading
+import time
+
+from utils.logger import logger
+from utils.metrics import get_metrics_registry
+
+
+class _WatchState:
+    """单个 (进程, 动作) 的重新应用状态"""
+
+    __slots__ = (
+        "name",
+        "applied",
+        "streak",
+        "resets",
+        "attempts",
+        "failures",
+        "next_attempt_at",
+        "given_up",
+        "last_reset_at",
+    )
+
+    def __init__(self, name):
+        self.name = name
+        self.applied = True  # 最近一次已知的状态是否已应用
+        self.streak = 0  # 当前连续未能保持的次数，决定退避时长
+        self.resets = 0  # 状态被进程还原的累计次数
+        self.attempts = 0  # 重新应用的累计次数
+        self.failures = 0  # 应用失败的累计次数
+        self.next_attempt_at = 0.0  # 允许下次应用的时间（time.monotonic）
+        self.given_up = False
+        self.last_reset_at = None
+
+
+class ReapplyWatchdog:
+    """重新应用看门狗，由规则线程调用"""
+
+    def __init__(self, base_delay=2.0, max_delay=300.0, max_attempts=5, jitter=0.2, clock=time.monotonic, rng=None):
+        """
+        初始化看门狗
+
+        Args:
+            base_delay (float): 第一次重新应用前的等待时间（秒）
+            max_delay (float): 退避等待时间上限（秒）
+            max_attempts (int): 连续未能保持的次数上限，达到后放弃该进程，0表示不放弃
+            jitter (float): 退避时间的随机抖动比例（0~1）
+            clock (callable): 单调时钟
+            rng (random.Random, optional): 随机数生成器
+        """
+        self.base_delay = max(0.0, float(base_delay))
+        self.max_delay = max(self.base_delay, float(max_delay))
+        self.max_attempts = max(0, int(max_attempts))
+        self.jitter = min(max(0.0, float(jitter)), 1.0)
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._states = {}  # (ProcessEntry, 动作) -> _WatchState
+        self._fight_back = {}  # 进程名 -> 累计还原次数（进程重启后继续累计）
+        self._lock = threading.Lock()
+
+        metrics = get_metrics_registry()
+        self._resets = metrics.counter("reapply.resets")
+        self._attempts = metrics.counter("reapply.attempts")
+        self._suppressed = metrics.counter("reapply.suppressed")
+        self._given_up = metrics.counter("reapply.given_up")
+
+    def _delay(self, streak):
+        """按连续次数计算带抖动的退避时间"""
+        delay = min(self.max_delay, self.base_delay * (2 ** max(0, streak - 1)))
+        if self.jitter:
+            delay *= 1 + self._rng.uniform(-self.jitter, self.jitter)
+        return delay
+
+    def _state(self, entry, action, name):
+        state = self._states.get((entry, action))
+        if state is None:
+            state = self._states[(entry, action)] = _WatchState(name)
+        return state
+
+    def _schedule(self, state, entry, action):
+        """连续次数加一后安排下次应用时间，达到上限时放弃"""
+        state.streak += 1
+        if self.max_attempts and state.streak >= self.max_attempts:
+            state.given_up = True
+            self._given_up.inc()
+            logger.warning(
+                f"进程 {state.name} (PID: {entry.pid}) 连续 {state.streak} 次未能保持 {action} 状态，"
+                f"放弃重新应用（还原 {state.resets} 次, 失败 {state.failures} 次）"
+            )
+            return
+        state.next_attempt_at = self._clock() + self._delay(state.streak)
+
+    def on_reset(self, entry, action, name=""):
+        """
+        核验发现之前应用的状态被进程还原
+
+        Args:
+            entry (ProcessEntry): 进程条目
+            action (str): 动作名称
+            name (str): 进程名称
+        """
+        with self._lock:
+            state = self._state(entry, action, name)
+            state.applied = False
+            state.resets += 1
+            state.last_reset_at = self._clock()
+            self._fight_back[name] = self._fight_back.get(name, 0) + 1
+            self._resets.inc()
+            if state.given_up:
+                return
+            self._schedule(state, entry, action)
+            if not state.given_up:
+                logger.debug(
+                    f"进程 {name} (PID: {entry.pid}) 还原了 {action} 状态（第 {state.resets} 次），"
+                    f"{state.next_attempt_at - self._clock():.1f} 秒后重新应用"
+                )
+
+    def on_attempt(self, entry, action, success, name=""):
+        """
+        记录一次应用的结果，失败时按退避安排下次应用
+
+        Args:
+            entry (ProcessEntry): 进程条目
+            action (str): 动作名称
+            success (bool): 是否应用成功
+            name (str): 进程名称
+        """
+        with self._lock:
+            state = self._states.get((entry, action))
+            if success and state is None:
+                return
+            state = state or self._state(entry, action, name)
+            state.applied = bool(success)
+            state.attempts += 1
+            self._attempts.inc()
+            if not success:
+                state.failures += 1
+                if not state.given_up:
+                    self._schedule(state, entry, action)
+
+    def on_held(self, entry, action):
+        """
+        核验确认状态仍然保持，清除连续次数
+
+        Args:
+            entry (ProcessEntry): 进程条目
+            action (str): 动作名称
+        """
+        with self._lock:
+            state = self._states.get((entry, action))
+            if state is not None and not state.given_up:
+                state.applied = True
+                state.streak = 0
+                state.next_attempt_at = 0.0
+
+    def ready(self, entry, action):
+        """
+        判断现在是否允许应用，不允许时计入被抑制的次数
+
+        Args:
+            entry (ProcessEntry): 进程条目
+            action (str): 动作名称
+
+        Returns:
+            bool: 未放弃且退避时间已过时返回True
+        """
+        state = self._states.get((entry, action))
+        if state is None or (not state.given_up and self._clock() >= state.next_attempt_at):
+            return True
+        self._suppressed.inc()
+        return False
+
+    def is_pending(self, entry, action):
+        """
+        判断进程是否处于等待重新应用或已放弃的状态
+
+        Returns:
+            bool: 状态被还原或应用失败后尚未重新应用成功时返回True
+        """
+        state = self._states.get((entry, action))
+        return state is not None and not state.applied
+
+    def prune(self, snapshot):
+        """
+        清理已退出进程的记录，进程重启后（create_time不同）重新开始计数
+
+        Args:
+            snapshot (ProcessSnapshot): 最新进程快照
+        """
+        with self._lock:
+            for key in [key for key in self._states if key[0] not in snapshot]:
+                del self._states[key]
+
+    def clear(self):
+        """清除所有进程的记录（保留按进程名累计的还原次数）"""
+        with self._lock:
+            self._states.clear()
+
+    def get_stats(self, top=5):
+        """
+        获取看门狗统计信息
+
+        Args:
+            top (int): 返回还原次数最多的进程数量
+
+        Returns:
+            dict: 退避参数、跟踪的进程数、等待中与已放弃的进程数、各进程名的累计还原次数及当前还原最频繁的进程
+        """
+        with self._lock:
+            states = list(self._states.items())
+            fight_back = dict(self._fight_back)
+        now = self._clock()
+        processes = sorted(
+            (
+                {
+                    "name": state.name,
+                    "pid": entry.pid,
+                    "action": action,
+                    "resets": state.resets,
+                    "attempts": state.attempts,
+                    "failures": state.failures,
+                    "streak": state.streak,
+                    "given_up": state.given_up,
+                    "retry_in": (
+                        max(0.0, state.next_attempt_at - now) if not state.applied and not state.given_up else None
+                    ),
+                }
+                for (entry, action), state in states
+            ),
+            key=lambda item: (item["resets"] + item["failures"]),
+            reverse=True,
+        )
+        return {
+            "base_delay": self.base_delay,
+            "max_delay": self.max_delay,
+            "max_attempts": self.max_attempts,
+            "tracked": len(states),
+            "pending": sum(1 for _, state in states if not state.applied and not state.given_up),
+            "given_up": sum(1 for _, state in states if state.given_up),
+            "fight_back": fight_back,
+            "processes": processes[:top],
+        }
@@ -0,0 +1,316 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+服务状态查询模块
+通过一次批量枚举读取所有服务状态，复用最小权限的服务管理器句柄，并按TTL缓存结果
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+from utils.logger import logger
+
+
+# 服务状态：exists 是否存在，status 运行状态，start_type 启动类型
+ServiceStatus = namedtuple("ServiceStatus", ["exists", "status", "start_type"])
+
+MISSING_SERVICE = ServiceStatus(False, "unknown", "unknown")
+
+
+class ServiceStatusBackend:
+    """服务状态后端基类"""
+
+    def query(self, service_names):
+        """
+        批量查询服务状态
+
+        Args:
+            service_names (iterable): 服务名称
+
+        Returns:
+            dict: 服务名称 -> ServiceStatus，不存在的服务不包含在结果中
+        """
+        raise NotImplementedError
+
+    def invalidate(self, service_name=None):
+        """丢弃后端内部缓存的服务配置"""
+
+    def close(self):
+        """释放后端资源"""
+
+
+class Win32ServiceBackend(ServiceStatusBackend):
+    """Windows 服务管理器后端，使用 EnumServicesStatusEx 一次读取所有服务状态"""
+
+    # ERROR_INVALID_HANDLE，服务管理器句柄失效时需要重新打开
+    ERROR_INVALID_HANDLE = 6
+
+    def __init__(self):
+        self._scm_handle = None
+        self._start_types = {}  # 服务名称 -> 启动类型，启动类型很少变化，直到失效前一直复用
+        self._lock = threading.Lock()
+
+        self.enum_calls = 0
+        self.config_calls = 0
+
+    def _open_scm(self):
+        """打开只具备连接和枚举权限的服务管理器句柄"""
+        import win32service
+
+        if self._scm_handle is None:
+            self._scm_handle = win32service.OpenSCManager(
+                None, None, win32service.SC_MANAGER_CONNECT | win32service.SC_MANAGER_ENUMERATE_SERVICE
+            )
+        return self._scm_handle
+
+    def _query_start_type(self, scm_handle, service_name):
+        """查询单个服务的启动类型"""
+        import win32service
+
+        start_type_map = {
+            win32service.SERVICE_AUTO_START: "auto",
+            win32service.SERVICE_DEMAND_START: "manual",
+            win32service.SERVICE_DISABLED: "disabled",
+            win32service.SERVICE_BOOT_START: "boot",
+            win32service.SERVICE_SYSTEM_START: "system",
+        }
+
+        self.config_calls += 1
+        service_handle = win32service.OpenService(scm_handle, service_name, win32service.SERVICE_QUERY_CONFIG)
+        try:
+            service_config = win32service.QueryServiceConfig(service_handle)
+            return start_type_map.get(service_config[1], "unknown")
+        finally:
+            win32service.CloseServiceHandle(service_handle)
+
+    def query(self, service_names):
+        """一次枚举所有服务（包括驱动）的状态，只为关注的服务查询启动类型"""
+        import win32service
+
+        status_map = {
+            win32service.SERVICE_RUNNING: "running",
+            win32service.SERVICE_STOPPED: "stopped",
+            win32service.SERVICE_PAUSED: "paused",
+            win32service.SERVICE_START_PENDING: "start_pending",
+            win32service.SERVICE_STOP_PENDING: "stop_pending",
+            win32service.SERVICE_CONTINUE_PENDING: "continue_pending",
+            win32service.SERVICE_PAUSE_PENDING: "pause_pending",
+        }
+        wanted = {name.lower(): name for name in service_names}
+
+        with self._lock:
+            try:
+                scm_handle = self._open_scm()
+                self.enum_calls += 1
+                services = win32service.EnumServicesStatusEx(
+                    scm_handle,
+                    win32service.SERVICE_WIN32 | win32service.SERVICE_DRIVER,
+                    win32service.SERVICE_STATE_ALL,
+                )
+            except win32service.error as e:
+                # 句柄失效时关闭并在下次查询时重新打开
+                if e.args and e.args[0] == self.ERROR_INVALID_HANDLE:
+                    self.close()
+                raise
+
+            results = {}
+            for service in services:
+                name = wanted.get(service["ServiceName"].lower())
+                if name is None:
+                    continue
+                start_type = self._start_types.get(name)
+                if start_type is None:
+                    try:
+                        start_type = self._query_start_type(scm_handle, name)
+                    except win32service.error as e:
+                        logger.debug(f"查询服务 {name} 启动类型失败: {str(e)}")
+                        start_type = "unknown"
+                    self._start_types[name] = start_type
+                results[name] = ServiceStatus(True, status_map.get(service["CurrentState"], "unknown"), start_type)
+            return results
+
+    def invalidate(self, service_name=None):
+        """丢弃缓存的启动类型"""
+        with self._lock:
+            if service_name is None:
+                self._start_types.clear()
+            else:
+                self._start_types.pop(service_name, None)
+
+    def close(self):
+        """关闭服务管理器句柄"""
+        if self._scm_handle is not None:
+            import win32service
+
+            try:
+                win32service.CloseServiceHandle(self._scm_handle)
+            except win32service.error:
+                pass
+            self._scm_handle = None
+
+
+class FakeServiceBackend(ServiceStatusBackend):
+    """内存服务后端，用于在非Windows平台测试缓存行为和基准测试"""
+
+    def __init__(self, services=None, latency=0.0):
+        """
+        Args:
+            services (dict, optional): 服务名称 -> (运行状态, 启动类型)
+            latency (float): 每次批量查询的模拟耗时（秒）
+        """
+        self.services = dict(services or {})
+        self.latency = latency
+        self.enum_calls = 0
+
+    def set_service(self, service_name, status="running", start_type="auto"):
+        """添加或修改服务"""
+        self.services[service_name] = (status, start_type)
+
+    def delete_service(self, service_name):
+        """删除服务"""
+        self.services.pop(service_name, None)
+
+    def query(self, service_names):
+        self.enum_calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return {
+            name: ServiceStatus(True, *self.services[name]) for name in service_names if name in self.services
+        }
+
+
+class ServiceStatusProvider:
+    """带TTL缓存的服务状态提供者"""
+
+    def __init__(self, backend=None, ttl=2.0, clock=time.monotonic):
+        """
+        初始化服务状态提供者
+
+        Args:
+            backend (ServiceStatusBackend, optional): 服务状态后端，默认使用Windows服务管理器
+            ttl (float): 缓存有效期（秒）
+            clock (callable): 时钟函数，测试时可替换
+        """
+        self.backend = backend or Win32ServiceBackend()
+        self.ttl = ttl
+        self.clock = clock
+
+        self._watched = set()  # 需要批量查询的服务名称
+        self._cache = {}  # 服务名称 -> ServiceStatus
+        self._cache_time = None
+        self._lock = threading.Lock()
+
+        # 统计信息
+        self.hit_count = 0
+        self.miss_count = 0
+        self.query_count = 0
+        self.error_count = 0
+
+    def watch(self, service_names):
+        """
+        添加需要批量查询的服务，查询任意服务时会一并刷新
+
+        Args:
+            service_names (iterable): 服务名称
+        """
+        with self._lock:
+            new_names = set(service_names) - self._watched
+            if new_names:
+                self._watched |= new_names
+                self._cache_time = None
+
+    def _refresh(self):
+        """批量刷新所有关注的服务状态（调用方需持有锁）"""
+        self.query_count += 1
+        try:
+            found = self.backend.query(sorted(self._watched))
+        except Exception as e:
+            self.error_count += 1
+            logger.error(f"查询服务状态时发生错误: [{type(e).__name__}] {str(e)}")
+            found = {}
+        self._cache = {name: found.get(name, MISSING_SERVICE) for name in self._watched}
+        self._cache_time = self.clock()
+
+    def get_statuses(self, service_names):
+        """
+        获取多个服务的状态，缓存过期时一次批量查询
+
+        Args:
+            service_names (iterable): 服务名称
+
+        Returns:
+            dict: 服务名称 -> ServiceStatus
+        """
+        service_names = list(service_names)
+        with self._lock:
+            if not self._watched.issuperset(service_names):
+                self._watched.update(service_names)
+                self._cache_time = None
+
+            if self._cache_time is None or self.clock() - self._cache_time >= self.ttl:
+                self.miss_count += 1
+                self._refresh()
+            else:
+                self.hit_count += 1
+            return {name: self._cache.get(name, MISSING_SERVICE) for name in service_names}
+
+    def get_status(self, service_name):
+        """
+        获取单个服务的状态
+
+        Args:
+            service_name (str): 服务名称
+
+        Returns:
+            ServiceStatus: 服务状态
+        """
+        return self.get_statuses([service_name])[service_name]
+
+    def invalidate(self, service_name=None):
+        """
+        使缓存失效，停止或删除服务后调用以立即读取新状态
+
+        Args:
+            service_name (str, optional): 服务名称，为空时使所有缓存失效
+        """
+        with self._lock:
+            self._cache_time = None
+        self.backend.invalidate(service_name)
+
+    def get_stats(self):
+        """
+        获取缓存统计信息
+
+        Returns:
+            dict: 命中、未命中、批量查询及出错次数
+        """
+        total = self.hit_count + self.miss_count
+        return {
+            "hit_count": self.hit_count,
+            "miss_count": self.miss_count,
+            "hit_rate": self.hit_count / total if total else 0.0,
+            "query_count": self.query_count,
+            "error_count": self.error_count,
+            "ttl": self.ttl,
+        }
+
+    def close(self):
+        """释放后端资源"""
+        self.backend.close()
+
+
+# 全局服务状态提供者实例
+_service_status_provider = None
+_service_status_provider_lock = threading.Lock()
+
+
+def get_service_status_provider():
+    """获取ServiceStatusProvider单例"""
+    global _service_status_provider
+    if _service_status_provider is None:
+        with _service_status_provider_lock:
+            if _service_status_provider is None:
+                _service_status_provider = ServiceStatusProvider()
+    return _service_status_provider
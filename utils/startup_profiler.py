@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+启动导入耗时分析模块
+替换内置 __import__ 统计主线程中每个模块首次导入的累计耗时和自身耗时，并按导入层级输出耗时树
+"""
+
+import builtins
+import importlib.util
+import sys
+import threading
+import time
+
+
+class ImportRecord:
+    """单个模块的导入记录"""
+
+    __slots__ = ("name", "depth", "start", "cumulative", "children")
+
+    def __init__(self, name, depth, start):
+        self.name = name
+        self.depth = depth
+        self.start = start
+        self.cumulative = 0.0  # 包含子模块的总耗时（秒）
+        self.children = 0.0  # 子模块耗时（秒）
+
+    @property
+    def self_time(self):
+        """不含子模块的自身耗时（秒）"""
+        return max(0.0, self.cumulative - self.children)
+
+
+class ImportProfiler:
+    """导入耗时分析器"""
+
+    def __init__(self):
+        self.records = []  # 按导入开始顺序排列的 ImportRecord
+        self._stack = []
+        self._original_import = None
+        self._thread_id = None
+        self.installed_at = None
+
+    def install(self):
+        """开始统计（只统计调用此方法的线程中的导入）"""
+        if self._original_import is not None:
+            return
+        self._original_import = builtins.__import__
+        self._thread_id = threading.get_ident()
+        self.installed_at = time.perf_counter()
+        builtins.__import__ = self._import
+
+    def uninstall(self):
+        """停止统计并恢复内置 __import__"""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original_import = self._original_import
+        if threading.get_ident() != self._thread_id:
+            return original_import(name, globals, locals, fromlist, level)
+
+        module_name = name
+        if level:
+            try:
+                package = (globals or {}).get("__package__") or ""
+                module_name = importlib.util.resolve_name("." * level + name, package)
+            except (ImportError, ValueError):
+                return original_import(name, globals, locals, fromlist, level)
+
+        # 已导入的模块直接返回，不计入统计
+        if module_name in sys.modules:
+            return original_import(name, globals, locals, fromlist, level)
+
+        record = ImportRecord(module_name, len(self._stack), time.perf_counter())
+        self.records.append(record)
+        self._stack.append(record)
+        try:
+            return original_import(name, globals, locals, fromlist, level)
+        finally:
+            self._stack.pop()
+            record.cumulative = time.perf_counter() - record.start
+            if self._stack:
+                self._stack[-1].children += record.cumulative
+
+    def format_report(self, time_to_ready=None, threshold_ms=1.0):
+        """
+        生成导入耗时树
+
+        Args:
+            time_to_ready (float, optional): 从进程启动到托盘/窗口可用的总耗时（秒）
+            threshold_ms (float): 只显示累计耗时不低于此值的模块
+
+        Returns:
+            str: 报告文本
+        """
+        lines = [f"{'累计(ms)':>10} {'自身(ms)':>10}  模块"]
+        hidden_depth = None
+        for record in self.records:
+            # 父模块被过滤时跳过其所有子模块
+            if hidden_depth is not None:
+                if record.depth > hidden_depth:
+                    continue
+                hidden_depth = None
+            if record.cumulative * 1000 < threshold_ms:
+                hidden_depth = record.depth
+                continue
+            lines.append(
+                f"{record.cumulative * 1000:>10.1f} {record.self_time * 1000:>10.1f}  {'  ' * record.depth}{record.name}"
+            )
+
+        total_import = sum(record.cumulative for record in self.records if record.depth == 0)
+        lines.append(f"导入模块 {len(self.records)} 个，顶层导入总耗时 {total_import * 1000:.1f}ms")
+        if time_to_ready is not None:
+            lines.append(f"启动到托盘可用总耗时 {time_to_ready * 1000:.1f}ms")
+        return "\n".join(lines)
+
+
+# 全局分析器实例
+_import_profiler = None
+
+
+def get_import_profiler():
+    """获取ImportProfiler单例"""
+    global _import_profiler
+    if _import_profiler is None:
+        _import_profiler = ImportProfiler()
+    return _import_profiler
@@ -0,0 +1,282 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+状态快照模块
+由后台定时任务汇总各模块的运行状态，发布带版本号和内容摘要的不可变状态快照，界面线程只负责读取和渲染
+"""
+
+import hashlib
+import json
+import threading
+import time
+from types import MappingProxyType
+
+from utils.logger import logger
+from utils.metrics import get_metrics_registry
+from utils.overhead_governor import get_overhead_governor
+from utils.task_scheduler import get_task_scheduler
+
+
+def _freeze(value):
+    """递归地将字典和列表转换为只读的 MappingProxyType 和元组"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def compute_digest(sections):
+    """
+    计算状态内容摘要
+
+    Args:
+        sections (dict): 分区名称 -> 状态数据（可JSON序列化）
+
+    Returns:
+        str: 16位十六进制摘要
+    """
+    payload = json.dumps(sections, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class StatusSnapshot:
+    """不可变的状态快照，按分区名称索引"""
+
+    __slots__ = ("_sections", "version", "digest", "timestamp", "changed_at", "build_duration")
+
+    def __init__(self, sections, version=0, digest="", timestamp=0.0, changed_at=0.0, build_duration=0.0):
+        """
+        初始化状态快照
+
+        Args:
+            sections (dict): 分区名称 -> 状态数据
+            version (int): 快照版本号，仅在内容变化时递增
+            digest (str): 内容摘要
+            timestamp (float): 快照生成时间（time.monotonic）
+            changed_at (float): 内容发生变化的时间（time.time），用于界面显示
+            build_duration (float): 汇总状态所用时间（秒）
+        """
+        self._sections = _freeze(dict(sections))
+        self.version = version
+        self.digest = digest
+        self.timestamp = timestamp
+        self.changed_at = changed_at
+        self.build_duration = build_duration
+
+    def get(self, section, default=None):
+        """
+        获取指定分区的状态数据
+
+        Args:
+            section (str): 分区名称
+            default: 分区不存在时的返回值
+
+        Returns:
+            MappingProxyType: 只读的状态数据
+        """
+        return self._sections.get(section, default)
+
+    def sections(self):
+        """获取快照中的所有分区名称"""
+        return self._sections.keys()
+
+    @property
+    def age(self):
+        """快照距今的时间（秒）"""
+        return time.monotonic() - self.timestamp
+
+    def __getitem__(self, section):
+        return self._sections[section]
+
+    def __contains__(self, section):
+        return section in self._sections
+
+
+class StatusPublisher:
+    """状态发布器，后台定时任务定期调用各分区的采集函数，内容变化时发布新版本快照"""
+
+    def __init__(self, interval=1.0):
+        """
+        初始化状态发布器
+
+        Args:
+            interval (float): 定时采集周期（秒）
+        """
+        self.interval = interval
+        self._collectors = {}  # 分区名称 -> 采集函数
+        self._last_sections = {}  # 分区名称 -> 上次成功采集的数据，采集失败时沿用
+        self._snapshot = None
+        self._version = 0
+        self._build_lock = threading.Lock()
+        self._condition = threading.Condition()
+        self._task = None  # 统一任务调度器中的定时采集任务
+        self._listeners = []
+
+        # 运行指标
+        metrics = get_metrics_registry()
+        self._build_histogram = metrics.histogram("status.build_ms", "ms")
+        self._published = metrics.counter("status.published")
+        self._unchanged = metrics.counter("status.unchanged")
+        self._collector_errors = metrics.counter("status.collector_errors")
+
+    @property
+    def running(self):
+        """定时采集任务是否在运行"""
+        return self._task is not None and self._task.active
+
+    def register(self, section, collector):
+        """
+        注册分区采集函数，采集函数在后台线程中调用，返回可JSON序列化的字典
+
+        Args:
+            section (str): 分区名称
+            collector (callable): 无参数的采集函数
+        """
+        self._collectors[section] = collector
+
+    def unregister(self, section):
+        """取消注册分区采集函数"""
+        self._collectors.pop(section, None)
+        self._last_sections.pop(section, None)
+
+    def build(self):
+        """
+        调用所有采集函数汇总状态，内容摘要变化时发布新版本快照
+
+        Returns:
+            StatusSnapshot: 当前快照
+        """
+        with self._build_lock:
+            start = time.perf_counter()
+            sections = {}
+            for section, collector in list(self._collectors.items()):
+                try:
+                    sections[section] = collector()
+                except Exception as e:
+                    self._collector_errors.inc()
+                    logger.debug(f"采集状态分区 {section} 失败: {str(e)}")
+                    if section in self._last_sections:
+                        sections[section] = self._last_sections[section]
+            self._last_sections = sections
+
+            digest = compute_digest(sections)
+            build_duration = time.perf_counter() - start
+            self._build_histogram.observe(build_duration * 1000)
+
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.digest == digest:
+                self._unchanged.inc()
+                return snapshot
+
+            self._version += 1
+            snapshot = StatusSnapshot(
+                sections,
+                version=self._version,
+                digest=digest,
+                timestamp=time.monotonic(),
+                changed_at=time.time(),
+                build_duration=build_duration,
+            )
+            self._published.inc()
+
+        self._publish(snapshot)
+        return snapshot
+
+    def _publish(self, snapshot):
+        """发布新快照，通知监听者并唤醒等待中的读取者"""
+        with self._condition:
+            self._snapshot = snapshot
+            self._condition.notify_all()
+
+        for listener in list(self._listeners):
+            try:
+                listener(snapshot)
+            except Exception as e:
+                logger.error(f"状态快照监听者处理失败: {str(e)}")
+
+    def add_listener(self, listener):
+        """
+        注册快照发布回调，回调在后台采集线程中调用
+
+        Args:
+            listener (callable): 接收 StatusSnapshot 的回调
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """取消注册快照发布回调"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def get_snapshot(self):
+        """
+        获取最新快照，不会触发采集
+
+        Returns:
+            StatusSnapshot or None: 最新快照，尚未采集过时为None
+        """
+        return self._snapshot
+
+    def wait_for_snapshot(self, after_version=0, timeout=None):
+        """
+        等待比指定版本更新的快照
+
+        Args:
+            after_version (int): 已渲染过的快照版本号
+            timeout (float, optional): 最长等待时间（秒）
+
+        Returns:
+            StatusSnapshot or None: 最新快照（超时时返回当前快照）
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._snapshot is not None and self._snapshot.version > after_version, timeout
+            )
+            return self._snapshot
+
+    def request_refresh(self):
+        """请求立即重新采集，用于用户操作后尽快反映新状态，采集进行中的多次请求合并为一次"""
+        if self.running:
+            self._task.wake()
+        else:
+            self.build()
+
+    def start(self):
+        """启动定时采集任务，采集函数会查询进程和服务，在调度器的工作线程中执行"""
+        if self.running:
+            return
+        self._task = get_task_scheduler().schedule(
+            "status", self.build, self._next_interval, delay=0, jitter=0.2, blocking=True
+        )
+        logger.debug("状态发布任务已启动")
+
+    def stop(self):
+        """停止定时采集任务"""
+        if not self.running:
+            return
+        self._task.cancel()
+        logger.debug("状态发布任务已停止")
+
+    def _next_interval(self):
+        """下次采集前的等待时间（秒），自身开销超出预算时放大采集周期"""
+        return get_overhead_governor().stretch(self.interval)
+
+    def get_stats(self):
+        """
+        获取状态发布器统计信息
+
+        Returns:
+            dict: 统计信息
+        """
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version if snapshot else 0,
+            "digest": snapshot.digest if snapshot else "",
+            "published": self._published.value,
+            "unchanged": self._unchanged.value,
+            "collector_errors": self._collector_errors.value,
+            "last_build_ms": snapshot.build_duration * 1000 if snapshot else 0.0,
+        }
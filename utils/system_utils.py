@@ -235,4 +235,25 @@ def disable_auto_start(app_name=None):
         return False
 
 
- 
\ No newline at end of file
+def find_icon_path():
+    """
+    查找应用图标路径
+    
+    Returns:
+        str or None: 找到的图标路径，如果未找到则返回None
+    """
+    # 查找图标文件
+    base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    icon_paths = [
+        # 标准开发环境路径
+        os.path.join(base_path, 'assets', 'icon', 'favicon.ico'),
+        # 打包环境路径
+        os.path.join(os.path.dirname(sys.executable), 'favicon.ico')
+    ]
+    
+    # 静默查找图标文件，使用第一个存在的路径
+    for path in icon_paths:
+        if os.path.exists(path):
+            return path
+    
+    return None
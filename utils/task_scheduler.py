@@ -0,0 +1,531 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+统一任务调度模块
+所有周期任务共用一个定时线程：按到期时间排序唤醒，到期时间相近的任务合并到同一次唤醒中执行，
+可能阻塞的任务（Win32调用、进程表遍历等）交给有界工作线程池执行，停止时取消任务即可立即生效
+"""
+
+import heapq
+import itertools
+import queue
+import random
+import threading
+import time
+from concurrent.futures import Future
+
+from utils.logger import logger
+from utils.metrics import get_metrics_registry
+
+
+class ScheduledTask:
+    """调度器中的一个任务，由 TaskScheduler.schedule / call_later 创建"""
+
+    def __init__(self, scheduler, name, func, interval, jitter, blocking):
+        self._scheduler = scheduler
+        self.name = name
+        self.func = func
+        self.interval = interval  # 秒，或每次执行后调用以获取下次间隔的函数；None表示一次性任务
+        self.jitter = jitter  # 间隔的随机提前比例，同时作为与其他任务合并唤醒的容差
+        self.blocking = blocking  # 是否在工作线程池中执行
+        self.next_run = 0.0
+        self.cancelled = False
+        self.running = False
+        self._wake_requested = False
+        self._generation = 0  # 重新排期后旧的堆条目失效
+        self._last_interval = 0.0  # 最近一次计算出的间隔（秒）
+
+        # 统计信息
+        self.run_count = 0
+        self.error_count = 0
+        self.coalesced = 0  # 被合并的立即执行请求次数
+        self.total_time = 0.0
+        self.last_lateness = 0.0  # 最近一次执行相对计划时间的延迟（秒）
+
+    @property
+    def active(self):
+        """任务是否仍在调度中"""
+        return not self.cancelled
+
+    def next_delay(self):
+        """计算下次执行前的等待时间（秒）"""
+        interval = self.interval() if callable(self.interval) else self.interval
+        self._last_interval = interval
+        return max(0.0, interval * (1 - self.jitter * self._scheduler.rng()))
+
+    @property
+    def slack(self):
+        """允许提前执行的时间（秒），用于与其他到期任务合并唤醒"""
+        return self._last_interval * self.jitter
+
+    def wake(self):
+        """请求立即执行，执行中收到的多次请求合并为执行结束后的一次"""
+        self._scheduler._wake_task(self)
+
+    def cancel(self):
+        """取消任务，正在执行的本次不受影响"""
+        self._scheduler._cancel_task(self)
+
+
+class _WorkerLane:
+    """一组工作线程和对应的任务队列，按需创建线程，数量不超过上限"""
+
+    def __init__(self, name, max_workers, idle_timeout=None, on_wakeup=None, queue_histogram=None):
+        """
+        Args:
+            name (str): 线程名前缀
+            max_workers (int): 工作线程数上限
+            idle_timeout (float, optional): 空闲多久后线程退出（秒），None表示常驻
+            on_wakeup (callable, optional): 工作线程取到任务时调用，用于统计唤醒次数
+            queue_histogram (Histogram, optional): 记录任务排队耗时的直方图
+        """
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.idle_timeout = idle_timeout
+        self._on_wakeup = on_wakeup
+        self._queue_histogram = queue_histogram
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._workers = []
+        self._idle = 0  # 正在等待任务的线程数
+        self._pending = 0  # 已入队、尚未被线程取走的任务数
+        self._created = 0
+
+    @property
+    def workers(self):
+        """当前的工作线程数"""
+        with self._lock:
+            return len(self._workers)
+
+    def qsize(self):
+        return self._queue.qsize()
+
+    def submit(self, func, args, kwargs):
+        """入队一次调用，排队任务多于空闲线程且未达上限时新建线程"""
+        future = Future()
+        with self._lock:
+            self._pending += 1
+            if self._pending > self._idle and len(self._workers) < self.max_workers:
+                self._created += 1
+                worker = threading.Thread(
+                    target=self._worker_loop, name=f"{self.name}-{self._created}", daemon=True
+                )
+                self._workers.append(worker)
+                worker.start()
+        self._queue.put((future, func, args, kwargs, time.monotonic()))
+        return future
+
+    def _worker_loop(self):
+        """工作线程，阻塞等待任务，常驻线程空闲时不产生唤醒"""
+        me = threading.current_thread()
+        while True:
+            with self._lock:
+                self._idle += 1
+            try:
+                item = self._queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                with self._lock:
+                    self._idle -= 1
+                    # 退出前再次确认没有刚入队的任务
+                    if self._pending == 0:
+                        if me in self._workers:
+                            self._workers.remove(me)
+                        return
+                continue
+            with self._lock:
+                self._idle -= 1
+                if item is not None:
+                    self._pending -= 1
+            if item is None:
+                return
+            future, func, args, kwargs, queued_at = item
+            if self._on_wakeup:
+                self._on_wakeup()
+            if self._queue_histogram is not None:
+                self._queue_histogram.observe((time.monotonic() - queued_at) * 1000)
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(func(*args, **kwargs))
+                except BaseException as e:
+                    future.set_exception(e)
+
+    def stop(self):
+        """
+        取消尚未开始的任务，每个工作线程收到一个退出标记
+
+        Returns:
+            list: 需要等待退出的线程
+        """
+        with self._lock:
+            workers, self._workers = self._workers, []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                with self._lock:
+                    self._pending -= 1
+                item[0].cancel()
+        for _ in workers:
+            self._queue.put(None)
+        return workers
+
+
+class TaskScheduler:
+    """单线程定时调度器 + 有界工作线程池"""
+
+    BACKGROUND_IDLE_TIMEOUT = 30.0  # 后台线程空闲多久后退出（秒）
+
+    def __init__(self, max_workers=3, clock=time.monotonic, rng=random.random, max_background_workers=2):
+        """
+        初始化任务调度器
+
+        Args:
+            max_workers (int): 执行阻塞任务的工作线程数上限
+            max_background_workers (int): 执行耗时较长的一次性任务（界面操作、手动清理等）的线程数上限
+            clock (callable): 单调时钟
+            rng (callable): 返回 [0, 1) 随机数的函数，用于间隔抖动
+        """
+        self.max_workers = max(1, max_workers)
+        self.clock = clock
+        self.rng = rng
+        self._condition = threading.Condition()
+        self._heap = []  # (计划时间, 序号, 任务代数, 任务)
+        self._sequence = itertools.count()
+        self._tasks = set()
+        self._thread = None
+        self._running = False
+
+        # 统计信息
+        self.wakeups = 0  # 定时线程被唤醒的次数
+        self.worker_wakeups = 0  # 工作线程被唤醒执行任务的次数
+        self.batched_runs = 0  # 提前合并到其他任务唤醒中执行的次数
+        self._started_at = None
+        self.last_shutdown_ms = None
+
+        metrics = get_metrics_registry()
+        self._late_histogram = metrics.histogram("scheduler.late_ms", "ms")
+        self._queue_histogram = metrics.histogram("scheduler.executor_wait_ms", "ms")
+
+        # 周期任务和短小的即时任务共用常驻工作线程；耗时较长的一次性任务使用独立的后台线程，
+        # 空闲后退出，避免占满工作线程导致进程快照刷新等周期任务停滞
+        self._workers = _WorkerLane("ace-worker", self.max_workers, on_wakeup=self._count_worker_wakeup,
+                                    queue_histogram=self._queue_histogram)
+        self._background = _WorkerLane("ace-background", max_background_workers,
+                                       idle_timeout=self.BACKGROUND_IDLE_TIMEOUT)
+
+    @property
+    def running(self):
+        """定时线程是否在运行"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """启动定时线程，schedule 首次调用时会自动启动"""
+        with self._condition:
+            if not self._running:
+                self._start_locked()
+
+    def stop(self, timeout=2.0):
+        """
+        停止定时线程和工作线程，取消所有任务
+
+        Args:
+            timeout (float): 等待线程退出的最长时间（秒）
+
+        Returns:
+            float: 停止耗时（毫秒）
+        """
+        start = time.perf_counter()
+        with self._condition:
+            if not self._running:
+                return 0.0
+            self._running = False
+            for task in self._tasks:
+                task.cancelled = True
+            self._tasks.clear()
+            self._heap.clear()
+            self._condition.notify_all()
+
+        # 清空尚未开始的阻塞任务，每个工作线程收到一个退出标记
+        workers = self._workers.stop() + self._background.stop()
+
+        deadline = time.monotonic() + timeout
+        for thread in [self._thread] + workers:
+            if thread is not threading.current_thread():
+                thread.join(max(0.0, deadline - time.monotonic()))
+        self._thread = None
+        self.last_shutdown_ms = (time.perf_counter() - start) * 1000
+        logger.debug(f"统一任务调度线程已停止，耗时 {self.last_shutdown_ms:.1f}ms")
+        return self.last_shutdown_ms
+
+    def schedule(self, name, func, interval, delay=None, jitter=0.1, blocking=False):
+        """
+        添加周期任务，每次执行结束后按间隔重新排期，执行时间较长时不会重叠或补跑
+
+        Args:
+            name (str): 任务名，用于统计
+            func (callable): 无参数的任务函数
+            interval (float or callable): 间隔（秒），或每次执行后调用以获取下次间隔的函数
+            delay (float, optional): 首次执行前的等待时间，默认为一个带抖动的间隔
+            jitter (float): 间隔的随机提前比例，避免多个任务同时唤醒
+            blocking (bool): 任务可能阻塞（Win32调用、进程遍历等）时在工作线程池中执行
+
+        Returns:
+            ScheduledTask: 任务句柄
+        """
+        task = ScheduledTask(self, name, func, interval, jitter, blocking)
+        self._add(task, task.next_delay() if delay is None else delay)
+        return task
+
+    def call_later(self, delay, func, name=None, blocking=False):
+        """
+        添加一次性延迟任务
+
+        Args:
+            delay (float): 等待时间（秒）
+            func (callable): 无参数的任务函数
+            name (str, optional): 任务名
+            blocking (bool): 是否在工作线程池中执行
+
+        Returns:
+            ScheduledTask: 任务句柄
+        """
+        task = ScheduledTask(self, name or getattr(func, "__name__", "task"), func, None, 0.0, blocking)
+        self._add(task, delay)
+        return task
+
+    def submit(self, func, *args, **kwargs):
+        """
+        在有界工作线程池中执行一次短小的阻塞调用（与周期任务共用线程），代替临时创建线程
+
+        Args:
+            func (callable): 函数
+            *args: 位置参数
+            **kwargs: 关键字参数
+
+        Returns:
+            concurrent.futures.Future: 执行结果
+        """
+        with self._condition:
+            if not self._running:
+                self._start_locked()
+        return self._workers.submit(func, args, kwargs)
+
+    def submit_background(self, func, *args, **kwargs):
+        """
+        在独立的后台线程中执行耗时较长的一次性调用（删除服务、手动内存清理等），不占用周期任务的工作线程
+
+        Args:
+            func (callable): 函数
+            *args: 位置参数
+            **kwargs: 关键字参数
+
+        Returns:
+            concurrent.futures.Future: 执行结果
+        """
+        with self._condition:
+            if not self._running:
+                self._start_locked()
+        return self._background.submit(func, args, kwargs)
+
+    def _start_locked(self):
+        """启动定时线程（调用方需持有锁）"""
+        self._running = True
+        self._started_at = self.clock()
+        self.wakeups = 0
+        self.worker_wakeups = 0
+        self._thread = threading.Thread(target=self._timer_loop, name="ace-scheduler", daemon=True)
+        self._thread.start()
+        logger.debug("统一任务调度线程已启动")
+
+    def _count_worker_wakeup(self):
+        self.worker_wakeups += 1
+
+    def _add(self, task, delay):
+        with self._condition:
+            if not self._running:
+                self._start_locked()
+            self._tasks.add(task)
+            self._push_locked(task, self.clock() + max(0.0, delay))
+
+    def _push_locked(self, task, when):
+        """按计划时间入堆（调用方需持有锁）"""
+        task._generation += 1
+        task.next_run = when
+        item = (when, next(self._sequence), task._generation, task)
+        heapq.heappush(self._heap, item)
+        # 只有成为最早到期的任务时才需要唤醒定时线程重新计算等待时间
+        if self._heap[0] is item:
+            self._condition.notify()
+
+    def _wake_task(self, task):
+        with self._condition:
+            if task.cancelled:
+                return
+            if task.running or task._wake_requested:
+                task.coalesced += 1
+                task._wake_requested = True
+                return
+            if task.next_run <= self.clock():
+                task.coalesced += 1
+                return
+            self._push_locked(task, self.clock())
+
+    def _cancel_task(self, task):
+        with self._condition:
+            task.cancelled = True
+            self._tasks.discard(task)
+            # 堆中的条目在到期时丢弃，不唤醒定时线程
+
+    def _timer_loop(self):
+        """定时线程：等待最早到期的任务，执行所有已进入容差范围的任务"""
+        while True:
+            with self._condition:
+                due = self._collect_due_locked()
+                while self._running and not due:
+                    self._wait_locked()
+                    self.wakeups += 1
+                    due = self._collect_due_locked()
+                if not self._running:
+                    return
+                now = self.clock()
+                for task in due:
+                    task.running = True
+                    task.last_lateness = max(0.0, now - task.next_run)
+
+            for task in due:
+                self._late_histogram.observe(task.last_lateness * 1000)
+                if task.blocking:
+                    self.submit(self._execute, task)
+                else:
+                    self._execute(task)
+
+    def _wait_locked(self):
+        """等待到最早的任务到期或被通知（调用方需持有锁）"""
+        while self._heap and self._is_stale(self._heap[0]):
+            heapq.heappop(self._heap)
+        if not self._heap:
+            self._condition.wait()
+        else:
+            self._condition.wait(max(0.0, self._heap[0][0] - self.clock()))
+
+    @staticmethod
+    def _is_stale(item):
+        _, _, generation, task = item
+        return task.cancelled or generation != task._generation
+
+    def _collect_due_locked(self):
+        """取出已到期的任务，以及在各自容差内即将到期、可以顺带执行的任务（调用方需持有锁）"""
+        now = self.clock()
+        while self._heap and self._is_stale(self._heap[0]):
+            heapq.heappop(self._heap)
+        if not self._heap or self._heap[0][0] > now:
+            return []
+
+        due, keep = [], []
+        for item in self._heap:
+            when, _, _, task = item
+            if self._is_stale(item):
+                continue
+            if when <= now:
+                due.append(task)
+            elif when - task.slack <= now:
+                due.append(task)
+                self.batched_runs += 1
+            else:
+                keep.append(item)
+        heapq.heapify(keep)
+        self._heap = keep
+        for task in due:
+            # 出堆后使旧条目失效，执行结束时重新入堆
+            task._generation += 1
+        return due
+
+    def _execute(self, task):
+        """执行任务并按间隔重新排期"""
+        start = time.perf_counter()
+        try:
+            task.func()
+        except Exception as e:
+            task.error_count += 1
+            logger.error(f"调度任务 {task.name} 执行失败: {str(e)}")
+        elapsed = time.perf_counter() - start
+
+        with self._condition:
+            task.run_count += 1
+            task.total_time += elapsed
+            if task.cancelled or not self._running:
+                task.running = False
+                return
+            if task.interval is None:
+                task.running = False
+                task.cancelled = True
+                self._tasks.discard(task)
+                return
+        # 计算间隔可能调用其他模块，不持有锁；期间任务仍标记为执行中，收到的立即执行请求记为待处理
+        try:
+            delay = task.next_delay()
+        except Exception as e:
+            logger.error(f"调度任务 {task.name} 计算间隔失败: {str(e)}")
+            delay = 60.0
+        with self._condition:
+            # 与重新入堆在同一次持锁中清除执行标记，避免立即执行请求看到旧的计划时间而被误合并
+            task.running = False
+            if task.cancelled or not self._running:
+                return
+            if task._wake_requested:
+                task._wake_requested = False
+                delay = 0.0
+            self._push_locked(task, self.clock() + delay)
+
+    def get_stats(self):
+        """
+        获取调度器统计信息
+
+        Returns:
+            dict: 进程线程总数、调度器线程数、每分钟唤醒次数（定时线程与工作线程合计）、合并执行次数、停止耗时及各任务统计
+        """
+        with self._condition:
+            tasks = sorted(self._tasks, key=lambda task: task.name)
+            elapsed = self.clock() - self._started_at if self._started_at is not None else 0.0
+            return {
+                "running": self._running,
+                "process_threads": threading.active_count(),
+                "scheduler_threads": (1 if self.running else 0) + self._workers.workers + self._background.workers,
+                "workers": self._workers.workers,
+                "max_workers": self.max_workers,
+                "background_workers": self._background.workers,
+                "executor_queue": self._workers.qsize(),
+                "wakeups": self.wakeups,
+                "worker_wakeups": self.worker_wakeups,
+                "wakeups_per_min": (self.wakeups + self.worker_wakeups) / elapsed * 60 if elapsed > 0 else 0.0,
+                "batched_runs": self.batched_runs,
+                "last_shutdown_ms": self.last_shutdown_ms,
+                "tasks": {
+                    task.name: {
+                        "runs": task.run_count,
+                        "errors": task.error_count,
+                        "coalesced": task.coalesced,
+                        "avg_ms": task.total_time / task.run_count * 1000 if task.run_count else 0.0,
+                        "blocking": task.blocking,
+                    }
+                    for task in tasks
+                },
+            }
+
+
+# 全局调度器实例
+_task_scheduler = None
+_task_scheduler_lock = threading.Lock()
+
+
+def get_task_scheduler():
+    """获取TaskScheduler单例"""
+    global _task_scheduler
+    if _task_scheduler is None:
+        with _task_scheduler_lock:
+            if _task_scheduler is None:
+                _task_scheduler = TaskScheduler()
+    return _task_scheduler
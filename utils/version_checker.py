@@ -10,9 +10,9 @@ import json
 import re
 import os
 import requests
-import threading
 from packaging import version
 from .logger import logger
+from .task_scheduler import get_task_scheduler
 
 
 class VersionChecker(QObject):
@@ -52,9 +52,8 @@ class VersionChecker(QObject):
             silent_mode (bool): 是否静默检查（不显示弹窗）
         """
         self.silent_mode = silent_mode
-        thread = threading.Thread(target=self._check_for_updates_thread)
-        thread.daemon = True
-        thread.start()
+        # 网络请求在统一任务调度器的工作线程中执行
+        get_task_scheduler().submit_background(self._check_for_updates_thread)
 
     def _check_for_updates_thread(self):
         """